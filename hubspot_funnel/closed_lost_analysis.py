@@ -5,16 +5,29 @@ Closed Lost Deals Analysis
 Analyzes why deals are being lost after Demo Presentado stage.
 Generates a markdown report with loss reasons, customer profiles,
 per-owner breakdown, and period comparison.
+
+Usage:
+    python hubspot_funnel/closed_lost_analysis.py
+    python hubspot_funnel/closed_lost_analysis.py --refresh      # Re-download instead of syncing the snapshot
+    python hubspot_funnel/closed_lost_analysis.py --no-snapshot  # Query HubSpot directly
 """
 
 import os
+import re
+import sys
 import json
-import requests
+import argparse
 from datetime import datetime, timedelta
-from collections import Counter, defaultdict
+from collections import defaultdict
 from pathlib import Path
+
+import numpy as np
+import pandas as pd
 from dotenv import load_dotenv
 
+sys.path.insert(0, str(Path(__file__).parent))
+from hubspot_extract import FunnelExtractor, SearchSpec, add_extract_arguments, extractor_from_args
+
 load_dotenv()
 
 # Configuration
@@ -52,54 +65,34 @@ def load_owners():
     return {o["ownerId"]: o["name"] for o in data["owners"]}
 
 
-def fetch_deals(owner_ids: list, days_back: int = 60) -> list:
-    """Fetch closed lost deals for specified owners in date range."""
-    headers = {
-        "Authorization": f"Bearer {API_KEY}",
-        "Content-Type": "application/json"
-    }
-
-    cutoff_date = datetime.now() - timedelta(days=days_back)
-    cutoff_ms = int(cutoff_date.timestamp() * 1000)
+DEAL_PROPERTIES = [
+    "dealname", "amount", "dealstage", "closedate", "createdate",
+    "hubspot_owner_id", "motivo_de_cerrada_perdida",
+    "detalles_de_oportunidad_perdida", "costumer_profile",
+    "hs_analytics_source", "hs_analytics_source_data_1",
+    "origen_de_importacion"
+]
 
-    all_deals = []
-
-    for owner_id in owner_ids:
-        after = None
-        while True:
-            payload = {
-                "filterGroups": [{
-                    "filters": [
-                        {"propertyName": "dealstage", "operator": "EQ", "value": CLOSED_LOST_STAGE},
-                        {"propertyName": "hubspot_owner_id", "operator": "EQ", "value": owner_id},
-                        {"propertyName": "closedate", "operator": "GTE", "value": str(cutoff_ms)}
-                    ]
-                }],
-                "properties": [
-                    "dealname", "amount", "closedate", "createdate",
-                    "hubspot_owner_id", "motivo_de_cerrada_perdida",
-                    "detalles_de_oportunidad_perdida", "costumer_profile",
-                    "hs_analytics_source", "hs_analytics_source_data_1",
-                    "origen_de_importacion"
-                ],
-                "limit": 100
-            }
-            if after:
-                payload["after"] = after
 
-            resp = requests.post(f"{BASE_URL}/crm/v3/objects/deals/search",
-                               headers=headers, json=payload)
-            data = resp.json()
+def fetch_deals(owner_ids: list, days_back: int = 60, extractor: FunnelExtractor = None) -> list:
+    """Fetch closed lost deals for specified owners in date range.
 
-            all_deals.extend(data.get("results", []))
+    Deals come from the shared extraction layer (per-owner searches run
+    concurrently and are kept in the local snapshot). The stage is filtered
+    locally so deals that change stage are picked up by incremental syncs.
+    """
+    cutoff_date = datetime.now() - timedelta(days=days_back)
+    cutoff_ms = int(cutoff_date.timestamp() * 1000)
 
-            paging = data.get("paging", {})
-            if paging.get("next", {}).get("after"):
-                after = paging["next"]["after"]
-            else:
-                break
+    own_extractor = extractor is None
+    extractor = extractor or FunnelExtractor(API_KEY)
+    try:
+        deals = extractor.fetch(SearchSpec("deals", owner_ids, DEAL_PROPERTIES, "closedate", cutoff_ms))
+    finally:
+        if own_extractor:
+            extractor.close()
 
-    return all_deals
+    return [d for d in deals if d["properties"].get("dealstage") == CLOSED_LOST_STAGE]
 
 
 def parse_deals(deals: list, owners: dict) -> list:
@@ -143,377 +136,432 @@ def parse_deals(deals: list, owners: dict) -> list:
     return parsed
 
 
-def split_by_period(deals: list, days: int = 30):
+# Lead source labels mapping
+LEAD_SOURCE_LABELS = {
+    "ORGANIC_SEARCH": "Organic Search",
+    "PAID_SEARCH": "Paid Search",
+    "EMAIL_MARKETING": "Email Marketing",
+    "SOCIAL_MEDIA": "Organic Social",
+    "REFERRALS": "Referrals",
+    "OTHER_CAMPAIGNS": "Other Campaigns",
+    "DIRECT_TRAFFIC": "Direct Traffic",
+    "OFFLINE": "Offline Sources",
+    "PAID_SOCIAL": "Paid Social",
+    "AI_REFERRALS": "AI Referrals",
+}
+
+
+# Columns of a parsed deal (see parse_deals)
+DEAL_COLUMNS = [
+    "id", "name", "amount", "closedate", "owner_id", "owner_name", "loss_reason",
+    "loss_details", "customer_profile", "lead_source", "lead_source_detail", "origen_importacion",
+]
+CATEGORY_COLUMNS = [
+    "owner_name", "loss_reason", "reason_label", "profile", "lead_source", "source_label", "details_lc", "name_lc",
+]
+
+
+def deals_frame(deals: list) -> pd.DataFrame:
+    """Load parsed deals into the typed frame every analysis runs on.
+
+    Owner, reason, profile and source are categoricals. Labels, lowercase
+    text for keyword searches and the reason flags are derived once here,
+    so each analysis is a grouped aggregation over this frame. The lowercase
+    text is categorical too: verbatims repeat, and keyword searches only
+    need to scan each distinct text once.
+    """
+    df = pd.DataFrame(deals, columns=DEAL_COLUMNS)
+    for col in DEAL_COLUMNS:
+        if col not in ("amount", "closedate"):
+            df[col] = df[col].fillna("").astype(str)
+    df["amount"] = pd.to_numeric(df["amount"], errors="coerce").fillna(0).astype(float)
+    df["closedate"] = pd.to_datetime(df["closedate"], utc=True)
+
+    reason = df["loss_reason"]
+    df["reason_label"] = reason.map(LOSS_REASON_LABELS).fillna(reason)
+    df["profile"] = df["customer_profile"].str.lower()
+    source = df["lead_source"].where(df["lead_source"] != "", "Unknown")
+    df["source_label"] = source.map(LEAD_SOURCE_LABELS).fillna(source)
+    df["details_lc"] = df["loss_details"].str.lower()
+    df["name_lc"] = df["name"].str.lower()
+
+    reason_lc = reason.str.lower()
+    df["is_higiene"] = reason_lc.str.contains("higiene", regex=False)
+    df["is_noshow"] = reason_lc.str.contains("no_asistio", regex=False)
+    df["is_timing"] = reason_lc.str.contains("mal_timing", regex=False)
+
+    for col in CATEGORY_COLUMNS:
+        df[col] = df[col].astype("category")
+    return df
+
+
+def as_frame(deals) -> pd.DataFrame:
+    """Accept either a deals frame or a list of parsed deals."""
+    return deals if isinstance(deals, pd.DataFrame) else deals_frame(deals)
+
+
+def percent(part, whole) -> float:
+    return float(part / whole * 100) if whole > 0 else 0
+
+
+def contains_any(text: pd.Series, keywords: list) -> pd.Series:
+    """True where a categorical text column contains any of the keywords.
+
+    Searches the distinct texts, or the values themselves when a slice of the
+    frame has fewer rows than categories.
+    """
+    pattern = "|".join(re.escape(kw) for kw in keywords)
+    if len(text) < len(text.cat.categories):
+        return text.astype(str).str.contains(pattern)
+    found = np.asarray(text.cat.categories.str.contains(pattern), dtype=bool)
+    return pd.Series(found[text.cat.codes.to_numpy()], index=text.index)
+
+
+def reason_labels(df: pd.DataFrame, empty: str) -> pd.Series:
+    """Loss reason labels with `empty` for deals without a reason."""
+    return df["reason_label"].astype(str).where(df["loss_reason"] != "", empty)
+
+
+def grouped_totals(df: pd.DataFrame, keys) -> pd.DataFrame:
+    """Deal count and revenue per group, in order of first appearance."""
+    return (df.assign(_row=np.arange(len(df)))
+              .groupby(keys, observed=True)
+              .agg(count=("amount", "size"), revenue=("amount", "sum"), first=("_row", "min"))
+              .sort_values("first"))
+
+
+def most_common(df: pd.DataFrame, keys) -> pd.DataFrame:
+    """grouped_totals ordered like Counter.most_common(): by count, ties by first appearance."""
+    return grouped_totals(df, keys).sort_values("count", ascending=False, kind="stable")
+
+
+def counts_within(df: pd.DataFrame, key: str, value) -> dict:
+    """most_common() of `value` inside each `key` group, as {group: [(value, count), ...]}."""
+    result = defaultdict(list)
+    for (group, label), count in most_common(df, [key, value])["count"].items():
+        result[group].append((label, int(count)))
+    return result
+
+
+def owner_totals(df: pd.DataFrame, owners: dict, **aggregations) -> pd.DataFrame:
+    """Per-owner aggregations with one row per configured owner (zeros when they lost nothing)."""
+    grouped = df.groupby("owner_name", observed=True).agg(
+        deals=("amount", "size"), revenue=("amount", "sum"), **aggregations
+    )
+    grouped.index = grouped.index.astype(object)
+    return grouped.reindex(list(owners.values()), fill_value=0)
+
+
+def split_by_period(deals, days: int = 30):
     """Split deals into last N days and previous N days."""
-    now = datetime.now(tz=deals[0]["closedate"].tzinfo if deals and deals[0]["closedate"] else None)
-    cutoff = now - timedelta(days=days)
-    prev_cutoff = cutoff - timedelta(days=days)
+    df = as_frame(deals)
+    cutoff = pd.Timestamp.now(tz="UTC") - pd.Timedelta(days=days)
+    prev_cutoff = cutoff - pd.Timedelta(days=days)
 
-    recent = [d for d in deals if d["closedate"] and d["closedate"] >= cutoff]
-    previous = [d for d in deals if d["closedate"] and prev_cutoff <= d["closedate"] < cutoff]
+    closedate = df["closedate"]
+    recent = df[closedate >= cutoff]
+    previous = df[(closedate >= prev_cutoff) & (closedate < cutoff)]
 
     return recent, previous
 
 
-def analyze_loss_reasons(deals: list) -> dict:
-    """Analyze loss reason distribution."""
-    reasons = Counter(d["loss_reason"] for d in deals if d["loss_reason"])
-    total = sum(reasons.values())
+def reason_shares(pairs: list) -> dict:
+    """{label: {count, pct}} from most_common (label, count) pairs."""
+    total = sum(count for _, count in pairs)
+    return {label: {"count": count, "pct": percent(count, total)} for label, count in pairs}
 
-    result = {}
-    for reason, count in reasons.most_common():
-        label = LOSS_REASON_LABELS.get(reason, reason)
-        pct = (count / total * 100) if total > 0 else 0
-        result[label] = {"count": count, "pct": pct}
 
-    return result
+def analyze_loss_reasons(deals) -> dict:
+    """Analyze loss reason distribution."""
+    df = as_frame(deals)
+    counts = most_common(df[df["loss_reason"] != ""], "reason_label")["count"]
+    return reason_shares([(label, int(count)) for label, count in counts.items()])
 
 
-def analyze_customer_profiles(deals: list) -> dict:
+def analyze_customer_profiles(deals) -> dict:
     """Analyze customer profile distribution."""
-    profiles = Counter((d["customer_profile"] or "").lower() for d in deals if d.get("customer_profile"))
-    total = len(deals)
+    df = as_frame(deals)
+    profiles = most_common(df[df["profile"] != ""], "profile")
 
     result = {}
-    for profile, count in profiles.most_common():
-        if not profile:
-            continue
+    for profile, row in profiles.iterrows():
         label = PROFILE_LABELS.get(profile, profile.title())
-        amounts = [d["amount"] for d in deals if (d.get("customer_profile") or "").lower() == profile]
-        avg_amount = sum(amounts) / len(amounts) if amounts else 0
-        pct = (count / total * 100) if total > 0 else 0
-        result[label] = {"count": count, "pct": pct, "avg_amount": avg_amount}
+        result[label] = {
+            "count": int(row["count"]),
+            "pct": percent(row["count"], len(df)),
+            "avg_amount": float(row["revenue"] / row["count"]),
+        }
 
     return result
 
 
-def analyze_by_owner(deals: list, owners: dict) -> dict:
+def analyze_by_owner(deals, owners: dict) -> dict:
     """Analyze deals grouped by owner."""
-    by_owner = defaultdict(list)
-    for deal in deals:
-        by_owner[deal["owner_name"]].append(deal)
+    df = as_frame(deals)
+    totals = owner_totals(df, owners)
+    reasons = counts_within(df[df["loss_reason"] != ""], "owner_name", "reason_label")
+    rows = df.groupby("owner_name", observed=True).indices
+    no_rows = np.array([], dtype=int)
 
     result = {}
-    for owner_name in owners.values():
-        owner_deals = by_owner.get(owner_name, [])
-        total_amount = sum(d["amount"] for d in owner_deals)
-        reasons = analyze_loss_reasons(owner_deals)
-
+    for owner_name, row in totals.iterrows():
         result[owner_name] = {
-            "count": len(owner_deals),
-            "total_amount": total_amount,
-            "reasons": reasons,
-            "deals": owner_deals
+            "count": int(row["deals"]),
+            "total_amount": float(row["revenue"]),
+            "reasons": reason_shares(reasons.get(owner_name, [])),
+            "deals": df.iloc[rows.get(owner_name, no_rows)],
         }
 
     return result
 
 
-def extract_competitor_mentions(deals: list) -> dict:
+def extract_competitor_mentions(deals) -> dict:
     """Extract competitor mentions from loss details."""
     competitors = ["tokko", "inmuebles24", "properati", "simi", "witei", "salesforce",
                    "hubspot", "zoho", "monday", "notion", "excel", "whatsapp"]
+    details = as_frame(deals)["details_lc"]
 
-    mentions = Counter()
-    for deal in deals:
-        details = (deal.get("loss_details") or "").lower()
-        for comp in competitors:
-            if comp in details:
-                mentions[comp.title()] += 1
+    # Same order as Counter.most_common(): count, then first deal to mention it
+    mentions = []
+    for order, comp in enumerate(competitors):
+        found = contains_any(details, [comp]).to_numpy()
+        if found.any():
+            mentions.append((-int(found.sum()), int(found.argmax()), order, comp.title()))
 
-    return dict(mentions.most_common(10))
+    return {name: -count for count, _, _, name in sorted(mentions)[:10]}
 
 
 # =============================================================================
 # ENHANCED DIAGNOSTIC ANALYSIS FUNCTIONS
 # =============================================================================
 
-def analyze_revenue_by_reason(deals: list) -> dict:
+def analyze_revenue_by_reason(deals) -> dict:
     """Analyze revenue lost by reason (not just deal count)."""
-    by_reason = defaultdict(lambda: {"count": 0, "revenue": 0, "deals": []})
-    total_revenue = sum(d["amount"] for d in deals)
-    total_count = len(deals)
-
-    for deal in deals:
-        reason = deal.get("loss_reason", "") or "unknown"
-        label = LOSS_REASON_LABELS.get(reason, reason)
-        by_reason[label]["count"] += 1
-        by_reason[label]["revenue"] += deal["amount"]
-        by_reason[label]["deals"].append(deal)
+    df = as_frame(deals)
+    by_reason = grouped_totals(df.assign(reason=reason_labels(df, "unknown")), "reason")
+    total_revenue = df["amount"].sum()
+    total_count = len(df)
 
     result = {}
-    for reason, data in by_reason.items():
+    for reason, data in by_reason.sort_values("revenue", ascending=False, kind="stable").iterrows():
         result[reason] = {
-            "count": data["count"],
-            "count_pct": (data["count"] / total_count * 100) if total_count > 0 else 0,
-            "revenue": data["revenue"],
-            "revenue_pct": (data["revenue"] / total_revenue * 100) if total_revenue > 0 else 0,
-            "avg_deal": data["revenue"] / data["count"] if data["count"] > 0 else 0,
+            "count": int(data["count"]),
+            "count_pct": percent(data["count"], total_count),
+            "revenue": float(data["revenue"]),
+            "revenue_pct": percent(data["revenue"], total_revenue),
+            "avg_deal": float(data["revenue"] / data["count"]),
         }
 
-    return dict(sorted(result.items(), key=lambda x: x[1]["revenue"], reverse=True))
+    return result
 
 
-def segment_by_deal_size(deals: list) -> dict:
+def segment_by_deal_size(deals) -> dict:
     """Segment deals by size: Small ($0-500), Medium ($501-2000), Enterprise ($2001+)."""
     segments = {
-        "Small ($0-$500)": {"min": 0, "max": 500, "deals": []},
-        "Medium ($501-$2,000)": {"min": 501, "max": 2000, "deals": []},
-        "Enterprise ($2,001+)": {"min": 2001, "max": float("inf"), "deals": []},
+        "Small ($0-$500)": (0, 500),
+        "Medium ($501-$2,000)": (501, 2000),
+        "Enterprise ($2,001+)": (2001, float("inf")),
     }
+    df = as_frame(deals)
 
-    for deal in deals:
-        amount = deal["amount"]
-        for seg_name, seg_data in segments.items():
-            if seg_data["min"] <= amount <= seg_data["max"]:
-                seg_data["deals"].append(deal)
-                break
-
-    total = len(deals)
     result = {}
-    for seg_name, seg_data in segments.items():
-        seg_deals = seg_data["deals"]
+    for seg_name, (low, high) in segments.items():
+        seg_deals = df[df["amount"].between(low, high)]
         result[seg_name] = {
             "count": len(seg_deals),
-            "pct": (len(seg_deals) / total * 100) if total > 0 else 0,
-            "total_revenue": sum(d["amount"] for d in seg_deals),
+            "pct": percent(len(seg_deals), len(df)),
+            "total_revenue": float(seg_deals["amount"].sum()),
             "deals": seg_deals,
         }
 
     return result
 
 
-def loss_autopsy(deals: list, threshold: float = 5000) -> list:
+def loss_autopsy(deals, threshold: float = 5000) -> list:
     """Deep dive on high-value lost deals (>threshold)."""
-    high_value = [d for d in deals if d["amount"] >= threshold]
-    high_value.sort(key=lambda x: x["amount"], reverse=True)
-
-    autopsies = []
-    for deal in high_value:
-        reason_label = LOSS_REASON_LABELS.get(deal["loss_reason"], deal["loss_reason"] or "N/A")
-        autopsies.append({
-            "name": deal["name"],
-            "amount": deal["amount"],
-            "owner": deal["owner_name"],
-            "reason": reason_label,
-            "details": deal.get("loss_details", ""),
-            "profile": deal.get("customer_profile", ""),
-        })
+    df = as_frame(deals)
+    high_value = df[df["amount"] >= threshold].sort_values("amount", ascending=False, kind="stable")
 
-    return autopsies
+    return pd.DataFrame({
+        "name": high_value["name"],
+        "amount": high_value["amount"],
+        "owner": high_value["owner_name"].astype(str),
+        "reason": reason_labels(high_value, "N/A"),
+        "details": high_value["loss_details"],
+        "profile": high_value["customer_profile"],
+    }).to_dict("records")
 
 
-def categorize_higiene_verbatims(deals: list) -> dict:
+def categorize_higiene_verbatims(deals) -> dict:
     """Categorize 'Higiene de lead' deals by subcategory."""
-    higiene_deals = [d for d in deals if "higiene" in (d.get("loss_reason") or "").lower()]
-
     categories = {
-        "Duplicado": [],
-        "Negocio de prueba": [],
-        "Buscaba trabajo": [],
-        "Otro": [],
+        "Duplicado": ["duplica", "ya tiene", "ya está"],
+        "Negocio de prueba": ["prueba", "test"],
+        "Buscaba trabajo": ["trabajo", "empleo"],
     }
+    df = as_frame(deals)
+    higiene = df[df["is_higiene"]]
+
+    # First matching subcategory wins, like an if/elif chain
+    category = np.select(
+        [contains_any(higiene["details_lc"], keywords) for keywords in categories.values()],
+        list(categories), default="Otro",
+    )
+    totals = grouped_totals(higiene.assign(category=category), "category")
 
-    for deal in higiene_deals:
-        details = (deal.get("loss_details") or "").lower()
-        if "duplica" in details or "ya tiene" in details or "ya está" in details:
-            categories["Duplicado"].append(deal)
-        elif "prueba" in details or "test" in details:
-            categories["Negocio de prueba"].append(deal)
-        elif "trabajo" in details or "empleo" in details:
-            categories["Buscaba trabajo"].append(deal)
-        else:
-            categories["Otro"].append(deal)
-
-    total = len(higiene_deals)
     result = {}
-    for cat, cat_deals in categories.items():
-        if cat_deals:
+    for cat in [*categories, "Otro"]:
+        if cat in totals.index:
             result[cat] = {
-                "count": len(cat_deals),
-                "pct": (len(cat_deals) / total * 100) if total > 0 else 0,
-                "revenue": sum(d["amount"] for d in cat_deals),
+                "count": int(totals.at[cat, "count"]),
+                "pct": percent(totals.at[cat, "count"], len(higiene)),
+                "revenue": float(totals.at[cat, "revenue"]),
             }
 
     return result
 
 
-def analyze_zero_value_deals(deals: list) -> dict:
+def analyze_zero_value_deals(deals) -> dict:
     """Analyze the impact of $0 deals on metrics."""
-    zero_deals = [d for d in deals if d["amount"] == 0]
-    nonzero_deals = [d for d in deals if d["amount"] > 0]
+    df = as_frame(deals)
+    zero_deals = df[df["amount"] == 0]
+    nonzero_deals = df[df["amount"] > 0]
 
     return {
         "zero_count": len(zero_deals),
-        "zero_pct": (len(zero_deals) / len(deals) * 100) if deals else 0,
+        "zero_pct": percent(len(zero_deals), len(df)),
         "nonzero_count": len(nonzero_deals),
-        "nonzero_revenue": sum(d["amount"] for d in nonzero_deals),
+        "nonzero_revenue": float(nonzero_deals["amount"].sum()),
         "zero_deals": zero_deals,
     }
 
 
-def analyze_owner_lead_quality(deals: list, owners: dict) -> dict:
+def analyze_owner_lead_quality(deals, owners: dict) -> dict:
     """Analyze lead quality indicators by owner."""
-    by_owner = defaultdict(list)
-    for deal in deals:
-        by_owner[deal["owner_name"]].append(deal)
+    df = as_frame(deals)
+    totals = owner_totals(df, owners, higiene=("is_higiene", "sum"), noshow=("is_noshow", "sum"))
 
     result = {}
-    for owner_name in owners.values():
-        owner_deals = by_owner.get(owner_name, [])
-        if not owner_deals:
-            continue
-
-        total = len(owner_deals)
-        higiene_count = len([d for d in owner_deals if "higiene" in (d.get("loss_reason") or "").lower()])
-        noshow_count = len([d for d in owner_deals if "no_asistio" in (d.get("loss_reason") or "").lower()])
+    for owner_name, row in totals[totals["deals"] > 0].iterrows():
+        total = int(row["deals"])
+        higiene_count = int(row["higiene"])
+        noshow_count = int(row["noshow"])
 
         # Quality score: lower higiene + noshow = better quality
-        quality_score = 100 - ((higiene_count + noshow_count) / total * 100) if total > 0 else 0
+        quality_score = 100 - ((higiene_count + noshow_count) / total * 100)
 
         result[owner_name] = {
             "total_deals": total,
             "higiene_count": higiene_count,
-            "higiene_pct": (higiene_count / total * 100) if total > 0 else 0,
+            "higiene_pct": percent(higiene_count, total),
             "noshow_count": noshow_count,
-            "noshow_pct": (noshow_count / total * 100) if total > 0 else 0,
+            "noshow_pct": percent(noshow_count, total),
             "quality_score": quality_score,
         }
 
     return dict(sorted(result.items(), key=lambda x: x[1]["quality_score"]))
 
 
-def extract_enhanced_competitors(deals: list) -> dict:
+def extract_enhanced_competitors(deals) -> dict:
     """Enhanced competitor extraction including contextual mentions."""
+    # HeyGia variants are merged under one name
     competitors = {
-        "zoho": {"name": "Zoho", "mentions": 0, "deals": [], "revenue": 0},
-        "heygia": {"name": "HeyGia", "mentions": 0, "deals": [], "revenue": 0},
-        "hgia": {"name": "HeyGia", "mentions": 0, "deals": [], "revenue": 0},
-        "atom": {"name": "Atom", "mentions": 0, "deals": [], "revenue": 0},
-        "tokko": {"name": "Tokko", "mentions": 0, "deals": [], "revenue": 0},
-        "inmuebles24": {"name": "Inmuebles24", "mentions": 0, "deals": [], "revenue": 0},
-        "salesforce": {"name": "Salesforce", "mentions": 0, "deals": [], "revenue": 0},
+        "zoho": "Zoho",
+        "heygia": "HeyGia",
+        "hgia": "HeyGia",
+        "atom": "Atom",
+        "tokko": "Tokko",
+        "inmuebles24": "Inmuebles24",
+        "salesforce": "Salesforce",
     }
+    df = as_frame(deals)
+    # One pass over every name/verbatim, then per-competitor checks on the deals that mention any
+    candidates = df[contains_any(df["details_lc"], list(competitors)) | contains_any(df["name_lc"], list(competitors))]
 
-    # Also track generic "cheaper alternative" mentions
-    generic_alternatives = []
+    result = {}
+    for key, name in competitors.items():
+        mentioned = candidates[contains_any(candidates["details_lc"], [key]) | contains_any(candidates["name_lc"], [key])]
+        if len(mentioned):
+            entry = result.setdefault(name, {"mentions": 0, "deals_lost": 0, "revenue_lost": 0})
+            entry["mentions"] += len(mentioned)
+            entry["deals_lost"] += len(mentioned)
+            entry["revenue_lost"] += float(mentioned["amount"].sum())
 
-    for deal in deals:
-        details = (deal.get("loss_details") or "").lower()
-        name = (deal.get("name") or "").lower()
-        combined = details + " " + name
-
-        for key, comp_data in competitors.items():
-            if key in combined:
-                comp_data["mentions"] += 1
-                comp_data["deals"].append(deal)
-                comp_data["revenue"] += deal["amount"]
-
-        # Check for generic cheaper alternatives
-        if any(phrase in details for phrase in ["más económic", "económica", "50% más", "otra opción"]):
-            generic_alternatives.append(deal)
-
-    # Merge HeyGia variants
-    competitors["heygia"]["mentions"] += competitors["hgia"]["mentions"]
-    competitors["heygia"]["deals"].extend(competitors["hgia"]["deals"])
-    competitors["heygia"]["revenue"] += competitors["hgia"]["revenue"]
-    del competitors["hgia"]
-
-    result = {comp_data["name"]: {
-        "mentions": comp_data["mentions"],
-        "deals_lost": len(comp_data["deals"]),
-        "revenue_lost": comp_data["revenue"],
-    } for comp_data in competitors.values() if comp_data["mentions"] > 0}
-
-    if generic_alternatives:
+    # Also track generic "cheaper alternative" mentions
+    generic_alternatives = df[contains_any(df["details_lc"], ["más económic", "económica", "50% más", "otra opción"])]
+    if len(generic_alternatives):
         result["Alternativa más económica"] = {
             "mentions": len(generic_alternatives),
             "deals_lost": len(generic_alternatives),
-            "revenue_lost": sum(d["amount"] for d in generic_alternatives),
+            "revenue_lost": float(generic_alternatives["amount"].sum()),
         }
 
     return dict(sorted(result.items(), key=lambda x: x[1]["revenue_lost"], reverse=True))
 
 
-def analyze_geographic_friction(deals: list) -> list:
+def analyze_geographic_friction(deals) -> list:
     """Identify geographic/currency friction from verbatims."""
     keywords = ["bolivia", "cambio", "exchange", "currency", "dólar", "peso", "moneda"]
-    friction_deals = []
+    df = as_frame(deals)
 
-    for deal in deals:
-        details = (deal.get("loss_details") or "").lower()
-        for keyword in keywords:
-            if keyword in details:
-                friction_deals.append({
-                    "deal": deal["name"],
-                    "amount": deal["amount"],
-                    "details": deal.get("loss_details", ""),
-                    "keyword": keyword,
-                })
-                break
+    # First keyword found (in list order) is the one reported
+    keyword = np.select([contains_any(df["details_lc"], [kw]) for kw in keywords], keywords, default="")
+    friction = df[keyword != ""]
 
-    return friction_deals
+    return pd.DataFrame({
+        "deal": friction["name"],
+        "amount": friction["amount"],
+        "details": friction["loss_details"],
+        "keyword": keyword[keyword != ""],
+    }).to_dict("records")
 
 
-def analyze_noshow_rate(deals: list, owners: dict) -> dict:
+def analyze_noshow_rate(deals, owners: dict) -> dict:
     """Calculate no-show rate by owner."""
-    by_owner = defaultdict(list)
-    for deal in deals:
-        by_owner[deal["owner_name"]].append(deal)
+    totals = owner_totals(as_frame(deals), owners, noshow=("is_noshow", "sum"))
 
     result = {}
-    for owner_name in owners.values():
-        owner_deals = by_owner.get(owner_name, [])
-        noshow_count = len([d for d in owner_deals if "no_asistio" in (d.get("loss_reason") or "").lower()])
-        total = len(owner_deals)
-
+    for owner_name, row in totals.iterrows():
         result[owner_name] = {
-            "noshow_count": noshow_count,
-            "total_deals": total,
-            "noshow_rate": (noshow_count / total * 100) if total > 0 else 0,
+            "noshow_count": int(row["noshow"]),
+            "total_deals": int(row["deals"]),
+            "noshow_rate": percent(row["noshow"], row["deals"]),
         }
 
     return dict(sorted(result.items(), key=lambda x: x[1]["noshow_rate"], reverse=True))
 
 
-def analyze_seasonality(deals: list) -> dict:
+def analyze_seasonality(deals) -> dict:
     """Analyze 'Mal timing/Budget' for delayed vs true loss."""
-    timing_deals = [d for d in deals if "mal_timing" in (d.get("loss_reason") or "").lower()]
-
     delayed_keywords = ["enero", "january", "retomar", "revisar más adelante", "esperar", "3 semana"]
     budget_keywords = ["presupuesto", "ppto", "budget", "recursos", "no tiene"]
 
-    delayed = []
-    true_budget = []
-    other = []
+    df = as_frame(deals)
+    timing_deals = df[df["is_timing"]]
+    is_delayed = contains_any(timing_deals["details_lc"], delayed_keywords)
+    is_budget = ~is_delayed & contains_any(timing_deals["details_lc"], budget_keywords)
 
-    for deal in timing_deals:
-        details = (deal.get("loss_details") or "").lower()
-
-        if any(kw in details for kw in delayed_keywords):
-            delayed.append(deal)
-        elif any(kw in details for kw in budget_keywords):
-            true_budget.append(deal)
-        else:
-            other.append(deal)
+    delayed = timing_deals[is_delayed]
+    true_budget = timing_deals[is_budget]
+    other_count = int((~is_delayed & ~is_budget).sum())
 
     total = len(timing_deals)
     return {
         "total_timing_deals": total,
         "delayed_interest": {
             "count": len(delayed),
-            "pct": (len(delayed) / total * 100) if total > 0 else 0,
-            "revenue": sum(d["amount"] for d in delayed),
+            "pct": percent(len(delayed), total),
+            "revenue": float(delayed["amount"].sum()),
             "deals": delayed,
         },
         "true_budget_loss": {
             "count": len(true_budget),
-            "pct": (len(true_budget) / total * 100) if total > 0 else 0,
-            "revenue": sum(d["amount"] for d in true_budget),
+            "pct": percent(len(true_budget), total),
+            "revenue": float(true_budget["amount"].sum()),
         },
         "uncategorized": {
-            "count": len(other),
-            "pct": (len(other) / total * 100) if total > 0 else 0,
+            "count": other_count,
+            "pct": percent(other_count, total),
         },
     }
 
@@ -541,23 +589,17 @@ def pareto_analysis(revenue_by_reason: dict) -> list:
     return result
 
 
-def owner_efficiency_matrix(deals: list, owners: dict) -> list:
+def owner_efficiency_matrix(deals, owners: dict) -> list:
     """Compare owner efficiency: deals lost vs revenue lost vs avg deal value."""
-    by_owner = defaultdict(list)
-    for deal in deals:
-        by_owner[deal["owner_name"]].append(deal)
+    totals = owner_totals(as_frame(deals), owners)
 
     result = []
-    for owner_name in owners.values():
-        owner_deals = by_owner.get(owner_name, [])
-        total_revenue = sum(d["amount"] for d in owner_deals)
-        avg_deal = total_revenue / len(owner_deals) if owner_deals else 0
-
+    for owner_name, row in totals.iterrows():
         result.append({
             "owner": owner_name,
-            "deals_lost": len(owner_deals),
-            "revenue_lost": total_revenue,
-            "avg_deal_value": avg_deal,
+            "deals_lost": int(row["deals"]),
+            "revenue_lost": float(row["revenue"]),
+            "avg_deal_value": float(row["revenue"] / row["deals"]) if row["deals"] else 0,
         })
 
     # Rank by avg deal value (who's losing bigger deals)
@@ -568,79 +610,52 @@ def owner_efficiency_matrix(deals: list, owners: dict) -> list:
     return result
 
 
-# Lead source labels mapping
-LEAD_SOURCE_LABELS = {
-    "ORGANIC_SEARCH": "Organic Search",
-    "PAID_SEARCH": "Paid Search",
-    "EMAIL_MARKETING": "Email Marketing",
-    "SOCIAL_MEDIA": "Organic Social",
-    "REFERRALS": "Referrals",
-    "OTHER_CAMPAIGNS": "Other Campaigns",
-    "DIRECT_TRAFFIC": "Direct Traffic",
-    "OFFLINE": "Offline Sources",
-    "PAID_SOCIAL": "Paid Social",
-    "AI_REFERRALS": "AI Referrals",
-}
-
-
-def analyze_by_lead_source(deals: list) -> dict:
+def analyze_by_lead_source(deals) -> dict:
     """Analyze closed lost deals by lead origin channel."""
-    by_source = defaultdict(lambda: {"count": 0, "revenue": 0, "deals": [], "reasons": Counter()})
-    total_count = len(deals)
-    total_revenue = sum(d["amount"] for d in deals)
-
-    for deal in deals:
-        source = deal.get("lead_source") or "Unknown"
-        label = LEAD_SOURCE_LABELS.get(source, source)
-        by_source[label]["count"] += 1
-        by_source[label]["revenue"] += deal["amount"]
-        by_source[label]["deals"].append(deal)
+    df = as_frame(deals)
+    total_count = len(df)
+    total_revenue = df["amount"].sum()
 
-        # Track loss reasons per source
-        reason = deal.get("loss_reason", "")
-        reason_label = LOSS_REASON_LABELS.get(reason, reason or "N/A")
-        by_source[label]["reasons"][reason_label] += 1
+    by_source = most_common(df, "source_label")
+    # Track loss reasons per source
+    reasons = counts_within(df.assign(reason=reason_labels(df, "N/A")), "source_label", "reason")
 
     result = {}
-    for source, data in sorted(by_source.items(), key=lambda x: x[1]["count"], reverse=True):
-        top_reasons = data["reasons"].most_common(3)
+    for source, data in by_source.iterrows():
         result[source] = {
-            "count": data["count"],
-            "count_pct": (data["count"] / total_count * 100) if total_count > 0 else 0,
-            "revenue": data["revenue"],
-            "revenue_pct": (data["revenue"] / total_revenue * 100) if total_revenue > 0 else 0,
-            "avg_deal": data["revenue"] / data["count"] if data["count"] > 0 else 0,
-            "top_reasons": top_reasons,
+            "count": int(data["count"]),
+            "count_pct": percent(data["count"], total_count),
+            "revenue": float(data["revenue"]),
+            "revenue_pct": percent(data["revenue"], total_revenue),
+            "avg_deal": float(data["revenue"] / data["count"]),
+            "top_reasons": reasons[source][:3],
         }
 
     return result
 
 
-def analyze_lead_source_by_owner(deals: list, owners: dict) -> dict:
+def analyze_lead_source_by_owner(deals, owners: dict) -> dict:
     """Analyze lead source distribution per owner."""
-    by_owner = defaultdict(lambda: defaultdict(int))
-
-    for deal in deals:
-        owner = deal.get("owner_name", "Unknown")
-        source = deal.get("lead_source") or "Unknown"
-        label = LEAD_SOURCE_LABELS.get(source, source)
-        by_owner[owner][label] += 1
+    sources = counts_within(as_frame(deals), "owner_name", "source_label")
 
     result = {}
     for owner_name in owners.values():
-        owner_sources = dict(by_owner.get(owner_name, {}))
-        total = sum(owner_sources.values())
+        owner_sources = sources.get(owner_name, [])
+        total = sum(c for _, c in owner_sources)
         result[owner_name] = {
             "total": total,
-            "sources": {s: {"count": c, "pct": (c / total * 100) if total > 0 else 0}
-                        for s, c in sorted(owner_sources.items(), key=lambda x: x[1], reverse=True)}
+            "sources": {s: {"count": c, "pct": percent(c, total)} for s, c in owner_sources}
         }
 
     return result
 
 
-def generate_report(recent: list, previous: list, owners: dict) -> str:
-    """Generate markdown report."""
+
+def generate_report(recent, previous, owners: dict) -> str:
+    """Generate markdown report from the recent and previous deals frames."""
+    recent = as_frame(recent)
+    previous = as_frame(previous)
+
     now = datetime.now()
     period_end = now.strftime("%Y-%m-%d")
     period_start = (now - timedelta(days=30)).strftime("%Y-%m-%d")
@@ -648,9 +663,9 @@ def generate_report(recent: list, previous: list, owners: dict) -> str:
 
     # Summary stats
     recent_count = len(recent)
-    recent_amount = sum(d["amount"] for d in recent)
+    recent_amount = recent["amount"].sum()
     prev_count = len(previous)
-    prev_amount = sum(d["amount"] for d in previous)
+    prev_amount = previous["amount"].sum()
 
     count_change = ((recent_count - prev_count) / prev_count * 100) if prev_count > 0 else 0
 
@@ -872,9 +887,9 @@ def generate_report(recent: list, previous: list, owners: dict) -> str:
     report.append(f"| Uncategorized | {other['count']} | {other['pct']:.0f}% | - | Needs review |")
     report.append("")
 
-    if delayed["deals"]:
+    if len(delayed["deals"]):
         report.append("**Delayed Interest Deals (follow up in January):**")
-        for d in delayed["deals"][:5]:
+        for d in delayed["deals"].head(5).to_dict("records"):
             report.append(f"- {d['name']}: ${d['amount']:,.0f} - {d.get('loss_details', '')[:50]}")
         report.append("")
 
@@ -961,18 +976,23 @@ def generate_report(recent: list, previous: list, owners: dict) -> str:
     report.append("| Deal | Owner | Amount | Reason | Details |")
     report.append("|------|-------|--------|--------|---------|")
 
-    for d in sorted(recent, key=lambda x: x["amount"], reverse=True):
-        reason_label = LOSS_REASON_LABELS.get(d["loss_reason"], d["loss_reason"] or "-")
-        details = (d["loss_details"] or "-")[:40]
-        if len(d.get("loss_details", "") or "") > 40:
+    appendix = recent.assign(reason=reason_labels(recent, "-")).sort_values("amount", ascending=False, kind="stable")
+    columns = ["name", "owner_name", "amount", "reason", "loss_details"]
+    for name, owner, amount, reason_label, loss_details in zip(*(appendix[c].tolist() for c in columns)):
+        details = (loss_details or "-")[:40]
+        if len(loss_details) > 40:
             details += "..."
-        report.append(f"| {d['name'][:25]} | {d['owner_name']} | ${d['amount']:,.0f} | {reason_label} | {details} |")
+        report.append(f"| {name[:25]} | {owner} | ${amount:,.0f} | {reason_label} | {details} |")
 
     return "\n".join(report)
 
 
 def main():
     """Main entry point."""
+    parser = argparse.ArgumentParser(description="Closed Lost Deals Analysis")
+    add_extract_arguments(parser)
+    args = parser.parse_args()
+
     # Load owners
     owners = load_owners()
     owner_ids = list(owners.keys())
@@ -980,7 +1000,11 @@ def main():
     print("Fetching deals from HubSpot...", file=__import__("sys").stderr)
 
     # Fetch deals (last 60 days for comparison)
-    deals = fetch_deals(owner_ids, days_back=60)
+    extractor = extractor_from_args(API_KEY, args)
+    try:
+        deals = fetch_deals(owner_ids, days_back=60, extractor=extractor)
+    finally:
+        extractor.close()
 
     if not deals:
         print("No deals found for the specified owners and date range.")
@@ -988,14 +1012,14 @@ def main():
 
     print(f"Found {len(deals)} deals total", file=__import__("sys").stderr)
 
-    # Parse deals
-    parsed = parse_deals(deals, owners)
+    # Parse deals into the analysis frame
+    frame = deals_frame(parse_deals(deals, owners))
 
     # Filter out deals without closedate
-    parsed = [d for d in parsed if d["closedate"]]
+    frame = frame[frame["closedate"].notna()]
 
     # Split by period
-    recent, previous = split_by_period(parsed, days=30)
+    recent, previous = split_by_period(frame, days=30)
 
     print(f"Recent period: {len(recent)} deals", file=__import__("sys").stderr)
     print(f"Previous period: {len(previous)} deals", file=__import__("sys").stderr)
@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+HubSpot Extraction Layer
+
+Shared data access for the funnel analyses:
+
+- HubSpotSearchClient: one keep-alive session, a shared requests-per-second
+  budget (HubSpot's search endpoints allow ~5/s per account), Retry-After
+  backoff on 429/5xx, and a thread pool so owner x object-type searches run
+  concurrently while each one walks its own `after` cursor.
+- HubSpotSnapshot: a local SQLite copy of the searched records. The first run
+  downloads the full window; later runs only ask HubSpot for records with
+  hs_lastmodifieddate after the previous sync, so weekly reports refresh in
+  seconds. Incremental syncs cannot see deleted or reassigned records, so a
+  full sync (which replaces the owner's window) runs again once the last one
+  is RECONCILE_AFTER_DAYS old, or on --refresh.
+
+Usage:
+    from hubspot_extract import FunnelExtractor, SearchSpec
+
+    extractor = FunnelExtractor(api_key)
+    deals = extractor.fetch(SearchSpec("deals", owner_ids, ["dealname", "dealstage"],
+                                       date_property="createdate", since_ms=cutoff_ms))
+"""
+
+import json
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import requests
+
+BASE_URL = "https://api.hubapi.com"
+SNAPSHOT_PATH = Path(__file__).parent.parent / "output" / "cache" / "hubspot_funnel_snapshot.db"
+
+SEARCH_LIMIT = 100                 # Max page size for CRM search
+REQUESTS_PER_SECOND = 4            # Stay under HubSpot's 5/s search limit
+MAX_WORKERS = 4
+MAX_RETRIES = 5
+MODIFIED_PROPERTY = "hs_lastmodifieddate"
+# Re-read a little before the last sync; HubSpot's search index lags writes
+SYNC_OVERLAP_MS = 10 * 60 * 1000
+# Full re-download per owner after this long, to drop deleted/reassigned records
+RECONCILE_AFTER_DAYS = 7
+
+
+def to_ms(value) -> Optional[int]:
+    """HubSpot timestamp (ISO string or epoch ms) -> epoch ms."""
+    if value in (None, ""):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        pass
+    try:
+        dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp() * 1000)
+
+
+class HubSpotSearchClient:
+    """CRM search with connection pooling, a shared rate limit and retries."""
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = BASE_URL,
+        requests_per_second: float = REQUESTS_PER_SECOND,
+        max_workers: int = MAX_WORKERS,
+        max_retries: int = MAX_RETRIES,
+        timeout: float = 30
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.min_interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self.stats = {"requests": 0, "retries": 0}
+
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json"
+        })
+
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def close(self):
+        self.session.close()
+
+    def _wait_turn(self):
+        """Block until the shared per-second budget allows another request."""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_at - now
+            self._next_at = max(now, self._next_at) + self.min_interval
+        if wait > 0:
+            time.sleep(wait)
+
+    def post(self, endpoint: str, payload: dict) -> dict:
+        """POST with Retry-After/exponential backoff on 429 and 5xx."""
+        for attempt in range(self.max_retries + 1):
+            self._wait_turn()
+            with self._lock:
+                self.stats["requests"] += 1
+            resp = self.session.post(f"{self.base_url}{endpoint}", json=payload, timeout=self.timeout)
+
+            if resp.status_code == 429 or resp.status_code >= 500:
+                if attempt == self.max_retries:
+                    resp.raise_for_status()
+                with self._lock:
+                    self.stats["retries"] += 1
+                retry_after = resp.headers.get("Retry-After")
+                try:
+                    delay = float(retry_after) if retry_after is not None else 2 ** attempt
+                except ValueError:
+                    delay = 2 ** attempt
+                time.sleep(delay)
+                continue
+
+            resp.raise_for_status()
+            return resp.json()
+
+    def search(self, object_type: str, filters: List[dict], properties: List[str]) -> List[dict]:
+        """All results of one search, following the paging cursor."""
+        results = []
+        after = None
+        while True:
+            payload = {
+                "filterGroups": [{"filters": filters}],
+                "properties": properties,
+                "limit": SEARCH_LIMIT
+            }
+            if after:
+                payload["after"] = after
+
+            data = self.post(f"/crm/v3/objects/{object_type}/search", payload)
+            results.extend(data.get("results", []))
+
+            after = data.get("paging", {}).get("next", {}).get("after")
+            if not after:
+                return results
+
+    def search_many(self, jobs: Dict[str, tuple]) -> Dict[str, object]:
+        """
+        Run several searches concurrently.
+
+        Args:
+            jobs: {key: (object_type, filters, properties)}
+
+        Returns:
+            {key: results list, or the exception that search raised}
+        """
+        def run(item):
+            key, (object_type, filters, properties) = item
+            try:
+                return key, self.search(object_type, filters, properties)
+            except requests.RequestException as e:
+                return key, e
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return dict(pool.map(run, jobs.items()))
+
+
+class HubSpotSnapshot:
+    """Local SQLite copy of HubSpot search results, updated incrementally."""
+
+    def __init__(self, path: Path = SNAPSHOT_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS records (
+                object_type TEXT NOT NULL,
+                id TEXT NOT NULL,
+                owner_id TEXT,
+                properties TEXT NOT NULL,
+                PRIMARY KEY (object_type, id)
+            );
+            CREATE INDEX IF NOT EXISTS records_owner ON records (object_type, owner_id);
+            CREATE TABLE IF NOT EXISTS sync_state (
+                scope TEXT PRIMARY KEY,
+                since_ms INTEGER NOT NULL,
+                synced_ms INTEGER NOT NULL,
+                properties TEXT NOT NULL,
+                full_synced_ms INTEGER
+            );
+        """)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(sync_state)")}
+        if "full_synced_ms" not in columns:
+            # Snapshots from before reconciliation: next sync per scope is a full one
+            self._conn.execute("ALTER TABLE sync_state ADD COLUMN full_synced_ms INTEGER")
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+    def get_state(self, scope: str) -> Optional[dict]:
+        row = self._conn.execute(
+            "SELECT since_ms, synced_ms, properties, full_synced_ms FROM sync_state WHERE scope = ?", (scope,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {"since_ms": row[0], "synced_ms": row[1], "properties": json.loads(row[2]),
+                "full_synced_ms": row[3]}
+
+    def set_state(
+        self,
+        scope: str,
+        since_ms: int,
+        synced_ms: int,
+        properties: Iterable[str],
+        full_synced_ms: Optional[int] = None
+    ):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO sync_state (scope, since_ms, synced_ms, properties, full_synced_ms) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (scope, since_ms, synced_ms, json.dumps(sorted(properties)), full_synced_ms)
+        )
+        self._conn.commit()
+
+    def upsert(self, object_type: str, records: List[dict]):
+        """Insert or update records; new properties are merged into stored ones."""
+        ids = [str(r.get("id")) for r in records]
+        stored = {}
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            rows = self._conn.execute(
+                f"SELECT id, properties FROM records WHERE object_type = ? AND id IN ({','.join('?' * len(chunk))})",
+                [object_type, *chunk]
+            ).fetchall()
+            stored.update((row[0], json.loads(row[1])) for row in rows)
+
+        rows = []
+        for record_id, record in zip(ids, records):
+            props = {**stored.get(record_id, {}), **(record.get("properties") or {})}
+            rows.append((object_type, record_id, props.get("hubspot_owner_id"), json.dumps(props)))
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO records (object_type, id, owner_id, properties) VALUES (?, ?, ?, ?)", rows
+        )
+        self._conn.commit()
+
+    def replace_window(
+        self,
+        object_type: str,
+        owner_id: str,
+        date_property: str,
+        since_ms: int,
+        records: List[dict]
+    ) -> int:
+        """
+        Store a full sync of one owner's window, deleting stored records it no longer contains.
+
+        Returns:
+            Number of stale records removed (deleted or reassigned in HubSpot)
+        """
+        keep = {str(r.get("id")) for r in records}
+        rows = self._conn.execute(
+            "SELECT id, properties FROM records WHERE object_type = ? AND owner_id = ?",
+            (object_type, str(owner_id))
+        ).fetchall()
+        stale = []
+        for record_id, raw in rows:
+            value = to_ms(json.loads(raw).get(date_property))
+            if record_id not in keep and value is not None and value >= since_ms:
+                stale.append((object_type, record_id))
+        self._conn.executemany("DELETE FROM records WHERE object_type = ? AND id = ?", stale)
+        self.upsert(object_type, records)
+        return len(stale)
+
+    def load(self, object_type: str, owner_ids: Iterable[str], date_property: str, since_ms: int) -> List[dict]:
+        """Stored records for these owners with date_property >= since_ms, in search-result shape."""
+        owner_ids = [str(o) for o in owner_ids]
+        rows = self._conn.execute(
+            f"SELECT id, properties FROM records WHERE object_type = ? "
+            f"AND owner_id IN ({','.join('?' * len(owner_ids))}) ORDER BY id",
+            [object_type, *owner_ids]
+        ).fetchall()
+        results = []
+        for record_id, raw in rows:
+            props = json.loads(raw)
+            value = to_ms(props.get(date_property))
+            if value is not None and value >= since_ms:
+                results.append({"id": record_id, "properties": props})
+        return results
+
+
+@dataclass
+class SearchSpec:
+    """Records of one object type for a set of owners since a date."""
+    object_type: str
+    owner_ids: List[str]
+    properties: List[str]
+    date_property: str
+    since_ms: int
+    extra_properties: List[str] = field(default_factory=list)
+
+    def all_properties(self) -> List[str]:
+        return sorted(set(self.properties) | set(self.extra_properties) |
+                      {"hubspot_owner_id", self.date_property, MODIFIED_PROPERTY})
+
+
+class FunnelExtractor:
+    """Fetch funnel data through the snapshot (or straight from HubSpot)."""
+
+    def __init__(
+        self,
+        api_key: str,
+        client: Optional[HubSpotSearchClient] = None,
+        snapshot_path: Optional[Path] = SNAPSHOT_PATH,
+        refresh: bool = False
+    ):
+        """
+        Args:
+            api_key: HubSpot private app token
+            client: Search client (default: a new HubSpotSearchClient)
+            snapshot_path: SQLite snapshot file; None disables the snapshot
+            refresh: Ignore previous syncs and re-download every window
+        """
+        self.client = client or HubSpotSearchClient(api_key)
+        self.snapshot = HubSpotSnapshot(snapshot_path) if snapshot_path else None
+        self.refresh = refresh
+
+    def close(self):
+        self.client.close()
+        if self.snapshot is not None:
+            self.snapshot.close()
+
+    @staticmethod
+    def scope(spec: SearchSpec, owner_id: str) -> str:
+        return f"{spec.object_type}:{owner_id}:{spec.date_property}"
+
+    def _job(self, spec: SearchSpec, owner_id: str, now_ms: int) -> tuple:
+        """
+        Search for one owner: the full window, or only what changed since the last sync.
+
+        Returns:
+            ((object_type, filters, properties), since_ms covered once the search succeeds,
+             time of the last full sync, or None if this search is a full sync)
+        """
+        filters = [
+            {"propertyName": "hubspot_owner_id", "operator": "EQ", "value": owner_id},
+            {"propertyName": spec.date_property, "operator": "GTE", "value": str(spec.since_ms)},
+        ]
+        state = None
+        if self.snapshot is not None and not self.refresh:
+            state = self.snapshot.get_state(self.scope(spec, owner_id))
+        reconcile_before_ms = now_ms - RECONCILE_AFTER_DAYS * 86400 * 1000
+        if (state and state["since_ms"] <= spec.since_ms
+                and set(spec.all_properties()) <= set(state["properties"])
+                and (state["full_synced_ms"] or 0) > reconcile_before_ms):
+            modified_since = max(0, state["synced_ms"] - SYNC_OVERLAP_MS)
+            filters.append({"propertyName": MODIFIED_PROPERTY, "operator": "GTE", "value": str(modified_since)})
+            return (spec.object_type, filters, spec.all_properties()), state["since_ms"], state["full_synced_ms"]
+        return (spec.object_type, filters, spec.all_properties()), spec.since_ms, None
+
+    def fetch_many(self, specs: List[SearchSpec]) -> Dict[str, List[dict]]:
+        """
+        Fetch several specs at once (all owner x object-type searches run concurrently).
+
+        Args:
+            specs: At most one spec per object type
+
+        Returns:
+            {object_type: records}; owners whose search failed are reported on stderr
+        """
+        started_ms = int(time.time() * 1000)
+        jobs = {}
+        covers = {}
+        full_synced = {}
+        for spec in specs:
+            for owner_id in spec.owner_ids:
+                key = (spec.object_type, owner_id)
+                jobs[key], covers[key], full_synced[key] = self._job(spec, owner_id, started_ms)
+
+        fetched = self.client.search_many(jobs)
+
+        results = {}
+        for spec in specs:
+            records = []
+            for owner_id in spec.owner_ids:
+                found = fetched[(spec.object_type, owner_id)]
+                if isinstance(found, Exception):
+                    print(f"Warning: Could not fetch {spec.object_type} for owner {owner_id}: {found}",
+                          file=sys.stderr)
+                    continue
+                if self.snapshot is None:
+                    records.extend(found)
+                    continue
+                key = (spec.object_type, owner_id)
+                if full_synced[key] is None:
+                    # Full window: anything stored but not returned was deleted or reassigned
+                    self.snapshot.replace_window(spec.object_type, owner_id, spec.date_property,
+                                                 spec.since_ms, found)
+                else:
+                    self.snapshot.upsert(spec.object_type, found)
+                self.snapshot.set_state(self.scope(spec, owner_id), covers[key], started_ms,
+                                        spec.all_properties(), full_synced[key] or started_ms)
+
+            if self.snapshot is not None:
+                records = self.snapshot.load(spec.object_type, spec.owner_ids, spec.date_property, spec.since_ms)
+            results[spec.object_type] = records
+        return results
+
+    def fetch(self, spec: SearchSpec) -> List[dict]:
+        """Records for one spec."""
+        return self.fetch_many([spec])[spec.object_type]
+
+
+def add_extract_arguments(parser):
+    """CLI flags shared by the funnel analyses."""
+    parser.add_argument("--refresh", action="store_true",
+                        help="Re-download the full window instead of updating the local snapshot "
+                             f"(done automatically every {RECONCILE_AFTER_DAYS} days)")
+    parser.add_argument("--no-snapshot", action="store_true",
+                        help="Query HubSpot directly without reading or writing the snapshot")
+
+
+def extractor_from_args(api_key: str, args) -> FunnelExtractor:
+    """FunnelExtractor configured from add_extract_arguments flags."""
+    return FunnelExtractor(
+        api_key,
+        snapshot_path=None if args.no_snapshot else SNAPSHOT_PATH,
+        refresh=args.refresh
+    )
@@ -11,6 +11,8 @@ Comprehensive performance report comparing deal owners across:
 Usage:
     python hubspot_funnel/owner_performance_analysis.py
     python hubspot_funnel/owner_performance_analysis.py --days 90
+    python hubspot_funnel/owner_performance_analysis.py --refresh      # Re-download instead of syncing the snapshot
+    python hubspot_funnel/owner_performance_analysis.py --no-snapshot  # Query HubSpot directly
 """
 
 import os
@@ -22,6 +24,9 @@ from datetime import datetime, timedelta
 from collections import Counter, defaultdict
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent))
+from hubspot_extract import FunnelExtractor, SearchSpec, add_extract_arguments, extractor_from_args
+
 # =============================================================================
 # CONFIGURATION
 # =============================================================================
@@ -106,86 +111,50 @@ def api_post(endpoint: str, payload: dict) -> dict:
 # DATA FETCHING
 # =============================================================================
 
-def fetch_deals(owner_ids: list, days_back: int = 180) -> list:
+DEAL_PROPERTIES = [
+    "dealname", "amount", "dealstage", "closedate", "createdate",
+    "hubspot_owner_id", "motivo_de_cerrada_perdida",
+    "detalles_de_oportunidad_perdida", "hs_analytics_source",
+    "pipeline"
+]
+
+ENGAGEMENT_TYPES = ["calls", "meetings", "emails"]
+ENGAGEMENT_PROPERTIES = ["hubspot_owner_id", "hs_timestamp", "hs_call_status", "hs_meeting_outcome"]
+
+
+def cutoff_ms_for(days_back: int) -> int:
+    return int((datetime.now() - timedelta(days=days_back)).timestamp() * 1000)
+
+
+def deal_spec(owner_ids: list, days_back: int) -> SearchSpec:
+    return SearchSpec("deals", owner_ids, DEAL_PROPERTIES, "createdate", cutoff_ms_for(days_back))
+
+
+def engagement_specs(owner_ids: list, days_back: int) -> list:
+    return [SearchSpec(obj_type, owner_ids, ENGAGEMENT_PROPERTIES, "hs_timestamp", cutoff_ms_for(days_back))
+            for obj_type in ENGAGEMENT_TYPES]
+
+
+def fetch_deals(owner_ids: list, days_back: int = 180, extractor: FunnelExtractor = None) -> list:
     """Fetch all deals for specified owners within date range."""
-    cutoff_date = datetime.now() - timedelta(days=days_back)
-    cutoff_ms = int(cutoff_date.timestamp() * 1000)
-
-    all_deals = []
-
-    for owner_id in owner_ids:
-        after = None
-        while True:
-            payload = {
-                "filterGroups": [{
-                    "filters": [
-                        {"propertyName": "hubspot_owner_id", "operator": "EQ", "value": owner_id},
-                        {"propertyName": "createdate", "operator": "GTE", "value": str(cutoff_ms)}
-                    ]
-                }],
-                "properties": [
-                    "dealname", "amount", "dealstage", "closedate", "createdate",
-                    "hubspot_owner_id", "motivo_de_cerrada_perdida",
-                    "detalles_de_oportunidad_perdida", "hs_analytics_source",
-                    "pipeline"
-                ],
-                "limit": 100
-            }
-            if after:
-                payload["after"] = after
-
-            data = api_post("/crm/v3/objects/deals/search", payload)
-            all_deals.extend(data.get("results", []))
-
-            paging = data.get("paging", {})
-            if paging.get("next", {}).get("after"):
-                after = paging["next"]["after"]
-            else:
-                break
-
-    return all_deals
-
-
-def fetch_engagements(owner_ids: list, days_back: int = 90) -> dict:
-    """Fetch calls, meetings, and emails for specified owners."""
-    cutoff_date = datetime.now() - timedelta(days=days_back)
-    cutoff_ms = int(cutoff_date.timestamp() * 1000)
-
-    engagements = {"calls": [], "meetings": [], "emails": []}
-
-    for obj_type in ["calls", "meetings", "emails"]:
-        timestamp_prop = "hs_timestamp" if obj_type != "emails" else "hs_timestamp"
-
-        for owner_id in owner_ids:
-            after = None
-            while True:
-                payload = {
-                    "filterGroups": [{
-                        "filters": [
-                            {"propertyName": "hubspot_owner_id", "operator": "EQ", "value": owner_id},
-                            {"propertyName": timestamp_prop, "operator": "GTE", "value": str(cutoff_ms)}
-                        ]
-                    }],
-                    "properties": ["hubspot_owner_id", timestamp_prop, "hs_call_status", "hs_meeting_outcome"],
-                    "limit": 100
-                }
-                if after:
-                    payload["after"] = after
-
-                try:
-                    data = api_post(f"/crm/v3/objects/{obj_type}/search", payload)
-                    engagements[obj_type].extend(data.get("results", []))
-
-                    paging = data.get("paging", {})
-                    if paging.get("next", {}).get("after"):
-                        after = paging["next"]["after"]
-                    else:
-                        break
-                except requests.HTTPError as e:
-                    print(f"Warning: Could not fetch {obj_type} for owner {owner_id}: {e}", file=sys.stderr)
-                    break
-
-    return engagements
+    own_extractor = extractor is None
+    extractor = extractor or FunnelExtractor(API_KEY)
+    try:
+        return extractor.fetch(deal_spec(owner_ids, days_back))
+    finally:
+        if own_extractor:
+            extractor.close()
+
+
+def fetch_engagements(owner_ids: list, days_back: int = 90, extractor: FunnelExtractor = None) -> dict:
+    """Fetch calls, meetings, and emails for specified owners (owner x type searches run concurrently)."""
+    own_extractor = extractor is None
+    extractor = extractor or FunnelExtractor(API_KEY)
+    try:
+        return extractor.fetch_many(engagement_specs(owner_ids, days_back))
+    finally:
+        if own_extractor:
+            extractor.close()
 
 
 # =============================================================================
@@ -646,6 +615,7 @@ def generate_report(deal_metrics: dict, activity_metrics: dict, all_deals: list,
 def main():
     parser = argparse.ArgumentParser(description="Owner Performance Analysis")
     parser.add_argument("--days", type=int, default=90, help="Analysis period in days (default: 90)")
+    add_extract_arguments(parser)
     args = parser.parse_args()
 
     print(f"Loading owners...", file=sys.stderr)
@@ -653,8 +623,17 @@ def main():
     owner_ids = list(owners.keys())
     print(f"Found {len(owners)} owners: {', '.join(owners.values())}", file=sys.stderr)
 
-    print(f"Fetching deals (last {args.days * 2} days for comparison)...", file=sys.stderr)
-    raw_deals = fetch_deals(owner_ids, days_back=args.days * 2)
+    # Deals and every owner x engagement type are fetched in one concurrent pass
+    print(f"Fetching deals (last {args.days * 2} days for comparison) and engagements...", file=sys.stderr)
+    extractor = extractor_from_args(API_KEY, args)
+    try:
+        fetched = extractor.fetch_many(
+            [deal_spec(owner_ids, args.days * 2)] + engagement_specs(owner_ids, args.days)
+        )
+    finally:
+        extractor.close()
+    raw_deals = fetched["deals"]
+    engagements = {obj_type: fetched[obj_type] for obj_type in ENGAGEMENT_TYPES}
     print(f"Found {len(raw_deals)} deals", file=sys.stderr)
 
     if not raw_deals:
@@ -664,8 +643,6 @@ def main():
     # Parse deals
     all_deals = parse_deals(raw_deals, owners)
 
-    print(f"Fetching engagements (calls, meetings, emails)...", file=sys.stderr)
-    engagements = fetch_engagements(owner_ids, days_back=args.days)
     print(f"Found {len(engagements['calls'])} calls, {len(engagements['meetings'])} meetings, {len(engagements['emails'])} emails", file=sys.stderr)
 
     print(f"Calculating metrics...", file=sys.stderr)
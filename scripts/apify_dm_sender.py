@@ -4,19 +4,46 @@ Apify Instagram DM Sender Script
 Sends Instagram direct messages to contacts via Apify actor.
 Reads Instagram handles from CSV and sends personalized messages.
 
+DMs are packed into batches (up to --batch-size usernames per actor run), one
+batch at a time per Instagram session; with several sessions (--session-env)
+up to --max-runs runs are in flight at once. Each session is paced to --delay
+seconds per DM. Per-item actor results are mapped back to rows, and every handed-off DM is recorded in a send ledger
+(output/apify_dm_ledger.db) before its run starts, so a re-run of the same
+campaign after a crash never messages the same handle twice. Ledger rows are
+scoped per campaign (the CSV plus the message template, or --campaign), so a
+new campaign to the same handles is not skipped.
+
+Batching is limited by what the actor is known to do:
+- Personalized messages share a run only with --paired-batches (or
+  APIFY_DM_PAIRS_MESSAGES=true), set once the actor has been checked to send
+  messages[i] to influencers[i]. Otherwise only DMs with identical text share
+  a run, so a message can never reach the wrong recipient.
+- The actor spaces DMs inside a run only if APIFY_DM_DELAY_INPUT names its
+  input field for seconds between messages; without it, --delay sends one DM
+  per run so every DM is still paced.
+With the defaults (personalized template, --delay 2, neither setting) every
+DM is its own actor run, so a campaign is bound by actor start-up time.
+
 Usage:
     python scripts/apify_dm_sender.py --csv output/prospects.csv --message "Hi {contact_name}!"
     python scripts/apify_dm_sender.py --csv output/prospects.csv --dry-run --limit 3
+    python scripts/apify_dm_sender.py --csv output/prospects.csv --message "Hi!" \\
+        --session-env INSTAGRAM_SESSION_ID INSTAGRAM_SESSION_ID_2 --batch-size 50
 """
 
 import os
 import sys
 import re
 import argparse
+import hashlib
+import sqlite3
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 import pandas as pd
 from dotenv import load_dotenv
 from tqdm import tqdm
@@ -30,6 +57,26 @@ APIFY_API_TOKEN = os.getenv('APIFY_API_TOKEN') or os.getenv('APIFY_API_KEY')
 # Apify actor for Instagram DMs
 APIFY_ACTOR_ID = os.getenv('APIFY_DM_ACTOR_ID', 'am_production/instagram-direct-messages-dms-automation')
 
+# Actor input field for seconds between DMs inside one run (unset: the actor has none)
+APIFY_DM_DELAY_INPUT = os.getenv('APIFY_DM_DELAY_INPUT')
+
+# Set once the actor is verified to send messages[i] to influencers[i]; until
+# then only identical messages are batched together
+APIFY_DM_PAIRS_MESSAGES = os.getenv('APIFY_DM_PAIRS_MESSAGES', '').lower() in ('1', 'true', 'yes')
+
+# DMs per actor run, and actor runs in flight across sessions
+DEFAULT_BATCH_SIZE = 25
+DEFAULT_MAX_RUNS = 2
+
+# Environment variables holding the Instagram session cookie of each sending account
+DEFAULT_SESSION_ENVS = ['INSTAGRAM_SESSION_ID']
+
+# Resumable record of every DM handed to an actor run
+DEFAULT_LEDGER = BASE_DIR / 'output' / 'apify_dm_ledger.db'
+
+# Dataset item fields the actor may use for the recipient
+ITEM_USERNAME_KEYS = ('username', 'influencer', 'user', 'recipient')
+
 # Blocklist of false positive handles (platform accounts, generic handles, etc.)
 HANDLE_BLOCKLIST = {
     # Platform/service accounts
@@ -218,9 +265,178 @@ def format_message(template: str, contact_name: str, company_name: str, instagra
     return message
 
 
+def campaign_id(csv_path: Path, message_template: str) -> str:
+    """Ledger scope for a campaign: the CSV file plus a hash of its message template."""
+    digest = hashlib.sha256(message_template.encode('utf-8')).hexdigest()[:12]
+    return f"{Path(csv_path).resolve()}#{digest}"
+
+
+class SendLedger:
+    """SQLite record of DMs handed to actor runs, keyed by campaign and Instagram handle.
+
+    A handle is written as 'pending' before its actor run starts and updated
+    to 'sent', 'error' or 'unconfirmed' once the run's results are read. Only
+    'error' handles are sent again on a later run of the same campaign;
+    'pending' ones (the process died mid-run) and 'unconfirmed' ones may have
+    been delivered. Other campaigns' rows are never consulted.
+    """
+
+    RETRYABLE = ('error',)
+
+    def __init__(self, db_path: Path = DEFAULT_LEDGER, campaign: str = ''):
+        self.db_path = Path(db_path)
+        self.campaign = campaign
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._init_db()
+
+    @contextmanager
+    def _transaction(self):
+        """Connection that commits on success and rolls back on error."""
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def _init_db(self):
+        with self._transaction() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS campaign_sends (
+                    campaign TEXT NOT NULL,
+                    instagram_handle TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    session TEXT,
+                    run_id TEXT,
+                    error TEXT,
+                    updated_at TEXT NOT NULL,
+                    PRIMARY KEY (campaign, instagram_handle)
+                )
+            """)
+
+    def record(self, outcomes: Dict[str, Tuple[str, Optional[str]]],
+               session: Optional[str] = None, run_id: Optional[str] = None):
+        """Store {handle: (status, error)} for this campaign in one transaction."""
+        now = datetime.now().isoformat()
+        with self._lock, self._transaction() as conn:
+            conn.executemany(
+                """INSERT OR REPLACE INTO campaign_sends
+                   (campaign, instagram_handle, status, session, run_id, error, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                [(self.campaign, handle, status, session, run_id, error, now)
+                 for handle, (status, error) in outcomes.items()]
+            )
+
+    def statuses(self) -> Dict[str, str]:
+        """Handle -> last recorded status in this campaign."""
+        with self._transaction() as conn:
+            return {row['instagram_handle']: row['status']
+                    for row in conn.execute(
+                        "SELECT instagram_handle, status FROM campaign_sends WHERE campaign = ?",
+                        (self.campaign,))}
+
+    def done(self) -> set:
+        """Handles this campaign must not message again."""
+        return {handle for handle, status in self.statuses().items() if status not in self.RETRYABLE}
+
+
+def session_cookies(session_id: str) -> List[Dict]:
+    """Cookie input for the DM actor (cookies must include domain for browser context)."""
+    return [
+        {
+            "name": "sessionid",
+            "value": session_id,
+            "domain": ".instagram.com",
+            "path": "/"
+        }
+    ]
+
+
+def get_sessions(session_envs: Iterable[str]) -> Dict[str, str]:
+    """Env var name -> Instagram session cookie, for the variables that are set."""
+    return {env: os.getenv(env) for env in session_envs if os.getenv(env)}
+
+
+def item_outcome(item: Dict) -> Optional[Tuple[str, str, Optional[str]]]:
+    """(username, status, error) from one actor dataset item, or None if it names no recipient."""
+    username = next((str(item[key]) for key in ITEM_USERNAME_KEYS if item.get(key)), None)
+    if not username:
+        return None
+    error = item.get('error') or item.get('errorMessage')
+    failed = (item.get('success') is False
+              or str(item.get('status', '')).lower() in ('failed', 'error'))
+    if error or failed:
+        return username.lstrip('@').lower(), 'error', str(error or item.get('status') or 'Send failed')
+    return username.lstrip('@').lower(), 'sent', None
+
+
+def run_dm_batch(client, session_id: str, batch: List[Tuple[str, str]], on_start=None,
+                 delay: float = 0.0, delay_input: Optional[str] = None
+                 ) -> Tuple[Optional[str], Dict[str, Tuple[str, Optional[str]]]]:
+    """
+    Send a batch of DMs in one actor run (am_production/instagram-direct-messages-dms-automation).
+
+    The actor pairs influencers[i] with messages[i]. Usernames with a per-item
+    result in the run's dataset get that result; the rest count as sent if the
+    run succeeded and as 'unconfirmed' otherwise.
+
+    Args:
+        batch: (username, message) pairs
+        on_start: Called with the run id once the run has started
+        delay: Seconds between DMs inside the run
+        delay_input: Actor input field that takes `delay`
+
+    Returns:
+        Tuple of (run_id, {username: (status, error)})
+    """
+    usernames = [username for username, _ in batch]
+    run_input = {
+        "influencers": usernames,
+        "messages": [message for _, message in batch],
+        "INSTAGRAM_COOKIES": session_cookies(session_id),
+    }
+    if delay_input:
+        run_input[delay_input] = delay
+
+    try:
+        run = client.actor(APIFY_ACTOR_ID).start(run_input=run_input)
+    except Exception as e:
+        return None, {username: ('error', str(e)) for username in usernames}
+
+    run_id = run.get('id')
+    if on_start:
+        on_start(run_id)
+
+    try:
+        run = client.run(run_id).wait_for_finish() or run
+        items = list(client.dataset(run['defaultDatasetId']).iterate_items())
+    except Exception as e:
+        return run_id, {username: ('unconfirmed', f"Lost track of actor run: {e}") for username in usernames}
+
+    outcomes = {}
+    for item in items:
+        outcome = item_outcome(item)
+        if outcome and outcome[0] in usernames:
+            outcomes[outcome[0]] = outcome[1:]
+
+    status = run.get('status', 'UNKNOWN')
+    for username in usernames:
+        if username not in outcomes:
+            if status == 'SUCCEEDED':
+                outcomes[username] = ('sent', None)
+            else:
+                outcomes[username] = ('unconfirmed', f"Actor run {status}, no result for this DM")
+    return run_id, outcomes
+
+
 def send_dm_via_apify(client, username: str, message: str) -> Tuple[bool, Optional[str]]:
     """
-    Send Instagram DM via Apify actor (am_production/instagram-direct-messages-dms-automation).
+    Send a single Instagram DM via Apify actor.
 
     Returns:
         Tuple of (success, error_message)
@@ -230,49 +446,114 @@ def send_dm_via_apify(client, username: str, message: str) -> Tuple[bool, Option
     if not instagram_session:
         return False, "INSTAGRAM_SESSION_ID not found in environment"
 
-    # Build cookies string
-    instagram_cookies = f"sessionid={instagram_session}"
+    _, outcomes = run_dm_batch(client, instagram_session, [(username, message)])
+    status, error = outcomes[username]
+    return status == 'sent', error
 
-    try:
-        # Input format for am_production/instagram-direct-messages-dms-automation
-        # Cookies must include domain for browser context
-        cookies_array = [
-            {
-                "name": "sessionid",
-                "value": instagram_session,
-                "domain": ".instagram.com",
-                "path": "/"
-            }
-        ]
-
-        run_input = {
-            "influencers": [username],
-            "messages": [message],
-            "INSTAGRAM_COOKIES": cookies_array,
-        }
 
-        # Call the actor
-        run = client.actor(APIFY_ACTOR_ID).call(run_input=run_input)
+def plan_batches(jobs: List[Tuple[str, str]], batch_size: int,
+                 pairs_messages: bool = False) -> List[List[Tuple[str, str]]]:
+    """
+    Split one session's (username, message) jobs into actor runs.
 
-        # Check results
-        if run.get('status') == 'SUCCEEDED':
-            return True, None
-        else:
-            return False, f"Actor run failed: {run.get('status', 'UNKNOWN')}"
+    Unless the actor is known to pair influencers[i] with messages[i], a run
+    only carries DMs with identical text, so each group of equal messages is
+    batched on its own (personalized messages end up one per run).
+    """
+    if pairs_messages:
+        groups = [jobs]
+    else:
+        by_message: Dict[str, List[Tuple[str, str]]] = {}
+        for job in jobs:
+            by_message.setdefault(job[1], []).append(job)
+        groups = list(by_message.values())
+    return [group[offset:offset + batch_size]
+            for group in groups for offset in range(0, len(group), batch_size)]
+
+
+def dispatch_dms(client, jobs: List[Tuple[str, str]], sessions: Dict[str, str], ledger: SendLedger,
+                 batch_size: int = DEFAULT_BATCH_SIZE, max_runs: int = DEFAULT_MAX_RUNS,
+                 delay: float = 2.0, delay_input: Optional[str] = APIFY_DM_DELAY_INPUT,
+                 pairs_messages: bool = APIFY_DM_PAIRS_MESSAGES) -> Dict[str, Dict]:
+    """
+    Send (username, message) jobs in batched actor runs.
 
-    except Exception as e:
-        return False, str(e)
+    Jobs are spread round-robin over the sessions. Each session runs its
+    batches one after another, starting a batch no sooner than `delay`
+    seconds per DM after the previous one; across sessions at most
+    `max_runs` runs are in flight. Inside a run the actor spaces DMs by
+    `delay` through its `delay_input` field; without one, each run carries
+    a single DM so no two DMs of a session go out unspaced. Different
+    messages share a run only when `pairs_messages` (see plan_batches).
+
+    Returns:
+        {username: {'status', 'error', 'session', 'run_id'}}
+    """
+    if delay and not delay_input:
+        batch_size = 1
+
+    labels = list(sessions)
+    queues = {label: [] for label in labels}
+    for i, job in enumerate(jobs):
+        queues[labels[i % len(labels)]].append(job)
+
+    slots = threading.Semaphore(max_runs)
+    results = {}
+    lock = threading.Lock()
+    progress = tqdm(total=len(jobs), desc="Sending DMs", unit="dm")
+
+    def drain(label: str):
+        next_start = 0.0
+        for batch in plan_batches(queues[label], batch_size, pairs_messages):
+            wait = next_start - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+
+            with slots:
+                next_start = time.monotonic() + delay * len(batch)
+                # Written before the run starts so a crash never re-sends
+                ledger.record({username: ('pending', None) for username, _ in batch}, session=label)
+                run_id, outcomes = run_dm_batch(
+                    client, sessions[label], batch,
+                    on_start=lambda rid: ledger.record({u: ('pending', None) for u, _ in batch},
+                                                       session=label, run_id=rid),
+                    delay=delay, delay_input=delay_input
+                )
+            ledger.record(outcomes, session=label, run_id=run_id)
+
+            with lock:
+                for username, (status, error) in outcomes.items():
+                    results[username] = {'status': status, 'error': error, 'session': label, 'run_id': run_id}
+                progress.update(len(batch))
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, len(labels))) as executor:
+            for future in [executor.submit(drain, label) for label in labels if queues[label]]:
+                future.result()
+    finally:
+        progress.close()
+    return results
 
 
 def process_csv_and_send(csv_path: Path, message_template: str,
                          dry_run: bool = False, limit: Optional[int] = None,
                          delay: float = 2.0, exclude_handles: Optional[List[str]] = None,
-                         first_handle_only: bool = False) -> Dict:
+                         first_handle_only: bool = False, batch_size: int = DEFAULT_BATCH_SIZE,
+                         max_runs: int = DEFAULT_MAX_RUNS, session_envs: Optional[List[str]] = None,
+                         ledger_path: Optional[Path] = None, campaign: Optional[str] = None,
+                         pairs_messages: bool = APIFY_DM_PAIRS_MESSAGES) -> Dict:
     """Process CSV and send DMs.
 
     Args:
         first_handle_only: If True, only send to the first handle per row.
                           This prevents sending to multiple handles with mismatched names.
+        delay: Seconds per DM for each session (its safe send rate)
+        batch_size: DMs per actor run
+        pairs_messages: The actor is verified to pair influencers[i] with messages[i]
+        max_runs: Actor runs in flight across sessions
+        session_envs: Env vars holding the sending sessions (default: INSTAGRAM_SESSION_ID)
+        ledger_path: Send ledger; handles this campaign already messaged are skipped
+        campaign: Ledger scope (default: the CSV path plus a hash of the template)
     """
     # Load CSV
     try:
@@ -284,19 +565,33 @@ def process_csv_and_send(csv_path: Path, message_template: str,
     if 'instagram_handles' not in df.columns:
         return {'error': "CSV missing 'instagram_handles' column", 'results': []}
 
-    # Get Apify client
+    # Get Apify client and sending sessions
     client = None
+    sessions = {}
     if not dry_run:
         client = get_apify_client()
         if not client:
             return {'error': "Apify client not available. Check APIFY_API_TOKEN.", 'results': []}
+        session_envs = session_envs or DEFAULT_SESSION_ENVS
+        sessions = get_sessions(session_envs)
+        if not sessions:
+            return {'error': f"{', '.join(session_envs)} not found in environment", 'results': []}
+
+    ledger_path = Path(ledger_path or DEFAULT_LEDGER)
+    campaign = campaign or campaign_id(csv_path, message_template)
+    # A dry run only reads an existing ledger, never creates one
+    ledger = None
+    already_sent = set()
+    if not dry_run or ledger_path.exists():
+        ledger = SendLedger(ledger_path, campaign)
+        already_sent = ledger.done()
+    excluded = {h.lower() for h in exclude_handles or []}
 
     # Track results
     processed_handles = set()
     results = []
-    sent_count = 0
     skipped_count = 0
-    error_count = 0
+    already_sent_count = 0
 
     # Process rows
     total_rows = len(df)
@@ -330,54 +625,54 @@ def process_csv_and_send(csv_path: Path, message_template: str,
                 if handle in processed_handles:
                     continue
                 # Check exclusion list
-                if exclude_handles and handle.lower() in [h.lower() for h in exclude_handles]:
+                if handle.lower() in excluded:
                     skipped_count += 1
                     continue
                 processed_handles.add(handle)
+                # Already messaged (or possibly messaged) on an earlier run
+                if handle in already_sent:
+                    already_sent_count += 1
+                    continue
 
                 # Format message
                 message = format_message(message_template, contact_name, company_name, handle)
 
-                result = {
+                results.append({
                     'instagram_handle': handle,
                     'contact_name': contact_name,
                     'company_name': company_name,
                     'message': message,
-                    'status': 'pending',
+                    'status': 'dry_run' if dry_run else 'pending',
                     'error': None,
+                    'session': None,
+                    'run_id': None,
                     'timestamp': datetime.now().isoformat()
-                }
-
-                if dry_run:
-                    result['status'] = 'dry_run'
-                    results.append(result)
-                    sent_count += 1
-                else:
-                    # Send via Apify
-                    success, error = send_dm_via_apify(client, handle, message)
-
-                    if success:
-                        result['status'] = 'sent'
-                        sent_count += 1
-                    else:
-                        result['status'] = 'error'
-                        result['error'] = error
-                        error_count += 1
-
-                    results.append(result)
-
-                    # Rate limiting
-                    time.sleep(delay)
+                })
 
             pbar.update(1)
             row_count += 1
 
+    if not dry_run and results:
+        outcomes = dispatch_dms(
+            client, [(r['instagram_handle'], r['message']) for r in results], sessions, ledger,
+            batch_size=batch_size, max_runs=max_runs, delay=delay, pairs_messages=pairs_messages
+        )
+        finished = datetime.now().isoformat()
+        for result in results:
+            result.update(outcomes[result['instagram_handle']])
+            result['timestamp'] = finished
+
+    statuses = [r['status'] for r in results]
     return {
         'error': None,
         'total_handles': len(processed_handles),
-        'sent': sent_count,
+        'sent': statuses.count('sent') + statuses.count('dry_run'),
         'skipped': skipped_count,
-        'errors': error_count,
+        'already_sent': already_sent_count,
+        'unconfirmed': statuses.count('unconfirmed'),
+        'errors': statuses.count('error'),
+        'runs': len({r['run_id'] for r in results if r['run_id']}),
+        'campaign': campaign,
         'results': results
     }
 
@@ -431,6 +726,14 @@ def print_summary(results: Dict):
     print(f"Total handles processed: {results['total_handles']}")
     print(f"Messages sent:           {results['sent']}")
     print(f"Errors:                  {results['errors']}")
+    if results.get('already_sent'):
+        print(f"Already sent (ledger):   {results['already_sent']}")
+    if results.get('unconfirmed'):
+        print(f"Unconfirmed:             {results['unconfirmed']} (not retried)")
+    if results.get('runs'):
+        print(f"Actor runs:              {results['runs']}")
+    if results.get('campaign'):
+        print(f"Ledger campaign:         {results['campaign']}")
     print("=" * 60 + "\n")
 
 
@@ -449,7 +752,21 @@ def main():
     parser.add_argument('--limit', type=int,
                        help='Limit number of rows to process')
     parser.add_argument('--delay', type=float, default=2.0,
-                       help='Delay between sends in seconds (default: 2)')
+                       help='Seconds per DM for each sending session (default: 2)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                       help=f'DMs per actor run (default: {DEFAULT_BATCH_SIZE})')
+    parser.add_argument('--paired-batches', action='store_true', default=APIFY_DM_PAIRS_MESSAGES,
+                       help='The actor is verified to send messages[i] to influencers[i]; '
+                            'lets personalized DMs share a run (default: APIFY_DM_PAIRS_MESSAGES)')
+    parser.add_argument('--max-runs', type=int, default=DEFAULT_MAX_RUNS,
+                       help=f'Actor runs in flight across sessions (default: {DEFAULT_MAX_RUNS})')
+    parser.add_argument('--session-env', type=str, nargs='+', default=DEFAULT_SESSION_ENVS,
+                       help='Env vars holding Instagram session cookies, one per sending account '
+                            '(default: INSTAGRAM_SESSION_ID)')
+    parser.add_argument('--ledger', type=str, default=str(DEFAULT_LEDGER),
+                       help='Send ledger; handles this campaign already messaged are skipped')
+    parser.add_argument('--campaign', type=str,
+                       help='Ledger campaign id to resume (default: CSV path plus a hash of the message)')
     parser.add_argument('--exclude', type=str, nargs='+',
                        help='Instagram handles to exclude (already messaged)')
     parser.add_argument('--first-handle-only', action='store_true',
@@ -492,7 +809,13 @@ def main():
         limit=args.limit,
         delay=args.delay,
         exclude_handles=args.exclude,
-        first_handle_only=args.first_handle_only
+        first_handle_only=args.first_handle_only,
+        batch_size=args.batch_size,
+        max_runs=args.max_runs,
+        session_envs=args.session_env,
+        ledger_path=Path(args.ledger),
+        campaign=args.campaign,
+        pairs_messages=args.paired_batches
     )
 
     # Show sample if dry run
@@ -5,10 +5,18 @@ Attempts to recover bounced contacts by:
 2. Searching Hunter.io for alternative contacts at the same domain
 3. Searching Apollo.io B2B database for alternative contacts
 
+Bounces are grouped by domain: each domain gets one round of generic-address
+verification and at most one Hunter domain search, shared by every bounced
+contact at that domain. Domains are resolved concurrently under a shared
+Hunter rate limiter, and definitive outcomes are cached on disk so a domain
+that already failed is not retried within the cache TTL.
+
 Usage:
     python scripts/bounce_recovery/bounce_recovery.py \
         --input config/bounced_contacts.csv \
         --output output/email_campaign/recovered_contacts.csv
+    python scripts/bounce_recovery/bounce_recovery.py --input ... --workers 8
+    python scripts/bounce_recovery/bounce_recovery.py --input ... --no-cache
 """
 
 import argparse
@@ -17,6 +25,7 @@ import os
 import re
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any
 from urllib.parse import urlparse
 
@@ -24,11 +33,30 @@ import pandas as pd
 import requests
 from dotenv import load_dotenv
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.rate_limiter import RateLimiter
+from utils.response_cache import ResponseCache, make_cache_key
+
 load_dotenv()
 
 HUNTER_API_KEY = os.getenv('HUNTER_API_KEY')
 HUNTER_BASE_URL = 'https://api.hunter.io/v2'
 
+# One limiter for every Hunter call (verifier + domain search) across threads
+HUNTER_MIN_INTERVAL = 0.15
+hunter_limiter = RateLimiter(HUNTER_MIN_INTERVAL)
+
+# Domains resolved in parallel
+DEFAULT_WORKERS = 4
+
+# Generic candidates verified per wave; later waves only run if no earlier
+# candidate was valid, so credits aren't spent on all ten patterns up front
+GENERIC_VERIFY_BATCH = 3
+
+# Domain outcomes cache
+CACHE_NAME = 'bounce_recovery'
+DEFAULT_CACHE_TTL_DAYS = 14
+
 # Apollo enricher import (for Strategy 3)
 try:
     from scripts.apollo_enricher import search_apollo_alternatives
@@ -116,6 +144,7 @@ def verify_email_with_hunter(email: str) -> Dict[str, Any]:
         return {'status': 'unknown', 'error': 'No Hunter API key'}
 
     try:
+        hunter_limiter.wait()
         resp = requests.get(
             f'{HUNTER_BASE_URL}/email-verifier',
             params={'email': email, 'api_key': HUNTER_API_KEY},
@@ -136,65 +165,92 @@ def verify_email_with_hunter(email: str) -> Dict[str, Any]:
         return {'status': 'error', 'error': str(e)}
 
 
-def try_generic_emails(domain: str, bounced_email: str) -> Optional[str]:
-    """Try generic email patterns and verify with Hunter.
+def find_valid_generic(
+    domain: str,
+    exclude: Optional[List[str]] = None,
+    executor: Optional[ThreadPoolExecutor] = None
+) -> Dict[str, Any]:
+    """Verify generic candidates for a domain, a wave at a time.
+
+    Candidates in a wave are verified concurrently; the first valid one in
+    priority order wins.
 
     Args:
         domain: The email domain
-        bounced_email: The original bounced email (to exclude)
+        exclude: Bounced emails that must not be suggested
+        executor: Pool to verify on (one is created if omitted)
 
     Returns:
-        First valid generic email found, or None
+        Dict with 'email' (or None) and 'definitive' (False if any check errored)
     """
     logger = logging.getLogger('bounce_recovery')
-    generics = generate_generic_emails(domain)
+    excluded = {e.lower() for e in (exclude or []) if e}
+    generics = [g for g in generate_generic_emails(domain) if g.lower() not in excluded]
+    definitive = True
 
-    for generic in generics:
-        if generic.lower() == bounced_email.lower():
-            continue
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=GENERIC_VERIFY_BATCH)
 
-        logger.debug(f"  Trying generic: {generic}")
-        result = verify_email_with_hunter(generic)
+    try:
+        for i in range(0, len(generics), GENERIC_VERIFY_BATCH):
+            wave = generics[i:i + GENERIC_VERIFY_BATCH]
+            for generic in wave:
+                logger.debug(f"  Trying generic: {generic}")
+            verifications = list(executor.map(verify_email_with_hunter, wave))
+
+            for generic, result in zip(wave, verifications):
+                if result.get('status') in ['rate_limited', 'error', 'unknown']:
+                    definitive = False
+                # Consider 'accept_all' as potentially valid for generic emails
+                # Generic emails at catch-all domains are often real
+                if result.get('status') in ['valid', 'accept_all']:
+                    logger.info(f"  Found valid generic: {generic} ({result.get('status')})")
+                    return {'email': generic, 'definitive': True}
+    finally:
+        if own_executor:
+            executor.shutdown(wait=False)
+
+    return {'email': None, 'definitive': definitive}
 
-        # Consider 'accept_all' as potentially valid for generic emails
-        # Generic emails at catch-all domains are often real
-        if result.get('status') in ['valid', 'accept_all']:
-            logger.info(f"  Found valid generic: {generic} ({result.get('status')})")
-            return generic
 
-        time.sleep(0.3)  # Rate limiting
+def try_generic_emails(domain: str, bounced_email: str) -> Optional[str]:
+    """Try generic email patterns and verify with Hunter.
 
-    return None
+    Args:
+        domain: The email domain
+        bounced_email: The original bounced email (to exclude)
 
+    Returns:
+        First valid generic email found, or None
+    """
+    return find_valid_generic(domain, exclude=[bounced_email])['email']
 
-def get_hunter_alternatives(
-    domain: str,
-    exclude: Optional[str] = None,
-    limit: int = 5
-) -> List[Dict[str, Any]]:
-    """Search Hunter for alternative contacts at domain.
+
+def hunter_domain_search(domain: str, limit: int = 6) -> Optional[List[Dict[str, Any]]]:
+    """Run one Hunter domain search.
 
     Args:
         domain: The email domain to search
-        exclude: Email to exclude from results
-        limit: Maximum alternatives to return
+        limit: Maximum contacts to request
 
     Returns:
-        List of alternative contacts with email and confidence
+        Contacts sorted by confidence (highest first), or None if the call failed
     """
     logger = logging.getLogger('bounce_recovery')
 
     if not HUNTER_API_KEY:
         logger.warning("No Hunter API key configured")
-        return []
+        return None
 
     try:
+        hunter_limiter.wait()
         resp = requests.get(
             f'{HUNTER_BASE_URL}/domain-search',
             params={
                 'domain': domain,
                 'api_key': HUNTER_API_KEY,
-                'limit': limit + 1  # Extra in case we need to exclude
+                'limit': limit
             },
             timeout=10
         )
@@ -203,36 +259,119 @@ def get_hunter_alternatives(
             data = resp.json().get('data', {})
             emails_data = data.get('emails', [])
 
-            # Sort by confidence and filter out excluded email
-            alternatives = []
+            contacts = []
             for contact in sorted(emails_data, key=lambda x: x.get('confidence', 0), reverse=True):
-                email = contact.get('value', '').lower()
-                if exclude and email == exclude.lower():
-                    continue
-
-                alternatives.append({
-                    'email': email,
+                contacts.append({
+                    'email': contact.get('value', '').lower(),
                     'confidence': contact.get('confidence', 0),
                     'first_name': contact.get('first_name', ''),
                     'last_name': contact.get('last_name', ''),
                     'position': contact.get('position', '')
                 })
-
-                if len(alternatives) >= limit:
-                    break
-
-            return alternatives
+            return contacts
 
         elif resp.status_code == 429:
             logger.warning("Hunter API rate limit reached")
-            return []
+            return None
         else:
             logger.warning(f"Hunter API error: HTTP {resp.status_code}")
-            return []
+            return None
 
     except Exception as e:
         logger.error(f"Hunter API error: {e}")
-        return []
+        return None
+
+
+def filter_alternatives(
+    contacts: List[Dict[str, Any]],
+    exclude: Optional[List[str]] = None,
+    limit: int = 5
+) -> List[Dict[str, Any]]:
+    """Drop excluded (bounced) emails and cap the list."""
+    excluded = {e.lower() for e in (exclude or []) if e}
+    return [c for c in contacts if c['email'].lower() not in excluded][:limit]
+
+
+def get_hunter_alternatives(
+    domain: str,
+    exclude: Optional[str] = None,
+    limit: int = 5
+) -> List[Dict[str, Any]]:
+    """Search Hunter for alternative contacts at domain.
+
+    Args:
+        domain: The email domain to search
+        exclude: Email to exclude from results
+        limit: Maximum alternatives to return
+
+    Returns:
+        List of alternative contacts with email and confidence
+    """
+    # Extra in case we need to exclude
+    contacts = hunter_domain_search(domain, limit=limit + 1) or []
+    return filter_alternatives(contacts, exclude=[exclude] if exclude else None, limit=limit)
+
+
+def resolve_domain(
+    domain: str,
+    bounced_emails: List[str],
+    cache: Optional[ResponseCache] = None,
+    executor: Optional[ThreadPoolExecutor] = None,
+    try_generics: bool = True,
+    try_hunter: bool = True
+) -> Dict[str, Any]:
+    """Work out recovery options for a domain once, for all its bounces.
+
+    Runs generic verification first and the Hunter domain search only if no
+    generic address is valid (same order as recover_contact).
+
+    Args:
+        domain: The email domain
+        bounced_emails: Every bounced address at this domain
+        cache: Outcome cache (definitive results only)
+        executor: Pool for concurrent verifications
+
+    Returns:
+        Dict with 'generic', 'alternatives' and 'cached'
+    """
+    logger = logging.getLogger('bounce_recovery')
+    key = make_cache_key('domain', domain, try_generics, try_hunter)
+    excluded = {e.lower() for e in bounced_emails if e}
+
+    if cache is not None:
+        cached = cache.get(key)
+        # A cached generic that has since bounced is stale; resolve again
+        if cached is not None and (cached.get('generic') or '').lower() in excluded:
+            logger.debug(f"  Cached generic for {domain} has bounced, re-resolving")
+            cached = None
+        if cached is not None:
+            logger.debug(f"  Cached outcome for {domain}")
+            cached['alternatives'] = filter_alternatives(
+                cached.get('alternatives', []), exclude=bounced_emails, limit=5 + len(bounced_emails)
+            )
+            cached['cached'] = True
+            return cached
+
+    info = {'domain': domain, 'generic': None, 'alternatives': [], 'cached': False}
+    definitive = bool(HUNTER_API_KEY)
+
+    if try_generics:
+        generic = find_valid_generic(domain, exclude=bounced_emails, executor=executor)
+        info['generic'] = generic['email']
+        definitive = definitive and generic['definitive']
+
+    if try_hunter and not info['generic']:
+        # One search per domain, sized so every bounced address can be excluded
+        contacts = hunter_domain_search(domain, limit=5 + len(bounced_emails))
+        if contacts is None:
+            definitive = False
+        else:
+            info['alternatives'] = filter_alternatives(contacts, exclude=bounced_emails, limit=5 + len(bounced_emails))
+
+    if cache is not None and definitive:
+        cache.set(key, {k: v for k, v in info.items() if k != 'cached'})
+
+    return info
 
 
 def recover_contact(
@@ -241,7 +380,8 @@ def recover_contact(
     try_reverify: bool = True,
     try_generics: bool = True,
     try_hunter: bool = True,
-    try_apollo: bool = True
+    try_apollo: bool = True,
+    domain_info: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """Attempt to recover a bounced contact.
 
@@ -252,6 +392,8 @@ def recover_contact(
         try_generics: Whether to try generic email patterns
         try_hunter: Whether to search Hunter for alternatives
         try_apollo: Whether to search Apollo B2B database
+        domain_info: Precomputed resolve_domain() result; skips the per-contact
+            generic verification and Hunter search
 
     Returns:
         Dict with recovery results
@@ -286,7 +428,12 @@ def recover_contact(
     # Strategy 1: Try generic emails
     if try_generics:
         logger.debug(f"Strategy 1: Trying generic emails for {domain}")
-        generic = try_generic_emails(domain, email)
+        if domain_info is not None:
+            generic = domain_info.get('generic')
+            if generic and generic.lower() == (email or '').lower():
+                generic = None
+        else:
+            generic = try_generic_emails(domain, email)
         if generic:
             result['recovered'] = True
             result['new_email'] = generic
@@ -296,7 +443,10 @@ def recover_contact(
     # Strategy 2: Search Hunter for alternative contacts
     if try_hunter:
         logger.debug(f"Strategy 2: Searching Hunter for alternatives at {domain}")
-        alternatives = get_hunter_alternatives(domain, exclude=email)
+        if domain_info is not None:
+            alternatives = filter_alternatives(domain_info.get('alternatives', []), exclude=[email])
+        else:
+            alternatives = get_hunter_alternatives(domain, exclude=email)
         result['alternatives'] = alternatives
 
         if alternatives:
@@ -333,7 +483,10 @@ def process_bounced_csv(
     csv_path: str,
     output_path: Optional[str] = None,
     dry_run: bool = False,
-    delay: float = 1.0
+    delay: float = 1.0,
+    workers: int = DEFAULT_WORKERS,
+    use_cache: bool = True,
+    cache_ttl_days: float = DEFAULT_CACHE_TTL_DAYS
 ) -> List[Dict[str, Any]]:
     """Process bounced contacts CSV and attempt recovery.
 
@@ -341,7 +494,10 @@ def process_bounced_csv(
         csv_path: Path to bounced contacts CSV
         output_path: Path for recovered contacts output
         dry_run: If True, don't make API calls
-        delay: Delay between recovery attempts
+        delay: Delay between recovery attempts (serial mode, workers=1)
+        workers: Domains/contacts processed in parallel
+        use_cache: Reuse cached domain outcomes
+        cache_ttl_days: How long domain outcomes stay cached
 
     Returns:
         List of recovery results
@@ -349,59 +505,117 @@ def process_bounced_csv(
     logger = logging.getLogger('bounce_recovery')
 
     df = pd.read_csv(csv_path)
-    results = []
+    results: List[Optional[Dict[str, Any]]] = [None] * len(df)
 
     logger.info(f"Processing {len(df)} bounced contacts from {csv_path}")
 
-    for idx, row in df.iterrows():
+    rows = []
+    for pos, (idx, row) in enumerate(df.iterrows()):
         email = row.get('primary_email', '')
-        page_name = row.get('page_name', 'Unknown')
         website_url = row.get('website_url', '')
 
         # Get domain from email or website
         domain = extract_domain(email) or extract_domain_from_url(website_url)
 
-        logger.info(f"\n[{idx+1}/{len(df)}] {page_name}")
-        logger.info(f"  Bounced: {email}")
-        logger.info(f"  Domain: {domain}")
-
         if not domain:
-            logger.warning(f"  Cannot determine domain, skipping")
-            results.append({
+            logger.warning(f"[{pos+1}/{len(df)}] {row.get('page_name', 'Unknown')}: cannot determine domain, skipping")
+            results[pos] = {
                 'original_email': email,
                 'recovered': False,
                 'recovery_method': None,
                 'error': 'No domain found'
-            })
+            }
             continue
 
         if dry_run:
             logger.info(f"  [DRY RUN] Would attempt recovery for {domain}")
-            results.append({
+            results[pos] = {
                 'original_email': email,
                 'recovered': False,
                 'recovery_method': 'dry_run'
-            })
+            }
             continue
 
-        # Attempt recovery
-        result = recover_contact(email, domain)
-        result['page_name'] = page_name
+        rows.append((pos, row, email, domain))
+
+    workers = max(1, workers)
+    domain_infos: Dict[str, Dict[str, Any]] = {}
+
+    def finish_row(item, result: Dict[str, Any]) -> Dict[str, Any]:
+        pos, row, email, domain = item
+        result['page_name'] = row.get('page_name', 'Unknown')
         result['contact_name'] = row.get('contact_name', '')
         result['hook_used'] = row.get('hook_used', '')
         result['hook_source'] = row.get('hook_source', '')
-        result['website_url'] = website_url
+        result['website_url'] = row.get('website_url', '')
 
         if result['recovered']:
-            logger.info(f"  RECOVERED: {result['new_email']} ({result['recovery_method']})")
+            logger.info(f"  {email} -> RECOVERED: {result['new_email']} ({result['recovery_method']})")
         else:
-            logger.warning(f"  NOT RECOVERED - no alternatives found")
-
-        results.append(result)
-
-        # Delay between contacts
-        if idx < len(df) - 1 and delay > 0:
-            time.sleep(delay)
+            logger.warning(f"  {email} -> NOT RECOVERED - no alternatives found")
+        return result
+
+    def recover_row(item) -> Dict[str, Any]:
+        pos, row, email, domain = item
+        result = recover_contact(email, domain, try_reverify=False, domain_info=domain_infos.get(domain))
+        return finish_row(item, result)
+
+    # Strategy 0 first: a plain re-verify is cheaper than any domain-level lookup
+    if rows and MILLIONVERIFIER_AVAILABLE:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            reverified = list(pool.map(
+                lambda item: recover_contact(item[2], item[3], try_generics=False,
+                                             try_hunter=False, try_apollo=False),
+                rows
+            ))
+        pending = []
+        for item, result in zip(rows, reverified):
+            if result['recovered']:
+                results[item[0]] = finish_row(item, result)
+            else:
+                pending.append(item)
+        if len(pending) < len(rows):
+            logger.info(f"{len(rows) - len(pending)} contacts recovered by re-verifying")
+        rows = pending
+
+    # Group the rest by domain
+    by_domain: Dict[str, List[str]] = {}
+    for _, _, email, domain in rows:
+        by_domain.setdefault(domain, []).append(email)
+
+    if rows:
+        logger.info(f"{len(rows)} contacts across {len(by_domain)} domains")
+
+    cache = None
+    if use_cache and rows and HUNTER_API_KEY:
+        cache = ResponseCache(CACHE_NAME, ttl_seconds=cache_ttl_days * 86400)
+
+    # Separate pools: domain resolution fans out its own verifications
+    with ThreadPoolExecutor(max_workers=workers) as pool, \
+         ThreadPoolExecutor(max_workers=workers * GENERIC_VERIFY_BATCH) as verify_pool:
+        try:
+            domains = list(by_domain)
+            resolved = pool.map(
+                lambda d: resolve_domain(d, by_domain[d], cache=cache, executor=verify_pool),
+                domains
+            )
+            domain_infos.update(zip(domains, resolved))
+            cached = sum(1 for info in domain_infos.values() if info.get('cached'))
+            if cached:
+                logger.info(f"{cached} domains answered from cache")
+
+            if workers == 1:
+                for n, item in enumerate(rows):
+                    results[item[0]] = recover_row(item)
+                    # Delay between contacts
+                    if n < len(rows) - 1 and delay > 0:
+                        time.sleep(delay)
+            else:
+                for item, result in zip(rows, pool.map(recover_row, rows)):
+                    results[item[0]] = result
+        finally:
+            if cache is not None:
+                cache.close()
 
     # Save results
     if output_path:
@@ -468,7 +682,13 @@ def parse_args(args: List[str]) -> argparse.Namespace:
     parser.add_argument('--dry-run', action='store_true',
                        help='Do not make API calls')
     parser.add_argument('--delay', type=float, default=1.0,
-                       help='Delay between recovery attempts (default: 1.0)')
+                       help='Delay between recovery attempts with --workers 1 (default: 1.0)')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                       help=f'Domains/contacts processed in parallel (default: {DEFAULT_WORKERS})')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Ignore cached domain outcomes')
+    parser.add_argument('--cache-ttl-days', type=float, default=DEFAULT_CACHE_TTL_DAYS,
+                       help=f'Days a domain outcome stays cached (default: {DEFAULT_CACHE_TTL_DAYS})')
     parser.add_argument('--verbose', '-v', action='store_true',
                        help='Enable verbose output')
 
@@ -497,7 +717,10 @@ def main():
         csv_path=args.input,
         output_path=output_path,
         dry_run=args.dry_run,
-        delay=args.delay
+        delay=args.delay,
+        workers=args.workers,
+        use_cache=not args.no_cache,
+        cache_ttl_days=args.cache_ttl_days
     )
 
     print_recovery_summary(results)
@@ -9,6 +9,8 @@ import pandas as pd
 import tempfile
 import os
 
+from scripts.email_verifier.verification import VerificationStatus
+
 
 class TestDomainExtraction:
     """Tests for extracting domain from email."""
@@ -201,6 +203,152 @@ class TestBatchRecovery:
         os.unlink(output_path)
 
 
+class TestDomainGrouping:
+    """Tests for domain-level batching and caching."""
+
+    @pytest.fixture
+    def same_domain_csv(self):
+        """Two bounces at one domain, one at another."""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            f.write("primary_email,page_name,contact_name,website_url\n")
+            f.write("bad@example.com,Example Co,John Doe,https://example.com\n")
+            f.write("old@example.com,Example Co,Jim Doe,https://example.com\n")
+            f.write("invalid@test.org,Test Inc,Jane Doe,https://test.org\n")
+        yield f.name
+        os.unlink(f.name)
+
+    @patch('scripts.bounce_recovery.bounce_recovery.HUNTER_API_KEY', 'test-key')
+    @patch('scripts.bounce_recovery.bounce_recovery.MILLIONVERIFIER_AVAILABLE', False)
+    @patch('scripts.bounce_recovery.bounce_recovery.APOLLO_AVAILABLE', False)
+    @patch('scripts.bounce_recovery.bounce_recovery.hunter_domain_search')
+    @patch('scripts.bounce_recovery.bounce_recovery.verify_email_with_hunter')
+    def test_one_domain_search_per_domain(self, mock_verify, mock_search, same_domain_csv):
+        """Bounces sharing a domain should share one domain search."""
+        from scripts.bounce_recovery import bounce_recovery
+
+        mock_verify.return_value = {'status': 'invalid'}
+        mock_search.return_value = [
+            {'email': 'bad@example.com', 'confidence': 95, 'first_name': '', 'last_name': '', 'position': ''},
+            {'email': 'owner@example.com', 'confidence': 90, 'first_name': '', 'last_name': '', 'position': ''},
+        ]
+
+        results = bounce_recovery.process_bounced_csv(same_domain_csv, use_cache=False)
+
+        assert mock_search.call_count == 2  # example.com and test.org
+        example = [r for r in results if r['original_email'].endswith('example.com')]
+        assert [r['new_email'] for r in example] == ['owner@example.com', 'owner@example.com']
+        # The bounced address itself is never suggested
+        assert all(a['email'] != 'bad@example.com' for a in example[0]['alternatives'])
+
+    @patch('scripts.bounce_recovery.bounce_recovery.HUNTER_API_KEY', 'test-key')
+    @patch('scripts.bounce_recovery.bounce_recovery.MILLIONVERIFIER_AVAILABLE', True)
+    @patch('scripts.bounce_recovery.bounce_recovery.APOLLO_AVAILABLE', False)
+    @patch('scripts.bounce_recovery.bounce_recovery.VerificationStatus', VerificationStatus, create=True)
+    @patch('scripts.bounce_recovery.bounce_recovery.millionverify_email', create=True)
+    @patch('scripts.bounce_recovery.bounce_recovery.hunter_domain_search')
+    @patch('scripts.bounce_recovery.bounce_recovery.verify_email_with_hunter')
+    def test_reverify_runs_before_domain_lookups(self, mock_verify, mock_search, mock_reverify, same_domain_csv):
+        """Contacts a re-verify recovers should cost no domain-level lookups."""
+        from scripts.bounce_recovery import bounce_recovery
+
+        mock_reverify.side_effect = lambda e: Mock(status=(
+            VerificationStatus.OK if e.endswith('@example.com') else VerificationStatus.INVALID))
+        mock_verify.return_value = {'status': 'invalid'}
+        mock_search.return_value = []
+
+        results = bounce_recovery.process_bounced_csv(same_domain_csv, use_cache=False)
+
+        assert [r['recovery_method'] for r in results] == ['reverify_original', 'reverify_original', None]
+        assert results[0]['page_name'] == 'Example Co'
+        assert [c.args[0] for c in mock_search.call_args_list] == ['test.org']
+        assert all(c.args[0].endswith('@test.org') for c in mock_verify.call_args_list)
+        # Each bounced address is re-verified exactly once
+        assert mock_reverify.call_count == 3
+
+    @patch('scripts.bounce_recovery.bounce_recovery.HUNTER_API_KEY', 'test-key')
+    @patch('scripts.bounce_recovery.bounce_recovery.hunter_domain_search')
+    @patch('scripts.bounce_recovery.bounce_recovery.verify_email_with_hunter')
+    def test_failed_domain_is_cached(self, mock_verify, mock_search, tmp_path):
+        """A domain with no options should not be retried within the TTL."""
+        from scripts.bounce_recovery.bounce_recovery import resolve_domain
+        from utils.response_cache import ResponseCache
+
+        mock_verify.return_value = {'status': 'invalid'}
+        mock_search.return_value = []
+        cache = ResponseCache('bounce_test', path=tmp_path / 'bounce.db')
+
+        first = resolve_domain('example.com', ['bad@example.com'], cache=cache)
+        calls = (mock_verify.call_count, mock_search.call_count)
+        second = resolve_domain('example.com', ['bad@example.com'], cache=cache)
+
+        assert first['cached'] is False
+        assert second['cached'] is True
+        assert second['generic'] is None and second['alternatives'] == []
+        assert (mock_verify.call_count, mock_search.call_count) == calls
+        cache.close()
+
+    @patch('scripts.bounce_recovery.bounce_recovery.HUNTER_API_KEY', 'test-key')
+    @patch('scripts.bounce_recovery.bounce_recovery.hunter_domain_search')
+    @patch('scripts.bounce_recovery.bounce_recovery.verify_email_with_hunter')
+    def test_errors_are_not_cached(self, mock_verify, mock_search, tmp_path):
+        """Rate-limited checks should be retried on the next run."""
+        from scripts.bounce_recovery.bounce_recovery import resolve_domain
+        from utils.response_cache import ResponseCache
+
+        mock_verify.return_value = {'status': 'rate_limited'}
+        mock_search.return_value = None
+        cache = ResponseCache('bounce_test', path=tmp_path / 'bounce.db')
+
+        resolve_domain('example.com', ['bad@example.com'], cache=cache)
+        assert resolve_domain('example.com', ['bad@example.com'], cache=cache)['cached'] is False
+        cache.close()
+
+    @patch('scripts.bounce_recovery.bounce_recovery.HUNTER_API_KEY', 'test-key')
+    @patch('scripts.bounce_recovery.bounce_recovery.MILLIONVERIFIER_AVAILABLE', False)
+    @patch('scripts.bounce_recovery.bounce_recovery.hunter_domain_search')
+    @patch('scripts.bounce_recovery.bounce_recovery.verify_email_with_hunter')
+    def test_cached_generic_is_never_the_bounced_email(self, mock_verify, mock_search, tmp_path):
+        """A generic cached by an earlier run should not be offered once it bounces."""
+        from scripts.bounce_recovery.bounce_recovery import recover_contact, resolve_domain
+        from utils.response_cache import ResponseCache
+
+        mock_verify.side_effect = lambda e: {'status': 'valid' if e == 'info@example.com' else 'invalid'}
+        mock_search.return_value = [
+            {'email': 'owner@example.com', 'confidence': 90, 'first_name': '', 'last_name': '', 'position': ''},
+        ]
+        cache = ResponseCache('bounce_test', path=tmp_path / 'bounce.db')
+        assert resolve_domain('example.com', ['bad@example.com'], cache=cache)['generic'] == 'info@example.com'
+
+        # Next campaign: info@ itself bounced
+        info = resolve_domain('example.com', ['info@example.com'], cache=cache)
+        result = recover_contact('info@example.com', 'example.com', domain_info=info)
+
+        assert info['cached'] is False
+        assert result['new_email'] == 'owner@example.com'
+        assert result['recovery_method'] == 'hunter_alt'
+
+        # Even a stale domain_info handed straight in is filtered
+        stale = {'generic': 'info@example.com', 'alternatives': []}
+        result = recover_contact('INFO@example.com', 'example.com', try_apollo=False, domain_info=stale)
+        assert result['recovered'] is False and result['new_email'] is None
+        cache.close()
+
+    @patch('scripts.bounce_recovery.bounce_recovery.verify_email_with_hunter')
+    def test_generic_verification_stops_after_first_valid_wave(self, mock_verify):
+        """Later waves should not be verified once a generic is found."""
+        from scripts.bounce_recovery.bounce_recovery import (
+            GENERIC_VERIFY_BATCH, find_valid_generic, generate_generic_emails
+        )
+
+        generics = generate_generic_emails('example.com')
+        mock_verify.side_effect = lambda e: {'status': 'valid' if e == generics[1] else 'invalid'}
+
+        result = find_valid_generic('example.com')
+
+        assert result == {'email': generics[1], 'definitive': True}
+        assert mock_verify.call_count == GENERIC_VERIFY_BATCH
+
+
 class TestResultsSummary:
     """Tests for recovery results summary."""
 
@@ -31,7 +31,6 @@ from pathlib import Path
 from typing import Optional, Dict, List, Tuple
 
 import pandas as pd
-import requests
 from dotenv import load_dotenv
 from tqdm import tqdm
 
@@ -39,6 +38,7 @@ from tqdm import tqdm
 sys.path.insert(0, str(Path(__file__).parent))
 from utils.run_id import get_run_id_from_env, get_versioned_filename, create_latest_symlink
 from utils.enrichment_config import should_run_module
+from utils.exa_client import get_exa_client
 
 load_dotenv()
 
@@ -56,7 +56,6 @@ logger = logging.getLogger(__name__)
 
 BASE_DIR = Path(__file__).parent.parent
 EXA_API_KEY = os.getenv('EXA_API_KEY')
-EXA_API_URL = "https://api.exa.ai/search"
 
 # Pipeline input/output paths
 INPUT_BASE = "03d_final.csv"
@@ -195,42 +194,27 @@ def search_exa_company_owner(company: str) -> Tuple[Optional[str], Optional[str]
 
     query = f'"{company}" owner OR founder OR CEO site:linkedin.com'
 
-    headers = {
-        "accept": "application/json",
-        "content-type": "application/json",
-        "x-api-key": EXA_API_KEY
-    }
-
-    payload = {
-        "query": query,
-        "numResults": 3,
-        "type": "auto",
-        "contents": {"text": {"maxCharacters": 500}}
-    }
-
     try:
-        response = requests.post(EXA_API_URL, headers=headers, json=payload, timeout=15)
-        if response.status_code == 200:
-            results = response.json().get('results', [])
+        results = get_exa_client().search(query, num_results=3, max_characters=500)
 
-            for result in results:
-                url = result.get('url', '')
-                title = result.get('title', '')
-                text = result.get('text', '')
+        for result in results:
+            url = result.get('url', '')
+            title = result.get('title', '')
+            text = result.get('text', '')
 
-                if '/in/' not in url:
-                    continue
+            if '/in/' not in url:
+                continue
 
-                # Extract name from title
-                match = re.match(r'^([A-Z][a-z]+ [A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)', title)
-                if match:
-                    name = match.group(1)
-                    if not is_valid_name(name):
-                        continue
-                    # Verify company appears somewhere
-                    company_words = [w.lower() for w in company.split() if len(w) > 3]
-                    if any(w in text.lower() or w in title.lower() for w in company_words):
-                        return name, url.split('?')[0]
+            # Extract name from title
+            match = re.match(r'^([A-Z][a-z]+ [A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)', title)
+            if match:
+                name = match.group(1)
+                if not is_valid_name(name):
+                    continue
+                # Verify company appears somewhere
+                company_words = [w.lower() for w in company.split() if len(w) > 3]
+                if any(w in text.lower() or w in title.lower() for w in company_words):
+                    return name, url.split('?')[0]
     except Exception as e:
         logger.error(f"Exa search error for {company}: {e}")
 
@@ -11,6 +11,11 @@ from openai import AsyncOpenAI
 
 from dotenv import load_dotenv
 
+try:
+    from .llm_gateway import DeferredCall, get_gateway
+except ImportError:
+    from llm_gateway import DeferredCall, get_gateway
+
 load_dotenv()
 
 # Configuration
@@ -155,12 +160,13 @@ Respond with ONLY the JSON object, no additional text."""
     return prompt
 
 
-def parse_llm_response(content: str) -> Dict[str, Any]:
+def parse_llm_response(content: str, quiet: bool = False) -> Dict[str, Any]:
     """
     Parse the LLM response into a structured dict.
 
     Args:
         content: Raw LLM response string
+        quiet: Don't print parse failures
 
     Returns:
         Parsed dict with hook data
@@ -194,11 +200,17 @@ def parse_llm_response(content: str) -> Dict[str, Any]:
 
         return result
 
-    except (json.JSONDecodeError, KeyError, ValueError) as e:
-        print(f"    [Analyzer] Failed to parse LLM response: {e}")
+    except (json.JSONDecodeError, KeyError, ValueError, TypeError, AttributeError) as e:
+        if not quiet:
+            print(f"    [Analyzer] Failed to parse LLM response: {e}")
         return get_fallback_result("Failed to parse LLM response")
 
 
+def is_valid_llm_response(content: str) -> bool:
+    """True if the response parses as the expected JSON (safe to cache)."""
+    return not parse_llm_response(content, quiet=True)['reasoning'].startswith('Fallback result')
+
+
 def get_fallback_result(reason: str = "Unknown error") -> Dict[str, Any]:
     """
     Return a fallback result when analysis fails.
@@ -270,7 +282,8 @@ async def analyze_and_select_hook(research: Dict[str, Any]) -> Dict[str, Any]:
 
         print("    [Analyzer] Analyzing research data...")
 
-        response = await openai_client.chat.completions.create(
+        content = await get_gateway().complete(
+            'analyze', 'openai', openai_client,
             model=OPENAI_MODEL,
             messages=[
                 {
@@ -282,17 +295,19 @@ async def analyze_and_select_hook(research: Dict[str, Any]) -> Dict[str, Any]:
                     "content": prompt
                 }
             ],
+            validate=is_valid_llm_response,
             temperature=0.7,
             max_tokens=500
         )
 
-        content = response.choices[0].message.content
         result = parse_llm_response(content)
 
         print(f"    [Analyzer] Selected hook: {result['chosen_hook'][:50]}... (confidence: {result['confidence']})")
 
         return result
 
+    except DeferredCall:
+        raise
     except Exception as e:
         print(f"    [Analyzer] Error: {e}")
         return get_fallback_result(str(e))
@@ -17,6 +17,11 @@ from groq import AsyncGroq
 
 from dotenv import load_dotenv
 
+try:
+    from .llm_gateway import DeferredCall, get_gateway
+except ImportError:
+    from llm_gateway import DeferredCall, get_gateway
+
 load_dotenv()
 
 # Configuration
@@ -152,6 +157,29 @@ OUTPUT FORMAT (respond with valid JSON only):
     return prompt
 
 
+def strip_code_fence(response: str) -> str:
+    """Return the text inside a markdown code block, if the response has one."""
+    response = response.strip()
+    if '```json' in response:
+        start = response.find('```json') + 7
+        end = response.find('```', start)
+        response = response[start:end].strip()
+    elif '```' in response:
+        start = response.find('```') + 3
+        end = response.find('```', start)
+        response = response[start:end].strip()
+    return response
+
+
+def is_valid_compose_response(content: str) -> bool:
+    """True if the response parses as the expected JSON (safe to cache)."""
+    try:
+        data = json.loads(strip_code_fence(content))
+    except json.JSONDecodeError:
+        return False
+    return isinstance(data, dict) and bool(data.get('subject_line')) and bool(data.get('email_body'))
+
+
 def parse_json_response(response: str) -> Dict[str, str]:
     """
     Parse LLM response as JSON.
@@ -163,14 +191,7 @@ def parse_json_response(response: str) -> Dict[str, str]:
     # Try to find JSON in the response
     try:
         # Handle case where response might have markdown code blocks
-        if '```json' in response:
-            start = response.find('```json') + 7
-            end = response.find('```', start)
-            response = response[start:end].strip()
-        elif '```' in response:
-            start = response.find('```') + 3
-            end = response.find('```', start)
-            response = response[start:end].strip()
+        response = strip_code_fence(response)
 
         data = json.loads(response)
         return {
@@ -264,22 +285,26 @@ async def compose_email(
 Your emails get responses because they show genuine curiosity about the recipient's business,
 not because they have clever sales tactics. You write like a peer, not a salesperson."""
 
-    # Try Groq first (faster, usually available), then OpenAI
-    if groq_client:
+    messages = [
+        {"role": "system", "content": system_msg},
+        {"role": "user", "content": prompt}
+    ]
+    gateway = get_gateway()
+
+    # Try Groq first (faster, usually available), then OpenAI.
+    # Batch mode goes straight to OpenAI so the request can join the batch.
+    if groq_client and not gateway.batch_mode:
         try:
             print(f"    [Composer] Generating email for {contact.get('contact_name', 'Unknown')}...")
 
-            response = await groq_client.chat.completions.create(
+            content = await gateway.complete(
+                'compose', 'groq', groq_client,
                 model=GROQ_MODEL,
-                messages=[
-                    {"role": "system", "content": system_msg},
-                    {"role": "user", "content": prompt}
-                ],
+                messages=messages,
+                validate=is_valid_compose_response,
                 temperature=0.8,
                 max_tokens=400
             )
-
-            content = response.choices[0].message.content
             parsed = parse_json_response(content)
 
             result = {
@@ -300,17 +325,14 @@ not because they have clever sales tactics. You write like a peer, not a salespe
         try:
             print(f"    [Composer] Trying OpenAI for {contact.get('contact_name', 'Unknown')}...")
 
-            response = await openai_client.chat.completions.create(
+            content = await gateway.complete(
+                'compose', 'openai', openai_client,
                 model=OPENAI_MODEL,
-                messages=[
-                    {"role": "system", "content": system_msg},
-                    {"role": "user", "content": prompt}
-                ],
+                messages=messages,
+                validate=is_valid_compose_response,
                 temperature=0.8,
                 max_tokens=400
             )
-
-            content = response.choices[0].message.content
             parsed = parse_json_response(content)
 
             result = {
@@ -323,6 +345,8 @@ not because they have clever sales tactics. You write like a peer, not a salespe
             print(f"    [Composer] (OpenAI) Generated: {parsed['subject_line'][:40]}...")
             return result
 
+        except DeferredCall:
+            raise
         except Exception as e:
             print(f"    [Composer] OpenAI error: {e}")
 
@@ -8,6 +8,18 @@ Usage:
     python drafter.py --input custom.csv        # Custom input file
     python drafter.py --limit 10                # Process 10 contacts
     python drafter.py --sender "Your Name"      # Custom sender name
+    python drafter.py --all --concurrency 20    # 20 prospects in flight
+    python drafter.py --all --exa-concurrency 8 --openai-concurrency 16
+    python drafter.py --all --no-llm-cache      # Ignore cached LLM responses
+    python drafter.py --all --llm-batch         # Offline run via the OpenAI Batch API
+
+LLM responses are cached per stage (see llm_gateway.py), so after editing the
+compose prompt a re-run only pays for the compose stage.
+
+With --llm-batch, uncached OpenAI calls are queued and submitted as one batch
+instead of being made inline; those prospects are left out of the output.
+Re-run the same command once the batch finishes: it collects the results and
+advances every prospect one stage (analyze, then compose).
 """
 
 import asyncio
@@ -28,6 +40,11 @@ if __name__ == "__main__":
 from researcher import research_prospect
 from analyzer import analyze_and_select_hook
 from composer import compose_email
+from limits import DEFAULT_PROSPECT_CONCURRENCY, PROVIDER_LIMITS, configure_limits
+from llm_gateway import (
+    DEFAULT_CACHE_TTL_DAYS, DeferredCall, configure_gateway, get_gateway,
+    load_batch_state, save_batch_state
+)
 
 # Default paths
 DEFAULT_INPUT = "processed/03d_final.csv"
@@ -85,6 +102,53 @@ def parse_args(args: List[str] = None) -> argparse.Namespace:
         help=f"Sender name for emails (default: {DEFAULT_SENDER})"
     )
 
+    parser.add_argument(
+        '--concurrency', '-c',
+        type=int,
+        default=DEFAULT_PROSPECT_CONCURRENCY,
+        help=f"Prospects drafted in parallel (default: {DEFAULT_PROSPECT_CONCURRENCY})"
+    )
+
+    parser.add_argument(
+        '--exa-concurrency',
+        type=int,
+        default=None,
+        help=f"Concurrent Exa requests (default: {PROVIDER_LIMITS['exa']})"
+    )
+
+    parser.add_argument(
+        '--openai-concurrency',
+        type=int,
+        default=None,
+        help=f"Concurrent OpenAI requests (default: {PROVIDER_LIMITS['openai']})"
+    )
+
+    parser.add_argument(
+        '--groq-concurrency',
+        type=int,
+        default=None,
+        help=f"Concurrent Groq requests (default: {PROVIDER_LIMITS['groq']})"
+    )
+
+    parser.add_argument(
+        '--no-llm-cache',
+        action='store_true',
+        help="Don't read or write the LLM response cache"
+    )
+
+    parser.add_argument(
+        '--llm-cache-ttl-days',
+        type=float,
+        default=DEFAULT_CACHE_TTL_DAYS,
+        help=f"Days LLM responses stay cached (default: {DEFAULT_CACHE_TTL_DAYS})"
+    )
+
+    parser.add_argument(
+        '--llm-batch',
+        action='store_true',
+        help="Queue uncached OpenAI calls for the Batch API (re-run to collect)"
+    )
+
     parser.add_argument(
         '--dry-run',
         action='store_true',
@@ -170,6 +234,13 @@ def load_prospects(input_path: str) -> List[Dict[str, Any]]:
     return prospects
 
 
+def draft_status(result: Dict[str, Any]) -> str:
+    """'pending' (waiting on the LLM batch), 'error' or 'drafted'."""
+    if result.get('deferred'):
+        return 'pending'
+    return 'error' if result.get('error') else 'drafted'
+
+
 def save_results(results: List[Dict[str, Any]], output_path: str) -> None:
     """
     Save draft results to CSV.
@@ -194,11 +265,12 @@ def save_results(results: List[Dict[str, Any]], output_path: str) -> None:
         'analyzer_reasoning',
         'exa_sources',
         'confidence_score',
-        'draft_timestamp'
+        'draft_timestamp',
+        'draft_status'
     ]
 
     # Create DataFrame with columns in order
-    df = pd.DataFrame(results)
+    df = pd.DataFrame([{**r, 'draft_status': draft_status(r)} for r in results])
 
     # Add any missing columns
     for col in output_cols:
@@ -241,7 +313,8 @@ async def process_prospect(
         'exa_sources': '',
         'confidence_score': 0,
         'draft_timestamp': datetime.now().isoformat(),
-        'error': False
+        'error': False,
+        'deferred': False
     }
 
     try:
@@ -299,6 +372,10 @@ async def process_prospect(
         result['subject_line'] = email.get('subject_line', '')
         result['email_body'] = email.get('email_body', '')
 
+    except DeferredCall as e:
+        print(f"    [Drafter] {e}")
+        result['deferred'] = True
+
     except Exception as e:
         print(f"    [Error] Failed to process {prospect.get('page_name')}: {e}")
         result['error'] = True
@@ -307,56 +384,122 @@ async def process_prospect(
     return result
 
 
+def error_result(prospect: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+    """Build the result row for a prospect whose pipeline raised."""
+    return {
+        'page_name': prospect.get('page_name', ''),
+        'contact_name': prospect.get('contact_name', ''),
+        'primary_email': prospect.get('primary_email', ''),
+        'subject_line': '',
+        'email_body': '',
+        'hook_used': '',
+        'hook_source': '',
+        'hook_type': '',
+        'analyzer_reasoning': f'Error: {str(error)}',
+        'exa_sources': '',
+        'confidence_score': 0,
+        'draft_timestamp': datetime.now().isoformat(),
+        'error': True
+    }
+
+
 async def process_batch(
     prospects: List[Dict[str, Any]],
     limit: Optional[int] = None,
-    sender_name: str = DEFAULT_SENDER
+    sender_name: str = DEFAULT_SENDER,
+    concurrency: int = DEFAULT_PROSPECT_CONCURRENCY
 ) -> List[Dict[str, Any]]:
     """
     Process a batch of prospects.
 
+    Up to `concurrency` prospects move through research -> analyze -> compose
+    at once, so one prospect's LLM call overlaps another's Exa lookups. API
+    pressure is bounded separately per provider (see limits.py).
+
     Args:
         prospects: List of prospect dicts
         limit: Max number to process (None for all)
         sender_name: Name to sign emails with
+        concurrency: Max prospects in flight
 
     Returns:
-        List of result dicts
+        List of result dicts, in input order
     """
     # Apply limit
     if limit is not None:
         prospects = prospects[:limit]
 
-    results = []
-
-    print(f"\n[Drafter] Processing {len(prospects)} prospects...")
-
-    for i, prospect in enumerate(tqdm(prospects, desc="Drafting emails")):
-        print(f"\n[{i+1}/{len(prospects)}] {prospect.get('page_name', 'Unknown')}")
-
-        try:
-            result = await process_prospect(prospect, sender_name)
-            results.append(result)
-        except Exception as e:
-            print(f"    [Error] {e}")
-            # Add error result
-            results.append({
-                'page_name': prospect.get('page_name', ''),
-                'contact_name': prospect.get('contact_name', ''),
-                'primary_email': prospect.get('primary_email', ''),
-                'subject_line': '',
-                'email_body': '',
-                'hook_used': '',
-                'hook_source': '',
-                'hook_type': '',
-                'analyzer_reasoning': f'Error: {str(e)}',
-                'exa_sources': '',
-                'confidence_score': 0,
-                'draft_timestamp': datetime.now().isoformat(),
-                'error': True
-            })
-
-    return results
+    total = len(prospects)
+    in_flight = asyncio.Semaphore(max(1, concurrency))
+
+    print(f"\n[Drafter] Processing {total} prospects ({max(1, concurrency)} in flight)...")
+
+    progress = tqdm(total=total, desc="Drafting emails")
+
+    async def run_one(i: int, prospect: Dict[str, Any]) -> Dict[str, Any]:
+        async with in_flight:
+            print(f"\n[{i+1}/{total}] {prospect.get('page_name', 'Unknown')}")
+            try:
+                return await process_prospect(prospect, sender_name)
+            except Exception as e:
+                print(f"    [Error] {e}")
+                return error_result(prospect, e)
+            finally:
+                progress.update(1)
+
+    try:
+        results = await asyncio.gather(
+            *(run_one(i, prospect) for i, prospect in enumerate(prospects))
+        )
+    finally:
+        progress.close()
+
+    return list(results)
+
+
+def print_llm_metrics() -> None:
+    """Print per-stage LLM call, cache, token and latency metrics."""
+    lines = get_gateway().summary_lines()
+    if lines:
+        print("\nLLM stages:")
+        for line in lines:
+            print(f"  {line}")
+
+
+async def collect_llm_batches() -> None:
+    """Load finished batches into the LLM cache; keep unfinished ones queued.
+
+    Requests of a still-running batch are marked in flight so this run
+    defers them instead of submitting them again.
+    """
+    from analyzer import is_valid_llm_response, openai_client
+    from composer import is_valid_compose_response
+
+    gateway = get_gateway()
+    validators = {'analyze': is_valid_llm_response, 'compose': is_valid_compose_response}
+    waiting = []
+    for batch in load_batch_state():
+        stored = await gateway.collect_batch(openai_client, batch['id'], validators)
+        if stored is None:
+            print(f"[Drafter] Batch {batch['id']} still running")
+            waiting.append(batch)
+            gateway.in_flight.update(batch['keys'])
+        else:
+            print(f"[Drafter] Batch {batch['id']} collected ({stored} responses)")
+    save_batch_state(waiting)
+
+
+async def submit_llm_batch() -> Optional[str]:
+    """Submit queued LLM requests as one batch and remember its ID."""
+    from analyzer import openai_client
+
+    gateway = get_gateway()
+    keys = list(gateway.pending)
+    batch_id = await gateway.submit_batch(openai_client)
+    if batch_id:
+        save_batch_state(load_batch_state() + [{'id': batch_id, 'keys': keys}])
+        print(f"\n[Drafter] Submitted batch {batch_id} ({len(keys)} requests). Re-run with --llm-batch once it completes.")
+    return batch_id
 
 
 def print_summary(results: List[Dict[str, Any]]) -> None:
@@ -424,14 +567,41 @@ async def main():
                 print(f"  - {p.get('page_name')} ({p.get('primary_email')})")
             return
 
+        configure_limits(
+            exa=args.exa_concurrency,
+            openai=args.openai_concurrency,
+            groq=args.groq_concurrency
+        )
+        if args.llm_batch and args.no_llm_cache:
+            print("[Error] --llm-batch needs the LLM cache")
+            sys.exit(1)
+        configure_gateway(
+            cache_ttl_days=None if args.no_llm_cache else args.llm_cache_ttl_days,
+            batch_mode=args.llm_batch
+        )
+
+        if args.llm_batch:
+            await collect_llm_batches()
+
         # Process batch
-        results = await process_batch(prospects, limit=limit, sender_name=args.sender)
+        results = await process_batch(
+            prospects,
+            limit=limit,
+            sender_name=args.sender,
+            concurrency=args.concurrency
+        )
+
+        deferred = sum(1 for r in results if r.get('deferred'))
+        if args.llm_batch and deferred:
+            print(f"\n[Drafter] {deferred} prospects waiting on the LLM batch (saved as pending)")
+            await submit_llm_batch()
 
-        # Save results
+        # Save results (deferred prospects are kept with draft_status 'pending')
         save_results(results, args.output)
 
         # Print summary
-        print_summary(results)
+        print_summary([r for r in results if not r.get('deferred')])
+        print_llm_metrics()
 
         print(f"\n[Drafter] Done! Check {args.output} for email drafts.")
 
@@ -0,0 +1,71 @@
+"""Per-provider concurrency budgets for the email drafter.
+
+Several prospects run through research -> analyze -> compose at the same
+time, so each external API gets its own semaphore. A slow provider (e.g.
+OpenAI) then queues its own calls without starving Exa or Groq.
+
+Semaphores are created lazily per event loop, so the module is safe to use
+from tests or repeated asyncio.run() calls.
+
+Usage:
+    from limits import provider_limit, configure_limits
+
+    configure_limits(exa=8)
+    async with provider_limit('exa'):
+        results = await search(...)
+"""
+
+import asyncio
+import os
+import weakref
+from typing import Dict, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Prospects in flight at once (research/analyze/compose overlap across them)
+DEFAULT_PROSPECT_CONCURRENCY = int(os.getenv('DRAFTER_CONCURRENCY', '10'))
+
+# Concurrent requests allowed per provider
+PROVIDER_LIMITS: Dict[str, int] = {
+    'exa': int(os.getenv('EXA_CONCURRENCY', '5')),
+    'openai': int(os.getenv('OPENAI_CONCURRENCY', '8')),
+    'groq': int(os.getenv('GROQ_CONCURRENCY', '4')),
+}
+
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def configure_limits(
+    exa: Optional[int] = None,
+    openai: Optional[int] = None,
+    groq: Optional[int] = None
+) -> Dict[str, int]:
+    """
+    Override provider budgets. Takes effect for semaphores created afterwards.
+
+    Returns:
+        The current provider limits
+    """
+    for name, value in (('exa', exa), ('openai', openai), ('groq', groq)):
+        if value is not None:
+            PROVIDER_LIMITS[name] = max(1, int(value))
+    _semaphores.clear()
+    return dict(PROVIDER_LIMITS)
+
+
+def provider_limit(provider: str) -> asyncio.Semaphore:
+    """
+    Return the semaphore guarding calls to a provider on the running loop.
+
+    Args:
+        provider: 'exa', 'openai' or 'groq'
+    """
+    loop = asyncio.get_running_loop()
+    per_loop = _semaphores.setdefault(loop, {})
+    if provider not in per_loop:
+        per_loop[provider] = asyncio.Semaphore(PROVIDER_LIMITS.get(provider, 1))
+    return per_loop[provider]
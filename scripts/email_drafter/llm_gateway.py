@@ -0,0 +1,292 @@
+"""LLM gateway for the email drafter.
+
+Every chat completion made by the analyzer and composer goes through one
+gateway, which adds:
+
+- A SQLite response cache keyed on a content hash of (provider, model,
+  messages, params). Re-running a batch after a crash, or after tweaking only
+  the compose prompt, re-uses every unchanged analyzer answer and only pays
+  for the stage whose prompt changed.
+- Per-stage metrics: calls, cache hits, tokens and latency.
+- An optional OpenAI Batch API mode for offline drafting runs. Cache misses
+  are queued instead of called (the prospect is reported as deferred), the
+  queue is submitted as one batch, and a later run collects the batch output
+  into the cache and moves on to the next stage. Collected responses are
+  checked with the same per-stage validators as live calls. Requests of a
+  batch that is still running stay deferred and are never queued again.
+
+The default gateway has no cache; drafter.py enables it for CLI runs.
+
+Usage:
+    from llm_gateway import configure_gateway, get_gateway
+
+    configure_gateway(cache_ttl_days=30)
+    content = await get_gateway().complete(
+        'analyze', 'openai', openai_client, model='gpt-4o',
+        messages=[...], temperature=0.7, max_tokens=500
+    )
+"""
+
+import hashlib
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set
+
+try:
+    from .limits import provider_limit
+except ImportError:
+    from limits import provider_limit
+
+# Shared cache lives in scripts/utils
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.response_cache import ResponseCache
+
+CACHE_NAME = 'email_drafter_llm'
+DEFAULT_CACHE_TTL_DAYS = 30
+
+BATCH_ENDPOINT = '/v1/chat/completions'
+BATCH_COMPLETION_WINDOW = '24h'
+BATCH_STATE_PATH = Path(__file__).parent.parent.parent / 'output' / 'email_campaign' / 'llm_batches.json'
+
+
+class DeferredCall(Exception):
+    """Raised in batch mode when a response is not cached yet (queued for the batch)."""
+
+
+def new_stage_metrics() -> Dict[str, float]:
+    return {
+        'calls': 0, 'cache_hits': 0, 'deferred': 0, 'errors': 0,
+        'prompt_tokens': 0, 'completion_tokens': 0, 'latency_s': 0.0
+    }
+
+
+class LLMGateway:
+    """Cached, metered access to chat completions for the drafter stages."""
+
+    def __init__(self, cache: Optional[ResponseCache] = None, batch_mode: bool = False):
+        self.cache = cache
+        self.batch_mode = batch_mode
+        self.pending: Dict[str, Dict[str, Any]] = {}
+        # Keys of requests in submitted batches that have not been collected
+        self.in_flight: Set[str] = set()
+        self.metrics: Dict[str, Dict[str, float]] = {}
+
+    @staticmethod
+    def request_key(provider: str, model: str, messages: List[Dict[str, str]], params: Dict[str, Any]) -> str:
+        """Content hash of one request (exact, order-independent for params)."""
+        payload = json.dumps(
+            {'provider': provider, 'model': model, 'messages': messages, 'params': params},
+            sort_keys=True, ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def stage(self, name: str) -> Dict[str, float]:
+        """Metrics dict for a stage (created on first use)."""
+        return self.metrics.setdefault(name, new_stage_metrics())
+
+    async def complete(
+        self,
+        stage: str,
+        provider: str,
+        client: Any,
+        model: str,
+        messages: List[Dict[str, str]],
+        validate: Optional[Callable[[str], bool]] = None,
+        **params
+    ) -> str:
+        """
+        Return the completion text for a request, from cache when possible.
+
+        Args:
+            stage: Pipeline stage name for metrics ('analyze', 'compose')
+            provider: 'openai' or 'groq' (concurrency budget, cache key)
+            client: Async OpenAI-compatible client
+            model: Model name
+            messages: Chat messages
+            validate: Only responses passing this check are cached/reused
+            **params: Completion parameters (temperature, max_tokens, ...)
+
+        Raises:
+            DeferredCall: In batch mode, when the response is not cached yet
+        """
+        metrics = self.stage(stage)
+        key = self.request_key(provider, model, messages, params)
+
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None and (validate is None or validate(cached)):
+                metrics['cache_hits'] += 1
+                return cached
+
+        if self.batch_mode and provider == 'openai':
+            metrics['deferred'] += 1
+            if key in self.in_flight:
+                raise DeferredCall(f"{stage} waiting on a submitted batch")
+            self.pending[key] = {
+                'custom_id': f'{stage}:{key}',
+                'method': 'POST',
+                'url': BATCH_ENDPOINT,
+                'body': {'model': model, 'messages': messages, **params},
+            }
+            raise DeferredCall(f"{stage} queued for batch")
+
+        started = time.perf_counter()
+        try:
+            async with provider_limit(provider):
+                response = await client.chat.completions.create(model=model, messages=messages, **params)
+        except Exception:
+            metrics['errors'] += 1
+            raise
+        finally:
+            metrics['latency_s'] += time.perf_counter() - started
+        metrics['calls'] += 1
+
+        usage = getattr(response, 'usage', None)
+        for field in ('prompt_tokens', 'completion_tokens'):
+            value = getattr(usage, field, 0)
+            if isinstance(value, int):
+                metrics[field] += value
+
+        content = response.choices[0].message.content
+        if self.cache is not None and content and (validate is None or validate(content)):
+            self.cache.set(key, content)
+        return content
+
+    def batch_lines(self) -> List[str]:
+        """Queued requests as Batch API JSONL lines."""
+        return [json.dumps(request, ensure_ascii=False) for request in self.pending.values()]
+
+    async def submit_batch(self, client: Any) -> Optional[str]:
+        """
+        Upload queued requests as one OpenAI batch.
+
+        The queued keys move to in_flight until the batch is collected.
+
+        Returns:
+            Batch ID, or None if nothing was queued
+        """
+        if not self.pending:
+            return None
+        data = ('\n'.join(self.batch_lines()) + '\n').encode('utf-8')
+        upload = await client.files.create(file=('drafter_batch.jsonl', data), purpose='batch')
+        batch = await client.batches.create(
+            input_file_id=upload.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=BATCH_COMPLETION_WINDOW
+        )
+        self.in_flight.update(self.pending)
+        self.pending.clear()
+        return batch.id
+
+    async def collect_batch(
+        self,
+        client: Any,
+        batch_id: str,
+        validators: Optional[Dict[str, Callable[[str], bool]]] = None
+    ) -> Optional[int]:
+        """
+        Store a finished batch's responses in the cache.
+
+        Args:
+            client: Async OpenAI client
+            batch_id: Batch to collect
+            validators: Per-stage checks; responses failing them are not cached
+
+        Returns:
+            Number of responses stored, or None if the batch is still running
+        """
+        validators = validators or {}
+        batch = await client.batches.retrieve(batch_id)
+        if batch.status in ('validating', 'in_progress', 'finalizing'):
+            return None
+        if not batch.output_file_id:
+            return 0
+
+        output = await client.files.content(batch.output_file_id)
+        stored = 0
+        metrics = self.stage('batch')
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            response = row.get('response') or {}
+            if response.get('status_code') != 200:
+                metrics['errors'] += 1
+                continue
+            body = response.get('body', {})
+            usage = body.get('usage') or {}
+            metrics['prompt_tokens'] += usage.get('prompt_tokens', 0)
+            metrics['completion_tokens'] += usage.get('completion_tokens', 0)
+            content = body['choices'][0]['message']['content']
+            stage, _, key = row['custom_id'].rpartition(':')
+            validate = validators.get(stage)
+            if validate is not None and content and not validate(content):
+                metrics['errors'] += 1
+                continue
+            if self.cache is not None and content:
+                self.cache.set(key, content)
+                stored += 1
+        metrics['calls'] += stored
+        return stored
+
+    def summary_lines(self) -> List[str]:
+        """One line per stage: calls, cache hits, tokens, latency."""
+        lines = []
+        for name, m in self.metrics.items():
+            avg = m['latency_s'] / m['calls'] if m['calls'] else 0.0
+            lines.append(
+                f"{name}: {m['calls']} calls, {m['cache_hits']} cached, {m['deferred']} deferred, "
+                f"{m['errors']} errors, {m['prompt_tokens']}+{m['completion_tokens']} tokens, "
+                f"{avg:.2f}s avg latency"
+            )
+        return lines
+
+
+def load_batch_state(path: Path = BATCH_STATE_PATH) -> List[Dict[str, Any]]:
+    """Submitted batches that have not been collected yet: [{'id', 'keys'}]."""
+    if not path.exists():
+        return []
+    batches = json.loads(path.read_text()).get('batches', [])
+    # Older state files stored bare batch IDs
+    return [{'id': b, 'keys': []} if isinstance(b, str) else b for b in batches]
+
+
+def save_batch_state(batches: List[Dict[str, Any]], path: Path = BATCH_STATE_PATH):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({'batches': batches}, indent=2))
+
+
+_gateway = LLMGateway()
+
+
+def get_gateway() -> LLMGateway:
+    """Return the gateway used by the analyzer and composer."""
+    return _gateway
+
+
+def configure_gateway(
+    cache_ttl_days: Optional[float] = DEFAULT_CACHE_TTL_DAYS,
+    batch_mode: bool = False,
+    cache_path: Optional[Path] = None
+) -> LLMGateway:
+    """
+    Replace the shared gateway.
+
+    Args:
+        cache_ttl_days: Response cache lifetime; None or 0 disables the cache
+        batch_mode: Queue OpenAI cache misses for the Batch API
+        cache_path: Override the cache file location
+
+    Returns:
+        The new gateway
+    """
+    global _gateway
+    if _gateway.cache is not None:
+        _gateway.cache.close()
+    cache = None
+    if cache_ttl_days:
+        cache = ResponseCache(CACHE_NAME, ttl_seconds=cache_ttl_days * 86400, path=cache_path)
+    _gateway = LLMGateway(cache=cache, batch_mode=batch_mode)
+    return _gateway
@@ -6,25 +6,38 @@ Gathers information from:
 - Social media (Instagram, Twitter content)
 """
 
+import asyncio
 import os
 import re
-import requests
+import sys
+from pathlib import Path
 from typing import Optional, List, Dict, Any
 from urllib.parse import urlparse
 
 from dotenv import load_dotenv
 
+try:
+    from .limits import provider_limit
+except ImportError:
+    from limits import provider_limit
+
+# Shared Exa client lives in scripts/utils
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.exa_client import get_exa_client
+
 load_dotenv()
 
 # Configuration
 EXA_API_KEY = os.getenv('EXA_API_KEY')
-EXA_API_URL = "https://api.exa.ai/search"
 
 
 async def search_exa(query: str, num_results: int = 3) -> List[Dict]:
     """
     Execute a search query via Exa API.
 
+    Uses the shared Exa client (pooled session, response cache, retries),
+    so the request never blocks the event loop.
+
     Args:
         query: Search query string
         num_results: Number of results to return
@@ -37,37 +50,23 @@ async def search_exa(query: str, num_results: int = 3) -> List[Dict]:
         return []
 
     try:
-        headers = {
-            "accept": "application/json",
-            "content-type": "application/json",
-            "x-api-key": EXA_API_KEY
-        }
-
-        payload = {
-            "query": query,
-            "numResults": num_results,
-            "type": "auto",
-            "contents": {
-                "text": {"maxCharacters": 3000}
-            }
-        }
-
-        response = requests.post(EXA_API_URL, headers=headers, json=payload, timeout=15)
-
-        if response.status_code == 200:
-            data = response.json()
-            return data.get("results", [])
-        else:
-            print(f"    [Exa] API error: {response.status_code}")
-            return []
-    except requests.Timeout:
-        print("    [Exa] Request timeout")
-        return []
+        async with provider_limit('exa'):
+            return await get_exa_client().search_async(query, num_results, max_characters=3000)
     except Exception as e:
         print(f"    [Exa] Search error: {e}")
         return []
 
 
+async def search_exa_many(queries: List[str], num_results: int = 3) -> List[List[Dict]]:
+    """
+    Run all of a prospect's queries for one source at once.
+
+    Returns:
+        One result list per query, in input order
+    """
+    return list(await asyncio.gather(*(search_exa(q, num_results=num_results) for q in queries)))
+
+
 def extract_domain(url: str) -> Optional[str]:
     """Extract domain from URL."""
     if not url:
@@ -191,8 +190,8 @@ async def research_company_website(
 
     for query in queries:
         print(f"    [Exa] Searching: {query[:50]}...")
-        results = await search_exa(query, num_results=2)
 
+    for results in await search_exa_many(queries, num_results=2):
         for r in results:
             url = r.get('url', '')
             text = r.get('text', '')
@@ -293,33 +292,35 @@ async def research_social_media(
     twitter_findings = []
     sources = []
 
-    # Instagram research
+    instagram_query = None
+    twitter_query = None
     if instagram_handle:
-        query = f'"{instagram_handle}" OR "@{instagram_handle}" instagram'
-        print(f"    [Exa] Instagram search: {query[:50]}...")
-        results = await search_exa(query, num_results=2)
+        instagram_query = f'"{instagram_handle}" OR "@{instagram_handle}" instagram'
+        print(f"    [Exa] Instagram search: {instagram_query[:50]}...")
+    if company_name:
+        twitter_query = f'"{contact_name}" {company_name} twitter'
+        print(f"    [Exa] Twitter search: {twitter_query[:50]}...")
 
-        for r in results:
-            url = r.get('url', '')
-            text = r.get('text', '')
-            if 'instagram' in url.lower():
-                sources.append(url)
-                if text:
-                    instagram_findings.append(text[:300])
+    queries = [q for q in (instagram_query, twitter_query) if q]
+    results_by_query = dict(zip(queries, await search_exa_many(queries, num_results=2)))
 
-    # Twitter research
-    if company_name:
-        query = f'"{contact_name}" {company_name} twitter'
-        print(f"    [Exa] Twitter search: {query[:50]}...")
-        results = await search_exa(query, num_results=2)
+    # Instagram research
+    for r in results_by_query.get(instagram_query, []):
+        url = r.get('url', '')
+        text = r.get('text', '')
+        if 'instagram' in url.lower():
+            sources.append(url)
+            if text:
+                instagram_findings.append(text[:300])
 
-        for r in results:
-            url = r.get('url', '')
-            text = r.get('text', '')
-            if 'twitter' in url.lower() or 'x.com' in url.lower():
-                sources.append(url)
-                if text:
-                    twitter_findings.append(text[:300])
+    # Twitter research
+    for r in results_by_query.get(twitter_query, []):
+        url = r.get('url', '')
+        text = r.get('text', '')
+        if 'twitter' in url.lower() or 'x.com' in url.lower():
+            sources.append(url)
+            if text:
+                twitter_findings.append(text[:300])
 
     return {
         'instagram': instagram_findings[:3],
@@ -358,24 +359,27 @@ async def research_prospect(
 
     all_sources = []
 
-    # Company website research
-    company_data = {'website_findings': [], 'recent_news': []}
-    if website_url:
-        web_result = await research_company_website(company_name, website_url, contact_name)
-        company_data['website_findings'] = web_result.get('findings', [])
-        all_sources.extend(web_result.get('sources', []))
-
-    # LinkedIn research
-    linkedin_data = await research_linkedin_profile(contact_name, company_name, linkedin_url)
-    all_sources.extend(linkedin_data.get('sources', []))
+    async def no_website() -> Dict[str, Any]:
+        return {'findings': [], 'sources': []}
 
-    # Social media research
-    social_data = await research_social_media(
-        contact_name,
-        company_name,
-        instagram_handle,
-        twitter_handle
+    # Website, LinkedIn and social lookups are independent - run them together
+    web_result, linkedin_data, social_data = await asyncio.gather(
+        research_company_website(company_name, website_url, contact_name) if website_url else no_website(),
+        research_linkedin_profile(contact_name, company_name, linkedin_url),
+        research_social_media(
+            contact_name,
+            company_name,
+            instagram_handle,
+            twitter_handle
+        )
     )
+
+    company_data = {
+        'website_findings': web_result.get('findings', []),
+        'recent_news': []
+    }
+    all_sources.extend(web_result.get('sources', []))
+    all_sources.extend(linkedin_data.get('sources', []))
     all_sources.extend(social_data.get('sources', []))
 
     return {
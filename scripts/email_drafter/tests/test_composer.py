@@ -357,6 +357,41 @@ Tomas"""
         assert result['hook_source'] == 'linkedin'
 
 
+class TestIsValidComposeResponse:
+    """Tests for the compose cache validator."""
+
+    def test_accepts_json_with_subject_and_body(self):
+        from composer import is_valid_compose_response
+
+        assert is_valid_compose_response('```json\n{"subject_line": "Hi", "email_body": "Body"}\n```')
+        assert not is_valid_compose_response('Subject: Hi\n\nBody')
+        assert not is_valid_compose_response('{"subject_line": "Hi", "email_body": ""}')
+        assert not is_valid_compose_response('["not", "an", "object"]')
+
+    @pytest.mark.asyncio
+    async def test_unparseable_output_is_not_cached(self, tmp_path):
+        import composer
+        from llm_gateway import configure_gateway
+
+        bad = MagicMock()
+        bad.choices = [MagicMock()]
+        bad.choices[0].message.content = 'Sorry, I cannot help with that.'
+        client = MagicMock()
+        client.chat.completions.create = AsyncMock(return_value=bad)
+        contact = {'contact_name': 'Jo Doe', 'page_name': 'Acme'}
+        hook = {'chosen_hook': 'Open house', 'hook_source': 'ad'}
+
+        configure_gateway(cache_ttl_days=1, cache_path=tmp_path / 'llm.db')
+        try:
+            with patch.object(composer, 'groq_client', None), patch.object(composer, 'openai_client', client):
+                await composer.compose_email(contact, hook, 'Tomas')
+                await composer.compose_email(contact, hook, 'Tomas')
+        finally:
+            configure_gateway(cache_ttl_days=None)
+
+        assert client.chat.completions.create.await_count == 2
+
+
 class TestBuildComposerPrompt:
     """Tests for the prompt building function."""
 
@@ -135,6 +135,25 @@ class TestProcessProspect:
         assert result is not None
         assert result.get('error') is True or result.get('confidence_score', 0) == 0
 
+    @pytest.mark.asyncio
+    async def test_deferred_llm_call_marks_prospect(self):
+        """A call queued for the LLM batch should defer the prospect, not fail it."""
+        from drafter import process_prospect
+        from llm_gateway import DeferredCall
+
+        prospect = {'page_name': 'Batch Co', 'contact_name': 'Ana', 'primary_email': 'ana@batch.com'}
+
+        with patch('drafter.research_prospect', new_callable=AsyncMock, return_value={'sources': []}), \
+             patch('drafter.analyze_and_select_hook', new_callable=AsyncMock,
+                   side_effect=DeferredCall('analyze queued for batch')), \
+             patch('drafter.compose_email', new_callable=AsyncMock) as mock_compose:
+
+            result = await process_prospect(prospect)
+
+        assert result['deferred'] is True
+        assert result['error'] is False
+        mock_compose.assert_not_awaited()
+
 
 class TestLoadProspects:
     """Tests for loading prospects from CSV."""
@@ -270,6 +289,64 @@ class TestSaveResults:
             os.unlink(temp_path)
 
 
+    def test_deferred_prospects_are_saved_as_pending(self, tmp_path):
+        """Prospects waiting on the LLM batch stay in the output, marked pending."""
+        from drafter import save_results
+
+        results = [
+            {'page_name': 'Done Co', 'primary_email': 'a@done.com', 'subject_line': 'Hi',
+             'email_body': 'Body', 'error': False, 'deferred': False},
+            {'page_name': 'Batch Co', 'primary_email': 'b@batch.com', 'subject_line': '',
+             'email_body': '', 'error': False, 'deferred': True},
+        ]
+        path = tmp_path / 'drafts.csv'
+
+        save_results(results, str(path))
+
+        df = pd.read_csv(path)
+        assert list(df['draft_status']) == ['drafted', 'pending']
+        assert list(df['page_name']) == ['Done Co', 'Batch Co']
+
+
+class TestLLMBatchRuns:
+    """Tests for submitting and collecting LLM batches across drafter runs."""
+
+    @pytest.mark.asyncio
+    async def test_rerun_while_batch_in_flight_submits_nothing(self, tmp_path):
+        """Requests of a running batch are deferred, not submitted in a second batch."""
+        import analyzer
+        import llm_gateway
+        from drafter import collect_llm_batches, submit_llm_batch
+        from llm_gateway import DeferredCall, configure_gateway
+
+        state_path = tmp_path / 'llm_batches.json'
+        client = MagicMock()
+        client.files.create = AsyncMock(return_value=MagicMock(id='file-1'))
+        client.batches.create = AsyncMock(return_value=MagicMock(id='batch-1'))
+        client.batches.retrieve = AsyncMock(return_value=MagicMock(status='in_progress'))
+        messages = [{'role': 'user', 'content': 'Pick a hook'}]
+
+        async def drafter_run():
+            gateway = configure_gateway(cache_ttl_days=1, batch_mode=True, cache_path=tmp_path / 'llm.db')
+            await collect_llm_batches()
+            with pytest.raises(DeferredCall):
+                await gateway.complete('analyze', 'openai', client, 'gpt-4o', messages, max_tokens=500)
+            return await submit_llm_batch()
+
+        with patch.object(analyzer, 'openai_client', client), \
+             patch('drafter.load_batch_state', lambda: llm_gateway.load_batch_state(state_path)), \
+             patch('drafter.save_batch_state', lambda b: llm_gateway.save_batch_state(b, state_path)):
+            try:
+                assert await drafter_run() == 'batch-1'
+                assert await drafter_run() is None
+            finally:
+                configure_gateway(cache_ttl_days=None)
+
+        assert client.batches.create.await_count == 1
+        [batch] = llm_gateway.load_batch_state(state_path)
+        assert batch['id'] == 'batch-1' and len(batch['keys']) == 1
+
+
 class TestBatchProcessing:
     """Tests for batch processing multiple prospects."""
 
@@ -355,6 +432,57 @@ class TestBatchProcessing:
         # (2 success + 1 error result)
         assert len(results) >= 2
 
+    @pytest.mark.asyncio
+    async def test_runs_prospects_concurrently_in_order(self):
+        """Should keep several prospects in flight and return results in input order."""
+        import asyncio
+        from drafter import process_batch
+
+        prospects = [
+            {'page_name': f'Co{i}', 'contact_name': f'User{i}', 'primary_email': f'u{i}@test.com'}
+            for i in range(6)
+        ]
+
+        running = 0
+        peak = 0
+
+        async def mock_process(prospect, sender_name):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            # Earlier prospects finish last
+            await asyncio.sleep(0.01 * (6 - int(prospect['page_name'][2:])))
+            running -= 1
+            return {'page_name': prospect['page_name'], 'confidence_score': 80}
+
+        with patch('drafter.process_prospect', side_effect=mock_process):
+            results = await process_batch(prospects, concurrency=3)
+
+        assert peak == 3
+        assert [r['page_name'] for r in results] == [p['page_name'] for p in prospects]
+
+    @pytest.mark.asyncio
+    async def test_failure_becomes_error_row(self):
+        """A raising prospect should produce an error row in its slot."""
+        from drafter import process_batch
+
+        prospects = [
+            {'page_name': 'Co1', 'contact_name': 'User1', 'primary_email': 'u1@test.com'},
+            {'page_name': 'Co2', 'contact_name': 'User2', 'primary_email': 'u2@test.com'},
+        ]
+
+        async def mock_process(prospect, sender_name):
+            if prospect['page_name'] == 'Co1':
+                raise Exception("boom")
+            return {'page_name': 'Co2', 'confidence_score': 80}
+
+        with patch('drafter.process_prospect', side_effect=mock_process):
+            results = await process_batch(prospects, concurrency=2)
+
+        assert results[0]['error'] is True
+        assert results[0]['analyzer_reasoning'] == 'Error: boom'
+        assert results[1]['page_name'] == 'Co2'
+
 
 class TestCLI:
     """Tests for command-line interface."""
@@ -389,6 +517,24 @@ class TestCLI:
         # Default limit should be small for testing
         assert args.limit == 3 or args.all is False
 
+    def test_parses_concurrency_arguments(self):
+        """Should parse prospect and provider concurrency flags."""
+        from drafter import parse_args
+
+        args = parse_args(['--concurrency', '20', '--exa-concurrency', '8'])
+        assert args.concurrency == 20
+        assert args.exa_concurrency == 8
+        assert args.openai_concurrency is None
+
+    def test_parses_llm_cache_arguments(self):
+        """Should parse LLM cache and batch flags."""
+        from drafter import parse_args
+
+        args = parse_args(['--llm-batch', '--llm-cache-ttl-days', '7'])
+        assert args.llm_batch is True
+        assert args.llm_cache_ttl_days == 7
+        assert args.no_llm_cache is False
+
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -0,0 +1,219 @@
+"""Tests for llm_gateway.py - cached, metered LLM calls and batch mode."""
+
+import json
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from llm_gateway import DeferredCall, LLMGateway, configure_gateway, load_batch_state
+from utils.response_cache import ResponseCache
+
+MESSAGES = [{"role": "user", "content": "Pick a hook"}]
+
+
+def make_client(content='{"ok": true}', prompt_tokens=120, completion_tokens=30):
+    response = MagicMock()
+    response.choices = [MagicMock()]
+    response.choices[0].message.content = content
+    response.usage.prompt_tokens = prompt_tokens
+    response.usage.completion_tokens = completion_tokens
+    client = MagicMock()
+    client.chat.completions.create = AsyncMock(return_value=response)
+    return client
+
+
+@pytest.fixture
+def cache(tmp_path):
+    c = ResponseCache('llm_test', path=tmp_path / 'llm.db')
+    yield c
+    c.close()
+
+
+class TestComplete:
+    """Tests for LLMGateway.complete."""
+
+    @pytest.mark.asyncio
+    async def test_caches_identical_requests(self, cache):
+        gateway = LLMGateway(cache=cache)
+        client = make_client()
+
+        first = await gateway.complete('analyze', 'openai', client, 'gpt-4o', MESSAGES, temperature=0.7)
+        second = await gateway.complete('analyze', 'openai', client, 'gpt-4o', MESSAGES, temperature=0.7)
+
+        assert first == second == '{"ok": true}'
+        assert client.chat.completions.create.await_count == 1
+        metrics = gateway.metrics['analyze']
+        assert metrics['calls'] == 1 and metrics['cache_hits'] == 1
+        assert metrics['prompt_tokens'] == 120 and metrics['completion_tokens'] == 30
+
+    @pytest.mark.asyncio
+    async def test_params_and_model_are_part_of_key(self, cache):
+        gateway = LLMGateway(cache=cache)
+        client = make_client()
+
+        await gateway.complete('compose', 'openai', client, 'gpt-4o', MESSAGES, temperature=0.8)
+        await gateway.complete('compose', 'openai', client, 'gpt-4o', MESSAGES, temperature=0.9)
+        await gateway.complete('compose', 'openai', client, 'gpt-4o-mini', MESSAGES, temperature=0.8)
+
+        assert client.chat.completions.create.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_invalid_responses_are_not_cached(self, cache):
+        gateway = LLMGateway(cache=cache)
+        client = make_client(content='not json')
+
+        for _ in range(2):
+            await gateway.complete('analyze', 'openai', client, 'gpt-4o', MESSAGES,
+                                   validate=lambda c: c.startswith('{'))
+
+        assert client.chat.completions.create.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_no_cache_always_calls(self):
+        gateway = LLMGateway()
+        client = make_client()
+
+        await gateway.complete('analyze', 'openai', client, 'gpt-4o', MESSAGES)
+        await gateway.complete('analyze', 'openai', client, 'gpt-4o', MESSAGES)
+
+        assert client.chat.completions.create.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_are_counted(self):
+        gateway = LLMGateway()
+        client = MagicMock()
+        client.chat.completions.create = AsyncMock(side_effect=RuntimeError('boom'))
+
+        with pytest.raises(RuntimeError):
+            await gateway.complete('compose', 'groq', client, 'llama', MESSAGES)
+
+        assert gateway.metrics['compose']['errors'] == 1
+
+
+class TestBatchMode:
+    """Tests for deferring calls to the OpenAI Batch API."""
+
+    @pytest.mark.asyncio
+    async def test_defers_and_collects(self, cache):
+        gateway = LLMGateway(cache=cache, batch_mode=True)
+        client = make_client()
+
+        with pytest.raises(DeferredCall):
+            await gateway.complete('analyze', 'openai', client, 'gpt-4o', MESSAGES, max_tokens=500)
+
+        client.chat.completions.create.assert_not_awaited()
+        [line] = gateway.batch_lines()
+        request = json.loads(line)
+        assert request['url'] == '/v1/chat/completions'
+        assert request['body'] == {'model': 'gpt-4o', 'messages': MESSAGES, 'max_tokens': 500}
+
+        client.files.create = AsyncMock(return_value=MagicMock(id='file-1'))
+        client.batches.create = AsyncMock(return_value=MagicMock(id='batch-1'))
+        assert await gateway.submit_batch(client) == 'batch-1'
+        assert gateway.pending == {}
+
+        output = json.dumps({
+            'custom_id': request['custom_id'],
+            'response': {'status_code': 200, 'body': {
+                'choices': [{'message': {'content': '{"hook": "x"}'}}],
+                'usage': {'prompt_tokens': 100, 'completion_tokens': 20}
+            }}
+        })
+        client.batches.retrieve = AsyncMock(return_value=MagicMock(status='completed', output_file_id='file-2'))
+        client.files.content = AsyncMock(return_value=MagicMock(text=output + '\n'))
+        assert await gateway.collect_batch(client, 'batch-1') == 1
+
+        content = await gateway.complete('analyze', 'openai', client, 'gpt-4o', MESSAGES, max_tokens=500)
+        assert content == '{"hook": "x"}'
+        client.chat.completions.create.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_collect_skips_responses_failing_stage_validator(self, cache):
+        gateway = LLMGateway(cache=cache, batch_mode=True)
+        client = make_client()
+        for prompt in ('good', 'bad'):
+            with pytest.raises(DeferredCall):
+                await gateway.complete('compose', 'openai', client, 'gpt-4o',
+                                       [{'role': 'user', 'content': prompt}], max_tokens=400)
+        requests = [json.loads(line) for line in gateway.batch_lines()]
+        assert all(r['custom_id'].startswith('compose:') for r in requests)
+
+        output = '\n'.join(json.dumps({
+            'custom_id': r['custom_id'],
+            'response': {'status_code': 200, 'body': {
+                'choices': [{'message': {'content': '{"ok": true}' if i == 0 else 'not json'}}]
+            }}
+        }) for i, r in enumerate(requests))
+        client.batches.retrieve = AsyncMock(return_value=MagicMock(status='completed', output_file_id='file-2'))
+        client.files.content = AsyncMock(return_value=MagicMock(text=output))
+
+        def is_json(content):
+            try:
+                json.loads(content)
+                return True
+            except ValueError:
+                return False
+
+        assert await gateway.collect_batch(client, 'batch-1', {'compose': is_json}) == 1
+        assert gateway.metrics['batch']['errors'] == 1
+        good = await gateway.complete('compose', 'openai', client, 'gpt-4o',
+                                      [{'role': 'user', 'content': 'good'}], max_tokens=400)
+        assert good == '{"ok": true}'
+        with pytest.raises(DeferredCall):
+            await gateway.complete('compose', 'openai', client, 'gpt-4o',
+                                   [{'role': 'user', 'content': 'bad'}], max_tokens=400)
+
+    @pytest.mark.asyncio
+    async def test_in_flight_requests_are_not_queued_again(self, cache):
+        gateway = LLMGateway(cache=cache, batch_mode=True)
+        client = make_client()
+        gateway.in_flight.add(gateway.request_key('openai', 'gpt-4o', MESSAGES, {}))
+
+        with pytest.raises(DeferredCall):
+            await gateway.complete('analyze', 'openai', client, 'gpt-4o', MESSAGES)
+
+        assert gateway.pending == {} and gateway.metrics['analyze']['deferred'] == 1
+
+    def test_legacy_batch_state_is_read(self, tmp_path):
+        path = tmp_path / 'llm_batches.json'
+        path.write_text(json.dumps({'batches': ['batch-1']}))
+        assert load_batch_state(path) == [{'id': 'batch-1', 'keys': []}]
+
+    @pytest.mark.asyncio
+    async def test_running_batch_is_not_collected(self, cache):
+        gateway = LLMGateway(cache=cache, batch_mode=True)
+        client = MagicMock()
+        client.batches.retrieve = AsyncMock(return_value=MagicMock(status='in_progress'))
+
+        assert await gateway.collect_batch(client, 'batch-1') is None
+
+
+class TestStageReuse:
+    """Changing the compose prompt should only re-run the compose stage."""
+
+    @pytest.mark.asyncio
+    async def test_analyzer_answers_are_reused(self, tmp_path):
+        import analyzer
+
+        configure_gateway(cache_ttl_days=1, cache_path=tmp_path / 'llm.db')
+        try:
+            research = {'ad_content': ['Open house Saturday'], 'company': {}, 'personal': {}}
+            content = json.dumps({
+                'chosen_hook': 'Open house', 'hook_source': 'ad', 'hook_type': 'offer',
+                'problem_framing': 'x', 'confidence': 80, 'reasoning': 'y'
+            })
+            client = make_client(content=content)
+
+            with patch.object(analyzer, 'openai_client', client):
+                first = await analyzer.analyze_and_select_hook(research)
+                second = await analyzer.analyze_and_select_hook(research)
+
+            assert first == second
+            assert client.chat.completions.create.await_count == 1
+        finally:
+            configure_gateway(cache_ttl_days=None)
@@ -188,6 +188,38 @@ class TestResearchProspect:
         assert 'personal' in result
         assert 'sources' in result
 
+    @pytest.mark.asyncio
+    async def test_sources_run_concurrently(self):
+        """Website, LinkedIn and social lookups should overlap, not run in sequence."""
+        import asyncio
+        from researcher import research_prospect
+
+        running = 0
+        peak = 0
+
+        def tracked(value):
+            async def side_effect(*args, **kwargs):
+                nonlocal running, peak
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+                return value
+            return side_effect
+
+        with patch('researcher.research_company_website', side_effect=tracked({'findings': [], 'sources': ['web.com']})), \
+             patch('researcher.research_linkedin_profile', side_effect=tracked({'findings': [], 'sources': ['linkedin.com']})), \
+             patch('researcher.research_social_media', side_effect=tracked({'instagram': [], 'twitter': [], 'sources': []})):
+
+            result = await research_prospect(
+                contact_name='John Doe',
+                company_name='Example Realty',
+                website_url='https://example.com'
+            )
+
+        assert peak == 3
+        assert sorted(result['sources']) == ['linkedin.com', 'web.com']
+
     @pytest.mark.asyncio
     async def test_handles_missing_data(self):
         """Should work even when some data is missing."""
@@ -238,6 +270,11 @@ class TestResearchProspect:
 class TestSearchExa:
     """Tests for the low-level Exa search function."""
 
+    @staticmethod
+    def make_client():
+        from utils.exa_client import ExaClient
+        return ExaClient(api_key='test-key', cache=None, max_retries=0)
+
     @pytest.mark.asyncio
     async def test_search_exa_calls_api(self):
         """Should make correct API call to Exa."""
@@ -251,11 +288,15 @@ class TestSearchExa:
             ]
         }
 
-        with patch('researcher.requests.post', return_value=mock_response):
+        client = self.make_client()
+        with patch('researcher.EXA_API_KEY', 'test-key'), \
+             patch('researcher.get_exa_client', return_value=client), \
+             patch.object(client.session, 'post', return_value=mock_response) as mock_post:
             results = await search_exa('test query')
 
         assert len(results) == 1
         assert results[0]['url'] == 'https://example.com'
+        assert mock_post.call_args.kwargs['json']['query'] == 'test query'
 
     @pytest.mark.asyncio
     async def test_search_exa_handles_api_error(self):
@@ -265,7 +306,10 @@ class TestSearchExa:
         mock_response = MagicMock()
         mock_response.status_code = 500
 
-        with patch('researcher.requests.post', return_value=mock_response):
+        client = self.make_client()
+        with patch('researcher.EXA_API_KEY', 'test-key'), \
+             patch('researcher.get_exa_client', return_value=client), \
+             patch.object(client.session, 'post', return_value=mock_response):
             results = await search_exa('test query')
 
         assert results == []
@@ -276,11 +320,37 @@ class TestSearchExa:
         from researcher import search_exa
         import requests
 
-        with patch('researcher.requests.post', side_effect=requests.Timeout):
+        client = self.make_client()
+        with patch('researcher.EXA_API_KEY', 'test-key'), \
+             patch('researcher.get_exa_client', return_value=client), \
+             patch.object(client.session, 'post', side_effect=requests.Timeout):
             results = await search_exa('test query')
 
         assert results == []
 
+    @pytest.mark.asyncio
+    async def test_website_queries_run_together(self):
+        """All website queries for a prospect should be in flight at once."""
+        import asyncio
+        from researcher import research_company_website
+
+        running = 0
+        peak = 0
+
+        async def slow_search(query, num_results=3):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return [{'url': f'https://example.com/{len(query)}', 'text': ''}]
+
+        with patch('researcher.search_exa', side_effect=slow_search):
+            result = await research_company_website('Example Realty', 'https://example.com')
+
+        assert peak == 3
+        assert len(result['sources']) >= 1
+
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -1,5 +1,5 @@
 """Email Templates Module - Sales pipeline email templates."""
 
-from .template_loader import load_template, list_templates, render_template
+from .template_loader import load_template, list_templates, render_template, render_many
 
-__all__ = ['load_template', 'list_templates', 'render_template']
+__all__ = ['load_template', 'list_templates', 'render_template', 'render_many']
@@ -0,0 +1,255 @@
+"""HubSpot data layer for template sends.
+
+Loads deals, their primary contact/company and owner names for many deals at
+once using the CRM batch-read and associations batch endpoints, instead of
+several blocking REST calls per deal. Owner names are kept in an in-process
+TTL cache.
+
+For N deals this costs about 5 * ceil(N / 100) calls plus one call per
+uncached owner (roughly 25 calls for 500 deals instead of 2,000+).
+
+Usage:
+    client = HubSpotDealClient()
+    records = client.fetch_deal_records(["123", "456"])
+    records["123"]["deal"], records["123"]["contact"], records["123"]["company"]
+    client.get_owner_name("1918855052")
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+HUBSPOT_BASE_URL = os.getenv("HUBSPOT_BASE_URL", "https://api.hubapi.com")
+
+# HubSpot caps batch inputs at 100 per request
+BATCH_SIZE = 100
+DEFAULT_OWNER_TTL = 3600  # seconds
+DEFAULT_TIMEOUT = 30
+DEFAULT_MAX_RETRIES = 3
+
+DEAL_PROPERTIES = [
+    "dealname", "amount", "dealstage", "closedate",
+    "hubspot_owner_id", "demo_date", "demo_time",
+    "meeting_link", "proposal_link"
+]
+CONTACT_PROPERTIES = ["firstname", "lastname", "email", "company"]
+COMPANY_PROPERTIES = ["name", "domain"]
+
+# Owner names (fallback if not in HubSpot)
+OWNER_NAMES = {
+    "1918855052": "Tomas",
+    "1951969820": "Lina",
+}
+
+
+def chunked(items: List[str], size: int = BATCH_SIZE) -> Iterable[List[str]]:
+    """Yield successive chunks of a list."""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+class TTLCache:
+    """Small thread-safe in-process cache with per-entry expiry."""
+
+    def __init__(self, ttl_seconds: float = DEFAULT_OWNER_TTL, clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._data: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if missing/expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if self._clock() >= expires_at:
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key: str, value: Any):
+        """Store a value for ttl_seconds."""
+        with self._lock:
+            self._data[key] = (value, self._clock() + self.ttl_seconds)
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._data.clear()
+
+
+class HubSpotDealClient:
+    """Batch HubSpot reader for deals, contacts, companies and owners."""
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        owner_cache: Optional[TTLCache] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_retries: int = DEFAULT_MAX_RETRIES
+    ):
+        self.api_key = api_key if api_key is not None else os.getenv("HUBSPOT_API_KEY")
+        self.base_url = (base_url or HUBSPOT_BASE_URL).rstrip("/")
+        self.owner_cache = owner_cache if owner_cache is not None else TTLCache()
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.stats = {"requests": 0, "retries": 0, "owner_cache_hits": 0}
+
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_maxsize=4))
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=4))
+        self.session.headers.update({
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        })
+
+    def _request(self, method: str, path: str, **kwargs) -> Optional[Dict[str, Any]]:
+        """Send one request, retrying 429/5xx. Returns JSON or None."""
+        url = f"{self.base_url}{path}"
+        for attempt in range(self.max_retries + 1):
+            self.stats["requests"] += 1
+            try:
+                resp = self.session.request(method, url, timeout=self.timeout, **kwargs)
+            except requests.RequestException as e:
+                logger.error(f"HubSpot request failed ({path}): {e}")
+                return None
+
+            if resp.status_code in (200, 207):
+                return resp.json()
+
+            if (resp.status_code == 429 or resp.status_code >= 500) and attempt < self.max_retries:
+                retry_after = resp.headers.get("Retry-After", "")
+                delay = float(retry_after) if str(retry_after).isdigit() else 2 ** attempt
+                self.stats["retries"] += 1
+                logger.warning(f"HubSpot HTTP {resp.status_code} on {path}, retrying in {delay:.0f}s")
+                time.sleep(delay)
+                continue
+
+            logger.error(f"HubSpot HTTP {resp.status_code} on {path}")
+            return None
+        return None
+
+    def batch_read(self, object_type: str, ids: List[str], properties: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Read many objects of one type.
+
+        Returns:
+            Dict of object ID -> properties (missing IDs are omitted)
+        """
+        records = {}
+        unique = list(dict.fromkeys(str(i) for i in ids if i))
+        for chunk in chunked(unique):
+            data = self._request(
+                "POST",
+                f"/crm/v3/objects/{object_type}/batch/read",
+                json={"properties": properties, "inputs": [{"id": i} for i in chunk]}
+            )
+            for result in (data or {}).get("results", []):
+                records[str(result.get("id"))] = result.get("properties", {})
+        return records
+
+    def batch_associations(self, from_type: str, to_type: str, ids: List[str]) -> Dict[str, str]:
+        """
+        Look up the first associated object for many records.
+
+        Returns:
+            Dict of from-ID -> first associated to-ID
+        """
+        associations = {}
+        unique = list(dict.fromkeys(str(i) for i in ids if i))
+        for chunk in chunked(unique):
+            data = self._request(
+                "POST",
+                f"/crm/v4/associations/{from_type}/{to_type}/batch/read",
+                json={"inputs": [{"id": i} for i in chunk]}
+            )
+            for result in (data or {}).get("results", []):
+                targets = result.get("to", [])
+                if targets:
+                    associations[str(result["from"]["id"])] = str(targets[0].get("toObjectId"))
+        return associations
+
+    def fetch_deal_records(self, deal_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch deals with their primary contact and company.
+
+        Returns:
+            Dict of deal ID -> {'deal', 'contact', 'company'} (values may be None)
+        """
+        if not self.api_key:
+            logger.error("HUBSPOT_API_KEY not configured")
+            return {}
+
+        deal_ids = [str(d) for d in deal_ids]
+        deals = self.batch_read("deals", deal_ids, DEAL_PROPERTIES)
+        found = [d for d in deal_ids if d in deals]
+
+        contact_links = self.batch_associations("deals", "contacts", found)
+        company_links = self.batch_associations("deals", "companies", found)
+        contacts = self.batch_read("contacts", list(contact_links.values()), CONTACT_PROPERTIES)
+        companies = self.batch_read("companies", list(company_links.values()), COMPANY_PROPERTIES)
+
+        records = {}
+        for deal_id in deal_ids:
+            if deal_id not in deals:
+                logger.error(f"Deal {deal_id} not found")
+                continue
+            records[deal_id] = {
+                "deal": deals[deal_id],
+                "contact": contacts.get(contact_links.get(deal_id)),
+                "company": companies.get(company_links.get(deal_id)),
+            }
+        return records
+
+    def get_owner_name(self, owner_id: str) -> str:
+        """
+        Get owner first name from ID (local mapping, then cache, then HubSpot).
+
+        Returns:
+            Owner name string ("Team" if unknown)
+        """
+        if owner_id in OWNER_NAMES:
+            return OWNER_NAMES[owner_id]
+
+        cached = self.owner_cache.get(owner_id)
+        if cached is not None:
+            self.stats["owner_cache_hits"] += 1
+            return cached
+
+        if not self.api_key:
+            return "Team"
+
+        data = self._request("GET", f"/crm/v3/owners/{owner_id}")
+        if data is None:
+            return "Team"
+
+        name = data.get("firstName") or "Team"
+        self.owner_cache.set(owner_id, name)
+        return name
+
+    def close(self):
+        """Release the HTTP session."""
+        self.session.close()
+
+
+_client: Optional[HubSpotDealClient] = None
+_client_lock = threading.Lock()
+
+
+def get_hubspot_client() -> HubSpotDealClient:
+    """Return the process-wide client (owner cache survives across sends)."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HubSpotDealClient()
+        return _client
@@ -3,6 +3,17 @@
 
 Loads email templates from config/email_templates/, parses YAML frontmatter,
 and substitutes variables from deal/contact data.
+
+Templates are parsed once and cached until their file (or the registry)
+changes on disk. Subjects and bodies are compiled into render plans of
+literal segments and variable slots, so rendering is a join rather than a
+regex pass. render_many() renders a whole DataFrame of variables column-wise
+for bulk campaigns.
+
+Placeholders:
+    {{ first_name }}                          variable
+    {{ first_name | default("there") }}       literal fallback when missing/empty
+    {{ first_name | contact_name }}           first non-empty of several variables
 """
 
 import os
@@ -10,9 +21,13 @@ import re
 import json
 import logging
 import argparse
+import threading
+from functools import lru_cache
 from pathlib import Path
 from dataclasses import dataclass, field
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Mapping, Tuple, Union
+
+import pandas as pd
 
 # Module logger
 logger = logging.getLogger(__name__)
@@ -21,6 +36,14 @@ logger = logging.getLogger(__name__)
 CONFIG_DIR = Path(__file__).parent.parent.parent / "config" / "email_templates"
 TEMPLATES_JSON = CONFIG_DIR / "templates.json"
 
+# {{ name }} or {{ name | other | default("text") }}
+VAR_PATTERN = re.compile(r'\{\{\s*(\w+(?:\s*\|\s*(?:\w+|default\(\s*"[^"]*"\s*\)))*)\s*\}\}')
+DEFAULT_PATTERN = re.compile(r'default\(\s*"([^"]*)"\s*\)')
+
+# Parsed templates and registry, keyed by path -> (mtime_ns, value)
+_file_cache: Dict[str, Tuple[int, Any]] = {}
+_file_cache_lock = threading.Lock()
+
 
 @dataclass
 class Template:
@@ -38,6 +61,92 @@ class Template:
     frontmatter: Dict[str, Any] = field(default_factory=dict)
 
 
+@dataclass(frozen=True)
+class Slot:
+    """A variable placeholder: candidate names in order, optional literal default."""
+    names: Tuple[str, ...]
+    default: Optional[str]
+    placeholder: str
+
+    def resolve(self, variables: Mapping[str, Any]) -> Optional[str]:
+        """Return the slot text, or None if no value or default applies."""
+        if len(self.names) == 1 and self.default is None:
+            if self.names[0] not in variables:
+                return None
+            value = variables[self.names[0]]
+            return str(value) if value is not None else ""
+
+        for name in self.names:
+            value = variables.get(name)
+            if value is not None and value != "":
+                return str(value)
+        return self.default
+
+
+@dataclass(frozen=True)
+class RenderPlan:
+    """Compiled text: literal segments interleaved with variable slots."""
+    segments: Tuple[Union[str, Slot], ...]
+
+    @property
+    def slots(self) -> List[Slot]:
+        return [seg for seg in self.segments if isinstance(seg, Slot)]
+
+    def render(self, variables: Mapping[str, Any], strict: bool = False) -> str:
+        """Render with a dict of variables (same rules as render_template)."""
+        parts = []
+        for seg in self.segments:
+            if isinstance(seg, str):
+                parts.append(seg)
+                continue
+            text = seg.resolve(variables)
+            if text is None:
+                if strict:
+                    raise ValueError(f"Missing required variable: {seg.names[0]}")
+                logger.warning(f"Variable not provided: {seg.names[0]}")
+                text = seg.placeholder  # Keep placeholder
+            parts.append(text)
+        return ''.join(parts)
+
+
+@lru_cache(maxsize=512)
+def compile_text(text: str) -> RenderPlan:
+    """
+    Compile template text into a render plan (cached by content).
+
+    Args:
+        text: Subject or body text with {{ placeholders }}.
+
+    Returns:
+        RenderPlan of literal segments and slots.
+    """
+    segments: List[Union[str, Slot]] = []
+    pos = 0
+    for match in VAR_PATTERN.finditer(text):
+        if match.start() > pos:
+            segments.append(text[pos:match.start()])
+
+        names, default = [], None
+        for part in match.group(1).split('|'):
+            part = part.strip()
+            default_match = DEFAULT_PATTERN.fullmatch(part)
+            if default_match:
+                default = default_match.group(1)
+            else:
+                names.append(part)
+        segments.append(Slot(tuple(names), default, match.group(0)))
+        pos = match.end()
+
+    if pos < len(text):
+        segments.append(text[pos:])
+    return RenderPlan(tuple(segments))
+
+
+def compile_template(template: Template) -> Tuple[RenderPlan, RenderPlan]:
+    """Return the (subject, body) render plans for a template."""
+    return compile_text(template.subject), compile_text(template.body)
+
+
 def parse_frontmatter(content: str) -> tuple[Dict[str, Any], str]:
     """
     Parse YAML frontmatter from template content.
@@ -149,8 +258,31 @@ def load_registry() -> Dict[str, Any]:
         logger.error(f"Templates registry not found: {TEMPLATES_JSON}")
         return {"templates": [], "variable_sources": {}}
 
-    with open(TEMPLATES_JSON) as f:
-        return json.load(f)
+    return _cached_file(TEMPLATES_JSON, lambda raw: json.loads(raw))
+
+
+def _cached_file(path: Path, parse) -> Any:
+    """Parse a file once and reuse the result until its mtime changes."""
+    key = str(path)
+    mtime = path.stat().st_mtime_ns
+    with _file_cache_lock:
+        cached = _file_cache.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+    with open(path) as f:
+        value = parse(f.read())
+
+    with _file_cache_lock:
+        _file_cache[key] = (mtime, value)
+    return value
+
+
+def clear_template_cache():
+    """Forget parsed templates and compiled render plans."""
+    with _file_cache_lock:
+        _file_cache.clear()
+    compile_text.cache_clear()
 
 
 def list_templates() -> List[Dict[str, Any]]:
@@ -193,14 +325,15 @@ def load_template(template_id: str) -> Optional[Template]:
         logger.error(f"Template file not found: {template_path}")
         return None
 
-    with open(template_path) as f:
-        raw_content = f.read()
+    def parse(raw_content: str) -> Tuple[str, Dict[str, Any], str, str]:
+        # Parse frontmatter and body
+        frontmatter, content = parse_frontmatter(raw_content)
+        subject, body = extract_subject_body(content)
+        return raw_content, frontmatter, subject, body
 
-    # Parse frontmatter and body
-    frontmatter, content = parse_frontmatter(raw_content)
-    subject, body = extract_subject_body(content)
+    raw_content, frontmatter, subject, body = _cached_file(template_path, parse)
 
-    return Template(
+    template = Template(
         id=template_meta["id"],
         name=template_meta["name"],
         description=template_meta["description"],
@@ -211,8 +344,10 @@ def load_template(template_id: str) -> Optional[Template]:
         subject=subject,
         body=body,
         raw_content=raw_content,
-        frontmatter=frontmatter
+        frontmatter=dict(frontmatter)
     )
+    compile_template(template)
+    return template
 
 
 def render_template(
@@ -234,28 +369,104 @@ def render_template(
     Raises:
         ValueError: If strict=True and variables are missing.
     """
-    subject = template.subject
-    body = template.body
+    subject_plan, body_plan = compile_template(template)
+    return subject_plan.render(variables, strict), body_plan.render(variables, strict)
 
-    # Find all variables in template ({{ var_name }} format)
-    var_pattern = r'\{\{\s*(\w+)\s*\}\}'
 
-    def replace_var(match, text):
-        var_name = match.group(1)
-        if var_name in variables:
-            value = variables[var_name]
-            return str(value) if value is not None else ""
-        elif strict:
-            raise ValueError(f"Missing required variable: {var_name}")
-        else:
-            logger.warning(f"Variable not provided: {var_name}")
-            return match.group(0)  # Keep placeholder
+def _column_text(frame: pd.DataFrame, name: str) -> Tuple[pd.Series, pd.Series, pd.Series]:
+    """
+    Column as text, plus masks of rows with no value (NaN/None) and of rows
+    where the variable is absent (NaN, i.e. the key was missing, not None).
+    """
+    column = frame[name]
+    empty = column.isna()
+    absent = empty & ~column.map(lambda value: value is None).astype(bool)
+    text = column.astype(str)
+    if pd.api.types.is_float_dtype(column):
+        # Integer columns become float when any row is missing; render 100.0 as "100"
+        whole = ~empty & (column % 1 == 0) & (column.abs() < 2 ** 53)
+        text = text.where(~whole, column.where(whole, 0).astype('int64').astype(str))
+    return text.where(~empty, ""), empty, absent
+
+
+def _render_plan_frame(plan: RenderPlan, frame: pd.DataFrame, strict: bool) -> pd.Series:
+    """Render one plan for every row of a DataFrame, column-wise."""
+    result = pd.Series([""] * len(frame), index=frame.index, dtype=object)
+
+    for seg in plan.segments:
+        if isinstance(seg, str):
+            result = result + seg
+            continue
 
-    # Substitute in subject and body
-    subject = re.sub(var_pattern, lambda m: replace_var(m, subject), subject)
-    body = re.sub(var_pattern, lambda m: replace_var(m, body), body)
+        present = [n for n in seg.names if n in frame.columns]
+        if len(seg.names) == 1 and seg.default is None:
+            if not present:
+                if strict:
+                    raise ValueError(f"Missing required variable: {seg.names[0]}")
+                logger.warning(f"Variable not provided: {seg.names[0]}")
+                result = result + seg.placeholder
+                continue
+            text, _, absent = _column_text(frame, present[0])
+            if absent.any():
+                if strict:
+                    raise ValueError(f"Missing required variable: {seg.names[0]}")
+                logger.warning(f"Variable not provided: {seg.names[0]}")
+                text = text.where(~absent, seg.placeholder)
+            result = result + text
+            continue
 
-    return subject, body
+        # Fallback chain: first non-empty column, then the default
+        fallback = seg.default if seg.default is not None else seg.placeholder
+        values = pd.Series([fallback] * len(frame), index=frame.index, dtype=object)
+        filled = pd.Series(False, index=frame.index)
+        for name in present:
+            text, empty, _ = _column_text(frame, name)
+            use = ~filled & ~empty & (text != "")
+            values = values.where(~use, text)
+            filled |= use
+        if seg.default is None and not filled.all():
+            if strict:
+                raise ValueError(f"Missing required variable: {seg.names[0]}")
+            logger.warning(f"Variable not provided: {seg.names[0]}")
+        result = result + values
+
+    return result
+
+
+def render_many(
+    template: Template,
+    variables_frame: Union[pd.DataFrame, List[Dict[str, Any]]],
+    strict: bool = False
+) -> pd.DataFrame:
+    """
+    Render a template for many recipients at once.
+
+    Each placeholder is filled from a whole column, so cost grows with the
+    number of placeholders rather than per-email regex passes. None renders
+    as "" and NaN (a row without that key) keeps the placeholder, as in
+    render_template; whole-number floats render without ".0".
+
+    Args:
+        template: Template object to render.
+        variables_frame: One row of variables per email (DataFrame or list of dicts).
+        strict: If True, raise error on missing variables.
+
+    Returns:
+        DataFrame with 'subject' and 'body' columns, aligned to the input index.
+
+    Raises:
+        ValueError: If strict=True and variables are missing.
+    """
+    if isinstance(variables_frame, pd.DataFrame):
+        frame = variables_frame
+    else:
+        # object dtype keeps None apart from missing keys (NaN) and ints as ints
+        frame = pd.DataFrame(variables_frame, dtype=object)
+    subject_plan, body_plan = compile_template(template)
+    return pd.DataFrame({
+        'subject': _render_plan_frame(subject_plan, frame, strict),
+        'body': _render_plan_frame(body_plan, frame, strict),
+    }, index=frame.index)
 
 
 def preview_template(template: Template, variables: Optional[Dict[str, Any]] = None) -> str:
@@ -2,6 +2,8 @@
 """Template Sender - Send sales pipeline emails using templates.
 
 Fetches deal/contact data from HubSpot and sends templated emails via Gmail.
+Bulk mode (--deal-ids / --deals-file) loads every deal with batched HubSpot
+reads and sends over a single SMTP session.
 """
 
 import os
@@ -13,12 +15,20 @@ from datetime import datetime
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Callable, Dict, Any, Optional, List, Tuple
 
-import requests
 from dotenv import load_dotenv
 
 from .template_loader import load_template, render_template, list_templates, Template
+from .hubspot_data import (
+    CONTACT_PROPERTIES, DEAL_PROPERTIES,
+    HubSpotDealClient, get_hubspot_client
+)
+
+try:
+    from ..gmail_sender.smtp_pool import SMTPSession
+except ImportError:
+    from gmail_sender.smtp_pool import SMTPSession
 
 load_dotenv()
 
@@ -27,7 +37,6 @@ logger = logging.getLogger(__name__)
 
 # HubSpot Configuration
 HUBSPOT_API_KEY = os.getenv("HUBSPOT_API_KEY")
-HUBSPOT_BASE_URL = "https://api.hubapi.com"
 
 # Gmail Configuration
 GMAIL_ADDRESS = os.getenv('GMAIL_ADDRESS')
@@ -36,12 +45,6 @@ GMAIL_SEND_AS = os.getenv('GMAIL_SEND_AS', GMAIL_ADDRESS)
 SMTP_SERVER = 'smtp.gmail.com'
 SMTP_PORT = 587
 
-# Owner names (fallback if not in HubSpot)
-OWNER_NAMES = {
-    "1918855052": "Tomas",
-    "1951969820": "Lina",
-}
-
 # Logs directory
 LOGS_DIR = Path(__file__).parent.parent.parent / "output" / "email_campaign" / "template_logs"
 
@@ -59,35 +62,7 @@ def fetch_deal(deal_id: str) -> Optional[Dict[str, Any]]:
     if not HUBSPOT_API_KEY:
         logger.error("HUBSPOT_API_KEY not configured")
         return None
-
-    headers = {
-        "Authorization": f"Bearer {HUBSPOT_API_KEY}",
-        "Content-Type": "application/json"
-    }
-
-    properties = [
-        "dealname", "amount", "dealstage", "closedate",
-        "hubspot_owner_id", "demo_date", "demo_time",
-        "meeting_link", "proposal_link"
-    ]
-
-    url = f"{HUBSPOT_BASE_URL}/crm/v3/objects/deals/{deal_id}"
-    params = {
-        "properties": ",".join(properties),
-        "associations": "contacts,companies"
-    }
-
-    try:
-        resp = requests.get(url, headers=headers, params=params)
-        if resp.status_code == 200:
-            data = resp.json()
-            return data.get("properties", {})
-        else:
-            logger.error(f"Failed to fetch deal {deal_id}: HTTP {resp.status_code}")
-            return None
-    except Exception as e:
-        logger.error(f"Error fetching deal: {e}")
-        return None
+    return get_hubspot_client().batch_read("deals", [deal_id], DEAL_PROPERTIES).get(str(deal_id))
 
 
 def fetch_contact(contact_id: str) -> Optional[Dict[str, Any]]:
@@ -102,146 +77,43 @@ def fetch_contact(contact_id: str) -> Optional[Dict[str, Any]]:
     """
     if not HUBSPOT_API_KEY:
         return None
-
-    headers = {
-        "Authorization": f"Bearer {HUBSPOT_API_KEY}",
-        "Content-Type": "application/json"
-    }
-
-    properties = ["firstname", "lastname", "email", "company"]
-
-    url = f"{HUBSPOT_BASE_URL}/crm/v3/objects/contacts/{contact_id}"
-    params = {"properties": ",".join(properties)}
-
-    try:
-        resp = requests.get(url, headers=headers, params=params)
-        if resp.status_code == 200:
-            data = resp.json()
-            return data.get("properties", {})
-        else:
-            logger.error(f"Failed to fetch contact {contact_id}: HTTP {resp.status_code}")
-            return None
-    except Exception as e:
-        logger.error(f"Error fetching contact: {e}")
-        return None
-
-
-def fetch_associated_contact(deal_id: str) -> Optional[Dict[str, Any]]:
-    """
-    Fetch the primary contact associated with a deal.
-
-    Args:
-        deal_id: HubSpot deal ID.
-
-    Returns:
-        Contact properties dict or None.
-    """
-    if not HUBSPOT_API_KEY:
-        return None
-
-    headers = {
-        "Authorization": f"Bearer {HUBSPOT_API_KEY}",
-        "Content-Type": "application/json"
-    }
-
-    url = f"{HUBSPOT_BASE_URL}/crm/v3/objects/deals/{deal_id}/associations/contacts"
-
-    try:
-        resp = requests.get(url, headers=headers)
-        if resp.status_code == 200:
-            data = resp.json()
-            results = data.get("results", [])
-            if results:
-                contact_id = results[0].get("id")
-                return fetch_contact(contact_id)
-        return None
-    except Exception as e:
-        logger.error(f"Error fetching associated contact: {e}")
-        return None
-
-
-def fetch_associated_company(deal_id: str) -> Optional[Dict[str, Any]]:
-    """
-    Fetch the primary company associated with a deal.
-
-    Args:
-        deal_id: HubSpot deal ID.
-
-    Returns:
-        Company properties dict or None.
-    """
-    if not HUBSPOT_API_KEY:
-        return None
-
-    headers = {
-        "Authorization": f"Bearer {HUBSPOT_API_KEY}",
-        "Content-Type": "application/json"
-    }
-
-    url = f"{HUBSPOT_BASE_URL}/crm/v3/objects/deals/{deal_id}/associations/companies"
-
-    try:
-        resp = requests.get(url, headers=headers)
-        if resp.status_code == 200:
-            data = resp.json()
-            results = data.get("results", [])
-            if results:
-                company_id = results[0].get("id")
-                # Fetch company details
-                company_url = f"{HUBSPOT_BASE_URL}/crm/v3/objects/companies/{company_id}"
-                params = {"properties": "name,domain"}
-                company_resp = requests.get(company_url, headers=headers, params=params)
-                if company_resp.status_code == 200:
-                    return company_resp.json().get("properties", {})
-        return None
-    except Exception as e:
-        logger.error(f"Error fetching associated company: {e}")
-        return None
+    return get_hubspot_client().batch_read("contacts", [contact_id], CONTACT_PROPERTIES).get(str(contact_id))
 
 
 def get_owner_name(owner_id: str) -> str:
     """
     Get owner name from ID.
 
+    Uses the local mapping, then the client's in-process owner cache, and
+    only then /crm/v3/owners.
+
     Args:
         owner_id: HubSpot owner ID.
 
     Returns:
         Owner name string.
     """
-    # Try local mapping first
-    if owner_id in OWNER_NAMES:
-        return OWNER_NAMES[owner_id]
-
-    # Try to fetch from HubSpot
-    if HUBSPOT_API_KEY:
-        headers = {"Authorization": f"Bearer {HUBSPOT_API_KEY}"}
-        url = f"{HUBSPOT_BASE_URL}/crm/v3/owners/{owner_id}"
-        try:
-            resp = requests.get(url, headers=headers)
-            if resp.status_code == 200:
-                data = resp.json()
-                return data.get("firstName", "Team")
-        except Exception:
-            pass
-
-    return "Team"
+    return get_hubspot_client().get_owner_name(owner_id)
 
 
-def build_variables_from_deal(deal_id: str) -> Dict[str, Any]:
+def build_variables_from_record(
+    record: Optional[Dict[str, Any]],
+    owner_name: Callable[[str], str] = get_owner_name
+) -> Dict[str, Any]:
     """
-    Build template variables from HubSpot deal data.
+    Build template variables from a fetched deal record.
 
     Args:
-        deal_id: HubSpot deal ID.
+        record: {'deal', 'contact', 'company'} from HubSpotDealClient.fetch_deal_records.
+        owner_name: Resolves an owner ID to a name.
 
     Returns:
         Dict of variable values.
     """
     variables = {}
+    record = record or {}
 
-    # Fetch deal
-    deal = fetch_deal(deal_id)
+    deal = record.get("deal")
     if deal:
         variables["demo_date"] = deal.get("demo_date", "[FECHA]")
         variables["demo_time"] = deal.get("demo_time", "[HORA]")
@@ -251,18 +123,16 @@ def build_variables_from_deal(deal_id: str) -> Dict[str, Any]:
 
         owner_id = deal.get("hubspot_owner_id")
         if owner_id:
-            variables["owner_name"] = get_owner_name(owner_id)
+            variables["owner_name"] = owner_name(owner_id)
         else:
             variables["owner_name"] = "Team"
 
-    # Fetch contact
-    contact = fetch_associated_contact(deal_id)
+    contact = record.get("contact")
     if contact:
         variables["first_name"] = contact.get("firstname", "[NOMBRE]")
         variables["contact_email"] = contact.get("email", "")
 
-    # Fetch company
-    company = fetch_associated_company(deal_id)
+    company = record.get("company")
     if company:
         variables["company_name"] = company.get("name", "[EMPRESA]")
     elif contact and contact.get("company"):
@@ -273,13 +143,50 @@ def build_variables_from_deal(deal_id: str) -> Dict[str, Any]:
     return variables
 
 
+def build_variables_for_deals(
+    deal_ids: List[str],
+    client: Optional[HubSpotDealClient] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Build template variables for many deals with batched HubSpot reads.
+
+    Args:
+        deal_ids: HubSpot deal IDs.
+        client: HubSpot client (defaults to the shared one).
+
+    Returns:
+        Dict of deal ID -> variables (deals not found are omitted).
+    """
+    client = client or get_hubspot_client()
+    records = client.fetch_deal_records(deal_ids)
+    return {
+        deal_id: build_variables_from_record(record, owner_name=client.get_owner_name)
+        for deal_id, record in records.items()
+    }
+
+
+def build_variables_from_deal(deal_id: str) -> Dict[str, Any]:
+    """
+    Build template variables from HubSpot deal data.
+
+    Args:
+        deal_id: HubSpot deal ID.
+
+    Returns:
+        Dict of variable values.
+    """
+    variables = build_variables_for_deals([deal_id]).get(str(deal_id))
+    return variables if variables is not None else build_variables_from_record(None)
+
+
 def send_email(
     to: str,
     subject: str,
     body: str,
     login_address: str,
     password: str,
-    send_as_address: Optional[str] = None
+    send_as_address: Optional[str] = None,
+    session: Optional[SMTPSession] = None
 ) -> Tuple[bool, Optional[str]]:
     """
     Send an email via Gmail SMTP.
@@ -291,6 +198,7 @@ def send_email(
         login_address: Email for SMTP login.
         password: Gmail app password.
         send_as_address: "From" address (alias).
+        session: Open SMTP session to reuse (connects per message if None).
 
     Returns:
         Tuple of (success, error_message).
@@ -304,10 +212,13 @@ def send_email(
         msg['Subject'] = subject
         msg.attach(MIMEText(body, 'plain'))
 
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-            server.starttls()
-            server.login(login_address, password)
-            server.send_message(msg)
+        if session is not None:
+            session.send_message(msg)
+        else:
+            with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
+                server.starttls()
+                server.login(login_address, password)
+                server.send_message(msg)
 
         logger.info(f"Sent to {to}")
         return True, None
@@ -373,12 +284,39 @@ def send_template_email(
         return False, f"Template not found: {template_id}"
 
     # Build variables from deal
-    variables = build_variables_from_deal(deal_id)
+    variables = build_variables_from_deal(deal_id) if deal_id else build_variables_from_record(None)
 
     # Apply extra variables
     if extra_variables:
         variables.update(extra_variables)
 
+    return deliver_template(template, template_id, deal_id, variables, recipient_email, dry_run)
+
+
+def deliver_template(
+    template: Template,
+    template_id: str,
+    deal_id: str,
+    variables: Dict[str, Any],
+    recipient_email: Optional[str] = None,
+    dry_run: bool = False,
+    session: Optional[SMTPSession] = None
+) -> Tuple[bool, Optional[str]]:
+    """
+    Render a loaded template with prepared variables and send (or preview) it.
+
+    Args:
+        template: Loaded template.
+        template_id: Template identifier (for the send log).
+        deal_id: HubSpot deal ID (for the send log).
+        variables: Template variables.
+        recipient_email: Override recipient (uses contact email if None).
+        dry_run: If True, preview without sending.
+        session: Reusable SMTP session (bulk sends).
+
+    Returns:
+        Tuple of (success, error_message).
+    """
     # Get recipient
     to_email = recipient_email or variables.get("contact_email")
     if not to_email:
@@ -417,13 +355,101 @@ def send_template_email(
         body=body,
         login_address=GMAIL_ADDRESS,
         password=GMAIL_APP_PASSWORD,
-        send_as_address=GMAIL_SEND_AS
+        send_as_address=GMAIL_SEND_AS,
+        session=session
     )
 
     log_send(template_id, deal_id, to_email, subject, success, error)
     return success, error
 
 
+def send_template_bulk(
+    template_id: str,
+    deal_ids: List[str],
+    dry_run: bool = False,
+    extra_variables: Optional[Dict[str, Any]] = None,
+    client: Optional[HubSpotDealClient] = None
+) -> Dict[str, Any]:
+    """
+    Send a template to a list of deals.
+
+    HubSpot data for all deals is loaded up front with batch reads, and
+    every email goes over one SMTP session.
+
+    Args:
+        template_id: Template identifier.
+        deal_ids: HubSpot deal IDs.
+        dry_run: If True, preview without sending.
+        extra_variables: Variables applied to every email.
+        client: HubSpot client (defaults to the shared one).
+
+    Returns:
+        Stats dict with sent/failed counts, per-deal errors and HubSpot calls made.
+    """
+    stats = {"total": len(deal_ids), "sent": 0, "failed": 0, "errors": {}, "hubspot_requests": 0}
+
+    template = load_template(template_id)
+    if not template:
+        stats["failed"] = len(deal_ids)
+        stats["errors"] = {deal_id: f"Template not found: {template_id}" for deal_id in deal_ids}
+        return stats
+
+    client = client or get_hubspot_client()
+    requests_before = client.stats["requests"]
+    variables_by_deal = build_variables_for_deals(deal_ids, client=client)
+    stats["hubspot_requests"] = client.stats["requests"] - requests_before
+    logger.info(f"Loaded {len(variables_by_deal)}/{len(deal_ids)} deals in {stats['hubspot_requests']} HubSpot calls")
+
+    if not dry_run and (not GMAIL_ADDRESS or not GMAIL_APP_PASSWORD):
+        stats["failed"] = len(deal_ids)
+        stats["errors"] = {deal_id: "Gmail credentials not configured" for deal_id in deal_ids}
+        return stats
+
+    session = None if dry_run else SMTPSession(GMAIL_ADDRESS, GMAIL_APP_PASSWORD)
+    try:
+        for deal_id in deal_ids:
+            variables = variables_by_deal.get(str(deal_id))
+            if variables is None:
+                success, error = False, "Deal not found"
+            else:
+                if extra_variables:
+                    variables.update(extra_variables)
+                success, error = deliver_template(
+                    template, template_id, deal_id, variables, dry_run=dry_run, session=session
+                )
+
+            if success:
+                stats["sent"] += 1
+            else:
+                stats["failed"] += 1
+                stats["errors"][deal_id] = error
+                logger.warning(f"Deal {deal_id}: {error}")
+    finally:
+        if session is not None:
+            session.close()
+
+    return stats
+
+
+def load_deal_ids(deal_ids: Optional[str] = None, deals_file: Optional[str] = None) -> List[str]:
+    """
+    Collect deal IDs from a comma-separated string and/or a file.
+
+    The file may be a plain list (one ID per line) or a CSV with a deal_id column.
+    """
+    ids = [d.strip() for d in (deal_ids or "").split(",") if d.strip()]
+
+    if deals_file:
+        with open(deals_file) as f:
+            lines = [line.strip() for line in f if line.strip()]
+        if lines and "deal_id" in lines[0].split(","):
+            column = lines[0].split(",").index("deal_id")
+            lines = [line.split(",")[column].strip() for line in lines[1:]]
+        ids.extend(line for line in lines if line)
+
+    return list(dict.fromkeys(ids))
+
+
 def setup_logging(verbose: bool = False) -> logging.Logger:
     """Configure logging."""
     level = logging.DEBUG if verbose else logging.INFO
@@ -454,6 +480,10 @@ Examples:
   # Send email for a deal
   python template_sender.py --template post_demo_proposal --deal-id 12345
 
+  # Bulk: send to a list of deals (batched HubSpot reads, one SMTP session)
+  python template_sender.py --template post_demo_followup --deal-ids 123,456,789 --dry-run
+  python template_sender.py --template post_demo_followup --deals-file deals.csv
+
   # Override recipient
   python template_sender.py --template pre_demo_confirmation --deal-id 12345 --to test@example.com --dry-run
 
@@ -476,6 +506,18 @@ Examples:
         help='HubSpot deal ID'
     )
 
+    parser.add_argument(
+        '--deal-ids',
+        type=str,
+        help='Comma-separated HubSpot deal IDs (bulk mode)'
+    )
+
+    parser.add_argument(
+        '--deals-file',
+        type=str,
+        help='File of deal IDs, one per line or CSV with a deal_id column (bulk mode)'
+    )
+
     parser.add_argument(
         '--to',
         type=str,
@@ -517,6 +559,30 @@ def main():
             logger.error(f"Invalid JSON for --vars: {e}")
             return 1
 
+    if args.deal_ids or args.deals_file:
+        if args.to:
+            logger.error("--to cannot be used with --deal-ids/--deals-file")
+            return 1
+        deal_ids = load_deal_ids(args.deal_ids, args.deals_file)
+        if args.deal_id:
+            deal_ids = list(dict.fromkeys([args.deal_id, *deal_ids]))
+
+        logger.info("=" * 50)
+        logger.info("TEMPLATE SENDER (BULK)")
+        logger.info(f"Template: {args.template}")
+        logger.info(f"Deals: {len(deal_ids)}")
+        logger.info(f"Mode: {'DRY RUN' if args.dry_run else 'LIVE'}")
+        logger.info("=" * 50)
+
+        stats = send_template_bulk(
+            template_id=args.template,
+            deal_ids=deal_ids,
+            dry_run=args.dry_run,
+            extra_variables=extra_vars
+        )
+        logger.info(f"Sent: {stats['sent']}  Failed: {stats['failed']}  HubSpot calls: {stats['hubspot_requests']}")
+        return 0 if stats["failed"] == 0 else 1
+
     # Validate inputs
     if not args.deal_id and not args.to:
         logger.error("Must provide either --deal-id or --to")
@@ -0,0 +1,240 @@
+"""
+Bulk verification engine for email drafts.
+
+Runs the same checks as verifier.verify_single_draft over a whole drafts
+DataFrame:
+
+- The cheap deterministic checks are evaluated as column-wise string
+  operations. Rows they prove to pass are done; only rows that may fail are
+  handed to the scalar check function, so issue details stay identical.
+- Those remaining scalar checks run in a process pool for large batches.
+- The LLM writing-quality check (network-bound) runs on a thread pool.
+
+Usage:
+    from bulk import verify_frame
+
+    results = verify_frame(drafts_df, workers=4)
+"""
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+import checks
+from checks import (
+    CheckResult,
+    FRANCHISE_KEYWORDS,
+    GENERIC_DOMAINS,
+    GENERIC_EMAIL_PREFIXES,
+    INVALID_NAMES,
+    MEDIA_DOMAINS,
+    COMPANY_SUFFIXES,
+    NON_ALNUM_PATTERN,
+    TEMPLATE_VAR_PATTERN,
+    check_contact_name,
+    check_email_name_match,
+    check_no_template_vars,
+    check_domain_match,
+    check_greeting_name,
+    check_writing_quality,
+    check_franchise_personalization,
+)
+
+# Order matches verify_single_draft
+CHECK_ORDER = [
+    'contact_name', 'email_name_match', 'template_vars', 'domain_match',
+    'greeting_name', 'writing_quality', 'franchise_personalization'
+]
+
+SCALAR_CHECKS = {
+    'contact_name': check_contact_name,
+    'email_name_match': check_email_name_match,
+    'template_vars': check_no_template_vars,
+    'domain_match': check_domain_match,
+    'greeting_name': check_greeting_name,
+    'franchise_personalization': check_franchise_personalization,
+}
+
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+DEFAULT_LLM_WORKERS = 8
+# Below this many scalar checks a process pool costs more than it saves
+PROCESS_POOL_MIN_ITEMS = 2000
+
+INVALID_NAME_PATTERN = re.compile('|'.join(re.escape(n) for n in sorted(INVALID_NAMES, key=len, reverse=True)))
+FRANCHISE_PATTERN = re.compile('|'.join(re.escape(k) for k in sorted(FRANCHISE_KEYWORDS, key=len, reverse=True)))
+GENERIC_GREETING_PATTERN = re.compile(r'^(?:Hi\s+there\s*,|Hello\s+there\s*,|Hello\s*,)', re.IGNORECASE)
+GREETING_NAME_PATTERN = re.compile(r'^(?:Hi|Hello|Dear|Hey)\s+([A-Za-z]+)', re.IGNORECASE)
+
+ScalarItem = Tuple[int, str, tuple]
+
+
+def text_column(df: pd.DataFrame, column: str) -> pd.Series:
+    """Column as str values, the way verify_single_draft reads them (NaN -> 'nan')."""
+    if column not in df.columns:
+        return pd.Series([''] * len(df), dtype=object)
+    return pd.Series([str(v) for v in df[column].tolist()], dtype=object)
+
+
+def first_word(series: pd.Series) -> pd.Series:
+    """Lowercased first whitespace-separated word ('' if none)."""
+    return series.str.split().str[0].fillna('').str.lower()
+
+
+def contact_name_candidates(contact: pd.Series) -> pd.Series:
+    """Rows where check_contact_name may not pass."""
+    stripped = contact.str.strip()
+    lower = stripped.str.lower()
+    empty = lower.isin({'', 'nan', '[generic]'})
+    suspicious = lower.str.contains(INVALID_NAME_PATTERN) | (stripped.str.len() < 2)
+    return ~empty & suspicious
+
+
+def email_name_match_candidates(email: pd.Series, contact: pd.Series) -> pd.Series:
+    """Rows where check_email_name_match may not pass."""
+    skip = (email == '') | (contact == '')
+    contact_lower = contact.str.lower().str.strip()
+    skip |= contact_lower.isin(INVALID_NAMES | {'none', 'none none', 'nan'})
+
+    prefix = email.where(email.str.contains('@', regex=False), '').str.split('@').str[0].fillna('').str.lower()
+    skip |= prefix.isin(GENERIC_EMAIL_PREFIXES)
+
+    first = first_word(contact)
+    matches = pd.Series(
+        [len(f) >= 2 and (f in p or p.startswith(f[0])) for f, p in zip(first.tolist(), prefix.tolist())],
+        index=email.index
+    )
+    return ~skip & ~matches
+
+
+def template_var_candidates(body: pd.Series) -> pd.Series:
+    """Rows with leftover {{ template }} variables."""
+    return body.str.contains(TEMPLATE_VAR_PATTERN)
+
+
+def domain_match_candidates(email: pd.Series, page: pd.Series) -> pd.Series:
+    """Rows where check_domain_match may not pass."""
+    has_at = email.str.contains('@', regex=False)
+    domain = email.where(has_at, '').str.split('@').str[1].fillna('').str.lower()
+    skip = (email == '') | (page == '') | (domain == '')
+    special = domain.isin(GENERIC_DOMAINS | MEDIA_DOMAINS)
+
+    company = page.str.lower()
+    for suffix in COMPANY_SUFFIXES:
+        company = company.str.replace(suffix, '', regex=False)
+    company = company.str.replace(NON_ALNUM_PATTERN, '', regex=True)
+    domain_base = domain.str.split('.').str[0].fillna('').str.replace(NON_ALNUM_PATTERN, '', regex=True)
+
+    related = pd.Series([
+        len(c) >= 3 and len(d) >= 3 and (c[:4] in d or d[:4] in c or (len(c) >= 4 and c in d))
+        for c, d in zip(company.tolist(), domain_base.tolist())
+    ], index=email.index)
+    return ~skip & (special | ~related)
+
+
+def greeting_name_candidates(body: pd.Series, contact: pd.Series) -> pd.Series:
+    """Rows where check_greeting_name may not pass."""
+    stripped = body.str.strip()
+    skip = (body == '') | stripped.str.contains(GENERIC_GREETING_PATTERN)
+
+    greeting = stripped.str.extract(GREETING_NAME_PATTERN, expand=False).fillna('').str.lower()
+    skip |= greeting == ''
+
+    contact_str = contact.str.strip()
+    contact_empty = contact_str.str.lower().isin({'', 'nan', '[generic]'})
+    is_none = greeting == 'none'
+    skip |= ~is_none & (contact_empty | (greeting == first_word(contact_str)))
+    return ~skip
+
+
+def franchise_candidates(page: pd.Series) -> pd.Series:
+    """Rows for franchise companies (the only ones check_franchise_personalization can flag)."""
+    return page.str.lower().str.contains(FRANCHISE_PATTERN)
+
+
+def run_scalar_checks(items: List[ScalarItem]) -> List[Tuple[int, str, CheckResult]]:
+    """Run scalar checks (top-level so process pool workers can import it)."""
+    return [(pos, name, SCALAR_CHECKS[name](*args)) for pos, name, args in items]
+
+
+def collect_scalar_items(
+    email: pd.Series, contact: pd.Series, body: pd.Series, page: pd.Series, hook: pd.Series
+) -> List[ScalarItem]:
+    """Rows x checks that the column-wise filters could not clear."""
+    candidates = {
+        'contact_name': (contact_name_candidates(contact), lambda i: (contact[i],)),
+        'email_name_match': (email_name_match_candidates(email, contact), lambda i: (email[i], contact[i])),
+        'template_vars': (template_var_candidates(body), lambda i: (body[i],)),
+        'domain_match': (domain_match_candidates(email, page), lambda i: (email[i], page[i])),
+        'greeting_name': (greeting_name_candidates(body, contact), lambda i: (body[i], contact[i])),
+        'franchise_personalization': (
+            franchise_candidates(page), lambda i: (body[i], hook[i], page[i], contact[i])
+        ),
+    }
+    items = []
+    for name, (mask, args) in candidates.items():
+        for pos in mask[mask].index:
+            items.append((int(pos), name, args(pos)))
+    return items
+
+
+def verify_frame(
+    drafts_df: pd.DataFrame,
+    workers: int = DEFAULT_WORKERS,
+    llm_workers: int = DEFAULT_LLM_WORKERS
+) -> List[Dict[str, Any]]:
+    """
+    Verify every draft in a DataFrame.
+
+    Args:
+        drafts_df: DataFrame of email drafts
+        workers: Processes for the remaining scalar checks (1 = in-process)
+        llm_workers: Threads for the LLM writing-quality check
+
+    Returns:
+        Non-passing results, same shape and order as verifier.verify_all_drafts
+    """
+    email = text_column(drafts_df, 'primary_email')
+    contact = text_column(drafts_df, 'contact_name')
+    body = text_column(drafts_df, 'email_body')
+    page = text_column(drafts_df, 'page_name')
+    hook = text_column(drafts_df, 'hook_used')
+
+    items = collect_scalar_items(email, contact, body, page, hook)
+
+    found: Dict[Tuple[int, str], CheckResult] = {}
+    if workers > 1 and len(items) >= PROCESS_POOL_MIN_ITEMS:
+        chunk = -(-len(items) // (workers * 4))
+        chunks = [items[i:i + chunk] for i in range(0, len(items), chunk)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for batch in pool.map(run_scalar_checks, chunks):
+                found.update(((pos, name), result) for pos, name, result in batch)
+    else:
+        found.update(((pos, name), result) for pos, name, result in run_scalar_checks(items))
+
+    # LLM check only when a client is configured (otherwise it always passes)
+    if checks.openai_client is not None:
+        rows = [pos for pos in range(len(body)) if body[pos]]
+        with ThreadPoolExecutor(max_workers=max(1, llm_workers)) as pool:
+            quality = pool.map(lambda pos: check_writing_quality(body[pos], hook[pos]), rows)
+            found.update(((pos, 'writing_quality'), result) for pos, result in zip(rows, quality))
+
+    raw_page = drafts_df['page_name'].tolist() if 'page_name' in drafts_df.columns else [''] * len(drafts_df)
+    raw_contact = drafts_df['contact_name'].tolist() if 'contact_name' in drafts_df.columns else [''] * len(drafts_df)
+    raw_email = drafts_df['primary_email'].tolist() if 'primary_email' in drafts_df.columns else [''] * len(drafts_df)
+
+    results = []
+    for pos in range(len(drafts_df)):
+        for name in CHECK_ORDER:
+            result: Optional[CheckResult] = found.get((pos, name))
+            if result is not None and result.status != "pass":
+                results.append({
+                    'page_name': raw_page[pos],
+                    'contact_name': raw_contact[pos],
+                    'email': raw_email[pos],
+                    **asdict(result)
+                })
+    return results
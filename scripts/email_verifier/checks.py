@@ -86,6 +86,25 @@ GENERIC_DOMAINS = {
     'icloud.com', 'mail.com', 'protonmail.com', 'zoho.com'
 }
 
+# Suffixes stripped from company names before comparing with the email domain
+COMPANY_SUFFIXES = ['llc', 'inc', 'corp', 'co', 'real estate', 'realty', 'realtor', 'group', 'team', '& associates']
+
+# Patterns compiled once (checks run for every draft in a batch)
+TEMPLATE_VAR_PATTERN = re.compile(r'\{\{[^}]+\}\}')
+NON_ALNUM_PATTERN = re.compile(r'[^a-z0-9]')
+GENERIC_GREETING_PATTERNS = [
+    re.compile(p, re.IGNORECASE) for p in (r'^Hi\s+there\s*,', r'^Hello\s+there\s*,', r'^Hello\s*,')
+]
+GREETING_PATTERNS = [
+    re.compile(p, re.IGNORECASE) for p in (
+        r'^Hi\s+([A-Za-z]+)',
+        r'^Hello\s+([A-Za-z]+)',
+        r'^Dear\s+([A-Za-z]+)',
+        r'^Hey\s+([A-Za-z]+)',
+    )
+]
+FRANCHISE_PHRASE_PATTERNS = [re.compile(p, re.IGNORECASE) for p in GENERIC_FRANCHISE_PHRASES]
+
 
 def check_contact_name(name: str) -> CheckResult:
     """
@@ -253,7 +272,7 @@ def check_no_template_vars(email_body: str) -> CheckResult:
         )
 
     # Find all {{...}} patterns
-    template_vars = re.findall(r'\{\{[^}]+\}\}', email_body)
+    template_vars = TEMPLATE_VAR_PATTERN.findall(email_body)
 
     if template_vars:
         return CheckResult(
@@ -330,13 +349,13 @@ def check_domain_match(email: str, company_name: str) -> CheckResult:
     # Normalize company name for comparison
     company_lower = company_name.lower()
     # Remove common suffixes
-    for suffix in ['llc', 'inc', 'corp', 'co', 'real estate', 'realty', 'realtor', 'group', 'team', '& associates']:
+    for suffix in COMPANY_SUFFIXES:
         company_lower = company_lower.replace(suffix, '')
-    company_lower = re.sub(r'[^a-z0-9]', '', company_lower)
+    company_lower = NON_ALNUM_PATTERN.sub('', company_lower)
 
     # Normalize domain for comparison
     domain_base = domain.split('.')[0]  # Get first part before TLD
-    domain_normalized = re.sub(r'[^a-z0-9]', '', domain_base)
+    domain_normalized = NON_ALNUM_PATTERN.sub('', domain_base)
 
     # Check for any overlap
     if len(company_lower) >= 3 and len(domain_normalized) >= 3:
@@ -385,9 +404,8 @@ def check_greeting_name(email_body: str, contact_name: str) -> CheckResult:
         )
 
     # Check for generic greeting patterns first - these are always acceptable
-    generic_patterns = [r'^Hi\s+there\s*,', r'^Hello\s+there\s*,', r'^Hello\s*,']
-    for pattern in generic_patterns:
-        if re.search(pattern, email_body.strip(), re.IGNORECASE):
+    for pattern in GENERIC_GREETING_PATTERNS:
+        if pattern.search(email_body.strip()):
             return CheckResult(
                 check_name="greeting_name",
                 status="pass",
@@ -397,16 +415,9 @@ def check_greeting_name(email_body: str, contact_name: str) -> CheckResult:
             )
 
     # Extract greeting name from personal greeting patterns
-    greeting_patterns = [
-        r'^Hi\s+([A-Za-z]+)',
-        r'^Hello\s+([A-Za-z]+)',
-        r'^Dear\s+([A-Za-z]+)',
-        r'^Hey\s+([A-Za-z]+)',
-    ]
-
     greeting_name = None
-    for pattern in greeting_patterns:
-        match = re.search(pattern, email_body.strip(), re.IGNORECASE)
+    for pattern in GREETING_PATTERNS:
+        match = pattern.search(email_body.strip())
         if match:
             greeting_name = match.group(1)
             break
@@ -666,8 +677,8 @@ def check_franchise_personalization(
     text_to_check = f"{email_body} {hook_used}".lower()
 
     # Check for generic franchise phrases
-    for pattern in GENERIC_FRANCHISE_PHRASES:
-        match = re.search(pattern, text_to_check, re.IGNORECASE)
+    for pattern in FRANCHISE_PHRASE_PATTERNS:
+        match = pattern.search(text_to_check)
         if match:
             matched_text = match.group(0)
             return CheckResult(
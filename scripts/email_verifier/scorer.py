@@ -5,6 +5,8 @@ Combines multiple signals to determine if an email is safe to send:
 - Hunter.io confidence (20%)
 - Domain type/catch-all status (15%)
 - Email pattern (generic vs named) (15%)
+
+score_frame() applies the same scoring column-wise to a whole DataFrame.
 """
 
 import os
@@ -13,17 +15,20 @@ from dataclasses import dataclass
 from typing import Optional, Dict, Any
 from enum import Enum
 
+import numpy as np
+import pandas as pd
 from dotenv import load_dotenv
 
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
-# Import verification types (handle circular import)
 try:
-    from .verifier import VerificationStatus, VerificationResult, is_generic_email
+    from .verification import VerificationStatus, VerificationResult, is_generic_email
 except ImportError:
-    from scripts.email_verifier.verifier import VerificationStatus, VerificationResult, is_generic_email
+    from scripts.email_verifier.verification import VerificationStatus, VerificationResult, is_generic_email
+
+TRUE_STRINGS = {'true', 't', 'yes', 'y', '1'}
 
 
 class SendRecommendation(Enum):
@@ -164,6 +169,77 @@ def calculate_send_score(
     )
 
 
+def _as_flag(value: Any) -> bool:
+    """Read a CSV-style flag: bools/numbers as-is, strings like "True"/"false"/"1"."""
+    if isinstance(value, str):
+        return value.strip().lower() in TRUE_STRINGS
+    if value is None or pd.isna(value):
+        return False
+    return bool(value)
+
+
+def score_frame(
+    df: pd.DataFrame,
+    email_col: str = 'email',
+    status_col: str = 'verification_status',
+    hunter_col: str = 'hunter_confidence',
+    catch_all_col: str = 'is_catch_all'
+) -> pd.DataFrame:
+    """
+    Column-wise calculate_send_score for a batch of emails.
+
+    Args:
+        df: One row per email.
+        email_col: Email address column.
+        status_col: VerificationStatus (or its value) per row; missing = not verified.
+        hunter_col: Hunter.io confidence (0-100); missing = no Hunter data.
+        catch_all_col: Catch-all flag (bool, 0/1 or "True"/"False" text);
+            missing = normal domain.
+
+    Returns:
+        DataFrame (same index) with api_score, hunter_score, domain_score,
+        pattern_score, total_score and recommendation (SendRecommendation value).
+    """
+    def column(name):
+        return df[name] if name in df.columns else pd.Series(None, index=df.index, dtype=object)
+
+    status = column(status_col).map(lambda s: s.value if isinstance(s, VerificationStatus) else s)
+    verified = status.notna()
+    api_points = {
+        VerificationStatus.OK.value: 50,
+        VerificationStatus.CATCH_ALL.value: 20,
+        VerificationStatus.UNKNOWN.value: 10,
+        VerificationStatus.INVALID.value: 0,
+    }
+    api_score = status.map(api_points).where(verified, 0).fillna(5).astype(int)
+
+    hunter = pd.to_numeric(column(hunter_col), errors='coerce').fillna(0)
+    hunter_score = (hunter.clip(lower=0) * 0.2).astype(int)
+
+    catch_all = column(catch_all_col).map(_as_flag).astype(bool)
+    domain_score = np.where(catch_all, 0, 15)
+
+    generic = column(email_col).fillna('').astype(str).map(is_generic_email).astype(bool)
+    pattern_score = np.where(generic, 5, 15)
+
+    total = api_score + hunter_score + domain_score + pattern_score
+    recommendation = np.select(
+        [status == VerificationStatus.INVALID.value, total >= 70, total >= 50, total >= 30],
+        [SendRecommendation.DO_NOT_SEND.value, SendRecommendation.SAFE.value,
+         SendRecommendation.CAUTION.value, SendRecommendation.RISKY.value],
+        default=SendRecommendation.DO_NOT_SEND.value
+    )
+
+    return pd.DataFrame({
+        'api_score': api_score,
+        'hunter_score': hunter_score,
+        'domain_score': domain_score,
+        'pattern_score': pattern_score,
+        'total_score': total,
+        'recommendation': recommendation,
+    }, index=df.index)
+
+
 def score_for_sending(
     email: str,
     verification_result: Optional[VerificationResult] = None,
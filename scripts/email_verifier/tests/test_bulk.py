@@ -0,0 +1,128 @@
+"""
+Tests for the bulk (column-wise) verification engine.
+
+Run with: pytest scripts/email_verifier/tests/ -v
+"""
+
+import itertools
+import sys
+from dataclasses import asdict
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import bulk
+import checks
+from verifier import verify_all_drafts, verify_single_draft
+
+CONTACTS = ['John Smith', 'Sarah', 'None', 'Info Team', 'J', '', '[generic]', float('nan'), 'Maria Lopez']
+EMAILS = ['john@smithrealty.com', 'info@acme.com', 'sarah.k@gmail.com', 'bob@zillow.com', 'nodomain', '']
+PAGES = ['Smith Realty LLC', 'RE/MAX Elite', 'Acme Homes', 'Keller Williams Realty', '', 'XY']
+BODIES = [
+    'Hi John,\n\nSaw your listing.',
+    'Hello there,\n\nQuick question.',
+    'Hi None,\n\nHello.',
+    'Hey Sarah, as one of the largest real estate networks...',
+    'Dear {{ first_name }},\n\nHi.',
+    'Thanks for your time.',
+    '',
+]
+HOOKS = ['RE/MAX brand', 'your #1 team', '']
+
+
+def reference_results(df):
+    """verify_all_drafts as implemented before the bulk engine: row by row."""
+    results = []
+    for _, draft in df.iterrows():
+        for result in verify_single_draft(draft.to_dict()):
+            if result.status != "pass":
+                results.append({
+                    'page_name': draft.get('page_name', ''),
+                    'contact_name': draft.get('contact_name', ''),
+                    'email': draft.get('primary_email', ''),
+                    **asdict(result)
+                })
+    return results
+
+
+def make_drafts(n=None):
+    rows = [
+        {'contact_name': c, 'primary_email': e, 'page_name': p, 'email_body': b, 'hook_used': h}
+        for c, e, p, b, h in itertools.islice(
+            zip(itertools.cycle(CONTACTS), itertools.cycle(EMAILS), itertools.cycle(PAGES),
+                itertools.cycle(BODIES), itertools.cycle(HOOKS)),
+            n or 9 * 6 * 7
+        )
+    ]
+    rows += [
+        {'contact_name': c, 'primary_email': e, 'page_name': p, 'email_body': b, 'hook_used': 'RE/MAX brand'}
+        for c, e, p, b in itertools.product(CONTACTS[:4], EMAILS[:4], PAGES[:3], BODIES[:4])
+    ]
+    return pd.DataFrame(rows)
+
+
+def normalize(results):
+    """NaN != NaN, so compare string forms."""
+    return [{k: str(v) for k, v in r.items()} for r in results]
+
+
+@pytest.fixture(autouse=True)
+def no_llm(monkeypatch):
+    monkeypatch.setattr(checks, 'openai_client', None)
+
+
+class TestVerifyFrame:
+    """The bulk engine must return exactly what the row-by-row checks return."""
+
+    def test_matches_row_by_row(self):
+        df = make_drafts()
+        expected = reference_results(df)
+        assert expected  # the fixture exercises failing checks
+        assert normalize(bulk.verify_frame(df, workers=1)) == normalize(expected)
+
+    def test_process_pool_matches(self, monkeypatch):
+        monkeypatch.setattr(bulk, 'PROCESS_POOL_MIN_ITEMS', 1)
+        df = make_drafts()
+        assert normalize(bulk.verify_frame(df, workers=2)) == normalize(reference_results(df))
+
+    def test_verify_all_drafts_delegates(self):
+        df = make_drafts(20)
+        assert normalize(verify_all_drafts(df, workers=1)) == normalize(reference_results(df))
+
+    def test_missing_columns(self):
+        df = pd.DataFrame({'page_name': ['Acme'], 'email_body': ['Hi None,']})
+        assert normalize(bulk.verify_frame(df, workers=1)) == normalize(reference_results(df))
+
+    def test_clean_rows_skip_scalar_checks(self):
+        df = pd.DataFrame([{
+            'contact_name': 'John Smith', 'primary_email': 'john@smithrealty.com',
+            'page_name': 'Smith Realty', 'email_body': 'Hi John,\n\nSaw your listing.', 'hook_used': ''
+        }] * 50)
+        items = bulk.collect_scalar_items(
+            *(bulk.text_column(df, c) for c in ('primary_email', 'contact_name', 'email_body', 'page_name', 'hook_used'))
+        )
+        assert items == []
+        assert bulk.verify_frame(df, workers=1) == []
+
+    def test_writing_quality_runs_per_draft(self, monkeypatch):
+        response = MagicMock()
+        response.choices = [MagicMock()]
+        response.choices[0].message.content = (
+            '{"has_issues": true, "issues": [{"problem": "Awkward", "text": "Saw", "fix": "Reword"}]}'
+        )
+        client = MagicMock()
+        client.chat.completions.create.return_value = response
+        monkeypatch.setattr(checks, 'openai_client', client)
+
+        df = make_drafts(12)
+        expected = reference_results(df)
+        calls = client.chat.completions.create.call_count
+        client.chat.completions.create.reset_mock()
+
+        assert normalize(bulk.verify_frame(df, workers=1, llm_workers=4)) == normalize(expected)
+        assert client.chat.completions.create.call_count == calls
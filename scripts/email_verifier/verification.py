@@ -0,0 +1,47 @@
+"""
+Mailbox verification result types.
+
+Shared by the send scorer (scorer.py) and the callers that score verified
+addresses (gmail_sender, bounce_recovery).
+"""
+
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+try:
+    from .checks import GENERIC_EMAIL_PREFIXES
+except ImportError:
+    from checks import GENERIC_EMAIL_PREFIXES
+
+
+class VerificationStatus(Enum):
+    """Mailbox verification outcome (MillionVerifier result codes)."""
+    OK = 'ok'
+    CATCH_ALL = 'catch_all'
+    UNKNOWN = 'unknown'
+    INVALID = 'invalid'
+    ERROR = 'error'
+
+
+@dataclass
+class VerificationResult:
+    """Result of verifying one mailbox."""
+    email: str
+    status: VerificationStatus
+    is_catch_all: bool = False
+    is_deliverable: bool = False
+    confidence: int = 0
+    error: Optional[str] = None
+
+    @property
+    def safe_to_send(self) -> bool:
+        """Only verified mailboxes are safe; catch-all domains are not."""
+        return self.status == VerificationStatus.OK
+
+
+def is_generic_email(email: Optional[str]) -> bool:
+    """True for role addresses (info@, sales@, ...) rather than a named person."""
+    if not email or '@' not in email:
+        return False
+    return email.split('@')[0].lower() in GENERIC_EMAIL_PREFIXES
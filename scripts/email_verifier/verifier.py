@@ -7,6 +7,7 @@ Usage:
     python verifier.py --drafts output/email_campaign/drafts_batch2.csv
     python verifier.py --drafts drafts.csv --report
     python verifier.py --drafts drafts.csv --fix
+    python verifier.py --drafts drafts.csv --workers 8
 """
 
 import argparse
@@ -14,7 +15,6 @@ import logging
 import sys
 from pathlib import Path
 from typing import List, Dict, Any, Optional
-from dataclasses import asdict
 
 import pandas as pd
 
@@ -31,6 +31,13 @@ from checks import (
     check_writing_quality,
     check_franchise_personalization,
 )
+from bulk import DEFAULT_WORKERS, verify_frame
+
+# Mailbox verification types live in verification.py (re-exported for callers)
+try:
+    from .verification import VerificationStatus, VerificationResult, is_generic_email
+except ImportError:
+    from verification import VerificationStatus, VerificationResult, is_generic_email
 
 # Setup logging
 logging.basicConfig(
@@ -112,43 +119,24 @@ def verify_single_draft(draft: Dict[str, Any], prospect: Optional[Dict[str, Any]
 
 def verify_all_drafts(
     drafts_df: pd.DataFrame,
-    prospects_df: Optional[pd.DataFrame] = None
+    prospects_df: Optional[pd.DataFrame] = None,
+    workers: int = DEFAULT_WORKERS
 ) -> List[Dict[str, Any]]:
     """
     Verify all drafts and return detailed results.
 
+    Checks run column-wise over the whole frame (see bulk.py); results are
+    the same as calling verify_single_draft on each row.
+
     Args:
         drafts_df: DataFrame of email drafts
         prospects_df: Optional DataFrame of prospects for cross-reference
+        workers: Processes for the per-row checks that can't be vectorized
 
     Returns:
         List of result dicts with check details
     """
-    all_results = []
-
-    # Create prospect lookup if available
-    prospect_lookup = {}
-    if prospects_df is not None and 'page_name' in prospects_df.columns:
-        prospect_lookup = prospects_df.set_index('page_name').to_dict('index')
-
-    for idx, draft in drafts_df.iterrows():
-        page_name = draft.get('page_name', '')
-        prospect = prospect_lookup.get(page_name)
-
-        # Run all checks
-        check_results = verify_single_draft(draft.to_dict(), prospect)
-
-        # Add results
-        for result in check_results:
-            if result.status != "pass":  # Only include non-passing results
-                all_results.append({
-                    'page_name': page_name,
-                    'contact_name': draft.get('contact_name', ''),
-                    'email': draft.get('primary_email', ''),
-                    **asdict(result)
-                })
-
-    return all_results
+    return verify_frame(drafts_df, workers=workers)
 
 
 def print_summary(results: List[Dict[str, Any]], total_drafts: int):
@@ -272,6 +260,13 @@ def main():
         help='Auto-fix issues where possible (not implemented)'
     )
 
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f'Worker processes for per-row checks (default: {DEFAULT_WORKERS})'
+    )
+
     args = parser.parse_args()
 
     print("""
@@ -309,7 +304,7 @@ def main():
 
     # Run verification
     logger.info("Running verification checks...")
-    results = verify_all_drafts(drafts_df, prospects_df)
+    results = verify_all_drafts(drafts_df, prospects_df, workers=args.workers)
 
     # Print summary
     print_summary(results, len(drafts_df))
@@ -18,52 +18,35 @@ Usage:
 
 import os
 import re
+import sys
 import requests
+from pathlib import Path
 from typing import Optional
 from dotenv import load_dotenv
 
+sys.path.insert(0, str(Path(__file__).parent))
+from utils.exa_client import get_exa_client
+
 load_dotenv()
 
 EXA_API_KEY = os.getenv('EXA_API_KEY')
 HUNTER_API_KEY = os.getenv('HUNTER_API_KEY')
 
-# Exa API endpoint
-EXA_API_URL = "https://api.exa.ai/search"
-
 # Cost tracking
 COST_EXA_SEARCH = 0.001  # Estimate per search
 
 
 def search_exa(query: str, num_results: int = 5) -> list:
-    """Search Exa for a query and return results with text content."""
+    """Search Exa for a query and return results with text content.
+
+    Goes through the shared Exa client (pooled session, cache, retries).
+    """
     if not EXA_API_KEY:
         print("    [Exa] No API key configured")
         return []
 
     try:
-        headers = {
-            "accept": "application/json",
-            "content-type": "application/json",
-            "x-api-key": EXA_API_KEY
-        }
-
-        payload = {
-            "query": query,
-            "numResults": num_results,
-            "type": "auto",
-            "contents": {
-                "text": {"maxCharacters": 5000}
-            }
-        }
-
-        response = requests.post(EXA_API_URL, headers=headers, json=payload, timeout=15)
-
-        if response.status_code == 200:
-            data = response.json()
-            return data.get("results", [])
-        else:
-            print(f"    [Exa] API error: {response.status_code}")
-            return []
+        return get_exa_client().search(query, num_results, max_characters=5000)
     except Exception as e:
         print(f"    [Exa] Search error: {e}")
         return []
@@ -3,14 +3,21 @@
 Sends drafted emails from CSV using Gmail SMTP with App Password authentication.
 Includes comprehensive logging, dry-run mode, resume capability, and advanced
 email verification with MillionVerifier API and multi-factor scoring.
+
+Sends reuse one authenticated SMTP session per account and are spread across
+accounts/aliases under daily and per-minute caps (see smtp_pool.py).
+Verification runs ahead of sending on a worker pool, so its latency stays off
+the send path.
 """
 
 import os
 import re
 import smtplib
+import sys
 import logging
 import argparse
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -20,6 +27,9 @@ import pandas as pd
 import requests
 from dotenv import load_dotenv
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.rate_limiter import RateLimiter
+
 # Import email verifier for advanced verification
 try:
     from scripts.email_verifier.verifier import (
@@ -36,6 +46,19 @@ try:
 except ImportError:
     EMAIL_VERIFIER_AVAILABLE = False
 
+try:
+    from .smtp_pool import (
+        SMTPSession, SMTPPool, SenderAccount, SendScheduler,
+        load_sender_accounts, parse_account_names, parse_aliases,
+        DEFAULT_DAILY_CAP, DEFAULT_PER_MINUTE_CAP
+    )
+except ImportError:
+    from smtp_pool import (
+        SMTPSession, SMTPPool, SenderAccount, SendScheduler,
+        load_sender_accounts, parse_account_names, parse_aliases,
+        DEFAULT_DAILY_CAP, DEFAULT_PER_MINUTE_CAP
+    )
+
 load_dotenv()
 
 # Hunter.io configuration
@@ -50,6 +73,17 @@ GMAIL_SEND_AS = os.getenv('GMAIL_SEND_AS', GMAIL_ADDRESS)  # "From" address (ali
 SMTP_SERVER = 'smtp.gmail.com'
 SMTP_PORT = 587
 
+# Verification runs ahead of sending on this many threads
+DEFAULT_VERIFY_WORKERS = 4
+
+# Verifications in flight ahead of the send cursor, per worker (paid credits
+# are only spent on rows close to being sent)
+VERIFY_LOOKAHEAD_PER_WORKER = 2
+
+# Minimum seconds between verification calls (shared across workers)
+HUNTER_MIN_INTERVAL = 0.3
+VERIFY_API_MIN_INTERVAL = 0.5
+
 # Do not contact list path
 DO_NOT_CONTACT_PATH = 'config/do_not_contact.csv'
 
@@ -180,7 +214,8 @@ def send_email(
     body: str,
     login_address: str,
     password: str,
-    send_as_address: Optional[str] = None
+    send_as_address: Optional[str] = None,
+    session: Optional[SMTPSession] = None
 ) -> Tuple[bool, Optional[str]]:
     """
     Send an email via Gmail SMTP.
@@ -192,6 +227,8 @@ def send_email(
         login_address: Email address for SMTP authentication.
         password: Gmail app password.
         send_as_address: "From" address (alias). Defaults to login_address.
+        session: Persistent SMTP session to reuse. Without one, a connection
+            is opened and closed for this message only.
 
     Returns:
         Tuple of (success: bool, error: Optional[str])
@@ -206,11 +243,14 @@ def send_email(
         msg['Subject'] = subject
         msg.attach(MIMEText(body, 'plain'))
 
-        # Connect and send (login with main account, send from alias)
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-            server.starttls()
-            server.login(login_address, password)
-            server.send_message(msg)
+        if session is not None:
+            session.send_message(msg)
+        else:
+            # Connect and send (login with main account, send from alias)
+            with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
+                server.starttls()
+                server.login(login_address, password)
+                server.send_message(msg)
 
         logger.info(f"✓ Sent to {to}")
         return True, None
@@ -225,6 +265,79 @@ def send_email(
         return False, error_msg
 
 
+def run_verification(
+    email: str,
+    hunter_confidence: Optional[float],
+    verify_api: bool,
+    limiter: Optional[RateLimiter] = None
+) -> Dict[str, Any]:
+    """
+    Verify one address (MillionVerifier + scoring, or Hunter).
+
+    Runs on the verification worker pool, ahead of the send loop.
+
+    Returns:
+        Dict with 'api_result' and 'score' (verify_api) or 'hunter' (Hunter).
+    """
+    if limiter is not None:
+        limiter.wait()
+
+    if verify_api:
+        logger.debug(f"  Verifying {email} with MillionVerifier API...")
+        api_result = verify_email_api(email, api_key=MILLIONVERIFIER_API_KEY)
+        score = calculate_send_score(
+            email=email,
+            verification_result=api_result,
+            hunter_confidence=hunter_confidence
+        )
+        return {'api_result': api_result, 'score': score}
+
+    logger.debug(f"  Verifying {email} with Hunter...")
+    return {'hunter': verify_email_with_hunter(email)}
+
+
+def build_sender_accounts(
+    login_address: Optional[str],
+    password: Optional[str],
+    send_as_address: Optional[str],
+    daily_cap: int,
+    per_minute_cap: int,
+    account_names: Optional[List[str]] = None
+) -> List[SenderAccount]:
+    """
+    Resolve the accounts to send from.
+
+    Explicit credentials give a single account; otherwise the default
+    GMAIL_ADDRESS account plus any named accounts opted in via
+    account_names (or GMAIL_SENDER_ACCOUNTS).
+    """
+    if not login_address and not password:
+        accounts = load_sender_accounts(
+            daily_cap=daily_cap, per_minute_cap=per_minute_cap, names=account_names
+        )
+        if accounts:
+            return accounts
+
+    login_address = login_address or GMAIL_ADDRESS or ''
+    password = password or GMAIL_APP_PASSWORD or ''
+    return [SenderAccount(
+        login=login_address,
+        password=password,
+        aliases=parse_aliases(send_as_address or GMAIL_SEND_AS, login_address),
+        daily_cap=daily_cap,
+        per_minute_cap=per_minute_cap,
+    )]
+
+
+def count_sent_today(df: pd.DataFrame) -> Dict[str, int]:
+    """Count today's sends per login (sent_from column) for daily caps."""
+    if 'sent_from' not in df.columns:
+        return {}
+    today = datetime.now().date().isoformat()
+    sent = df[(df['send_status'] == 'sent') & df['sent_at'].astype(str).str.startswith(today)]
+    return sent['sent_from'].value_counts().to_dict()
+
+
 def process_csv(
     csv_path: str,
     dry_run: bool = False,
@@ -238,7 +351,11 @@ def process_csv(
     skip_invalid: bool = False,
     verify_api: bool = False,
     min_score: int = 70,
-    skip_catch_all: bool = False
+    skip_catch_all: bool = False,
+    accounts: Optional[List[SenderAccount]] = None,
+    daily_cap: int = DEFAULT_DAILY_CAP,
+    per_minute_cap: int = DEFAULT_PER_MINUTE_CAP,
+    verify_workers: int = DEFAULT_VERIFY_WORKERS
 ) -> Dict[str, Any]:
     """
     Process CSV file and send emails.
@@ -257,35 +374,32 @@ def process_csv(
         verify_api: Use MillionVerifier API for verification.
         min_score: Minimum score threshold (0-100) for sending.
         skip_catch_all: Skip catch-all domain emails.
+        accounts: Sending accounts (default: from credentials or environment).
+        daily_cap: Max sends per account per day.
+        per_minute_cap: Max sends per account per minute.
+        verify_workers: Threads verifying addresses ahead of sending (at most
+            VERIFY_LOOKAHEAD_PER_WORKER rows each, and never more rows than
+            today's remaining sends).
 
     Returns:
         Results dictionary with counts and timing.
     """
     start_time = time.time()
 
-    # Use environment variables if not provided
-    login_address = login_address or GMAIL_ADDRESS
-    password = password or GMAIL_APP_PASSWORD
-    send_as_address = send_as_address or GMAIL_SEND_AS or login_address
+    if accounts is None:
+        accounts = build_sender_accounts(
+            login_address, password, send_as_address, daily_cap, per_minute_cap
+        )
 
     logger.info(f"Loading {csv_path}...")
     df = pd.read_csv(csv_path)
 
     # Initialize status columns if they don't exist (as string type to avoid FutureWarning)
-    if 'send_status' not in df.columns:
-        df['send_status'] = ''
-    else:
-        df['send_status'] = df['send_status'].fillna('').astype(str)
-
-    if 'sent_at' not in df.columns:
-        df['sent_at'] = ''
-    else:
-        df['sent_at'] = df['sent_at'].fillna('').astype(str)
-
-    if 'send_error' not in df.columns:
-        df['send_error'] = ''
-    else:
-        df['send_error'] = df['send_error'].fillna('').astype(str)
+    for col in ['send_status', 'sent_at', 'send_error', 'sent_from']:
+        if col not in df.columns:
+            df[col] = ''
+        else:
+            df[col] = df[col].fillna('').astype(str)
 
     # Count already sent
     already_sent = df[df['send_status'] == 'sent'].shape[0]
@@ -313,6 +427,7 @@ def process_csv(
         'skipped_low_score': 0,
         'skipped_catch_all': 0,
         'skipped_unsubscribed': 0,
+        'deferred_cap': 0,
         'duration': 0
     }
 
@@ -328,130 +443,183 @@ def process_csv(
         logger.warning("MILLIONVERIFIER_API_KEY not set, falling back to Hunter")
         verify_api = False
 
-    # Process each row
-    for i, (idx, row) in enumerate(to_process.iterrows(), 1):
-        email = row.get('primary_email', '')
-        subject = row.get('subject_line', '')
-        body = row.get('email_body', '')
-
-        logger.info(f"[{i}/{total_to_process}] Processing {email}...")
+    verify = verify_api or verify_first
 
-        # Validate email
+    # Stage 1: cheap checks; verification runs a small window ahead of sending
+    rows = []
+    for idx, row in to_process.iterrows():
+        email = row.get('primary_email', '')
         if not is_valid_email(email):
-            logger.warning(f"Invalid email format: {email}")
-            df.loc[idx, 'send_status'] = 'failed'
-            df.loc[idx, 'send_error'] = 'Invalid email format'
-            results['failed'] += 1
-            df.to_csv(csv_path, index=False)
-            continue
-
-        # Check do_not_contact list (unsubscribes)
-        if email.lower().strip() in do_not_contact:
-            logger.warning(f"⛔ BLOCKED: {email} is on do_not_contact list (unsubscribed)")
-            df.loc[idx, 'send_status'] = 'blocked_unsubscribed'
-            df.loc[idx, 'send_error'] = 'On do_not_contact list'
-            results['skipped_unsubscribed'] += 1
-            df.to_csv(csv_path, index=False)
-            continue
-
-        # Advanced API verification with scoring
-        if verify_api:
-            logger.debug(f"  Verifying {email} with MillionVerifier API...")
-            api_result = verify_email_api(email, api_key=MILLIONVERIFIER_API_KEY)
+            precheck = 'invalid'
+        elif email.lower().strip() in do_not_contact:
+            precheck = 'blocked'
+        else:
+            precheck = None
+        rows.append((idx, row, precheck))
+
+    scheduler = SendScheduler(accounts)
+    scheduler.seed_daily_counts(count_sent_today(df))
+
+    verify_executor = None
+    verifications = {}
+    to_verify = [(idx, row) for idx, row, precheck in rows if not precheck] if verify else []
+    lookahead = max(1, verify_workers) * VERIFY_LOOKAHEAD_PER_WORKER
+    if verify:
+        limiter = RateLimiter(VERIFY_API_MIN_INTERVAL if verify_api else HUNTER_MIN_INTERVAL)
+        verify_executor = ThreadPoolExecutor(
+            max_workers=max(1, verify_workers), thread_name_prefix='verify'
+        )
 
-            # Get Hunter confidence if available
+    def submit_verifications():
+        """Top up verifications ahead of the send cursor, within today's caps."""
+        window = lookahead if dry_run else min(lookahead, scheduler.remaining_today())
+        while to_verify and len(verifications) < window:
+            idx, row = to_verify.pop(0)
             hunter_confidence = row.get('hunter_confidence', None)
             if pd.isna(hunter_confidence):
                 hunter_confidence = None
-
-            # Calculate score
-            score = calculate_send_score(
-                email=email,
-                verification_result=api_result,
-                hunter_confidence=hunter_confidence
+            verifications[idx] = verify_executor.submit(
+                run_verification, row.get('primary_email', ''), hunter_confidence, verify_api, limiter
             )
 
-            # Store verification results
-            df.loc[idx, 'api_verify_status'] = api_result.status.value
-            df.loc[idx, 'is_catch_all'] = api_result.is_catch_all
-            df.loc[idx, 'send_score'] = score.total_score
-            df.loc[idx, 'score_recommendation'] = score.recommendation.value
-
-            logger.info(f"  Score: {score.total_score}/100 ({score.recommendation.value})")
+    # Stage 2: send over persistent sessions under per-account caps
+    pool = SMTPPool()
 
-            # Skip catch-all if requested
-            if skip_catch_all and api_result.is_catch_all:
-                logger.warning(f"  Skipping catch-all domain email: {email}")
-                df.loc[idx, 'send_status'] = 'skipped_catch_all'
-                df.loc[idx, 'send_error'] = 'Catch-all domain'
-                results['skipped_catch_all'] += 1
+    try:
+        for i, (idx, row, precheck) in enumerate(rows, 1):
+            email = row.get('primary_email', '')
+            subject = row.get('subject_line', '')
+            body = row.get('email_body', '')
+
+            # Nothing left to send today: don't verify (or send) the rest
+            if not dry_run and not precheck and scheduler.remaining_today() == 0:
+                results['deferred_cap'] = total_to_process - i + 1
+                logger.warning(
+                    f"Daily caps reached for all accounts; "
+                    f"{results['deferred_cap']} emails left for the next run"
+                )
+                break
+
+            if verify:
+                submit_verifications()
+
+            logger.info(f"[{i}/{total_to_process}] Processing {email}...")
+
+            # Validate email
+            if precheck == 'invalid':
+                logger.warning(f"Invalid email format: {email}")
+                df.loc[idx, 'send_status'] = 'failed'
+                df.loc[idx, 'send_error'] = 'Invalid email format'
+                results['failed'] += 1
                 df.to_csv(csv_path, index=False)
                 continue
 
-            # Skip if below minimum score
-            if score.total_score < min_score:
-                logger.warning(f"  Score {score.total_score} below threshold {min_score}")
-                df.loc[idx, 'send_status'] = 'skipped_low_score'
-                df.loc[idx, 'send_error'] = f'Score {score.total_score} < {min_score}'
-                results['skipped_low_score'] += 1
+            # Check do_not_contact list (unsubscribes)
+            if precheck == 'blocked':
+                logger.warning(f"⛔ BLOCKED: {email} is on do_not_contact list (unsubscribed)")
+                df.loc[idx, 'send_status'] = 'blocked_unsubscribed'
+                df.loc[idx, 'send_error'] = 'On do_not_contact list'
+                results['skipped_unsubscribed'] += 1
                 df.to_csv(csv_path, index=False)
                 continue
 
-            time.sleep(0.5)  # Rate limiting for API
-
-        # Legacy Hunter verification (fallback)
-        elif verify_first:
-            logger.debug(f"  Verifying {email} with Hunter...")
-            verification = verify_email_with_hunter(email)
-            df.loc[idx, 'hunter_verify_status'] = verification.get('status', '')
-
-            if not verification.get('deliverable', True):
-                logger.warning(f"  Email not deliverable: {email} ({verification.get('status')})")
-                if skip_invalid:
-                    df.loc[idx, 'send_status'] = 'skipped_invalid'
-                    df.loc[idx, 'send_error'] = f"Hunter: {verification.get('status')}"
-                    results['skipped'] = results.get('skipped', 0) + 1
+            # Advanced API verification with scoring
+            if verify_api:
+                verification = verifications.pop(idx).result()
+                api_result = verification['api_result']
+                score = verification['score']
+
+                # Store verification results
+                df.loc[idx, 'api_verify_status'] = api_result.status.value
+                df.loc[idx, 'is_catch_all'] = api_result.is_catch_all
+                df.loc[idx, 'send_score'] = score.total_score
+                df.loc[idx, 'score_recommendation'] = score.recommendation.value
+
+                logger.info(f"  Score: {score.total_score}/100 ({score.recommendation.value})")
+
+                # Skip catch-all if requested
+                if skip_catch_all and api_result.is_catch_all:
+                    logger.warning(f"  Skipping catch-all domain email: {email}")
+                    df.loc[idx, 'send_status'] = 'skipped_catch_all'
+                    df.loc[idx, 'send_error'] = 'Catch-all domain'
+                    results['skipped_catch_all'] += 1
                     df.to_csv(csv_path, index=False)
                     continue
-                else:
-                    logger.warning(f"  Proceeding anyway (use --skip-invalid to skip)")
-
-            time.sleep(0.3)  # Rate limiting for Hunter API
 
-        if dry_run:
-            # Dry run - just mark status
-            logger.info(f"[DRY RUN] Would send to: {email}")
-            logger.debug(f"  Subject: {subject}")
-            logger.debug(f"  Body preview: {body[:100]}...")
-            df.loc[idx, 'send_status'] = 'dry_run'
-            df.loc[idx, 'sent_at'] = datetime.now().isoformat()
-        else:
-            # Actually send
-            success, error = send_email(
-                to=email,
-                subject=subject,
-                body=body,
-                login_address=login_address,
-                password=password,
-                send_as_address=send_as_address
-            )
+                # Skip if below minimum score
+                if score.total_score < min_score:
+                    logger.warning(f"  Score {score.total_score} below threshold {min_score}")
+                    df.loc[idx, 'send_status'] = 'skipped_low_score'
+                    df.loc[idx, 'send_error'] = f'Score {score.total_score} < {min_score}'
+                    results['skipped_low_score'] += 1
+                    df.to_csv(csv_path, index=False)
+                    continue
 
-            if success:
-                df.loc[idx, 'send_status'] = 'sent'
+            # Legacy Hunter verification (fallback)
+            elif verify_first:
+                verification = verifications.pop(idx).result()['hunter']
+                df.loc[idx, 'hunter_verify_status'] = verification.get('status', '')
+
+                if not verification.get('deliverable', True):
+                    logger.warning(f"  Email not deliverable: {email} ({verification.get('status')})")
+                    if skip_invalid:
+                        df.loc[idx, 'send_status'] = 'skipped_invalid'
+                        df.loc[idx, 'send_error'] = f"Hunter: {verification.get('status')}"
+                        results['skipped'] = results.get('skipped', 0) + 1
+                        df.to_csv(csv_path, index=False)
+                        continue
+                    else:
+                        logger.warning(f"  Proceeding anyway (use --skip-invalid to skip)")
+
+            if dry_run:
+                # Dry run - just mark status
+                logger.info(f"[DRY RUN] Would send to: {email}")
+                logger.debug(f"  Subject: {subject}")
+                logger.debug(f"  Body preview: {body[:100]}...")
+                df.loc[idx, 'send_status'] = 'dry_run'
                 df.loc[idx, 'sent_at'] = datetime.now().isoformat()
-                df.loc[idx, 'send_error'] = ''
-                results['sent'] += 1
             else:
-                df.loc[idx, 'send_status'] = 'failed'
-                df.loc[idx, 'send_error'] = error
-                results['failed'] += 1
+                account = scheduler.acquire()
+                if account is None:
+                    results['deferred_cap'] = total_to_process - i + 1
+                    logger.warning(
+                        f"Daily caps reached for all accounts; "
+                        f"{results['deferred_cap']} emails left for the next run"
+                    )
+                    break
+
+                # Actually send
+                success, error = send_email(
+                    to=email,
+                    subject=subject,
+                    body=body,
+                    login_address=account.login,
+                    password=account.password,
+                    send_as_address=account.next_alias(),
+                    session=pool.session(account)
+                )
+
+                if success:
+                    df.loc[idx, 'send_status'] = 'sent'
+                    df.loc[idx, 'sent_at'] = datetime.now().isoformat()
+                    df.loc[idx, 'sent_from'] = account.login
+                    df.loc[idx, 'send_error'] = ''
+                    results['sent'] += 1
+                else:
+                    df.loc[idx, 'send_status'] = 'failed'
+                    df.loc[idx, 'send_error'] = error
+                    results['failed'] += 1
 
-            # Delay between sends (not in dry run)
-            if i < total_to_process and delay > 0:
-                time.sleep(delay)
+                # Delay between sends (not in dry run)
+                if i < total_to_process and delay > 0:
+                    time.sleep(delay)
 
-        # Save after each email (resume safety)
-        df.to_csv(csv_path, index=False)
+            # Save after each email (resume safety)
+            df.to_csv(csv_path, index=False)
+    finally:
+        pool.close_all()
+        if verify_executor is not None:
+            verify_executor.shutdown(wait=False, cancel_futures=True)
 
     results['duration'] = round(time.time() - start_time, 1)
 
@@ -478,6 +646,8 @@ def print_results_summary(results: Dict[str, Any]) -> None:
         logger.info(f"Skipped (low score): {results['skipped_low_score']}")
     if results.get('skipped_catch_all', 0) > 0:
         logger.info(f"Skipped (catch-all): {results['skipped_catch_all']}")
+    if results.get('deferred_cap', 0) > 0:
+        logger.info(f"Deferred (daily caps reached): {results['deferred_cap']}")
     logger.info(f"Duration: {results['duration']}s")
     logger.info("=" * 50)
 
@@ -586,6 +756,35 @@ Examples:
         help='Skip emails on catch-all domains (use with --verify-api)'
     )
 
+    parser.add_argument(
+        '--accounts',
+        type=parse_account_names,
+        default=None,
+        help='Comma-separated GMAIL_{NAME}_ADDRESS account names to also send from, '
+             'e.g. SALES,OUTREACH (default: GMAIL_SENDER_ACCOUNTS, else GMAIL_ADDRESS only)'
+    )
+
+    parser.add_argument(
+        '--daily-cap',
+        type=int,
+        default=DEFAULT_DAILY_CAP,
+        help=f'Max sends per account per day (default: {DEFAULT_DAILY_CAP})'
+    )
+
+    parser.add_argument(
+        '--per-minute-cap',
+        type=int,
+        default=DEFAULT_PER_MINUTE_CAP,
+        help=f'Max sends per account per minute (default: {DEFAULT_PER_MINUTE_CAP})'
+    )
+
+    parser.add_argument(
+        '--verify-workers',
+        type=int,
+        default=DEFAULT_VERIFY_WORKERS,
+        help=f'Threads verifying emails ahead of sending (default: {DEFAULT_VERIFY_WORKERS})'
+    )
+
     return parser.parse_args(args)
 
 
@@ -616,6 +815,12 @@ def main():
         logger.info(f"Send As: {GMAIL_SEND_AS}")
     else:
         logger.info(f"From: {GMAIL_ADDRESS}")
+    accounts = build_sender_accounts(
+        None, None, None, args.daily_cap, args.per_minute_cap, account_names=args.accounts
+    )
+    if len(accounts) > 1:
+        logger.info(f"Accounts: {', '.join(a.login for a in accounts)}")
+    logger.info(f"Caps per account: {args.daily_cap}/day, {args.per_minute_cap}/min")
     logger.info(f"CSV: {args.csv}")
     logger.info(f"Mode: {'DRY RUN' if args.dry_run else 'LIVE'}")
     if args.verify_api:
@@ -639,7 +844,11 @@ def main():
         skip_invalid=args.skip_invalid,
         verify_api=args.verify_api,
         min_score=args.min_score,
-        skip_catch_all=args.skip_catch_all
+        skip_catch_all=args.skip_catch_all,
+        accounts=accounts,
+        daily_cap=args.daily_cap,
+        per_minute_cap=args.per_minute_cap,
+        verify_workers=args.verify_workers
     )
 
     return 0 if results['failed'] == 0 else 1
@@ -4,17 +4,27 @@ Connects to Gmail via IMAP to find:
 1. Bounce notifications (delivery failures)
 2. Replies to sent emails
 
+Only headers (From/Subject/Date/X-Failed-Recipients) are fetched, in bulk
+UID batches; a full message is downloaded only for a confirmed bounce whose
+recipient is not in the headers. UIDVALIDITY/UIDNEXT are remembered per
+account in output/inbox_checker_state.json, so each run only scans mail that
+arrived since the previous one.
+
 Usage:
     python scripts/gmail_sender/inbox_checker.py --hours 24
+    python scripts/gmail_sender/inbox_checker.py --full     # Ignore saved state
 """
 
 import argparse
 import imaplib
 import email
 from email.header import decode_header
+import json
 import os
 import re
 from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -22,6 +32,15 @@ load_dotenv()
 GMAIL_USER = os.getenv('GMAIL_ADDRESS', os.getenv('GMAIL_USER', os.getenv('GMAIL_LOGIN')))
 GMAIL_APP_PASSWORD = os.getenv('GMAIL_APP_PASSWORD')
 
+# Incremental scan state (UIDVALIDITY + last seen UID per account/mailbox)
+STATE_PATH = Path(__file__).parent.parent.parent / 'output' / 'inbox_checker_state.json'
+
+# Headers needed to classify a message
+HEADER_FIELDS = 'FROM SUBJECT DATE X-FAILED-RECIPIENTS'
+
+# UIDs per FETCH command
+FETCH_BATCH_SIZE = 500
+
 # Known bounce sender patterns
 BOUNCE_SENDERS = [
     'mailer-daemon@',
@@ -211,66 +230,221 @@ def is_bounce(from_addr, subject):
     return False
 
 
-def check_inbox(hours=24, verbose=False):
-    """Check Gmail inbox for bounces and replies."""
-
-    if not GMAIL_USER or not GMAIL_APP_PASSWORD:
-        print("Error: GMAIL_USER and GMAIL_APP_PASSWORD must be set in .env")
-        return None, None
-
-    print(f"Connecting to Gmail as {GMAIL_USER}...")
-
-    # Connect to Gmail IMAP
-    mail = imaplib.IMAP4_SSL('imap.gmail.com')
-    mail.login(GMAIL_USER, GMAIL_APP_PASSWORD)
+def load_state(state_path: Path = STATE_PATH) -> Dict:
+    """Load saved scan state ({} if missing or unreadable)."""
+    try:
+        with open(state_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state: Dict, state_path: Path = STATE_PATH) -> None:
+    """Persist scan state atomically."""
+    state_path = Path(state_path)
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = state_path.with_suffix('.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, state_path)
+
+
+def mailbox_status(mail, mailbox: str = 'INBOX') -> Tuple[Optional[int], Optional[int]]:
+    """Return (UIDVALIDITY, UIDNEXT) for a mailbox."""
+    _, data = mail.status(mailbox, '(UIDVALIDITY UIDNEXT)')
+    raw = data[0].decode() if isinstance(data[0], bytes) else str(data[0])
+    validity = re.search(r'UIDVALIDITY (\d+)', raw)
+    uidnext = re.search(r'UIDNEXT (\d+)', raw)
+    return (
+        int(validity.group(1)) if validity else None,
+        int(uidnext.group(1)) if uidnext else None,
+    )
+
+
+def compress_uids(uids: List[int]) -> str:
+    """Build a compact IMAP sequence set ("1:4,9,12:13") from UIDs."""
+    uids = sorted(set(uids))
+    ranges = []
+    start = prev = None
+    for uid in uids:
+        if start is None:
+            start = prev = uid
+        elif uid == prev + 1:
+            prev = uid
+        else:
+            ranges.append(f"{start}:{prev}" if start != prev else str(start))
+            start = prev = uid
+    if start is not None:
+        ranges.append(f"{start}:{prev}" if start != prev else str(start))
+    return ','.join(ranges)
+
+
+def parse_fetch_response(data) -> Dict[int, bytes]:
+    """Map UID -> literal payload from an IMAP UID FETCH response."""
+    payloads = {}
+    for item in data or []:
+        if not isinstance(item, tuple) or len(item) < 2:
+            continue
+        meta = item[0].decode(errors='replace') if isinstance(item[0], bytes) else str(item[0])
+        match = re.search(r'UID (\d+)', meta)
+        if match:
+            payloads[int(match.group(1))] = item[1]
+    return payloads
+
+
+def fetch_in_batches(mail, uids: List[int], query: str, batch_size: int = FETCH_BATCH_SIZE) -> Dict[int, bytes]:
+    """UID FETCH `query` for many UIDs, batch_size UIDs per command."""
+    payloads = {}
+    for i in range(0, len(uids), batch_size):
+        chunk = uids[i:i + batch_size]
+        _, data = mail.uid('FETCH', compress_uids(chunk), query)
+        payloads.update(parse_fetch_response(data))
+    return payloads
+
+
+def search_uids(mail, criteria: str) -> List[int]:
+    """Run UID SEARCH and return UIDs as ints."""
+    _, data = mail.uid('SEARCH', None, criteria)
+    if not data or not data[0]:
+        return []
+    return [int(u) for u in data[0].split()]
+
+
+def check_inbox(
+    hours=24,
+    verbose=False,
+    incremental=True,
+    state_path: Path = STATE_PATH,
+    batch_size: int = FETCH_BATCH_SIZE,
+    mail=None
+):
+    """
+    Check Gmail inbox for bounces and replies.
+
+    Args:
+        hours: Look-back window for the first (or a --full) scan
+        verbose: Print each bounce/reply
+        incremental: Only scan UIDs newer than the last run (same UIDVALIDITY)
+        state_path: Where scan state is stored
+        batch_size: UIDs per header FETCH
+        mail: Existing logged-in IMAP connection (for testing)
+
+    Returns:
+        (bounces, replies) lists of dicts, or (None, None) without credentials
+    """
+    own_connection = mail is None
+    if own_connection:
+        if not GMAIL_USER or not GMAIL_APP_PASSWORD:
+            print("Error: GMAIL_USER and GMAIL_APP_PASSWORD must be set in .env")
+            return None, None
+
+        print(f"Connecting to Gmail as {GMAIL_USER}...")
+
+        # Connect to Gmail IMAP
+        mail = imaplib.IMAP4_SSL('imap.gmail.com')
+        mail.login(GMAIL_USER, GMAIL_APP_PASSWORD)
+
+    account = (GMAIL_USER or 'default').lower()
+    state = load_state(state_path)
+    mailbox_state = state.get(account, {}).get('INBOX', {})
 
     bounces = []
     replies = []
 
-    # Calculate date filter
-    since_date = (datetime.now() - timedelta(hours=hours)).strftime('%d-%b-%Y')
-
-    # Check INBOX for replies and bounces
-    mail.select('INBOX')
-    _, message_ids = mail.search(None, f'(SINCE {since_date})')
+    # Check INBOX for replies and bounces (read-only: never touches \Seen)
+    uidvalidity, uidnext = mailbox_status(mail, 'INBOX')
+    mail.select('INBOX', readonly=True)
+
+    last_uid = mailbox_state.get('last_uid')
+    resume = (
+        incremental
+        and last_uid is not None
+        and uidvalidity is not None
+        and mailbox_state.get('uidvalidity') == uidvalidity
+    )
+
+    if resume:
+        if uidnext is not None and uidnext - 1 <= last_uid:
+            uids = []
+        else:
+            # "N:*" always matches the newest message, even when older than N
+            uids = [u for u in search_uids(mail, f'UID {last_uid + 1}:*') if u > last_uid]
+        print(f"Checking {len(uids)} new messages since UID {last_uid}...")
+    else:
+        # Calculate date filter
+        since_date = (datetime.now() - timedelta(hours=hours)).strftime('%d-%b-%Y')
+        uids = search_uids(mail, f'(SINCE {since_date})')
+        print(f"Checking {len(uids)} messages from last {hours} hours...")
 
-    print(f"Checking {len(message_ids[0].split())} messages from last {hours} hours...")
+    headers = fetch_in_batches(
+        mail, uids, f'(UID BODY.PEEK[HEADER.FIELDS ({HEADER_FIELDS})])', batch_size
+    )
 
-    for msg_id in message_ids[0].split():
-        _, msg_data = mail.fetch(msg_id, '(RFC822)')
-        email_body = msg_data[0][1]
-        msg = email.message_from_bytes(email_body)
+    pending_bounces = []
+    for uid in sorted(headers):
+        msg = email.message_from_bytes(headers[uid])
 
         from_addr = decode_mime_header(msg['From'])
         subject = decode_mime_header(msg['Subject'])
         date = msg['Date']
 
         if is_bounce(from_addr, subject):
-            bounced_email = extract_bounced_email(msg)
-            bounces.append({
+            bounce = {
                 'type': 'bounce',
                 'from': from_addr,
                 'subject': subject,
                 'date': date,
-                'bounced_email': bounced_email,
-            })
-            if verbose:
-                print(f"  [BOUNCE] {bounced_email or 'unknown'} - {subject[:50]}")
+                'bounced_email': extract_bounced_email(msg),
+                'uid': uid,
+            }
+            bounces.append(bounce)
+            if not bounce['bounced_email']:
+                pending_bounces.append(bounce)
         else:
             # Check if it's a reply (not from ourselves)
-            if GMAIL_USER.lower() not in from_addr.lower():
-                # Skip automated messages
-                if not any(x in from_addr.lower() for x in ['noreply', 'no-reply', 'notifications', 'mailer']):
-                    replies.append({
-                        'type': 'reply',
-                        'from': from_addr,
-                        'subject': subject,
-                        'date': date,
-                    })
-                    if verbose:
-                        print(f"  [REPLY] {from_addr} - {subject[:50]}")
-
-    mail.logout()
+            if GMAIL_USER and GMAIL_USER.lower() in from_addr.lower():
+                continue
+            # Skip automated messages
+            if not any(x in from_addr.lower() for x in ['noreply', 'no-reply', 'notifications', 'mailer']):
+                replies.append({
+                    'type': 'reply',
+                    'from': from_addr,
+                    'subject': subject,
+                    'date': date,
+                    'uid': uid,
+                })
+                if verbose:
+                    print(f"  [REPLY] {from_addr} - {subject[:50]}")
+
+    # Full bodies only for bounces whose recipient isn't in the headers
+    if pending_bounces:
+        bodies = fetch_in_batches(
+            mail, [b['uid'] for b in pending_bounces], '(UID BODY.PEEK[])', batch_size
+        )
+        for bounce in pending_bounces:
+            if bounce['uid'] in bodies:
+                bounce['bounced_email'] = extract_bounced_email(
+                    email.message_from_bytes(bodies[bounce['uid']])
+                )
+
+    if verbose:
+        for bounce in bounces:
+            print(f"  [BOUNCE] {bounce['bounced_email'] or 'unknown'} - {bounce['subject'][:50]}")
+
+    if uidvalidity is not None:
+        seen = [last_uid or 0] if resume else [0]
+        seen.extend(uids)
+        if uidnext is not None:
+            seen.append(uidnext - 1)
+        state.setdefault(account, {})['INBOX'] = {
+            'uidvalidity': uidvalidity,
+            'last_uid': max(seen),
+            'checked_at': datetime.now().isoformat(),
+        }
+        save_state(state, state_path)
+
+    if own_connection:
+        mail.logout()
 
     return bounces, replies
 
@@ -279,9 +453,11 @@ def main():
     parser = argparse.ArgumentParser(description='Check Gmail for bounces and replies')
     parser.add_argument('--hours', type=int, default=24, help='Check emails from last N hours (default: 24)')
     parser.add_argument('--verbose', '-v', action='store_true', help='Show details for each message')
+    parser.add_argument('--full', action='store_true',
+                        help='Rescan the whole --hours window instead of only new mail')
     args = parser.parse_args()
 
-    bounces, replies = check_inbox(hours=args.hours, verbose=args.verbose)
+    bounces, replies = check_inbox(hours=args.hours, verbose=args.verbose, incremental=not args.full)
 
     if bounces is None:
         return
@@ -0,0 +1,298 @@
+"""SMTP session pool and send scheduler for the Gmail sender.
+
+Keeps one long-lived, authenticated SMTP connection per sending account
+instead of connect/STARTTLS/login per message, and spreads sends across
+accounts and their aliases under per-account daily and per-minute caps.
+
+Accounts are read from the environment, following the same convention as
+contact_intel:
+    GMAIL_ADDRESS / GMAIL_APP_PASSWORD / GMAIL_SEND_AS        (default account)
+    GMAIL_{NAME}_ADDRESS / GMAIL_{NAME}_APP_PASSWORD / GMAIL_{NAME}_SEND_AS
+GMAIL_SEND_AS values may list several comma-separated aliases.
+Named accounts only send when listed, either by the caller or in
+GMAIL_SENDER_ACCOUNTS (comma-separated NAMEs, e.g. "SALES,OUTREACH"), since
+contact_intel also configures read-only personal inboxes this way.
+Caps: GMAIL_DAILY_CAP (default 400), GMAIL_PER_MINUTE_CAP (default 20).
+
+Usage:
+    accounts = load_sender_accounts()
+    scheduler = SendScheduler(accounts)
+    with SMTPPool() as pool:
+        account = scheduler.acquire()
+        pool.session(account).send_message(msg)
+"""
+
+import logging
+import os
+import smtplib
+import socket
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SMTP_SERVER = 'smtp.gmail.com'
+SMTP_PORT = 587
+SMTP_TIMEOUT = 30
+
+DEFAULT_DAILY_CAP = int(os.getenv('GMAIL_DAILY_CAP', '400'))
+DEFAULT_PER_MINUTE_CAP = int(os.getenv('GMAIL_PER_MINUTE_CAP', '20'))
+
+# Gmail drops connections after ~100 messages; recycle before that happens
+MAX_MESSAGES_PER_CONNECTION = 90
+
+# Errors after which a fresh connection is worth one more try
+RECONNECT_ERRORS = (
+    smtplib.SMTPServerDisconnected,
+    smtplib.SMTPResponseException,
+    socket.timeout,
+    ConnectionError,
+)
+
+
+def is_reconnectable(error: Exception) -> bool:
+    """True for dropped connections, timeouts and 421 'service not available'."""
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code == 421
+    return isinstance(error, RECONNECT_ERRORS)
+
+
+class SMTPSession:
+    """One authenticated SMTP connection, reconnected on demand."""
+
+    def __init__(
+        self,
+        login: str,
+        password: str,
+        server: str = SMTP_SERVER,
+        port: int = SMTP_PORT,
+        timeout: float = SMTP_TIMEOUT,
+        max_messages: int = MAX_MESSAGES_PER_CONNECTION
+    ):
+        self.login = login
+        self.password = password
+        self.server = server
+        self.port = port
+        self.timeout = timeout
+        self.max_messages = max_messages
+        self.sent = 0
+        self.reconnects = 0
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._messages_on_connection = 0
+        self._lock = threading.Lock()
+
+    def connect(self):
+        """Open the connection, STARTTLS and log in."""
+        smtp = smtplib.SMTP(self.server, self.port, timeout=self.timeout)
+        smtp.starttls()
+        smtp.login(self.login, self.password)
+        self._smtp = smtp
+        self._messages_on_connection = 0
+        logger.debug(f"SMTP session opened for {self.login}")
+
+    def _drop(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except Exception:
+                pass
+        self._smtp = None
+
+    def send_message(self, msg):
+        """Send a message, reconnecting once if the connection went away."""
+        with self._lock:
+            if self._smtp is not None and self._messages_on_connection >= self.max_messages:
+                self._drop()
+
+            for attempt in range(2):
+                try:
+                    if self._smtp is None:
+                        self.connect()
+                    self._smtp.send_message(msg)
+                    self._messages_on_connection += 1
+                    self.sent += 1
+                    return
+                except Exception as e:
+                    if attempt or not is_reconnectable(e):
+                        raise
+                    logger.warning(f"SMTP session for {self.login} dropped ({e}), reconnecting")
+                    self._drop()
+                    self.reconnects += 1
+
+    def close(self):
+        """Close the connection (QUIT)."""
+        with self._lock:
+            self._drop()
+
+
+class SMTPPool:
+    """Long-lived SMTP sessions keyed by login address."""
+
+    def __init__(self, session_factory: Callable[..., SMTPSession] = SMTPSession):
+        self._session_factory = session_factory
+        self._sessions: Dict[str, SMTPSession] = {}
+        self._lock = threading.Lock()
+
+    def session(self, account: 'SenderAccount') -> SMTPSession:
+        """Return (creating lazily) the session for an account."""
+        with self._lock:
+            if account.login not in self._sessions:
+                self._sessions[account.login] = self._session_factory(account.login, account.password)
+            return self._sessions[account.login]
+
+    def close_all(self):
+        """Close every open session."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for s in sessions:
+            s.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close_all()
+
+
+@dataclass
+class SenderAccount:
+    """A sending login with its aliases and send caps."""
+    login: str
+    password: str
+    aliases: List[str] = field(default_factory=list)
+    daily_cap: int = DEFAULT_DAILY_CAP
+    per_minute_cap: int = DEFAULT_PER_MINUTE_CAP
+    sent_today: int = 0
+    recent: Deque[float] = field(default_factory=deque)
+    _alias_index: int = 0
+
+    def next_alias(self) -> str:
+        """Rotate through the account's "From" aliases."""
+        if not self.aliases:
+            return self.login
+        alias = self.aliases[self._alias_index % len(self.aliases)]
+        self._alias_index += 1
+        return alias
+
+
+def parse_aliases(value: Optional[str], login: str) -> List[str]:
+    """Split a comma-separated GMAIL_SEND_AS value (defaults to the login)."""
+    aliases = [a.strip() for a in (value or '').split(',') if a.strip()]
+    return aliases or [login]
+
+
+def parse_account_names(value: Optional[str]) -> List[str]:
+    """Split a comma-separated account list into upper-case NAMEs."""
+    return [n.strip().upper() for n in (value or '').split(',') if n.strip()]
+
+
+def load_sender_accounts(
+    daily_cap: int = DEFAULT_DAILY_CAP,
+    per_minute_cap: int = DEFAULT_PER_MINUTE_CAP,
+    names: Optional[List[str]] = None
+) -> List[SenderAccount]:
+    """
+    Load sending accounts from environment variables.
+
+    Args:
+        daily_cap: Max sends per account per day
+        per_minute_cap: Max sends per account per minute
+        names: Named accounts to send from in addition to the default
+            (default: GMAIL_SENDER_ACCOUNTS, else none)
+
+    Returns:
+        List of SenderAccount (default account first)
+    """
+    accounts = []
+    if names is None:
+        names = parse_account_names(os.getenv('GMAIL_SENDER_ACCOUNTS'))
+    allowed = {n.upper() for n in names}
+
+    default_login = os.getenv('GMAIL_ADDRESS')
+    default_password = os.getenv('GMAIL_APP_PASSWORD')
+    if default_login and default_password:
+        accounts.append(SenderAccount(
+            login=default_login,
+            password=default_password,
+            aliases=parse_aliases(os.getenv('GMAIL_SEND_AS'), default_login),
+            daily_cap=daily_cap,
+            per_minute_cap=per_minute_cap,
+        ))
+
+    for key, value in sorted(os.environ.items()):
+        if not (key.startswith('GMAIL_') and key.endswith('_ADDRESS')):
+            continue
+        name_part = key[6:-8]  # GMAIL_PERSONAL_ADDRESS -> PERSONAL
+        if not name_part or name_part == 'ADDRESS' or name_part not in allowed:
+            continue
+        password = os.getenv(f'GMAIL_{name_part}_APP_PASSWORD')
+        if password and value != default_login:
+            accounts.append(SenderAccount(
+                login=value,
+                password=password,
+                aliases=parse_aliases(os.getenv(f'GMAIL_{name_part}_SEND_AS'), value),
+                daily_cap=daily_cap,
+                per_minute_cap=per_minute_cap,
+            ))
+
+    return accounts
+
+
+class SendScheduler:
+    """Hands out the next account allowed to send under its caps."""
+
+    WINDOW_SECONDS = 60
+
+    def __init__(
+        self,
+        accounts: List[SenderAccount],
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        self.accounts = accounts
+        self._clock = clock
+        self._sleep = sleep
+
+    def seed_daily_counts(self, counts: Dict[str, int]):
+        """Count sends already made today (e.g. from the CSV) toward daily caps."""
+        for account in self.accounts:
+            account.sent_today = counts.get(account.login, 0)
+
+    def remaining_today(self) -> int:
+        """Sends left across all accounts today."""
+        return sum(max(0, a.daily_cap - a.sent_today) for a in self.accounts)
+
+    def acquire(self) -> Optional[SenderAccount]:
+        """
+        Reserve one send slot.
+
+        Picks the least-used account with room in its per-minute window,
+        waiting for a window to open if needed.
+
+        Returns:
+            The account to send from, or None once every daily cap is reached
+        """
+        while True:
+            now = self._clock()
+            available = [a for a in self.accounts if a.sent_today < a.daily_cap]
+            if not available:
+                return None
+
+            for account in available:
+                while account.recent and now - account.recent[0] >= self.WINDOW_SECONDS:
+                    account.recent.popleft()
+
+            ready = [a for a in available if len(a.recent) < a.per_minute_cap]
+            if ready:
+                account = min(ready, key=lambda a: a.sent_today)
+                account.recent.append(now)
+                account.sent_today += 1
+                return account
+
+            wait = min(a.recent[0] + self.WINDOW_SECONDS - now for a in available)
+            logger.info(f"Per-minute caps reached, waiting {wait:.1f}s")
+            self._sleep(max(wait, 0.05))
@@ -247,6 +247,136 @@ class TestProcessCsv:
         os.unlink(sample_csv)
 
 
+class TestSendEngine:
+    """Tests for pooled sessions, caps and ahead-of-send verification."""
+
+    @pytest.fixture
+    def sample_csv(self):
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            f.write("primary_email,subject_line,email_body\n")
+            f.write("test1@example.com,Subject 1,Body 1\n")
+            f.write("test2@example.com,Subject 2,Body 2\n")
+            f.write("test3@example.com,Subject 3,Body 3\n")
+            name = f.name
+        yield name
+        os.unlink(name)
+
+    @patch('scripts.gmail_sender.smtp_pool.smtplib.SMTP')
+    def test_reuses_one_session_per_account(self, mock_smtp, sample_csv):
+        """All sends from one account should share a single SMTP login."""
+        from scripts.gmail_sender.gmail_sender import process_csv
+
+        results = process_csv(
+            csv_path=sample_csv,
+            login_address="sender@example.com",
+            password="test_password",
+            delay=0
+        )
+
+        assert results['sent'] == 3
+        assert mock_smtp.call_count == 1
+        mock_smtp.return_value.login.assert_called_once()
+        df = pd.read_csv(sample_csv)
+        assert all(df['sent_from'] == 'sender@example.com')
+
+    @patch('scripts.gmail_sender.gmail_sender.send_email')
+    def test_defers_rows_past_daily_cap(self, mock_send, sample_csv):
+        """Rows beyond the daily cap should stay unsent for the next run."""
+        from scripts.gmail_sender.gmail_sender import process_csv
+
+        mock_send.return_value = (True, None)
+
+        results = process_csv(
+            csv_path=sample_csv,
+            login_address="sender@example.com",
+            password="test_password",
+            delay=0,
+            daily_cap=2
+        )
+
+        assert results['sent'] == 2
+        assert results['deferred_cap'] == 1
+        df = pd.read_csv(sample_csv)
+        assert (df['send_status'] == 'sent').sum() == 2
+
+    @patch('scripts.gmail_sender.gmail_sender.send_email')
+    @patch('scripts.gmail_sender.gmail_sender.verify_email_with_hunter')
+    def test_hunter_verification_runs_ahead(self, mock_hunter, mock_send, sample_csv):
+        """Hunter results should be applied per row without sleeping on the send path."""
+        from scripts.gmail_sender import gmail_sender
+
+        mock_hunter.side_effect = lambda email: (
+            {'status': 'invalid', 'deliverable': False} if email == 'test2@example.com'
+            else {'status': 'valid', 'deliverable': True}
+        )
+        mock_send.return_value = (True, None)
+
+        with patch.object(gmail_sender, 'HUNTER_MIN_INTERVAL', 0):
+            results = gmail_sender.process_csv(
+                csv_path=sample_csv,
+                login_address="sender@example.com",
+                password="test_password",
+                delay=0,
+                verify_first=True,
+                skip_invalid=True
+            )
+
+        assert mock_hunter.call_count == 3
+        assert results['sent'] == 2
+        df = pd.read_csv(sample_csv)
+        assert df.loc[1, 'send_status'] == 'skipped_invalid'
+
+    @patch('scripts.gmail_sender.gmail_sender.send_email')
+    @patch('scripts.gmail_sender.gmail_sender.verify_email_with_hunter')
+    def test_verification_stays_within_daily_cap(self, mock_hunter, mock_send, sample_csv):
+        """Rows deferred by the daily cap should not be verified (paid credits)."""
+        from scripts.gmail_sender import gmail_sender
+
+        mock_hunter.return_value = {'status': 'valid', 'deliverable': True}
+        mock_send.return_value = (True, None)
+
+        with patch.object(gmail_sender, 'HUNTER_MIN_INTERVAL', 0):
+            results = gmail_sender.process_csv(
+                csv_path=sample_csv,
+                login_address="sender@example.com",
+                password="test_password",
+                delay=0,
+                verify_first=True,
+                daily_cap=1
+            )
+
+        assert results['sent'] == 1 and results['deferred_cap'] == 2
+        assert mock_hunter.call_count == 1
+
+    @patch('scripts.gmail_sender.gmail_sender.verify_email_with_hunter')
+    def test_verification_window_follows_send_cursor(self, mock_hunter, sample_csv):
+        """Only a small window of rows is verified ahead of the row being sent."""
+        from scripts.gmail_sender import gmail_sender
+
+        submitted_at_first = []
+        mock_hunter.return_value = {'status': 'valid', 'deliverable': True}
+
+        def send(**kwargs):
+            submitted_at_first.append(mock_hunter.call_count)
+            return True, None
+
+        with patch.object(gmail_sender, 'HUNTER_MIN_INTERVAL', 0), \
+             patch.object(gmail_sender, 'VERIFY_LOOKAHEAD_PER_WORKER', 1), \
+             patch.object(gmail_sender, 'send_email', side_effect=send):
+            results = gmail_sender.process_csv(
+                csv_path=sample_csv,
+                login_address="sender@example.com",
+                password="test_password",
+                delay=0,
+                verify_first=True,
+                verify_workers=1
+            )
+
+        assert results['sent'] == 3
+        # With a one-row window, row 1 is sent before row 2 is verified
+        assert submitted_at_first == [1, 2, 3]
+
+
 class TestResultsSummary:
     """Tests for results summary functionality."""
 
@@ -333,6 +463,14 @@ class TestCLIArguments:
         args = parse_args(['--csv', 'test.csv', '--delay', '2.5'])
         assert args.delay == 2.5
 
+    def test_parse_args_accounts(self):
+        """--accounts should parse a comma-separated list of account names."""
+        from scripts.gmail_sender.gmail_sender import parse_args
+
+        assert parse_args(['--csv', 'test.csv']).accounts is None
+        args = parse_args(['--csv', 'test.csv', '--accounts', 'sales, outreach'])
+        assert args.accounts == ['SALES', 'OUTREACH']
+
 
 class TestEmailValidation:
     """Tests for email validation."""
@@ -0,0 +1,144 @@
+"""Tests for the header-only, incremental inbox scan."""
+
+import re
+
+import pytest
+
+
+BOUNCE_WITH_HEADER = (
+    b"From: Mail Delivery Subsystem <mailer-daemon@googlemail.com>\r\n"
+    b"Subject: Delivery Status Notification (Failure)\r\n"
+    b"X-Failed-Recipients: gone@example.com\r\n\r\n"
+)
+BOUNCE_NO_HEADER = (
+    b"From: postmaster@example.org\r\n"
+    b"Subject: Undeliverable: Hello\r\n\r\n"
+)
+BOUNCE_BODY = BOUNCE_NO_HEADER[:-2] + (
+    b"Content-Type: text/plain\r\n\r\n"
+    b"Your message to <missing@example.org> couldn't be delivered.\r\n"
+)
+REPLY = (
+    b"From: Jane Agent <jane@realty.com>\r\n"
+    b"Subject: Re: Quick question\r\n\r\n"
+)
+
+
+class FakeIMAP:
+    """Minimal IMAP double: UID SEARCH/FETCH over an in-memory mailbox."""
+
+    def __init__(self, messages, uidvalidity=7):
+        self.messages = messages  # uid -> (headers, full message)
+        self.uidvalidity = uidvalidity
+        self.fetches = []
+
+    def status(self, mailbox, what):
+        uidnext = max(self.messages) + 1 if self.messages else 1
+        return 'OK', [f'"INBOX" (UIDVALIDITY {self.uidvalidity} UIDNEXT {uidnext})'.encode()]
+
+    def select(self, mailbox, readonly=False):
+        assert readonly
+        return 'OK', [str(len(self.messages)).encode()]
+
+    def _expand(self, uid_set):
+        uids = []
+        for part in uid_set.split(','):
+            if ':' in part:
+                lo, hi = part.split(':')
+                hi = max(self.messages) if hi == '*' else int(hi)
+                uids.extend(u for u in self.messages if int(lo) <= u <= hi)
+            else:
+                uids.append(int(part))
+        return sorted(set(uids))
+
+    def uid(self, command, *args):
+        if command == 'SEARCH':
+            criteria = args[1]
+            match = re.match(r'UID (\S+)', criteria)
+            if match:
+                uids = self._expand(match.group(1)) or [max(self.messages)]
+            else:
+                uids = sorted(self.messages)
+            return 'OK', [' '.join(str(u) for u in uids).encode()]
+
+        uid_set, query = args
+        self.fetches.append((uid_set, query))
+        full = 'BODY.PEEK[]' in query
+        data = []
+        for uid in self._expand(uid_set):
+            headers, body = self.messages[uid]
+            payload = body if full else headers
+            data.append((f'{uid} (UID {uid} BODY[] {{{len(payload)}}}'.encode(), payload))
+            data.append(b')')
+        return 'OK', data
+
+
+@pytest.fixture
+def state_path(tmp_path):
+    return tmp_path / 'state.json'
+
+
+class TestHelpers:
+    """Tests for UID set helpers."""
+
+    def test_compress_uids(self):
+        from scripts.gmail_sender.inbox_checker import compress_uids
+
+        assert compress_uids([5, 1, 2, 3, 9, 10]) == '1:3,5,9:10'
+        assert compress_uids([]) == ''
+
+
+class TestCheckInbox:
+    """Tests for check_inbox."""
+
+    def test_classifies_from_headers_and_fetches_body_only_when_needed(self, state_path):
+        from scripts.gmail_sender.inbox_checker import check_inbox
+
+        mail = FakeIMAP({
+            1: (BOUNCE_WITH_HEADER, BOUNCE_WITH_HEADER),
+            2: (BOUNCE_NO_HEADER, BOUNCE_BODY),
+            3: (REPLY, REPLY),
+        })
+
+        bounces, replies = check_inbox(mail=mail, state_path=state_path)
+
+        assert sorted(b['bounced_email'] for b in bounces) == ['gone@example.com', 'missing@example.org']
+        assert [r['uid'] for r in replies] == [3]
+        body_fetches = [f for f in mail.fetches if 'BODY.PEEK[]' in f[1]]
+        assert body_fetches == [('2', '(UID BODY.PEEK[])')]
+        assert len(mail.fetches) == 2  # one header batch + one body fetch
+
+    def test_second_run_only_scans_new_mail(self, state_path):
+        from scripts.gmail_sender.inbox_checker import check_inbox
+
+        mail = FakeIMAP({1: (REPLY, REPLY), 2: (REPLY, REPLY)})
+        check_inbox(mail=mail, state_path=state_path)
+
+        mail.fetches.clear()
+        _, replies = check_inbox(mail=mail, state_path=state_path)
+        assert replies == []
+        assert mail.fetches == []
+
+        mail.messages[3] = (BOUNCE_WITH_HEADER, BOUNCE_WITH_HEADER)
+        bounces, replies = check_inbox(mail=mail, state_path=state_path)
+        assert [b['uid'] for b in bounces] == [3]
+        assert replies == []
+
+    def test_uidvalidity_change_triggers_rescan(self, state_path):
+        from scripts.gmail_sender.inbox_checker import check_inbox
+
+        mail = FakeIMAP({1: (REPLY, REPLY)})
+        check_inbox(mail=mail, state_path=state_path)
+
+        mail.uidvalidity = 8
+        _, replies = check_inbox(mail=mail, state_path=state_path)
+        assert [r['uid'] for r in replies] == [1]
+
+    def test_batches_header_fetches(self, state_path):
+        from scripts.gmail_sender.inbox_checker import check_inbox
+
+        mail = FakeIMAP({uid: (REPLY, REPLY) for uid in range(1, 6)})
+        _, replies = check_inbox(mail=mail, state_path=state_path, batch_size=2)
+
+        assert len(replies) == 5
+        assert [f[0] for f in mail.fetches] == ['1:2', '3:4', '5']
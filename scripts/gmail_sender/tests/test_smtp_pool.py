@@ -0,0 +1,180 @@
+"""Tests for the SMTP session pool and send scheduler."""
+
+import smtplib
+import socket
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+class TestSMTPSession:
+    """Tests for the persistent SMTP session."""
+
+    @patch('scripts.gmail_sender.smtp_pool.smtplib.SMTP')
+    def test_logs_in_once_for_many_messages(self, mock_smtp):
+        """One connect/STARTTLS/login should serve several messages."""
+        from scripts.gmail_sender.smtp_pool import SMTPSession
+
+        session = SMTPSession('me@example.com', 'pw')
+        for _ in range(3):
+            session.send_message(MagicMock())
+
+        assert mock_smtp.call_count == 1
+        server = mock_smtp.return_value
+        server.starttls.assert_called_once()
+        server.login.assert_called_once_with('me@example.com', 'pw')
+        assert server.send_message.call_count == 3
+
+    @patch('scripts.gmail_sender.smtp_pool.smtplib.SMTP')
+    def test_reconnects_on_421(self, mock_smtp):
+        """A 421 should drop the connection and retry on a fresh one."""
+        from scripts.gmail_sender.smtp_pool import SMTPSession
+
+        first, second = MagicMock(), MagicMock()
+        first.send_message.side_effect = smtplib.SMTPResponseException(421, b'Try again later')
+        mock_smtp.side_effect = [first, second]
+
+        session = SMTPSession('me@example.com', 'pw')
+        session.send_message(MagicMock())
+
+        assert session.reconnects == 1
+        second.send_message.assert_called_once()
+
+    @patch('scripts.gmail_sender.smtp_pool.smtplib.SMTP')
+    def test_reconnects_on_timeout(self, mock_smtp):
+        """Socket timeouts should trigger a reconnect."""
+        from scripts.gmail_sender.smtp_pool import SMTPSession
+
+        first, second = MagicMock(), MagicMock()
+        first.send_message.side_effect = socket.timeout('timed out')
+        mock_smtp.side_effect = [first, second]
+
+        session = SMTPSession('me@example.com', 'pw')
+        session.send_message(MagicMock())
+
+        assert session.sent == 1
+
+    @patch('scripts.gmail_sender.smtp_pool.smtplib.SMTP')
+    def test_does_not_retry_permanent_errors(self, mock_smtp):
+        """5xx errors should surface without reconnecting."""
+        from scripts.gmail_sender.smtp_pool import SMTPSession
+
+        mock_smtp.return_value.send_message.side_effect = smtplib.SMTPResponseException(550, b'No such user')
+
+        session = SMTPSession('me@example.com', 'pw')
+        with pytest.raises(smtplib.SMTPResponseException):
+            session.send_message(MagicMock())
+
+        assert mock_smtp.call_count == 1
+
+    @patch('scripts.gmail_sender.smtp_pool.smtplib.SMTP')
+    def test_recycles_connection_after_max_messages(self, mock_smtp):
+        """Connections should be recycled before Gmail closes them."""
+        from scripts.gmail_sender.smtp_pool import SMTPSession
+
+        session = SMTPSession('me@example.com', 'pw', max_messages=2)
+        for _ in range(5):
+            session.send_message(MagicMock())
+
+        assert mock_smtp.call_count == 3
+
+
+class TestSendScheduler:
+    """Tests for per-account cap scheduling."""
+
+    def make_accounts(self, daily_cap=10, per_minute_cap=2):
+        from scripts.gmail_sender.smtp_pool import SenderAccount
+        return [
+            SenderAccount('a@example.com', 'pw', ['a@example.com', 'alias@example.com'],
+                          daily_cap=daily_cap, per_minute_cap=per_minute_cap),
+            SenderAccount('b@example.com', 'pw', daily_cap=daily_cap, per_minute_cap=per_minute_cap),
+        ]
+
+    def test_spreads_sends_across_accounts(self):
+        """Sends should alternate between accounts."""
+        from scripts.gmail_sender.smtp_pool import SendScheduler
+
+        scheduler = SendScheduler(self.make_accounts(), clock=lambda: 0.0)
+        picks = [scheduler.acquire().login for _ in range(4)]
+
+        assert picks.count('a@example.com') == 2
+        assert picks.count('b@example.com') == 2
+
+    def test_waits_for_per_minute_window(self):
+        """With every window full, the scheduler should sleep until one opens."""
+        from scripts.gmail_sender.smtp_pool import SendScheduler
+
+        now = [0.0]
+        slept = []
+
+        def sleep(seconds):
+            slept.append(seconds)
+            now[0] += seconds
+
+        scheduler = SendScheduler(self.make_accounts(per_minute_cap=1), clock=lambda: now[0], sleep=sleep)
+        scheduler.acquire()
+        scheduler.acquire()
+        assert scheduler.acquire() is not None
+
+        assert slept == [60.0]
+
+    def test_returns_none_when_daily_caps_reached(self):
+        """Once all daily caps are used, acquire should return None."""
+        from scripts.gmail_sender.smtp_pool import SendScheduler
+
+        scheduler = SendScheduler(self.make_accounts(daily_cap=3, per_minute_cap=10), clock=lambda: 0.0)
+        scheduler.seed_daily_counts({'a@example.com': 3, 'b@example.com': 2})
+
+        assert scheduler.acquire().login == 'b@example.com'
+        assert scheduler.acquire() is None
+
+    def test_rotates_aliases(self):
+        """An account should cycle through its aliases."""
+        from scripts.gmail_sender.smtp_pool import SenderAccount
+
+        account = SenderAccount('a@example.com', 'pw', ['one@example.com', 'two@example.com'])
+        assert [account.next_alias() for _ in range(3)] == [
+            'one@example.com', 'two@example.com', 'one@example.com'
+        ]
+
+
+class TestLoadSenderAccounts:
+    """Tests for reading accounts from the environment."""
+
+    def test_loads_default_and_named_accounts(self, monkeypatch):
+        from scripts.gmail_sender.smtp_pool import load_sender_accounts
+
+        for key in list(__import__('os').environ):
+            if key.startswith('GMAIL_'):
+                monkeypatch.delenv(key)
+        monkeypatch.setenv('GMAIL_ADDRESS', 'main@example.com')
+        monkeypatch.setenv('GMAIL_APP_PASSWORD', 'pw1')
+        monkeypatch.setenv('GMAIL_SEND_AS', 'x@example.com, y@example.com')
+        monkeypatch.setenv('GMAIL_SALES_ADDRESS', 'sales@example.com')
+        monkeypatch.setenv('GMAIL_SALES_APP_PASSWORD', 'pw2')
+
+        accounts = load_sender_accounts(daily_cap=50, names=['sales'])
+
+        assert [a.login for a in accounts] == ['main@example.com', 'sales@example.com']
+        assert accounts[0].aliases == ['x@example.com', 'y@example.com']
+        assert accounts[1].aliases == ['sales@example.com']
+        assert all(a.daily_cap == 50 for a in accounts)
+
+    def test_named_accounts_are_opt_in(self, monkeypatch):
+        from scripts.gmail_sender.smtp_pool import load_sender_accounts
+
+        for key in list(__import__('os').environ):
+            if key.startswith('GMAIL_'):
+                monkeypatch.delenv(key)
+        monkeypatch.setenv('GMAIL_ADDRESS', 'main@example.com')
+        monkeypatch.setenv('GMAIL_APP_PASSWORD', 'pw1')
+        monkeypatch.setenv('GMAIL_SALES_ADDRESS', 'sales@example.com')
+        monkeypatch.setenv('GMAIL_SALES_APP_PASSWORD', 'pw2')
+        monkeypatch.setenv('GMAIL_PERSONAL_ADDRESS', 'me@example.com')
+        monkeypatch.setenv('GMAIL_PERSONAL_APP_PASSWORD', 'pw3')
+
+        assert [a.login for a in load_sender_accounts()] == ['main@example.com']
+
+        monkeypatch.setenv('GMAIL_SENDER_ACCOUNTS', 'sales')
+        assert [a.login for a in load_sender_accounts()] == ['main@example.com', 'sales@example.com']
+        assert [a.login for a in load_sender_accounts(names=[])] == ['main@example.com']
@@ -16,10 +16,15 @@ Data extracted:
 - gmaps_phone: Listed phone number
 - gmaps_address: Business address
 
+Searches are deduplicated, packed several per Apify actor run, and a few
+runs are kept in flight. Candidates are cached on disk by normalized
+(company, city) for CACHE_TTL_DAYS, so re-runs only search new companies.
+
 Usage:
     python scripts/google_maps_enricher.py           # Test mode (3 contacts)
     python scripts/google_maps_enricher.py --all     # Process all contacts
     python scripts/google_maps_enricher.py --csv output/prospects.csv  # Standalone
+    python scripts/google_maps_enricher.py --all --no-cache   # Ignore cached places
 """
 
 import os
@@ -28,6 +33,7 @@ import re
 import argparse
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Optional, Dict, List, Any
 from difflib import SequenceMatcher
@@ -40,6 +46,7 @@ from tqdm import tqdm
 # Add scripts directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 from utils.run_id import get_run_id_from_env, get_versioned_filename, create_latest_symlink
+from utils.response_cache import ResponseCache, make_cache_key
 
 load_dotenv()
 
@@ -66,6 +73,18 @@ OUTPUT_BASE = "03g_gmaps.csv"
 APIFY_API_TOKEN = os.getenv('APIFY_API_TOKEN') or os.getenv('APIFY_API_KEY')
 GOOGLE_MAPS_ACTOR = "compass/crawler-google-places"  # Primary actor
 
+# Batching / caching
+SEARCH_BATCH_SIZE = 10      # Search strings per actor run
+MAX_CONCURRENT_RUNS = 3     # Actor runs in flight
+RESULTS_PER_SEARCH = 5      # Candidates fetched per company
+CACHE_TTL_DAYS = 30         # Cached candidates expire after this
+
+GMAPS_COLUMNS = [
+    "gmaps_rating", "gmaps_review_count", "gmaps_place_id",
+    "gmaps_business_status", "gmaps_url", "gmaps_phone",
+    "gmaps_address", "gmaps_match_confidence"
+]
+
 # Try to import Apify client
 try:
     from apify_client import ApifyClient
@@ -76,14 +95,21 @@ except ImportError:
     logger.warning("apify-client not installed. Install with: pip install apify-client")
 
 
+_apify_client = None
+
+
 def get_apify_client() -> Optional[Any]:
-    """Get Apify client if available."""
+    """Get the shared Apify client (created once, reused across runs)."""
+    global _apify_client
+    if _apify_client is not None:
+        return _apify_client
     if not APIFY_AVAILABLE:
         return None
     if not APIFY_API_TOKEN:
         return None
     try:
-        return ApifyClient(APIFY_API_TOKEN)
+        _apify_client = ApifyClient(APIFY_API_TOKEN)
+        return _apify_client
     except Exception as e:
         logger.error(f"Failed to create Apify client: {e}")
         return None
@@ -129,36 +155,57 @@ def clean_company_name_for_search(name: str) -> str:
     return cleaned.strip()
 
 
-def search_google_maps_apify(
-    company_name: str,
-    location: str = None,
-    limit: int = 3
-) -> List[Dict]:
+def build_search_query(company_name: str, location: str = None) -> str:
+    """Build the Google Maps search string for a company."""
+    search_query = clean_company_name_for_search(company_name)
+    if location:
+        search_query = f"{search_query} {location}"
+    return search_query
+
+
+def parse_place(item: Dict) -> Dict:
+    """Convert an actor dataset item into a place result."""
+    return {
+        "name": item.get("title", ""),
+        "rating": item.get("totalScore"),
+        "review_count": item.get("reviewsCount") or item.get("reviews") or 0,
+        "place_id": item.get("placeId", ""),
+        "website": item.get("website", ""),
+        "phone": item.get("phone", ""),
+        "address": item.get("address", ""),
+        "business_status": "CLOSED" if item.get("permanentlyClosed") else "OPERATIONAL",
+        "categories": item.get("categories", []),
+        "url": item.get("url", ""),
+    }
+
+
+def search_google_maps_batch(
+    queries: List[str],
+    limit: int = RESULTS_PER_SEARCH
+) -> Optional[Dict[str, List[Dict]]]:
     """
-    Search Google Maps using Apify actor.
+    Run several searches in a single Apify actor run.
 
     Args:
-        company_name: Business name to search
-        location: Optional location to narrow search
-        limit: Max results to return
+        queries: Search strings
+        limit: Max results per search string
 
     Returns:
-        List of place results
+        {query: [place results]} for every query, or None if the run failed
+        (failed runs should not be cached)
     """
     client = get_apify_client()
     if not client:
         logger.warning("Apify client not available")
-        return []
+        return None
 
-    # Build search query
-    search_query = clean_company_name_for_search(company_name)
-    if location:
-        search_query = f"{search_query} {location}"
+    queries = list(dict.fromkeys(queries))
+    if not queries:
+        return {}
 
     try:
-        # Run the Google Maps actor
         run_input = {
-            "searchStringsArray": [search_query],
+            "searchStringsArray": queries,
             "maxCrawledPlacesPerSearch": limit,
             "language": "en",
             "maxReviews": 0,  # Don't fetch individual reviews, just counts
@@ -166,34 +213,113 @@ def search_google_maps_apify(
             "scrapeDirectories": False,
         }
 
-        logger.debug(f"Searching Google Maps for: {search_query}")
+        logger.debug(f"Searching Google Maps for {len(queries)} queries: {queries[:3]}...")
 
         run = client.actor(GOOGLE_MAPS_ACTOR).call(run_input=run_input)
 
-        results = []
+        results: Dict[str, List[Dict]] = {q: [] for q in queries}
         for item in client.dataset(run["defaultDatasetId"]).iterate_items():
-            # Debug: log first result structure
-            if not results:
-                logger.debug(f"Sample result keys: {list(item.keys())[:20]}")
-
-            results.append({
-                "name": item.get("title", ""),
-                "rating": item.get("totalScore"),
-                "review_count": item.get("reviewsCount") or item.get("reviews") or 0,
-                "place_id": item.get("placeId", ""),
-                "website": item.get("website", ""),
-                "phone": item.get("phone", ""),
-                "address": item.get("address", ""),
-                "business_status": "CLOSED" if item.get("permanentlyClosed") else "OPERATIONAL",
-                "categories": item.get("categories", []),
-                "url": item.get("url", ""),
-            })
+            # Each item carries the search string that produced it
+            query = item.get("searchString")
+            if query not in results:
+                if len(queries) != 1:
+                    logger.debug(f"Unmapped result for search '{query}': {item.get('title')}")
+                    continue
+                query = queries[0]
+            results[query].append(parse_place(item))
 
         return results
 
     except Exception as e:
         logger.error(f"Apify Google Maps search error: {e}")
-        return []
+        return None
+
+
+def search_google_maps_apify(
+    company_name: str,
+    location: str = None,
+    limit: int = 3
+) -> List[Dict]:
+    """
+    Search Google Maps using Apify actor.
+
+    Args:
+        company_name: Business name to search
+        location: Optional location to narrow search
+        limit: Max results to return
+
+    Returns:
+        List of place results
+    """
+    search_query = build_search_query(company_name, location)
+    results = search_google_maps_batch([search_query], limit=limit)
+    return (results or {}).get(search_query, [])
+
+
+def get_place_cache(ttl_days: float = CACHE_TTL_DAYS) -> ResponseCache:
+    """On-disk cache of Google Maps candidates keyed by (company, city)."""
+    return ResponseCache("google_maps", ttl_seconds=ttl_days * 24 * 60 * 60)
+
+
+def place_cache_key(company_name: str, location: str = None) -> str:
+    """Normalized (company, city) cache key."""
+    return make_cache_key(clean_company_name_for_search(company_name), location or "")
+
+
+def fetch_places(
+    searches: Dict[str, tuple],
+    cache: Optional[ResponseCache] = None,
+    batch_size: int = SEARCH_BATCH_SIZE,
+    max_concurrent_runs: int = MAX_CONCURRENT_RUNS,
+    limit: int = RESULTS_PER_SEARCH,
+    delay: float = 0.0
+) -> Dict[str, List[Dict]]:
+    """
+    Resolve candidates for many searches, hitting Apify only for cache misses.
+
+    Args:
+        searches: {cache_key: (company_name, location)}
+        cache: Optional on-disk cache
+        batch_size: Search strings per actor run
+        max_concurrent_runs: Actor runs in flight
+        limit: Max results per search
+        delay: Pause between actor run launches
+
+    Returns:
+        {cache_key: [place results]}
+    """
+    results = cache.get_many(searches) if cache else {}
+    missing = [key for key in searches if key not in results]
+    if cache:
+        logger.info(f"Google Maps cache: {len(results)} hits, {len(missing)} to search")
+    if not missing:
+        return results
+
+    queries = {key: build_search_query(*searches[key]) for key in missing}
+    batches = [missing[i:i + batch_size] for i in range(0, len(missing), batch_size)]
+
+    def run_batch(keys: List[str]) -> Dict[str, Optional[List[Dict]]]:
+        by_query = search_google_maps_batch([queries[k] for k in keys], limit=limit)
+        if by_query is None:
+            return {k: None for k in keys}
+        return {k: by_query.get(queries[k], []) for k in keys}
+
+    with ThreadPoolExecutor(max_workers=max_concurrent_runs) as executor:
+        futures = []
+        for i, batch in enumerate(batches):
+            if i and delay:
+                time.sleep(delay)
+            futures.append(executor.submit(run_batch, batch))
+
+        for future in tqdm(as_completed(futures), total=len(futures), desc="Google Maps actor runs"):
+            batch_results = future.result()
+            succeeded = {k: v for k, v in batch_results.items() if v is not None}
+            if cache and succeeded:
+                cache.set_many(succeeded)
+            for key, places in batch_results.items():
+                results[key] = places or []
+
+    return results
 
 
 def validate_match(
@@ -289,25 +415,9 @@ def find_best_match(
     return best
 
 
-def enrich_with_google_maps(
-    row: Dict,
-    delay: float = 1.0
-) -> Dict:
-    """
-    Enrich a single contact with Google Maps data.
-
-    Args:
-        row: Contact row as dict
-        delay: Delay before API call (for rate limiting)
-
-    Returns:
-        Dict with gmaps_* fields
-    """
-    company_name = str(row.get("page_name", "")).strip()
-    website_url = str(row.get("website_url", "")).strip()
-
-    # Default empty result
-    empty_result = {
+def empty_gmaps_result() -> Dict:
+    """Default gmaps_* fields when no confident match is found."""
+    return {
         "gmaps_rating": None,
         "gmaps_review_count": None,
         "gmaps_place_id": "",
@@ -318,25 +428,23 @@ def enrich_with_google_maps(
         "gmaps_match_confidence": 0.0,
     }
 
-    if not company_name:
-        return empty_result
-
-    # Rate limiting
-    time.sleep(delay)
 
-    # Search Google Maps
-    results = search_google_maps_apify(company_name, limit=5)
-
-    if not results:
-        logger.debug(f"No results for: {company_name}")
-        return empty_result
+def match_to_gmaps_fields(
+    candidates: List[Dict],
+    company_name: str,
+    website_url: str = None
+) -> Dict:
+    """
+    Pick the best candidate for a company and convert it to gmaps_* fields.
 
-    # Find best match
-    best_match = find_best_match(results, company_name, website_url, min_confidence=0.5)
+    Candidates are copied first, so cached results shared by several rows
+    are not mutated by validate_match.
+    """
+    best_match = find_best_match([dict(c) for c in candidates], company_name, website_url, min_confidence=0.5)
 
     if not best_match:
         logger.debug(f"No confident match for: {company_name}")
-        return empty_result
+        return empty_gmaps_result()
 
     # Extract data from best match - ensure proper types
     return {
@@ -351,22 +459,84 @@ def enrich_with_google_maps(
     }
 
 
+def row_location(row: Dict) -> str:
+    """City for the search, when the input has one."""
+    city = row.get("city")
+    if city is None or pd.isna(city):
+        return ""
+    return str(city).strip()
+
+
+def enrich_with_google_maps(
+    row: Dict,
+    delay: float = 1.0,
+    cache: Optional[ResponseCache] = None
+) -> Dict:
+    """
+    Enrich a single contact with Google Maps data.
+
+    Args:
+        row: Contact row as dict
+        delay: Delay before API call (for rate limiting)
+        cache: Optional candidate cache
+
+    Returns:
+        Dict with gmaps_* fields
+    """
+    company_name = str(row.get("page_name", "")).strip()
+    website_url = str(row.get("website_url", "")).strip()
+
+    if not company_name:
+        return empty_gmaps_result()
+
+    location = row_location(row)
+    key = place_cache_key(company_name, location)
+    results = cache.get(key) if cache else None
+
+    if results is None:
+        # Rate limiting
+        time.sleep(delay)
+
+        # Search Google Maps
+        results = search_google_maps_apify(company_name, location=location or None, limit=RESULTS_PER_SEARCH)
+        if cache:
+            cache.set(key, results)
+
+    if not results:
+        logger.debug(f"No results for: {company_name}")
+        return empty_gmaps_result()
+
+    return match_to_gmaps_fields(results, company_name, website_url)
+
+
 def enrich_google_maps(
     csv_path: Path,
     output_path: Optional[Path] = None,
     limit: Optional[int] = None,
     dry_run: bool = False,
-    delay: float = 1.0
+    delay: float = 1.0,
+    batch_size: int = SEARCH_BATCH_SIZE,
+    max_concurrent_runs: int = MAX_CONCURRENT_RUNS,
+    use_cache: bool = True,
+    cache_ttl_days: float = CACHE_TTL_DAYS
 ) -> Dict:
     """
     Enrich CSV with Google Maps business data.
 
+    Unique (company, city) searches are resolved once: cached candidates are
+    reused, and the rest are packed into batched actor runs executed
+    concurrently. Matching then runs per row on the candidates.
+
     Args:
         csv_path: Input CSV path
         output_path: Output CSV path
         limit: Max contacts to process
         dry_run: Preview without API calls
-        delay: Delay between API calls
+        delay: Delay between actor run launches
+        batch_size: Search strings per actor run
+        max_concurrent_runs: Actor runs in flight
+        use_cache: Read/write the on-disk candidate cache
+        cache_ttl_days: Cache entry lifetime
 
     Returns:
         Stats dictionary
@@ -383,12 +553,7 @@ def enrich_google_maps(
         return {"error": "Missing required column: page_name"}
 
     # Initialize gmaps columns if not exist
-    gmaps_columns = [
-        "gmaps_rating", "gmaps_review_count", "gmaps_place_id",
-        "gmaps_business_status", "gmaps_url", "gmaps_phone",
-        "gmaps_address", "gmaps_match_confidence"
-    ]
-    for col in gmaps_columns:
+    for col in GMAPS_COLUMNS:
         if col not in df.columns:
             df[col] = None if col in ["gmaps_rating", "gmaps_review_count", "gmaps_match_confidence"] else ""
 
@@ -400,6 +565,8 @@ def enrich_google_maps(
         "skipped": 0,
         "errors": 0,
         "already_had": 0,
+        "searches": 0,
+        "cache_hits": 0,
     }
 
     # Find rows to process
@@ -429,14 +596,40 @@ def enrich_google_maps(
             logger.info(f"  Would search: \"{row.get('page_name')}\"")
         return stats
 
-    # Process each contact
-    for idx, row in tqdm(rows_to_process, desc="Enriching with Google Maps"):
+    # Resolve candidates once per unique (company, city)
+    searches = {}
+    row_keys = {}
+    for idx, row in rows_to_process:
+        company_name = str(row.get("page_name", "")).strip()
+        location = row_location(row)
+        key = place_cache_key(company_name, location)
+        searches.setdefault(key, (company_name, location or None))
+        row_keys[idx] = key
+
+    cache = get_place_cache(cache_ttl_days) if use_cache else None
+    places = fetch_places(
+        searches,
+        cache=cache,
+        batch_size=batch_size,
+        max_concurrent_runs=max_concurrent_runs,
+        delay=delay
+    )
+    if cache:
+        stats["cache_hits"] = cache.hits
+        cache.close()
+    stats["searches"] = len(searches) - stats["cache_hits"]
+
+    # Match each contact against its candidates
+    results = {}
+    for idx, row in rows_to_process:
         try:
-            gmaps_data = enrich_with_google_maps(row, delay=delay)
-
-            # Update dataframe
-            for key, value in gmaps_data.items():
-                df.at[idx, key] = value
+            candidates = places.get(row_keys[idx], [])
+            gmaps_data = match_to_gmaps_fields(
+                candidates,
+                str(row.get("page_name", "")).strip(),
+                str(row.get("website_url", "")).strip()
+            )
+            results[idx] = gmaps_data
 
             if gmaps_data.get("gmaps_place_id"):
                 stats["found"] += 1
@@ -447,6 +640,12 @@ def enrich_google_maps(
             logger.error(f"Error processing {row.get('page_name')}: {e}")
             stats["errors"] += 1
 
+    # Single write-back of all gmaps columns
+    if results:
+        results_df = pd.DataFrame.from_dict(results, orient="index", columns=GMAPS_COLUMNS)
+        df[GMAPS_COLUMNS] = df[GMAPS_COLUMNS].astype(object)
+        df.loc[results_df.index, GMAPS_COLUMNS] = results_df
+
     # Save output
     if output_path is None:
         output_path = csv_path.parent / f"{csv_path.stem}_gmaps{csv_path.suffix}"
@@ -468,6 +667,8 @@ def print_summary(stats: Dict):
     print(f"Found on Google Maps: {stats.get('found', 0)}")
     print(f"Skipped (no name):    {stats.get('skipped', 0)}")
     print(f"Errors:               {stats.get('errors', 0)}")
+    print(f"Searches (API):       {stats.get('searches', 0)}")
+    print(f"Cache hits:           {stats.get('cache_hits', 0)}")
     print("=" * 60)
 
 
@@ -494,7 +695,15 @@ def main():
     parser.add_argument('--dry-run', action='store_true',
                        help='Preview without making API calls')
     parser.add_argument('--delay', type=float, default=1.0,
-                       help='Delay between API calls in seconds (default: 1.0)')
+                       help='Delay between actor run launches in seconds (default: 1.0)')
+    parser.add_argument('--batch-size', type=int, default=SEARCH_BATCH_SIZE,
+                       help=f'Search strings per actor run (default: {SEARCH_BATCH_SIZE})')
+    parser.add_argument('--concurrency', type=int, default=MAX_CONCURRENT_RUNS,
+                       help=f'Actor runs in flight (default: {MAX_CONCURRENT_RUNS})')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Ignore the on-disk place cache')
+    parser.add_argument('--cache-ttl-days', type=float, default=CACHE_TTL_DAYS,
+                       help=f'Place cache lifetime in days (default: {CACHE_TTL_DAYS})')
 
     args = parser.parse_args()
 
@@ -584,7 +793,11 @@ def main():
         output_path=output_path,
         limit=limit,
         dry_run=args.dry_run,
-        delay=args.delay
+        delay=args.delay,
+        batch_size=args.batch_size,
+        max_concurrent_runs=args.concurrency,
+        use_cache=not args.no_cache,
+        cache_ttl_days=args.cache_ttl_days
     )
 
     # Create latest symlink in pipeline mode
@@ -13,22 +13,36 @@ SETUP:
 6. Create a Google Sheet and share it with the service account email
 7. Copy the Sheet ID from the URL and set GOOGLE_SHEET_ID in .env
 
+Only rows that changed since the sheet was last read are written (one
+batch_update per sync), and a local manifest of row hashes skips unchanged
+syncs entirely.
+
 Usage:
-    python scripts/google_sheets_sync.py                    # Full sync
+    python scripts/google_sheets_sync.py                    # Sync changed rows
+    python scripts/google_sheets_sync.py --full             # Rewrite the whole worksheet
     python scripts/google_sheets_sync.py --create           # Create new sheet
     python scripts/google_sheets_sync.py --input FILE.csv   # Sync specific file
 """
 
 import os
+import re
 import sys
+import json
+import hashlib
 import argparse
 import logging
+from collections import Counter, deque
+from dataclasses import dataclass, field
 from pathlib import Path
 from datetime import datetime
+from typing import Dict, List, Optional
 
 import pandas as pd
 from dotenv import load_dotenv
 
+sys.path.insert(0, str(Path(__file__).parent))
+from master_store import normalize_email, normalize_name
+
 load_dotenv()
 
 # Setup logging
@@ -48,6 +62,21 @@ CREDENTIALS_FILE = "config/google-services-key.json"
 GOOGLE_SHEET_ID = os.getenv('GOOGLE_SHEET_ID', '')
 SHEET_NAME = "Master Contacts"
 
+# Key columns for the sheet (to avoid hitting cell limits). page_name keys
+# rows without an email when diffing against the current sheet.
+SHEET_COLUMNS = [
+    'contact_name', 'primary_email', 'primary_phone', 'company_name', 'page_name',
+    'website_url', 'instagram_handle', 'linkedin_profile', 'linkedin_url',
+    'source', 'lead_score', 'lead_tier', 'gmaps_rating', 'gmaps_review_count',
+    'has_meta_ads', 'has_marketing_pixel', 'scrape_date'
+]
+
+# Max rows per range in a batch_update (Google Sheets has limits)
+BATCH_SIZE = 1000
+
+# Row-hash manifests of the last sync, one per sheet/worksheet
+MANIFEST_DIR = BASE_DIR / "output" / "cache"
+
 
 def get_google_client():
     """Initialize Google Sheets client."""
@@ -90,9 +119,195 @@ def create_new_sheet(client, title: str = None) -> str:
     return sheet.id
 
 
-def sync_to_sheet(df: pd.DataFrame, sheet_id: str, worksheet_name: str = SHEET_NAME):
-    """Sync DataFrame to Google Sheet."""
-    client = get_google_client()
+def column_letter(index: int) -> str:
+    """1-based column index -> A1 column letters (1 -> A, 27 -> AA)."""
+    letters = ''
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(ord('A') + rem) + letters
+    return letters
+
+
+def sheet_columns(df: pd.DataFrame) -> List[str]:
+    """Columns written to the sheet (only key columns, to avoid hitting cell limits)."""
+    available_cols = [c for c in SHEET_COLUMNS if c in df.columns]
+    return available_cols or list(df.columns)[:20]  # Fallback to first 20
+
+
+def sheet_rows(df: pd.DataFrame, columns: List[str]) -> List[List[str]]:
+    """Cell values as the sheet stores them (NaN -> '', everything as strings)."""
+    return df[columns].fillna('').astype(str).values.tolist()
+
+
+def row_hash(values: List[str]) -> str:
+    return hashlib.sha1('\x1f'.join(values).encode('utf-8')).hexdigest()[:16]
+
+
+def row_keys(rows: List[List[str]], columns: List[str]) -> List[str]:
+    """Stable key per row: primary email, else page_name, else the row content.
+
+    Repeated keys get an occurrence suffix so every row has a unique key.
+    """
+    email_idx = columns.index('primary_email') if 'primary_email' in columns else None
+    page_idx = columns.index('page_name') if 'page_name' in columns else None
+
+    seen = Counter()
+    keys = []
+    for row in rows:
+        email = normalize_email(row[email_idx]) if email_idx is not None else ''
+        page = normalize_name(row[page_idx]) if page_idx is not None else ''
+        if email:
+            key = f"email:{email}"
+        elif page:
+            key = f"page:{page}"
+        else:
+            key = f"row:{row_hash(row)}"
+        seen[key] += 1
+        keys.append(key if seen[key] == 1 else f"{key}#{seen[key]}")
+    return keys
+
+
+@dataclass
+class SyncPlan:
+    """Cell writes needed to turn the current worksheet into the target rows."""
+    updates: Dict[int, List[str]] = field(default_factory=dict)  # sheet row number -> values
+    full: bool = False
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+    moved: int = 0
+    current_rows: int = 0
+
+
+def plan_sync(current: List[List[str]], columns: List[str], rows: List[List[str]], keys: List[str]) -> SyncPlan:
+    """Diff the worksheet values (header + rows) against the target rows.
+
+    Rows stay where they are: changed rows are rewritten in place, inserted
+    rows fill the slots of deleted ones (then append), and when more rows are
+    deleted than inserted the bottom rows move up into the remaining gaps so
+    the data stays contiguous. A different header means a full rewrite.
+    """
+    width = len(columns)
+    header = list(current[0]) if current else []
+    while header and header[-1] == '':
+        header.pop()
+
+    if header != columns:
+        updates = {1: columns}
+        updates.update({i + 2: row for i, row in enumerate(rows)})
+        return SyncPlan(updates=updates, full=True, inserted=len(rows))
+
+    existing = [(row + [''] * width)[:width] for row in current[1:]]
+    while existing and not any(existing[-1]):
+        existing.pop()
+    existing_keys = row_keys(existing, columns)
+    target = dict(zip(keys, rows))
+    plan = SyncPlan(current_rows=len(existing))
+
+    layout = []
+    written = set()
+    for pos, (key, values) in enumerate(zip(existing_keys, existing)):
+        if key in target:
+            layout.append(key)
+            if target[key] != values:
+                written.add(pos)
+                plan.updated += 1
+        else:
+            layout.append(None)
+            plan.deleted += 1
+
+    holes = deque(pos for pos, key in enumerate(layout) if key is None)
+    present = set(existing_keys)
+    for key in keys:
+        if key in present:
+            continue
+        if holes:
+            pos = holes.popleft()
+            layout[pos] = key
+        else:
+            pos = len(layout)
+            layout.append(key)
+        written.add(pos)
+        plan.inserted += 1
+
+    # More deletions than insertions: move bottom rows up into the gaps
+    while holes:
+        while layout and layout[-1] is None:
+            layout.pop()
+        hole = holes.popleft()
+        if hole >= len(layout):
+            break
+        layout[hole] = layout.pop()
+        written.discard(len(layout))
+        written.add(hole)
+        plan.moved += 1
+
+    plan.updates = {pos + 2: target[layout[pos]] for pos in sorted(written)}
+    return plan
+
+
+def update_ranges(updates: Dict[int, List[str]], width: int) -> List[dict]:
+    """Group row writes into contiguous A1 ranges for one batch_update."""
+    end_col = column_letter(width)
+    data = []
+    for row_number in sorted(updates):
+        last = data[-1] if data else None
+        if last and last['end'] == row_number - 1 and len(last['values']) < BATCH_SIZE:
+            last['end'] = row_number
+            last['values'].append(updates[row_number])
+        else:
+            data.append({'start': row_number, 'end': row_number, 'values': [updates[row_number]]})
+
+    return [{'range': f"A{r['start']}:{end_col}{r['end']}", 'values': r['values']} for r in data]
+
+
+def manifest_path_for(sheet_id: str, worksheet_name: str) -> Path:
+    slug = re.sub(r'[^A-Za-z0-9_-]+', '_', f"{sheet_id}_{worksheet_name}")
+    return MANIFEST_DIR / f"sheets_sync_{slug}.json"
+
+
+def build_manifest(columns: List[str], keys: List[str], rows: List[List[str]]) -> dict:
+    """Hash of every synced row, keyed like the sheet rows."""
+    return {'columns': columns, 'rows': {key: row_hash(row) for key, row in zip(keys, rows)}}
+
+
+def load_manifest(path: Path) -> Optional[dict]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_manifest(path: Path, manifest: dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f)
+    tmp.replace(path)
+
+
+def sync_to_sheet(df: pd.DataFrame, sheet_id: str, worksheet_name: str = SHEET_NAME,
+                  full: bool = False, client=None, manifest_path: Optional[Path] = None) -> dict:
+    """Sync DataFrame to Google Sheet, writing only the rows that changed.
+
+    The sheet is read once and diffed by row key (primary email / page_name);
+    inserted, changed and deleted rows go out in a single batch_update. A local
+    manifest of row hashes lets an unchanged sync return without any API call.
+    Pass full=True to ignore the manifest and rewrite the whole worksheet.
+    """
+    columns = sheet_columns(df)
+    rows = sheet_rows(df, columns)
+    keys = row_keys(rows, columns)
+    manifest = build_manifest(columns, keys, rows)
+    manifest_path = manifest_path or manifest_path_for(sheet_id, worksheet_name)
+
+    stats = {'inserted': 0, 'updated': 0, 'deleted': 0, 'moved': 0, 'full': full, 'write_calls': 0}
+    if not full and load_manifest(manifest_path) == manifest:
+        logger.info(f"Sheet already up to date ({len(rows)} contacts): no changes since last sync")
+        return stats
+
+    client = client or get_google_client()
 
     try:
         sheet = client.open_by_key(sheet_id)
@@ -102,66 +317,62 @@ def sync_to_sheet(df: pd.DataFrame, sheet_id: str, worksheet_name: str = SHEET_N
         sys.exit(1)
 
     # Get or create worksheet
+    created = False
     try:
         worksheet = sheet.worksheet(worksheet_name)
         logger.info(f"Updating existing worksheet: {worksheet_name}")
-    except:
-        worksheet = sheet.add_worksheet(title=worksheet_name, rows=len(df)+1, cols=len(df.columns))
+    except Exception:
+        worksheet = sheet.add_worksheet(title=worksheet_name, rows=len(df)+1, cols=len(columns))
         logger.info(f"Created new worksheet: {worksheet_name}")
-
-    # Clear existing data
-    worksheet.clear()
-
-    # Prepare data (handle NaN, convert to strings)
-    df_clean = df.fillna('').astype(str)
-
-    # Select key columns for the sheet (to avoid hitting cell limits)
-    key_columns = [
-        'contact_name', 'primary_email', 'primary_phone', 'company_name',
-        'website_url', 'instagram_handle', 'linkedin_profile', 'linkedin_url',
-        'source', 'lead_score', 'lead_tier', 'gmaps_rating', 'gmaps_review_count',
-        'has_meta_ads', 'has_marketing_pixel', 'scrape_date'
-    ]
-
-    # Use only columns that exist
-    available_cols = [c for c in key_columns if c in df_clean.columns]
-    if not available_cols:
-        available_cols = list(df_clean.columns)[:20]  # Fallback to first 20
-
-    df_subset = df_clean[available_cols]
-
-    # Convert to list of lists
-    data = [df_subset.columns.tolist()] + df_subset.values.tolist()
-
-    # Update in batches (Google Sheets has limits)
-    BATCH_SIZE = 1000
-    total_rows = len(data)
-
-    logger.info(f"Syncing {total_rows-1} rows, {len(available_cols)} columns...")
-
-    for i in range(0, total_rows, BATCH_SIZE):
-        batch = data[i:i+BATCH_SIZE]
-        start_row = i + 1
-        end_row = start_row + len(batch) - 1
-        end_col = chr(ord('A') + len(available_cols) - 1)
-
-        cell_range = f"A{start_row}:{end_col}{end_row}"
-        worksheet.update(cell_range, batch, value_input_option='RAW')
-        logger.info(f"  Updated rows {start_row}-{end_row}")
-
-    # Format header row
-    worksheet.format('1:1', {
-        'textFormat': {'bold': True},
-        'backgroundColor': {'red': 0.9, 'green': 0.9, 'blue': 0.9}
-    })
-
-    # Freeze header row
-    worksheet.freeze(rows=1)
-
-    logger.info(f"Sync complete: {total_rows-1} contacts")
+        created = True
+
+    # Read the current sheet once (one call) and diff against it
+    current = [] if full or created else worksheet.get_all_values()
+    plan = plan_sync(current, columns, rows, keys)
+
+    logger.info(f"Syncing {len(rows)} rows, {len(columns)} columns: "
+                f"{plan.inserted} inserted, {plan.updated} updated, {plan.deleted} deleted"
+                + (" (full rewrite)" if plan.full else ""))
+
+    write_calls = 0
+    if plan.full and not created:
+        worksheet.clear()
+        write_calls += 1
+
+    # Grow the grid before writing past its end; shrink it when rows were deleted
+    needed_rows = len(rows) + 1
+    if needed_rows > worksheet.row_count or len(rows) < plan.current_rows:
+        worksheet.resize(rows=needed_rows)
+        write_calls += 1
+    if len(columns) > worksheet.col_count:
+        worksheet.resize(cols=len(columns))
+        write_calls += 1
+
+    data = update_ranges(plan.updates, len(columns))
+    if data:
+        worksheet.batch_update(data, value_input_option='RAW')
+        write_calls += 1
+        logger.info(f"  Updated {len(plan.updates)} rows in {len(data)} ranges")
+
+    if plan.full:
+        # Format header row
+        worksheet.format('1:1', {
+            'textFormat': {'bold': True},
+            'backgroundColor': {'red': 0.9, 'green': 0.9, 'blue': 0.9}
+        })
+
+        # Freeze header row
+        worksheet.freeze(rows=1)
+        write_calls += 2
+
+    save_manifest(manifest_path, manifest)
+
+    logger.info(f"Sync complete: {len(rows)} contacts ({write_calls} write calls)")
     logger.info(f"View at: https://docs.google.com/spreadsheets/d/{sheet_id}")
 
-    return True
+    stats.update(inserted=plan.inserted, updated=plan.updated, deleted=plan.deleted,
+                 moved=plan.moved, full=plan.full, write_calls=write_calls)
+    return stats
 
 
 def main():
@@ -170,6 +381,7 @@ def main():
     parser.add_argument('--create', action='store_true', help='Create new Google Sheet')
     parser.add_argument('--sheet-id', type=str, help='Override sheet ID')
     parser.add_argument('--worksheet', type=str, default=SHEET_NAME, help='Worksheet name')
+    parser.add_argument('--full', action='store_true', help='Rewrite the whole worksheet (ignore the manifest)')
 
     args = parser.parse_args()
 
@@ -200,7 +412,7 @@ def main():
     logger.info(f"Loaded {len(df)} contacts from {input_path.name}")
 
     # Sync to sheet
-    sync_to_sheet(df, sheet_id, args.worksheet)
+    sync_to_sheet(df, sheet_id, args.worksheet, full=args.full, client=client)
 
     return 0
 
@@ -9,9 +9,18 @@ Enriches contacts missing email/phone using:
 Input: output/hubspot_import_merged.csv
 Output: output/hubspot_import_enriched.csv
 
+Contacts are enriched concurrently (--workers in flight). For each contact
+the email lookups race each other: the first verified email wins and the
+remaining lookups are cancelled; otherwise the best unverified email is kept
+in waterfall order (Hunter > Apollo > Exa). Every provider has its own rate
+limiter and on-disk response cache (output/cache/hubspot_enricher_*.db), so
+re-runs only pay for new lookups.
+
 Usage:
     python scripts/hubspot_enricher.py --all
+    python scripts/hubspot_enricher.py --all --workers 16
     python scripts/hubspot_enricher.py --limit 10
+    python scripts/hubspot_enricher.py --all --no-cache
     python scripts/hubspot_enricher.py --dry-run
 """
 
@@ -21,15 +30,21 @@ import re
 import json
 import argparse
 import logging
-import time
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import Any, Callable, Optional, Dict, List
 
 import pandas as pd
 import requests
 from dotenv import load_dotenv
 from tqdm import tqdm
 
+# Add scripts directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+from utils.rate_limiter import RateLimiter
+from utils.response_cache import ResponseCache, make_cache_key
+
 load_dotenv()
 
 # Setup logging
@@ -54,198 +69,209 @@ HUNTER_API_KEY = os.getenv('HUNTER_API_KEY')
 APOLLO_API_KEY = os.getenv('APOLLO_API_KEY')
 EXA_API_KEY = os.getenv('EXA_API_KEY')
 
+# Contacts in flight at once (each races its own lookups)
+DEFAULT_WORKERS = 8
+
+# Minimum seconds between calls to each provider, shared by all workers
+PROVIDER_INTERVALS = {
+    'duckduckgo': 1.0,
+    'hunter': 0.1,     # 15 req/s API limit
+    'apollo': 0.6,
+    'exa': 0.2,
+    'website': 0.0,
+}
+
+# Waterfall priority when no provider returns a verified email
+EMAIL_SOURCES = ['hunter', 'apollo', 'exa']
+
+CACHE_TTL_DAYS = 30
+
+# Rows between incremental saves
+SAVE_EVERY = 100
+
 
 def search_website_duckduckgo(company_name: str, location: str = "Florida") -> Optional[str]:
     """Find company website using DuckDuckGo."""
     if not company_name or len(company_name) < 3:
         return None
 
-    try:
-        from duckduckgo_search import DDGS
+    from duckduckgo_search import DDGS
 
-        query = f"{company_name} {location} real estate website"
+    query = f"{company_name} {location} real estate website"
 
-        with DDGS() as ddgs:
-            results = list(ddgs.text(query, max_results=3))
+    with DDGS() as ddgs:
+        results = list(ddgs.text(query, max_results=3))
 
-        if not results:
-            return None
-
-        # Filter for likely company websites
-        for result in results:
-            url = result.get('href', '')
-            # Skip social media and directories
-            skip_domains = ['facebook.com', 'linkedin.com', 'instagram.com', 'twitter.com',
-                          'zillow.com', 'realtor.com', 'yelp.com', 'yellowpages.com']
-            if any(domain in url.lower() for domain in skip_domains):
-                continue
-            return url
+    if not results:
+        return None
 
-        return results[0].get('href') if results else None
+    # Filter for likely company websites
+    for result in results:
+        url = result.get('href', '')
+        # Skip social media and directories
+        skip_domains = ['facebook.com', 'linkedin.com', 'instagram.com', 'twitter.com',
+                      'zillow.com', 'realtor.com', 'yelp.com', 'yellowpages.com']
+        if any(domain in url.lower() for domain in skip_domains):
+            continue
+        return url
 
-    except Exception as e:
-        logger.debug(f"DuckDuckGo error for {company_name}: {e}")
-        return None
+    return results[0].get('href') if results else None
 
 
 def find_email_hunter(domain: str, first_name: str, last_name: str) -> Optional[Dict]:
-    """Find email using Hunter.io."""
+    """Find email using Hunter.io.
+
+    Raises on request/HTTP errors so failures are retried instead of cached.
+    """
     if not HUNTER_API_KEY or not domain:
         return None
 
-    try:
-        # Email finder endpoint
-        url = "https://api.hunter.io/v2/email-finder"
-        params = {
-            "domain": domain,
-            "first_name": first_name,
-            "last_name": last_name,
-            "api_key": HUNTER_API_KEY
-        }
-
-        response = requests.get(url, params=params, timeout=10)
-
-        if response.status_code == 200:
-            data = response.json().get('data', {})
-            email = data.get('email')
-            if email:
-                return {
-                    'email': email,
-                    'confidence': data.get('score', 0),
-                    'source': 'hunter'
-                }
+    # Email finder endpoint
+    url = "https://api.hunter.io/v2/email-finder"
+    params = {
+        "domain": domain,
+        "first_name": first_name,
+        "last_name": last_name,
+        "api_key": HUNTER_API_KEY
+    }
 
-        return None
+    response = requests.get(url, params=params, timeout=10)
+    response.raise_for_status()
+
+    data = response.json().get('data') or {}
+    email = data.get('email')
+    if email:
+        return {
+            'email': email,
+            'confidence': data.get('score', 0),
+            'source': 'hunter',
+            'verified': (data.get('verification') or {}).get('status') == 'valid',
+        }
 
-    except Exception as e:
-        logger.debug(f"Hunter error for {domain}: {e}")
-        return None
+    return None
 
 
 def find_email_apollo(first_name: str, last_name: str, company: str) -> Optional[Dict]:
-    """Find email using Apollo.io."""
+    """Find email using Apollo.io.
+
+    Raises on request/HTTP errors so failures are retried instead of cached.
+    """
     if not APOLLO_API_KEY:
         return None
 
-    try:
-        url = "https://api.apollo.io/v1/people/match"
-        headers = {
-            "Content-Type": "application/json",
-            "Cache-Control": "no-cache"
-        }
-
-        payload = {
-            "api_key": APOLLO_API_KEY,
-            "first_name": first_name,
-            "last_name": last_name,
-            "organization_name": company,
-        }
-
-        response = requests.post(url, headers=headers, json=payload, timeout=15)
+    url = "https://api.apollo.io/v1/people/match"
+    headers = {
+        "Content-Type": "application/json",
+        "Cache-Control": "no-cache"
+    }
 
-        if response.status_code == 200:
-            data = response.json().get('person', {})
-            email = data.get('email')
-            if email:
-                return {
-                    'email': email,
-                    'confidence': 80,
-                    'source': 'apollo',
-                    'phone': data.get('phone_numbers', [{}])[0].get('number') if data.get('phone_numbers') else None
-                }
+    payload = {
+        "api_key": APOLLO_API_KEY,
+        "first_name": first_name,
+        "last_name": last_name,
+        "organization_name": company,
+    }
 
-        return None
+    response = requests.post(url, headers=headers, json=payload, timeout=15)
+    response.raise_for_status()
+
+    data = response.json().get('person') or {}
+    email = data.get('email')
+    if email:
+        return {
+            'email': email,
+            'confidence': 80,
+            'source': 'apollo',
+            'verified': data.get('email_status') == 'verified',
+            'phone': data.get('phone_numbers', [{}])[0].get('number') if data.get('phone_numbers') else None
+        }
 
-    except Exception as e:
-        logger.debug(f"Apollo error for {first_name} {last_name}: {e}")
-        return None
+    return None
 
 
 def find_email_exa(name: str, company: str) -> Optional[Dict]:
-    """Find email using Exa API search."""
+    """Find email using Exa API search.
+
+    Emails scraped from search results are never marked verified. Raises on
+    request/HTTP errors so failures are retried instead of cached.
+    """
     if not EXA_API_KEY:
         return None
 
-    try:
-        url = "https://api.exa.ai/search"
-        headers = {
-            "x-api-key": EXA_API_KEY,
-            "Content-Type": "application/json"
-        }
+    url = "https://api.exa.ai/search"
+    headers = {
+        "x-api-key": EXA_API_KEY,
+        "Content-Type": "application/json"
+    }
 
-        query = f'"{name}" "{company}" email contact real estate'
+    query = f'"{name}" "{company}" email contact real estate'
 
-        payload = {
-            "query": query,
-            "numResults": 3,
-            "type": "keyword",
-            "contents": {
-                "text": {"maxCharacters": 1000}
-            }
+    payload = {
+        "query": query,
+        "numResults": 3,
+        "type": "keyword",
+        "contents": {
+            "text": {"maxCharacters": 1000}
         }
+    }
 
-        response = requests.post(url, headers=headers, json=payload, timeout=15)
-
-        if response.status_code == 200:
-            results = response.json().get('results', [])
-
-            for result in results:
-                text = result.get('text', '')
-                # Extract email from text
-                email_match = re.search(r'[\w\.-]+@[\w\.-]+\.\w+', text)
-                if email_match:
-                    email = email_match.group(0).lower()
-                    # Validate it's not a generic email
-                    if not any(x in email for x in ['example', 'test', 'noreply', 'info@', 'contact@']):
-                        return {
-                            'email': email,
-                            'confidence': 60,
-                            'source': 'exa'
-                        }
+    response = requests.post(url, headers=headers, json=payload, timeout=15)
+    response.raise_for_status()
 
-        return None
+    results = response.json().get('results', [])
 
-    except Exception as e:
-        logger.debug(f"Exa error for {name}: {e}")
-        return None
+    for result in results:
+        text = result.get('text', '')
+        # Extract email from text
+        email_match = re.search(r'[\w\.-]+@[\w\.-]+\.\w+', text)
+        if email_match:
+            email = email_match.group(0).lower()
+            # Validate it's not a generic email
+            if not any(x in email for x in ['example', 'test', 'noreply', 'info@', 'contact@']):
+                return {
+                    'email': email,
+                    'confidence': 60,
+                    'source': 'exa',
+                    'verified': False,
+                }
+
+    return None
 
 
 def scrape_phone_from_website(url: str) -> Optional[str]:
-    """Scrape phone number from website."""
+    """Scrape phone number from website.
+
+    Raises on connection errors so unreachable sites are retried instead of cached.
+    """
     if not url:
         return None
 
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        }
-
-        response = requests.get(url, headers=headers, timeout=10)
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+    }
 
-        if response.status_code == 200:
-            text = response.text
+    response = requests.get(url, headers=headers, timeout=10)
 
-            # Phone patterns
-            patterns = [
-                r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',  # (123) 456-7890
-                r'\+1[-.\s]?\d{3}[-.\s]?\d{3}[-.\s]?\d{4}',  # +1 123 456 7890
-            ]
+    if response.status_code == 200:
+        text = response.text
 
-            for pattern in patterns:
-                matches = re.findall(pattern, text)
-                if matches:
-                    # Clean and return first match
-                    phone = re.sub(r'[^\d]', '', matches[0])
-                    if len(phone) == 10:
-                        return f"({phone[:3]}) {phone[3:6]}-{phone[6:]}"
-                    elif len(phone) == 11 and phone.startswith('1'):
-                        return f"({phone[1:4]}) {phone[4:7]}-{phone[7:]}"
+        # Phone patterns
+        patterns = [
+            r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',  # (123) 456-7890
+            r'\+1[-.\s]?\d{3}[-.\s]?\d{3}[-.\s]?\d{4}',  # +1 123 456 7890
+        ]
 
-        return None
+        for pattern in patterns:
+            matches = re.findall(pattern, text)
+            if matches:
+                # Clean and return first match
+                phone = re.sub(r'[^\d]', '', matches[0])
+                if len(phone) == 10:
+                    return f"({phone[:3]}) {phone[3:6]}-{phone[6:]}"
+                elif len(phone) == 11 and phone.startswith('1'):
+                    return f"({phone[1:4]}) {phone[4:7]}-{phone[7:]}"
 
-    except Exception as e:
-        logger.debug(f"Scrape error for {url}: {e}")
-        return None
+    return None
 
 
 def extract_domain(url: str) -> str:
@@ -271,8 +297,88 @@ def safe_str(value, default: str = "") -> str:
     return str(value).strip()
 
 
-def enrich_contact(row: pd.Series, skip_website: bool = False) -> Dict:
-    """Enrich a single contact with missing email/phone."""
+class CachedLookup:
+    """One enrichment provider behind its own rate limiter and on-disk cache.
+
+    Lookup errors are logged and returned as None without being cached, so
+    only real answers (including "not found") are reused on later runs.
+    Providers whose API key (`api_key_var`) is not set are skipped entirely.
+    """
+
+    def __init__(self, name: str, func: Callable, min_interval: float, api_key_var: Optional[str] = None):
+        self.name = name
+        self.func = func
+        self.api_key_var = api_key_var
+        self.limiter = RateLimiter(min_interval)
+        self.use_cache = True
+        self.calls = 0
+        self.errors = 0
+        self._cache = None
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self) -> Optional[ResponseCache]:
+        """Response cache, opened on first use (output/cache/hubspot_enricher_<name>.db)."""
+        if not self.use_cache:
+            return None
+        with self._lock:
+            if self._cache is None:
+                self._cache = ResponseCache(f"hubspot_enricher_{self.name}",
+                                            ttl_seconds=CACHE_TTL_DAYS * 24 * 60 * 60)
+            return self._cache
+
+    @property
+    def available(self) -> bool:
+        return not self.api_key_var or bool(globals().get(self.api_key_var))
+
+    def __call__(self, *args) -> Any:
+        if not self.available:
+            return None
+
+        cache = self.cache
+        key = make_cache_key(self.name, *args)
+        if cache is not None:
+            hit = cache.get(key)
+            if hit is not None:
+                return hit['value']
+
+        self.limiter.wait()
+        with self._lock:
+            self.calls += 1
+        try:
+            value = self.func(*args)
+        except Exception as e:
+            with self._lock:
+                self.errors += 1
+            logger.debug(f"{self.name} error for {args}: {e}")
+            return None
+
+        if cache is not None:
+            cache.set(key, {'value': value})
+        return value
+
+
+PROVIDERS = {
+    'duckduckgo': CachedLookup('duckduckgo', search_website_duckduckgo, PROVIDER_INTERVALS['duckduckgo']),
+    'hunter': CachedLookup('hunter', find_email_hunter, PROVIDER_INTERVALS['hunter'], 'HUNTER_API_KEY'),
+    'apollo': CachedLookup('apollo', find_email_apollo, PROVIDER_INTERVALS['apollo'], 'APOLLO_API_KEY'),
+    'exa': CachedLookup('exa', find_email_exa, PROVIDER_INTERVALS['exa'], 'EXA_API_KEY'),
+    'website': CachedLookup('website', scrape_phone_from_website, PROVIDER_INTERVALS['website']),
+}
+
+
+def enrich_contact(row: pd.Series, skip_website: bool = False,
+                   executor: Optional[ThreadPoolExecutor] = None) -> Dict:
+    """Enrich a single contact with missing email/phone.
+
+    Website discovery, Apollo and Exa start together and Hunter starts as soon
+    as a domain is known. The first verified email wins and cancels the lookups
+    still queued; otherwise the first email in EMAIL_SOURCES order is kept. The
+    phone is scraped from the website only when no email was found.
+
+    Lookups run on `executor` (shared across contacts by main), or on a
+    private pool when none is given.
+    """
     result = {
         'email': safe_str(row.get('Email')),
         'phone': safe_str(row.get('Phone Number')),
@@ -290,53 +396,84 @@ def enrich_contact(row: pd.Series, skip_website: bool = False) -> Dict:
     if result['email'] and '@' in result['email']:
         return result
 
-    # Step 1: Find website if missing (skip if --skip-website flag)
-    if not skip_website and not result['website'] and company:
-        website = search_website_duckduckgo(company)
-        if website:
-            result['website'] = website
-            logger.debug(f"Found website for {company}: {website}")
-        time.sleep(0.5)  # Rate limit
-
-    domain = extract_domain(result['website'])
-
-    # Step 2: Try Hunter.io (if we have domain)
-    if domain and first_name and last_name:
-        hunter_result = find_email_hunter(domain, first_name, last_name)
-        if hunter_result:
-            result['email'] = hunter_result['email']
-            result['email_source'] = 'hunter'
-            result['enriched'] = True
-            logger.info(f"Hunter found: {full_name} -> {result['email']}")
-            return result
-        time.sleep(0.3)
-
-    # Step 3: Try Apollo.io
-    if first_name and last_name and company:
-        apollo_result = find_email_apollo(first_name, last_name, company)
-        if apollo_result:
-            result['email'] = apollo_result['email']
-            result['email_source'] = 'apollo'
-            result['enriched'] = True
-            if apollo_result.get('phone') and not result['phone']:
-                result['phone'] = apollo_result['phone']
-            logger.info(f"Apollo found: {full_name} -> {result['email']}")
-            return result
-        time.sleep(0.3)
-
-    # Step 4: Try Exa search
-    if full_name and company:
-        exa_result = find_email_exa(full_name, company)
-        if exa_result:
-            result['email'] = exa_result['email']
-            result['email_source'] = 'exa'
-            result['enriched'] = True
-            logger.info(f"Exa found: {full_name} -> {result['email']}")
-            return result
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=len(PROVIDERS))
+
+    lookups = {}  # future -> email source
+
+    def start(source: str, *args):
+        if not PROVIDERS[source].available:
+            return None
+        future = executor.submit(PROVIDERS[source], *args)
+        lookups[future] = source
+        return future
+
+    def start_hunter():
+        domain = extract_domain(result['website'])
+        if domain and first_name and last_name:
+            return start('hunter', domain, first_name, last_name)
+        return None
 
-    # Step 5: Try to scrape phone if we have website but no phone
+    try:
+        # Find website if missing (skip if --skip-website flag); Hunter waits for it
+        website_lookup = None
+        if not skip_website and not result['website'] and company:
+            website_lookup = executor.submit(PROVIDERS['duckduckgo'], company)
+        else:
+            start_hunter()
+        if first_name and last_name and company:
+            start('apollo', first_name, last_name, company)
+        if full_name and company:
+            start('exa', full_name, company)
+
+        found = {}
+        winner = None
+        pending = set(lookups) | ({website_lookup} if website_lookup else set())
+        while pending and winner is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            if website_lookup in done:
+                website = website_lookup.result()
+                if website:
+                    result['website'] = website
+                    logger.debug(f"Found website for {company}: {website}")
+                hunter_lookup = start_hunter()
+                if hunter_lookup:
+                    pending.add(hunter_lookup)
+
+            for future in sorted(done & set(lookups), key=lambda f: EMAIL_SOURCES.index(lookups[f])):
+                hit = future.result()
+                if hit and hit.get('email'):
+                    found[lookups[future]] = hit
+                    if hit.get('verified') and winner is None:
+                        winner = lookups[future]
+
+        # A verified email won: drop lookups that have not started yet
+        for future in pending:
+            future.cancel()
+        if website_lookup in pending and not website_lookup.cancelled():
+            result['website'] = website_lookup.result() or result['website']
+    finally:
+        if own_executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    if winner is None and found:
+        winner = next(source for source in EMAIL_SOURCES if source in found)
+
+    if winner:
+        hit = found[winner]
+        result['email'] = hit['email']
+        result['email_source'] = winner
+        result['enriched'] = True
+        if hit.get('phone') and not result['phone']:
+            result['phone'] = hit['phone']
+        logger.info(f"{winner.title()} found: {full_name} -> {result['email']}"
+                    + (" (verified)" if hit.get('verified') else ""))
+        return result
+
+    # Try to scrape phone if we have website but no phone
     if result['website'] and not result['phone']:
-        phone = scrape_phone_from_website(result['website'])
+        phone = PROVIDERS['website'](result['website'])
         if phone:
             result['phone'] = phone
             result['enriched'] = True
@@ -371,6 +508,9 @@ def main():
     parser.add_argument('--limit', type=int, help='Limit contacts to process')
     parser.add_argument('--dry-run', action='store_true', help='Preview only')
     parser.add_argument('--skip-website', action='store_true', help='Skip website discovery (faster)')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'Contacts enriched concurrently (default: {DEFAULT_WORKERS})')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore the on-disk provider response caches')
 
     args = parser.parse_args()
 
@@ -417,15 +557,27 @@ def main():
     if 'Email Source' not in df.columns:
         df['Email Source'] = ''
 
-    # Process contacts
+    for provider in PROVIDERS.values():
+        provider.use_cache = not args.no_cache
+
+    # Process contacts: N in flight, their lookups share one pool (rate limited per provider)
     stats = {'found_email': 0, 'found_phone': 0, 'found_website': 0, 'errors': 0}
     output_path = str(BASE_DIR / args.output)
-    BATCH_SIZE = 10
+    workers = max(1, args.workers)
+    print(f"Workers: {workers}")
+
+    lookup_pool = ThreadPoolExecutor(max_workers=workers * len(PROVIDERS))
+    contact_pool = ThreadPoolExecutor(max_workers=workers)
+    futures = {
+        contact_pool.submit(enrich_contact, df.loc[idx], args.skip_website, lookup_pool): idx
+        for idx in rows_to_enrich
+    }
 
-    for i, idx in enumerate(tqdm(rows_to_enrich, desc="Enriching contacts")):
+    for i, future in enumerate(tqdm(as_completed(futures), total=len(futures), desc="Enriching contacts")):
+        idx = futures[future]
         try:
             row = df.loc[idx]
-            result = enrich_contact(row, skip_website=args.skip_website)
+            result = future.result()
 
             # Update DataFrame
             if result['email'] and '@' in str(result['email']):
@@ -447,8 +599,11 @@ def main():
             stats['errors'] += 1
 
         # Incremental save
-        if (i + 1) % BATCH_SIZE == 0:
-            save_incremental(df, output_path, f"batch_{(i + 1) // BATCH_SIZE}")
+        if (i + 1) % SAVE_EVERY == 0:
+            save_incremental(df, output_path, f"batch_{(i + 1) // SAVE_EVERY}")
+
+    contact_pool.shutdown()
+    lookup_pool.shutdown()
 
     # Final save
     df = df.drop(columns=['_needs_enrichment'], errors='ignore')
@@ -466,6 +621,10 @@ def main():
     print(f"  Phones found: {stats['found_phone']}")
     print(f"  Websites found: {stats['found_website']}")
     print(f"  Errors: {stats['errors']}")
+    print("\nProvider calls (cache hits / API calls / errors):")
+    for name, provider in PROVIDERS.items():
+        hits = provider._cache.hits if provider._cache else 0
+        print(f"  {name}: {hits} / {provider.calls} / {provider.errors}")
 
     # Final stats
     df_final = pd.read_csv(output_path)
@@ -2,12 +2,23 @@
 """
 Enrich HubSpot contacts by matching against existing all_agents database.
 No API calls - instant matching.
+
+Contacts are linked to agents by fuzzy name match (utils.name_matcher):
+accents, middle names, suffixes and nicknames no longer block a match, and
+only confident, unambiguous matches fill a missing email or phone.
 """
 
-import pandas as pd
+import argparse
 import logging
+import sys
 from pathlib import Path
 
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils.name_matcher import MIN_CONFIDENCE, NameIndex, full_names, name_parts
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s [%(levelname)s] %(message)s',
@@ -19,15 +30,73 @@ BASE_DIR = Path(__file__).parent.parent
 HUBSPOT_CSV = BASE_DIR / "output/hubspot_import_enriched.csv"
 AGENTS_CSV = BASE_DIR / "output/repliers/all_agents_2025.csv"
 
+# HubSpot column -> (Repliers agent column, stats key)
+FILL_COLUMNS = {
+    'Email': ('agent_email', 'enriched_email'),
+    'Phone Number': ('agent_phone', 'enriched_phone'),
+}
+
+
+def is_blank(series: pd.Series) -> pd.Series:
+    """True where a cell is NaN or an empty/whitespace string."""
+    return series.isna() | (series.astype(str).str.strip() == '')
+
+
+def fill_from_agents(hubspot: pd.DataFrame, agents: pd.DataFrame,
+                     min_confidence: float = MIN_CONFIDENCE) -> dict:
+    """Fill missing HubSpot emails/phones from fuzzy name matches (in place).
+
+    Each column is matched separately against the agents that actually have
+    a value for it. Agent rows repeating the same normalized name and value
+    count once, so only genuinely conflicting namesakes are ambiguous; those
+    are skipped rather than guessed.
+    """
+    names = full_names(hubspot['First Name'], hubspot['Last Name'])
+    stats = {
+        'already_complete': int((~is_blank(hubspot['Email']) & ~is_blank(hubspot['Phone Number'])).sum()),
+        'ambiguous': 0,
+        'fuzzy': 0,
+    }
+
+    for column, (agent_column, key) in FILL_COLUMNS.items():
+        stats[key] = 0
+        targets = is_blank(hubspot[column])
+        donors = agents[~is_blank(agents[agent_column])]
+        if not targets.any() or donors.empty:
+            continue
+
+        value_key = donors[agent_column].astype(str).str.strip().str.lower()
+        donors = donors[~pd.DataFrame({'name': name_parts(donors['agent_name'])['full'],
+                                       'value': value_key}).duplicated()]
+        matches = NameIndex(donors['agent_name']).match(names[targets], min_confidence=min_confidence)
+        stats['ambiguous'] += int(matches['ambiguous'].sum())
+        matches = matches[~matches['ambiguous'].astype(bool)]
+        if matches.empty:
+            continue
+
+        rows = matches['left'].to_numpy()
+        hubspot[column] = hubspot[column].astype(object)
+        hubspot.loc[rows, column] = donors.loc[matches['right'], agent_column].to_numpy()
+        if column == 'Email':
+            if 'Email Source' not in hubspot:
+                hubspot['Email Source'] = None
+            hubspot['Email Source'] = hubspot['Email Source'].astype(object)
+            hubspot.loc[rows, 'Email Source'] = 'repliers_db'
 
-def normalize_name(first, last):
-    """Normalize name for matching."""
-    first = str(first).strip().lower() if pd.notna(first) else ''
-    last = str(last).strip().lower() if pd.notna(last) else ''
-    return f"{first} {last}".strip()
+        fuzzy = int((matches['confidence'] < 1).sum())
+        stats[key] = len(matches)
+        stats['fuzzy'] += fuzzy
+        logger.info(f"{column}: {len(matches)} filled ({fuzzy} fuzzy matches)")
+
+    return stats
 
 
 def main():
+    parser = argparse.ArgumentParser(description='Fill HubSpot emails/phones from the Repliers agents database')
+    parser.add_argument('--min-confidence', type=float, default=MIN_CONFIDENCE,
+                        help=f'Minimum name match confidence, 0-1 (default: {MIN_CONFIDENCE})')
+    args = parser.parse_args()
+
     print(f"\n{'='*60}")
     print("HUBSPOT LOCAL ENRICHER")
     print(f"{'='*60}")
@@ -39,37 +108,7 @@ def main():
     print(f"Loaded {len(hubspot)} HubSpot contacts")
     print(f"Loaded {len(agents)} agents from database")
 
-    # Create lookup dict from agents
-    agents['match_name'] = agents['agent_name'].str.lower().str.strip()
-    agent_lookup = agents.set_index('match_name')[['agent_email', 'agent_phone']].to_dict('index')
-
-    # Track stats
-    stats = {'enriched_email': 0, 'enriched_phone': 0, 'already_complete': 0}
-
-    for idx, row in hubspot.iterrows():
-        # Skip if already has both
-        has_email = pd.notna(row['Email']) and row['Email'] != ''
-        has_phone = pd.notna(row['Phone Number']) and row['Phone Number'] != ''
-
-        if has_email and has_phone:
-            stats['already_complete'] += 1
-            continue
-
-        # Try to match
-        match_name = normalize_name(row['First Name'], row['Last Name'])
-        if match_name in agent_lookup:
-            agent_data = agent_lookup[match_name]
-
-            if not has_email and agent_data.get('agent_email'):
-                hubspot.at[idx, 'Email'] = agent_data['agent_email']
-                hubspot.at[idx, 'Email Source'] = 'repliers_db'
-                stats['enriched_email'] += 1
-                logger.info(f"Enriched email: {match_name} -> {agent_data['agent_email']}")
-
-            if not has_phone and agent_data.get('agent_phone'):
-                hubspot.at[idx, 'Phone Number'] = agent_data['agent_phone']
-                stats['enriched_phone'] += 1
-                logger.info(f"Enriched phone: {match_name} -> {agent_data['agent_phone']}")
+    stats = fill_from_agents(hubspot, agents, min_confidence=args.min_confidence)
 
     # Save
     hubspot.to_csv(HUBSPOT_CSV, index=False)
@@ -82,6 +121,8 @@ def main():
     print(f"  Already complete: {stats['already_complete']}")
     print(f"  Emails enriched: {stats['enriched_email']}")
     print(f"  Phones enriched: {stats['enriched_phone']}")
+    print(f"  Fuzzy (non-exact) matches: {stats['fuzzy']}")
+    print(f"  Skipped ambiguous matches: {stats['ambiguous']}")
 
     # Final counts
     final = pd.read_csv(HUBSPOT_CSV)
@@ -14,6 +14,13 @@ Usage:
     python instagram_enricher.py --all     # Process all contacts (fast mode)
     python instagram_enricher.py --all --full  # Full comprehensive search (slower)
     python instagram_enricher.py --verify  # Verify handles exist (slower, filters invalid handles)
+    python instagram_enricher.py --all --concurrency 30  # Contacts in flight at once
+
+Scheduling: a fixed pool of workers pulls contacts from a shared queue, so a
+slow contact only occupies its own slot. Blocking calls (LLM SDKs, website
+fetches, handle verification) run in a thread pool, each behind its own
+per-provider concurrency limit, and results are written to the DataFrame
+(and checkpointed to disk) as each contact finishes.
 """
 
 import os
@@ -22,9 +29,12 @@ import re
 import json
 import time
 import asyncio
+import weakref
+import functools
 import pandas as pd
 import requests
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from tqdm import tqdm
 from dotenv import load_dotenv
 from openai import OpenAI
@@ -35,7 +45,7 @@ from urllib.parse import urljoin, urlparse
 sys.path.insert(0, str(Path(__file__).parent))
 from utils.run_id import get_run_id_from_env, get_versioned_filename, create_latest_symlink
 from utils.redis_cache import get_cached_handles, cache_handles, is_redis_available
-from utils.instagram_apis import search_apify_instagram, is_paid_api_enabled
+from utils.instagram_apis import search_apify_instagram, is_paid_api_enabled, get_instagram_search
 
 load_dotenv()
 
@@ -81,6 +91,34 @@ BACKUP_FILE = 'processed/03d_final_backup.csv'
 # Rate limiting (reduced for Groq's higher rate limits)
 SEARCH_DELAY = 0.1 if groq_client else 1.0  # Groq handles rate limiting better
 
+# Contacts in flight at once (Groq: 30k RPM, OpenAI: 500 RPM)
+DEFAULT_CONCURRENCY = int(os.getenv('IG_ENRICH_CONCURRENCY', '20' if groq_client else '5'))
+
+# Concurrent requests allowed per provider, shared by all contacts in flight
+PROVIDER_LIMITS = {
+    'groq': int(os.getenv('GROQ_CONCURRENCY', '20')),
+    'openai': int(os.getenv('OPENAI_CONCURRENCY', '3')),
+    'web': int(os.getenv('WEB_SCRAPE_CONCURRENCY', '16')),
+    'apify': int(os.getenv('APIFY_CONCURRENCY', '5')),
+    'instagram': int(os.getenv('IG_VERIFY_CONCURRENCY', '2')),
+}
+
+# Write the DataFrame to disk every N finished contacts
+CHECKPOINT_EVERY = 25
+
+# Pause after each handle verification (Instagram blocks bursts)
+VERIFY_DELAY = 1.5
+
+# LLM model per provider
+LLM_MODELS = {
+    'groq': 'llama-3.3-70b-versatile',  # Fast and accurate (updated from deprecated llama-3.1)
+    'openai': 'gpt-4o',
+}
+
+INSTAGRAM_SYSTEM_PROMPT = """You are an expert at finding Instagram profiles. 
+Analyze the information and determine the most likely Instagram handle.
+Return ONLY the handle in format @username, or NOT_FOUND if you cannot determine it."""
+
 # Caching for website scraping (avoid re-scraping same URLs)
 _website_cache = {}
 REQUEST_DELAY = 0.2  # Reduced from 1.0 for faster scraping
@@ -90,6 +128,39 @@ HEADERS = {
     "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
 }
 
+# Pooled HTTP connections for website scraping (shared by the worker threads)
+_http_session = requests.Session()
+_http_session.mount('http://', requests.adapters.HTTPAdapter(pool_maxsize=PROVIDER_LIMITS['web']))
+_http_session.mount('https://', requests.adapters.HTTPAdapter(pool_maxsize=PROVIDER_LIMITS['web']))
+
+
+# =============================================================================
+# CONCURRENCY
+# =============================================================================
+
+_semaphores = weakref.WeakKeyDictionary()
+_io_executor = None
+
+
+def provider_limit(provider: str) -> asyncio.Semaphore:
+    """Semaphore guarding calls to a provider on the running loop (created lazily per loop)."""
+    loop = asyncio.get_running_loop()
+    per_loop = _semaphores.setdefault(loop, {})
+    if provider not in per_loop:
+        per_loop[provider] = asyncio.Semaphore(PROVIDER_LIMITS.get(provider, 1))
+    return per_loop[provider]
+
+
+async def run_blocking(provider: str, func, *args, **kwargs):
+    """Run a blocking call in the I/O thread pool, within the provider's concurrency limit."""
+    global _io_executor
+    if _io_executor is None:
+        _io_executor = ThreadPoolExecutor(max_workers=sum(PROVIDER_LIMITS.values()),
+                                          thread_name_prefix='ig-enrich')
+    async with provider_limit(provider):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_io_executor, functools.partial(func, *args, **kwargs))
+
 
 # =============================================================================
 # UTILITY FUNCTIONS
@@ -273,7 +344,7 @@ def scrape_website(url: str, timeout=10):
     try:
         if not url.startswith(("http://", "https://")):
             url = "https://" + url
-        response = requests.get(url, headers=HEADERS, timeout=timeout, allow_redirects=True)
+        response = _http_session.get(url, headers=HEADERS, timeout=timeout, allow_redirects=True)
         response.raise_for_status()
         return response.text
     except requests.RequestException:
@@ -316,6 +387,36 @@ def deep_scrape_website(base_url: str, max_pages=2) -> str:
     return "\n".join(all_html)
 
 
+async def scrape_website_async(url: str, timeout=10):
+    """Fetch website HTML without blocking the event loop (cached per URL for the run)."""
+    if url in _website_cache:
+        return _website_cache[url]
+    html = await run_blocking('web', scrape_website, url, timeout)
+    _website_cache[url] = html
+    return html
+
+
+async def deep_scrape_website_async(base_url: str, max_pages=2) -> str:
+    """Async deep_scrape_website: homepage first, remaining pages fetched concurrently."""
+    if not base_url or pd.isna(base_url):
+        return ""
+
+    if not base_url.startswith(("http://", "https://")):
+        base_url = "https://" + base_url
+
+    pages_to_check = ['/', '/about', '/contact', '/about-us']
+    urls = list(dict.fromkeys(urljoin(base_url, p) for p in pages_to_check[:max_pages]))
+
+    homepage = await scrape_website_async(urls[0])
+    # If we found Instagram link on homepage, skip other pages
+    if homepage and 'instagram.com' in homepage.lower():
+        return homepage
+
+    others = await asyncio.gather(*(scrape_website_async(u) for u in urls[1:]), return_exceptions=True)
+    pages = [homepage] + [html for html in others if isinstance(html, str)]
+    return "\n".join(html for html in pages if html)
+
+
 async def scrape_website_for_instagram(url: str, use_cache: bool = True) -> list:
     """Scrape website directly for Instagram handles (with caching)."""
     if not url:
@@ -328,7 +429,7 @@ async def scrape_website_for_instagram(url: str, use_cache: bool = True) -> list
             return cached
     
     try:
-        html = deep_scrape_website(url)
+        html = await deep_scrape_website_async(url)
         if html:
             handles = extract_instagram_handles_from_text(html)
             # Cache results if Redis is available
@@ -344,6 +445,27 @@ async def scrape_website_for_instagram(url: str, use_cache: bool = True) -> list
 # LLM API FUNCTIONS (Groq or OpenAI)
 # =============================================================================
 
+async def llm_complete(system_prompt: str, prompt: str, temperature: float = 0.3,
+                       max_tokens: int = 300, provider: str = None) -> str:
+    """One chat completion, run off the event loop within the provider's limit."""
+    provider = provider or llm_provider
+    client = groq_client if provider == "groq" else openai_client
+    response = await run_blocking(
+        provider,
+        client.chat.completions.create,
+        model=LLM_MODELS[provider],
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=temperature,
+        max_tokens=max_tokens
+    )
+    if response.choices and len(response.choices) > 0:
+        return response.choices[0].message.content.strip()
+    return ""
+
+
 async def search_with_llm(prompt: str, max_retries=3, delay=0.2):
     """Use LLM (Groq preferred, OpenAI fallback) to find Instagram handles."""
     if not llm_client:
@@ -351,43 +473,7 @@ async def search_with_llm(prompt: str, max_retries=3, delay=0.2):
     
     for attempt in range(max_retries):
         try:
-            if llm_provider == "groq":
-                # Groq API (10-20x faster)
-                response = groq_client.chat.completions.create(
-                    model="llama-3.3-70b-versatile",  # Fast and accurate (updated from deprecated llama-3.1)
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": """You are an expert at finding Instagram profiles. 
-Analyze the information and determine the most likely Instagram handle.
-Return ONLY the handle in format @username, or NOT_FOUND if you cannot determine it."""
-                        },
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.3,
-                    max_tokens=300
-                )
-            else:
-                # OpenAI API (fallback)
-                response = openai_client.chat.completions.create(
-                    model="gpt-4o",
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": """You are an expert at finding Instagram profiles. 
-Analyze the information and determine the most likely Instagram handle.
-Return ONLY the handle in format @username, or NOT_FOUND if you cannot determine it."""
-                        },
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.3,
-                    max_tokens=300
-                )
-            
-            if response.choices and len(response.choices) > 0:
-                content = response.choices[0].message.content.strip()
-                return content
-            return ""
+            return await llm_complete(INSTAGRAM_SYSTEM_PROMPT, prompt)
         except Exception as e:
             if attempt < max_retries - 1:
                 await asyncio.sleep(delay * (attempt + 1))
@@ -395,22 +481,7 @@ Return ONLY the handle in format @username, or NOT_FOUND if you cannot determine
             # If Groq fails and OpenAI is available, try OpenAI
             if llm_provider == "groq" and openai_client and attempt == max_retries - 1:
                 try:
-                    response = openai_client.chat.completions.create(
-                        model="gpt-4o",
-                        messages=[
-                            {
-                                "role": "system",
-                                "content": """You are an expert at finding Instagram profiles. 
-Analyze the information and determine the most likely Instagram handle.
-Return ONLY the handle in format @username, or NOT_FOUND if you cannot determine it."""
-                            },
-                            {"role": "user", "content": prompt}
-                        ],
-                        temperature=0.3,
-                        max_tokens=300
-                    )
-                    if response.choices and len(response.choices) > 0:
-                        return response.choices[0].message.content.strip()
+                    return await llm_complete(INSTAGRAM_SYSTEM_PROMPT, prompt, provider="openai")
                 except Exception:
                     pass
             raise
@@ -442,28 +513,10 @@ Return ONLY a JSON array of query strings, no other text:
 ["query1", "query2", "query3", ...]"""
 
     try:
-        if llm_provider == "groq":
-            response = groq_client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=[
-                    {"role": "system", "content": "You are an expert at generating web search queries. Return only valid JSON arrays."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=300
-            )
-        else:
-            response = openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": "You are an expert at generating web search queries. Return only valid JSON arrays."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=300
-            )
-        
-        content = response.choices[0].message.content.strip()
+        content = await llm_complete(
+            "You are an expert at generating web search queries. Return only valid JSON arrays.",
+            prompt, temperature=0.7
+        )
         json_match = re.search(r'\[.*?\]', content, re.DOTALL)
         if json_match:
             queries = json.loads(json_match.group())
@@ -498,28 +551,10 @@ Return ONLY a JSON array of handle patterns (without @ symbol), no other text:
 ["pattern1", "pattern2", "pattern3", ...]"""
 
     try:
-        if llm_provider == "groq":
-            response = groq_client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=[
-                    {"role": "system", "content": "You are an expert at Instagram handle patterns. Return only valid JSON arrays."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=300
-            )
-        else:
-            response = openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": "You are an expert at Instagram handle patterns. Return only valid JSON arrays."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=300
-            )
-        
-        content = response.choices[0].message.content.strip()
+        content = await llm_complete(
+            "You are an expert at Instagram handle patterns. Return only valid JSON arrays.",
+            prompt, temperature=0.7
+        )
         json_match = re.search(r'\[.*?\]', content, re.DOTALL)
         if json_match:
             patterns = json.loads(json_match.group())
@@ -622,23 +657,19 @@ async def strategy_multi_query_search(company_name: str, contact_name: str = "",
     handles = set()
     queries = await generate_search_queries(company_name, contact_name, industry)
     
-    for query in queries[:5]:
-        try:
-            prompt = f"""Search for Instagram handle using this query: "{query}"
+    prompts = [f"""Search for Instagram handle using this query: "{query}"
 
 Company: {company_name}
 Contact: {contact_name or 'N/A'}
 
 Based on web search results, what is the Instagram handle?
-Return ONLY @username or NOT_FOUND."""
-            
-            result = await search_with_llm(prompt)
-            found_handles = extract_instagram_handles_from_text(result)
-            if found_handles:
-                handles.update(found_handles)
-            await asyncio.sleep(SEARCH_DELAY)
-        except Exception:
-            continue
+Return ONLY @username or NOT_FOUND.""" for query in queries[:5]]
+
+    # Queries are independent; the provider limit paces them
+    results = await asyncio.gather(*(search_with_llm(p) for p in prompts), return_exceptions=True)
+    for result in results:
+        if isinstance(result, str):
+            handles.update(extract_instagram_handles_from_text(result))
     
     return list(handles)
 
@@ -653,7 +684,7 @@ async def strategy_deep_website_scrape(website_url: str) -> list:
     """Enhanced Strategy 3: Deep website scraping."""
     if not website_url or pd.isna(website_url):
         return []
-    html = deep_scrape_website(website_url)
+    html = await deep_scrape_website_async(website_url)
     if html:
         return extract_instagram_handles_from_text(html)
     return []
@@ -662,29 +693,25 @@ async def strategy_deep_website_scrape(website_url: str) -> list:
 async def strategy_cross_platform(linkedin_url: str, social_links: dict) -> list:
     """Enhanced Strategy 4: Cross-platform analysis."""
     handles = set()
+    urls = []
     
     if linkedin_url and pd.notna(linkedin_url):
-        try:
-            html = scrape_website(linkedin_url)
-            if html:
-                handles.update(extract_instagram_handles_from_text(html))
-        except Exception:
-            pass
+        urls.append(linkedin_url)
     
     if social_links:
         try:
             if isinstance(social_links, str):
                 social_links = json.loads(social_links)
             if 'facebook' in social_links:
-                try:
-                    html = scrape_website(social_links['facebook'])
-                    if html:
-                        handles.update(extract_instagram_handles_from_text(html))
-                except Exception:
-                    pass
+                urls.append(social_links['facebook'])
         except Exception:
             pass
     
+    pages = await asyncio.gather(*(scrape_website_async(u) for u in urls), return_exceptions=True)
+    for html in pages:
+        if isinstance(html, str):
+            handles.update(extract_instagram_handles_from_text(html))
+    
     return list(handles)
 
 
@@ -708,6 +735,35 @@ Analyze and suggest the most likely Instagram handle(s). Return ONLY @username o
         return []
 
 
+async def first_strategy_with_handles(strategies, known: set) -> list:
+    """Run strategies concurrently; return valid handles from the first one that finds
+    new handles and cancel the rest."""
+    tasks = [asyncio.ensure_future(strategy()) for strategy in strategies]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            try:
+                handles = await next_done
+            except Exception:
+                continue
+            valid = [h.lower() for h in handles if is_valid_handle(h)]
+            if set(valid) - known:
+                return valid
+        return []
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def verify_instagram_handle_async(handle: str) -> dict:
+    """verify_instagram_handle off the event loop, paced by the 'instagram' limit."""
+    async with provider_limit('instagram'):
+        loop = asyncio.get_running_loop()
+        verification = await loop.run_in_executor(None, verify_instagram_handle, handle)
+        # Rate limiting between verifications
+        await asyncio.sleep(VERIFY_DELAY)
+    return verification
+
+
 # =============================================================================
 # MAIN ENRICHMENT FUNCTION
 # =============================================================================
@@ -748,6 +804,7 @@ async def enrich_contact_instagram(row, skip_enhanced=False, verify_handles=Fals
     # 2. Check paid API if enabled (0.5s) - FAST
     if is_paid_api_enabled():
         try:
+            # Batched and cached inside; actor runs are capped by APIFY_CONCURRENCY
             paid_handles = await search_apify_instagram(page_name, website_url)
             for handle in paid_handles:
                 if is_valid_handle(handle):
@@ -832,25 +889,14 @@ Analyze and suggest the most likely Instagram handle(s). Return ONLY @username o
 
     # 7. ENHANCED SEARCH: Only if still missing and not skipped (4-8s) - SLOW
     if not skip_enhanced and len(all_handles) == len(existing_handles):
-        # Try enhanced strategies (limit to 3 most effective ones)
+        # Try enhanced strategies (limit to 3 most effective ones), concurrently;
+        # the first one to find new handles wins
         strategies = [
             lambda: strategy_deep_website_scrape(website_url),
             lambda: strategy_openai_reasoning(page_name, contact_name, company_desc, website_url),
             lambda: strategy_multi_query_search(page_name, contact_name, "real estate"),
         ]
-        
-        for strategy in strategies:
-            try:
-                handles = await strategy()
-                for handle in handles:
-                    if is_valid_handle(handle):
-                        all_handles.add(handle.lower())
-                # Early exit if we found handles
-                if len(all_handles) > len(existing_handles):
-                    break
-                await asyncio.sleep(0.1)  # Reduced delay for Groq
-            except Exception:
-                continue
+        all_handles.update(await first_strategy_with_handles(strategies, all_handles))
     
     # Cache results before returning
     handles_list = sorted(list(all_handles))[:20]
@@ -860,18 +906,14 @@ Analyze and suggest the most likely Instagram handle(s). Return ONLY @username o
     # Verify handles if requested (note: Instagram's anti-bot measures may limit effectiveness)
     if verify_handles:
         verified_handles = []
-        for handle in handles_list:
-            # Verify the handle exists
-            verification = verify_instagram_handle(handle)
+        verifications = await asyncio.gather(*(verify_instagram_handle_async(h) for h in handles_list))
+        for handle, verification in zip(handles_list, verifications):
             if verification['exists']:
                 verified_handles.append(handle)
             elif verification.get('error'):
                 # If there's an error (timeout, etc.), include it anyway (better to include than exclude on error)
                 verified_handles.append(handle)
             # If exists=False and no error, skip it (profile unavailable)
-            
-            # Rate limiting between verifications
-            await asyncio.sleep(1.5)
         
         return verified_handles
     else:
@@ -882,7 +924,9 @@ Analyze and suggest the most likely Instagram handle(s). Return ONLY @username o
 # MAIN PROCESSING
 # =============================================================================
 
-async def enrich_instagram_handles(df: pd.DataFrame, run_all: bool = False, skip_enhanced: bool = False, verify_handles: bool = False) -> pd.DataFrame:
+async def enrich_instagram_handles(df: pd.DataFrame, run_all: bool = False, skip_enhanced: bool = False,
+                                   verify_handles: bool = False, concurrency: int = None,
+                                   checkpoint_path=None) -> pd.DataFrame:
     """Enrich DataFrame with Instagram handles.
     
     Args:
@@ -890,6 +934,8 @@ async def enrich_instagram_handles(df: pd.DataFrame, run_all: bool = False, skip
         run_all: If True, process all rows; if False, process first 3 (test mode)
         skip_enhanced: If True, skip enhanced search strategies
         verify_handles: If True, verify handles exist via HTTP requests (slower but filters invalid handles)
+        concurrency: Contacts in flight at once (default: DEFAULT_CONCURRENCY)
+        checkpoint_path: If set, the DataFrame is saved here every CHECKPOINT_EVERY contacts
     """
     
     # Create backup
@@ -911,56 +957,76 @@ async def enrich_instagram_handles(df: pd.DataFrame, run_all: bool = False, skip
         print(f"\nTest mode: Processing first {len(rows_to_process)} contacts...")
         print("(Use --all to process all contacts)")
     
-    # Process in parallel batches for better performance
-    # Increased to 20 for Groq's higher rate limits (30k RPM vs OpenAI's 500 RPM)
-    BATCH_SIZE = 20 if groq_client else 3  # Process 20 contacts concurrently with Groq, 3 with OpenAI
-    found_count = 0
-    
+    concurrency = max(1, concurrency or DEFAULT_CONCURRENCY)
     rows_list = list(rows_to_process.iterrows())
     
-    # Process in batches with per-contact progress tracking
+    # Workers pull the next contact as soon as they finish one
+    queue = asyncio.Queue()
+    for item in rows_list:
+        queue.put_nowait(item)
+    
+    stats = {'done': 0, 'found': 0, 'busy_s': 0.0}
+    
+    def record(idx, row, handles):
+        """Write one contact's result into the DataFrame as soon as it's ready."""
+        stats['done'] += 1
+        page_name = row.get('page_name', '')
+        print(f"\n  [{stats['done']}/{len(rows_list)}] {page_name}")
+        
+        if isinstance(handles, Exception):
+            print(f"    ✗ Error: {str(handles)[:100]}")
+        elif handles:
+            existing = parse_instagram_handles_field(df.loc[idx, 'instagram_handles'])
+            # Merge and deduplicate (case-insensitive)
+            combined = list(set([h.lower() for h in existing + handles]))
+            df.loc[idx, 'instagram_handles'] = json.dumps(sorted(combined))
+            if len(combined) > len(existing):
+                stats['found'] += 1
+            print(f"    ✓ Found {len(handles)} new handle(s), total: {len(combined)}")
+        else:
+            print(f"    - No handles found")
+        
+        if checkpoint_path and stats['done'] % CHECKPOINT_EVERY == 0:
+            df.to_csv(checkpoint_path, index=False)
+    
+    async def worker(pbar):
+        while True:
+            try:
+                idx, row = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            started = time.perf_counter()
+            try:
+                handles = await enrich_contact_instagram(row, skip_enhanced=skip_enhanced, verify_handles=verify_handles)
+            except Exception as e:
+                handles = e
+            stats['busy_s'] += time.perf_counter() - started
+            record(idx, row, handles)
+            pbar.update(1)
+    
+    slots = min(concurrency, len(rows_list))
+    started = time.perf_counter()
     with tqdm(total=len(rows_list), desc="Enriching Instagram handles") as pbar:
-        for batch_start in range(0, len(rows_list), BATCH_SIZE):
-            batch = rows_list[batch_start:batch_start + BATCH_SIZE]
-            
-            # Process batch concurrently
-            batch_tasks = [
-                enrich_contact_instagram(row, skip_enhanced=skip_enhanced, verify_handles=verify_handles)
-                for idx, row in batch
-            ]
-            batch_results = await asyncio.gather(*batch_tasks, return_exceptions=True)
-            
-            # Update DataFrame with results
-            for (idx, row), handles in zip(batch, batch_results):
-                page_name = row.get('page_name', '')
-                pos = batch_start + batch.index((idx, row)) + 1
-                print(f"\n  [{pos}/{len(rows_list)}] {page_name}")
-                
-                if isinstance(handles, Exception):
-                    print(f"    ✗ Error: {str(handles)[:100]}")
-                    pbar.update(1)
-                    continue
-                
-                # Update instagram_handles column with all handles
-                if handles:
-                    existing = parse_instagram_handles_field(df.loc[idx, 'instagram_handles'])
-                    # Merge and deduplicate (case-insensitive)
-                    combined = list(set([h.lower() for h in existing + handles]))
-                    df.loc[idx, 'instagram_handles'] = json.dumps(sorted(combined))
-                    if len(combined) > len(existing):
-                        found_count += 1
-                    print(f"    ✓ Found {len(handles)} new handle(s), total: {len(combined)}")
-                else:
-                    print(f"    - No handles found")
-                
-                pbar.update(1)
-            
-            # Small delay between batches to avoid rate limits (only if needed)
-            if batch_start + BATCH_SIZE < len(rows_list):
-                # Groq handles rate limiting better, so minimal delay
-                await asyncio.sleep(SEARCH_DELAY)
-    
-    return df, found_count
+        await asyncio.gather(*(worker(pbar) for _ in range(slots)))
+    elapsed = time.perf_counter() - started
+    
+    if slots and elapsed > 0:
+        print(f"\n{len(rows_list)} contacts in {elapsed:.1f}s with {slots} slots "
+              f"({stats['busy_s'] / (slots * elapsed):.0%} slot utilization)")
+    
+    return df, stats['found']
+
+
+def get_int_arg(name: str, default=None):
+    """Value of an integer CLI flag like --concurrency 30 (or default)."""
+    if name in sys.argv:
+        pos = sys.argv.index(name)
+        if pos + 1 < len(sys.argv):
+            try:
+                return int(sys.argv[pos + 1])
+            except ValueError:
+                pass
+    return default
 
 
 # =============================================================================
@@ -1048,7 +1114,13 @@ async def main():
     # Check for --verify flag
     verify_handles = "--verify" in sys.argv
     
-    enriched_df, found_count = await enrich_instagram_handles(df, run_all=run_all, skip_enhanced=skip_enhanced, verify_handles=verify_handles)
+    concurrency = get_int_arg('--concurrency', DEFAULT_CONCURRENCY)
+    print(f"Concurrency: {concurrency} contacts in flight")
+    
+    enriched_df, found_count = await enrich_instagram_handles(
+        df, run_all=run_all, skip_enhanced=skip_enhanced, verify_handles=verify_handles,
+        concurrency=concurrency, checkpoint_path=input_file
+    )
     
     if verify_handles:
         print("\n⚠️  Note: Handle verification enabled. This will be slower due to HTTP requests.")
@@ -1080,6 +1152,12 @@ async def main():
         print(f"  Average handles per contact: {total_handles/len(enriched_df):.1f}")
     
     print(f"\nNew handles found in this run: {found_count}")
+    if is_paid_api_enabled():
+        usage = get_instagram_search().report()
+        print(f"Apify Instagram search: {usage['runs']} runs for {usage['queries']} queries "
+              f"({usage['cache_hits']} cached), ${usage['cost_usd']:.4f} "
+              f"(${usage['cost_per_query_usd']:.4f}/query searched), "
+              f"mean run {usage['mean_latency_seconds']:.1f}s")
     print(f"Backup saved to: {BACKUP_FILE}")
     print(f"Updated file: {INPUT_FILE}")
     
@@ -0,0 +1,224 @@
+"""
+Tests for WarmupScheduler - concurrent warm-up actions across sending accounts.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+
+LIMITS = {
+    'max_follows_per_day': 25,
+    'max_likes_per_day': 75,
+    'max_comments_per_day': 12,
+    'min_delay_seconds': 0,
+    'max_delay_seconds': 0,
+}
+
+PHASES = {
+    "1": {"action": "follow"},
+    "2": {"action": "like", "count": 2},
+    "3": {"action": "comment", "count": 1},
+    "4": {"action": "ready"},
+}
+
+
+class FakeActions:
+    """Records actions with timestamps; each call takes `latency` seconds."""
+
+    def __init__(self, name, log, latency=0.0, posts=3, fail=False):
+        self.name = name
+        self.log = log
+        self.latency = latency
+        self.posts = posts
+        self.fail = fail
+        self.lock = threading.Lock()
+
+    def _record(self, action, target):
+        time.sleep(self.latency)
+        with self.lock:
+            self.log.append((time.monotonic(), self.name, action, target))
+        return (False, 'boom') if self.fail else (True, None)
+
+    def follow(self, username):
+        return self._record('follow', username)
+
+    def like_post(self, post_url):
+        return self._record('like', post_url)
+
+    def comment(self, post_url, comment_text):
+        return self._record('comment', post_url)
+
+    def get_recent_posts(self, username, limit=5):
+        return [{'url': f'https://instagram.com/p/{username}{i}', 'caption': ''}
+                for i in range(min(limit, self.posts))]
+
+
+class FakeComments:
+    def generate_comment(self, page_name, post_caption='', post_type='image'):
+        return 'Great listing!'
+
+
+@pytest.fixture
+def tracker(tmp_path):
+    from scripts.instagram_warmup.warmup_tracker import WarmupTracker
+    return WarmupTracker(tmp_path / 'warmup_state.csv')
+
+
+def started(tracker, handles, phase=1):
+    """Add prospects and advance them to `phase`."""
+    for handle in handles:
+        tracker.add_prospect(handle, f'{handle} realty', handle)
+        for _ in range(phase):
+            tracker.advance_phase(handle)
+    return [tracker.prospects[h] for h in handles]
+
+
+def scheduler_for(tracker, accounts, limits=None, **kwargs):
+    from scripts.instagram_warmup.warmup_scheduler import WarmupScheduler
+    return WarmupScheduler(tracker, accounts, FakeComments(), PHASES, limits or LIMITS, **kwargs)
+
+
+class TestWarmupScheduler:
+    """Test queueing, pacing and budgets."""
+
+    def test_accounts_are_paced_independently(self, tracker):
+        log = []
+        accounts = {name: FakeActions(name, log) for name in ('a', 'b')}
+        limits = {**LIMITS, 'min_delay_seconds': 0.15, 'max_delay_seconds': 0.15}
+        scheduler = scheduler_for(tracker, accounts, limits)
+
+        begin = time.monotonic()
+        stats = asyncio.run(scheduler.run(started(tracker, ['p1', 'p2', 'p3', 'p4'])))
+        elapsed = time.monotonic() - begin
+
+        # Two follows per account: one gap each, run side by side
+        assert stats['follows'] == 4
+        assert 0.15 <= elapsed < 0.4
+        assert {name for _, name, _, _ in log} == {'a', 'b'}
+        for name in ('a', 'b'):
+            stamps = [t for t, n, _, _ in log if n == name]
+            assert stamps[1] - stamps[0] >= 0.14
+
+    def test_slow_account_does_not_block_others(self, tracker):
+        log = []
+        accounts = {'slow': FakeActions('slow', log, latency=0.5), 'fast': FakeActions('fast', log)}
+        scheduler = scheduler_for(tracker, accounts)
+        prospects = started(tracker, ['p1', 'p2', 'p3', 'p4'])
+        for prospect in prospects[1:]:
+            tracker.assign_account(prospect.instagram_handle, 'fast')
+            prospect.account = 'fast'
+
+        asyncio.run(scheduler.run(prospects))
+        order = [name for _, name, _, _ in log]
+        assert order == ['fast', 'fast', 'fast', 'slow']
+
+    def test_accounts_are_pinned(self, tracker):
+        accounts = {name: FakeActions(name, []) for name in ('a', 'b')}
+        asyncio.run(scheduler_for(tracker, accounts).run(started(tracker, ['p1', 'p2'])))
+        assert {tracker.prospects[h].account for h in ('p1', 'p2')} == {'a', 'b'}
+
+    def test_per_account_budgets(self, tracker):
+        log = []
+        accounts = {'a': FakeActions('a', log), 'b': FakeActions('b', log)}
+        scheduler = scheduler_for(tracker, accounts, account_limits={'a': {'max_follows_per_day': 1}})
+        stats = asyncio.run(scheduler.run(started(tracker, ['p1', 'p2', 'p3', 'p4'])))
+
+        assert stats['accounts']['a']['follows'] == 1
+        assert stats['accounts']['a']['deferred'] == 1
+        assert stats['accounts']['b']['follows'] == 2
+        # The deferred prospect stays in its phase for tomorrow
+        assert sorted(p.current_phase for p in tracker.get_prospects_by_status('in_progress')) == [1, 2, 2, 2]
+
+    def test_like_and_comment_phases(self, tracker):
+        log = []
+        prospects = started(tracker, ['liker'], phase=2) + started(tracker, ['commenter'], phase=3)
+        tracker.add_liked_post('liker', 'https://instagram.com/p/liker0')
+        prospects[0] = tracker.prospects['liker']
+
+        stats = asyncio.run(scheduler_for(tracker, {'a': FakeActions('a', log)}).run(prospects))
+
+        assert stats['likes'] == 2 and stats['comments'] == 1
+        liked = [target for _, _, action, target in log if action == 'like']
+        assert liked == ['https://instagram.com/p/liker1', 'https://instagram.com/p/liker2']
+        assert tracker.prospects['liker'].current_phase == 3
+        assert tracker.prospects['commenter'].posts_commented == ['https://instagram.com/p/commenter0']
+
+    def test_ready_and_errors(self, tracker):
+        prospects = started(tracker, ['done'], phase=4) + started(tracker, ['broken'])
+        stats = asyncio.run(scheduler_for(tracker, {'a': FakeActions('a', [], fail=True)}).run(prospects))
+
+        assert stats['ready_for_dm'] == 1 and stats['errors'] == 1
+        assert tracker.prospects['done'].status == 'ready_for_dm'
+        assert tracker.prospects['broken'].last_error == 'boom'
+        assert tracker.prospects['broken'].current_phase == 1
+
+    def test_action_limit_and_lag(self, tracker):
+        limits = {**LIMITS, 'min_delay_seconds': 0.05, 'max_delay_seconds': 0.05}
+        scheduler = scheduler_for(tracker, {'a': FakeActions('a', [])}, limits, action_limit=2)
+        stats = asyncio.run(scheduler.run(started(tracker, ['p1', 'p2', 'p3', 'p4'])))
+
+        report = stats['accounts']['a']
+        assert report['follows'] == 2 and report['deferred'] == 2
+        assert report['max_lag_seconds'] >= 0.0
+        assert report['actions_per_hour'] > 0
+
+
+class TestRunDailyWarmup:
+    """run_daily_warmup drives the scheduler."""
+
+    def test_single_account_run(self, tracker):
+        from scripts.instagram_warmup.warmup_orchestrator import run_daily_warmup
+
+        for handle in ('p1', 'p2'):
+            tracker.add_prospect(handle, handle, handle)
+        config = {'phases': PHASES, 'limits': LIMITS}
+        stats = run_daily_warmup(tracker, FakeActions('main', []), FakeComments(), config)
+
+        assert stats['follows'] == 2
+        assert stats['accounts']['main']['actions'] == 2
+        assert tracker.prospects['p1'].account == 'main'
+        assert tracker.count_by_status() == {'in_progress': 2}
+        # Not due again until the next daily run
+        assert tracker.get_due_prospects() == []
+
+    def test_rejects_actions_that_pace_themselves(self, tracker):
+        from scripts.instagram_warmup.warmup_actions import WarmupActions
+        from scripts.instagram_warmup.warmup_orchestrator import run_daily_warmup
+
+        tracker.add_prospect('p1', 'p1', 'p1')
+        config = {'phases': PHASES, 'limits': LIMITS}
+        with pytest.raises(ValueError, match='min_delay=0'):
+            run_daily_warmup(tracker, WarmupActions(dry_run=True), FakeComments(), config)
+        assert tracker.count_by_status() == {'pending': 1}
+
+    def test_builds_unpaced_actions_from_config(self, tracker):
+        from scripts.instagram_warmup.warmup_orchestrator import run_daily_warmup
+
+        tracker.add_prospect('p1', 'p1', 'p1')
+        config = {'phases': PHASES, 'limits': LIMITS, 'accounts': [{'name': 'main'}]}
+        stats = run_daily_warmup(tracker, None, FakeComments(), config, dry_run=True)
+        assert stats['follows'] == 1
+
+    def test_accounts_without_their_own_session_are_skipped(self, monkeypatch):
+        from scripts.instagram_warmup.warmup_orchestrator import build_accounts
+
+        monkeypatch.setenv('INSTAGRAM_SESSION_ID', 'MAINSESSION')
+        monkeypatch.setenv('COPY_SESSION', 'MAINSESSION')
+        monkeypatch.delenv('SECOND_SESSION', raising=False)
+        config = {'accounts': [{'name': 'main', 'session_env': 'INSTAGRAM_SESSION_ID'},
+                               {'name': 'second', 'session_env': 'SECOND_SESSION'},
+                               {'name': 'copy', 'session_env': 'COPY_SESSION'}]}
+
+        accounts = build_accounts(config)
+        assert list(accounts) == ['main']
+        assert accounts['main'].session_id == 'MAINSESSION'
+        # Dry runs touch no session, so every account is simulated
+        assert list(build_accounts(config, dry_run=True)) == ['main', 'second', 'copy']
+
+        monkeypatch.delenv('INSTAGRAM_SESSION_ID')
+        monkeypatch.delenv('COPY_SESSION')
+        with pytest.raises(ValueError, match='session'):
+            build_accounts(config)
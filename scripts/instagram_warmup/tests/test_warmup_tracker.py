@@ -98,9 +98,10 @@ class TestWarmupTracker:
         """Create a temporary CSV file for testing."""
         with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
             yield Path(f.name)
-        # Cleanup
-        if os.path.exists(f.name):
-            os.unlink(f.name)
+        # Cleanup (state CSV and its SQLite store)
+        for path in (f.name, str(Path(f.name).with_suffix('.db'))):
+            if os.path.exists(path):
+                os.unlink(path)
 
     def test_tracker_creates_file_if_missing(self, temp_csv_path):
         """Test that tracker creates CSV file if it doesn't exist."""
@@ -329,3 +330,73 @@ class TestWarmupTracker:
             assert 'reepequity' in tracker.prospects or 'timellis' in tracker.prospects
         finally:
             prospects_path.unlink()
+
+
+class TestWarmupStore:
+    """Test the SQLite store behind WarmupTracker."""
+
+    @pytest.fixture
+    def state_csv(self, tmp_path):
+        return tmp_path / 'warmup_state.csv'
+
+    def test_actions_persist_without_save(self, state_csv):
+        """Each tracker call is committed on its own (crash-safe)."""
+        from scripts.instagram_warmup.warmup_tracker import WarmupTracker
+
+        tracker = WarmupTracker(state_csv)
+        tracker.add_prospect('test', 'Test Co', 'Test')
+        tracker.advance_phase('test')
+        tracker.add_liked_post('test', 'https://post1')
+        tracker.add_liked_post('test', 'https://post1')
+        tracker.add_comment('test', 'https://post2', 'Great listing!')
+
+        reloaded = WarmupTracker(state_csv).prospects['test']
+        assert reloaded.likes_completed == 1
+        assert reloaded.posts_liked == ['https://post1']
+        assert reloaded.posts_commented == ['https://post2']
+        assert state_csv.with_suffix('.db').exists()
+
+    def test_unknown_handles_are_ignored(self, state_csv):
+        from scripts.instagram_warmup.warmup_tracker import WarmupTracker
+
+        tracker = WarmupTracker(state_csv)
+        tracker.add_liked_post('ghost', 'https://post1')
+        tracker.set_error('ghost', 'boom')
+        assert 'ghost' not in tracker.prospects
+        assert len(tracker.prospects) == 0
+
+    def test_legacy_csv_is_imported_once(self, state_csv):
+        """An existing state CSV seeds a new database, JSON post lists included."""
+        from scripts.instagram_warmup.warmup_tracker import WarmupTracker
+
+        state_csv.write_text(
+            'instagram_handle,page_name,contact_name,current_phase,status,likes_completed,comments_completed,'
+            'posts_liked,posts_commented,warmup_start_date,followed_at,last_error,retry_count\n'
+            'JohnDoe,John Realty,John,3,in_progress,2,0,"[""u1"", ""u2""]",[],2025-01-01T10:00:00,,,0\n'
+        )
+        tracker = WarmupTracker(state_csv)
+        state = tracker.prospects['johndoe']
+        assert state.posts_liked == ['u1', 'u2']
+        assert state.last_error is None and state.page_name == 'John Realty'
+
+        # The database is now the source of truth
+        tracker.update_status('johndoe', 'ready_for_dm')
+        tracker.save()
+        assert WarmupTracker(state_csv).count_by_status() == {'ready_for_dm': 1}
+
+    def test_due_prospects(self, state_csv):
+        """Started prospects are due now; later phases wait PHASE_INTERVAL."""
+        from scripts.instagram_warmup.warmup_tracker import WarmupTracker, PHASE_INTERVAL
+
+        tracker = WarmupTracker(state_csv)
+        for handle in ('a', 'b', 'c'):
+            tracker.add_prospect(handle, handle, handle)
+        tracker.advance_phase('a')
+        tracker.advance_phase('b')
+        tracker.advance_phase('b')
+
+        assert [p.instagram_handle for p in tracker.get_due_prospects()] == ['a']
+        later = datetime.now() + PHASE_INTERVAL + timedelta(minutes=1)
+        assert [p.instagram_handle for p in tracker.get_due_prospects(later)] == ['a', 'b']
+        assert len(tracker.get_due_prospects(later, limit=1)) == 1
+        assert tracker.count_by_status() == {'in_progress': 2, 'pending': 1}
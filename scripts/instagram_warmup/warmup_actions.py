@@ -33,7 +33,8 @@ POST_SCRAPER_ACTOR_ID = os.getenv('APIFY_POST_SCRAPER_ID', 'apify/instagram-post
 class WarmupActions:
     """Handles Instagram warm-up actions via Apify."""
 
-    def __init__(self, dry_run: bool = False, min_delay: float = 30.0, max_delay: float = 120.0):
+    def __init__(self, dry_run: bool = False, min_delay: float = 30.0, max_delay: float = 120.0,
+                 session_id: Optional[str] = None):
         """
         Initialize WarmupActions.
 
@@ -41,10 +42,13 @@ class WarmupActions:
             dry_run: If True, don't actually call Apify APIs
             min_delay: Minimum delay between actions (seconds)
             max_delay: Maximum delay between actions (seconds)
+            session_id: Instagram session of the sending account
+                (default: INSTAGRAM_SESSION_ID)
         """
         self.dry_run = dry_run
         self.min_delay = min_delay
         self.max_delay = max_delay
+        self.session_id = session_id
         self.client = self._get_apify_client()
         self._last_action_time = 0
 
@@ -61,8 +65,8 @@ class WarmupActions:
         return ApifyClient(token)
 
     def _get_instagram_session(self) -> Optional[str]:
-        """Get Instagram session ID from environment."""
-        return os.getenv('INSTAGRAM_SESSION_ID')
+        """Get Instagram session ID (explicit, else from environment)."""
+        return self.session_id or os.getenv('INSTAGRAM_SESSION_ID')
 
     def _build_cookies_array(self) -> List[Dict]:
         """Build cookies array for Apify actors."""
@@ -18,14 +18,14 @@ Usage:
 import os
 import sys
 import json
+import asyncio
 import argparse
 import logging
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 
 from dotenv import load_dotenv
-from tqdm import tqdm
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -33,6 +33,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from scripts.instagram_warmup.warmup_tracker import WarmupTracker, WarmupState
 from scripts.instagram_warmup.warmup_actions import WarmupActions
 from scripts.instagram_warmup.comment_generator import CommentGenerator
+from scripts.instagram_warmup.warmup_scheduler import WarmupScheduler
 
 load_dotenv()
 
@@ -54,6 +55,9 @@ CONFIG_DIR = BASE_DIR / 'config'
 STATE_FILE = CONFIG_DIR / 'warmup_state.csv'
 CONFIG_FILE = CONFIG_DIR / 'warmup_config.json'
 
+# Account name used when run_daily_warmup gets a single WarmupActions
+DEFAULT_ACCOUNT = 'main'
+
 # Default configuration
 DEFAULT_CONFIG = {
     "phases": {
@@ -71,7 +75,12 @@ DEFAULT_CONFIG = {
         "max_comments_per_day": 12,
         "min_delay_seconds": 30,
         "max_delay_seconds": 120
-    }
+    },
+    # Sending accounts, each with its own daily limits (optional "limits"
+    # overrides) and Instagram session taken from `session_env`
+    "accounts": [
+        {"name": "main", "session_env": "INSTAGRAM_SESSION_ID"}
+    ]
 }
 
 
@@ -105,9 +114,42 @@ def init_warmup(csv_path: Path, tracker: WarmupTracker) -> int:
     return count
 
 
+def build_accounts(config: Dict, dry_run: bool = False) -> Dict[str, WarmupActions]:
+    """One WarmupActions per configured sending account.
+
+    Pacing is left to the scheduler, so the actions themselves don't sleep.
+    Outside dry-run, an account whose session_env is unset, or whose session
+    is already used by an earlier account, is skipped: it would otherwise act
+    on that other session with a second full daily budget.
+
+    Raises:
+        ValueError: If no account has an Instagram session of its own
+    """
+    accounts = {}
+    sessions = {}
+    for account in config.get('accounts', DEFAULT_CONFIG['accounts']):
+        name = account['name']
+        session_env = account.get('session_env', 'INSTAGRAM_SESSION_ID')
+        session_id = os.getenv(session_env)
+        if not dry_run:
+            if not session_id:
+                logger.warning(f"Account {name}: {session_env} not set, skipping")
+                continue
+            if session_id in sessions:
+                logger.warning(f"Account {name}: same session as {sessions[session_id]}, skipping")
+                continue
+            sessions[session_id] = name
+        accounts[name] = WarmupActions(
+            dry_run=dry_run, min_delay=0, max_delay=0, session_id=session_id
+        )
+    if not accounts:
+        raise ValueError("No warm-up account has an Instagram session; set each account's session_env")
+    return accounts
+
+
 def run_daily_warmup(
     tracker: WarmupTracker,
-    actions: WarmupActions,
+    actions: Union[None, WarmupActions, Dict[str, WarmupActions]],
     comment_gen: CommentGenerator,
     config: Dict,
     limit: Optional[int] = None,
@@ -116,133 +158,52 @@ def run_daily_warmup(
     """
     Run daily warm-up actions for all prospects.
 
-    Returns summary of actions taken.
-    """
-    stats = {
-        'follows': 0,
-        'likes': 0,
-        'comments': 0,
-        'errors': 0,
-        'ready_for_dm': 0
-    }
+    `actions` is one WarmupActions or a dict of them keyed by sending
+    account (None builds them from config via build_accounts); accounts
+    work through their queues concurrently (see WarmupScheduler). The
+    scheduler does all pacing, so actions must be built with
+    min_delay=0, max_delay=0.
 
+    Returns summary of actions taken, with per-account throughput and
+    queue lag under 'accounts'.
+
+    Raises:
+        ValueError: If any actions sleep between calls themselves
+    """
     limits = config.get('limits', DEFAULT_CONFIG['limits'])
     phases = config.get('phases', DEFAULT_CONFIG['phases'])
+    if actions is None:
+        actions = build_accounts(config, dry_run=dry_run)
+    elif not isinstance(actions, dict):
+        actions = {DEFAULT_ACCOUNT: actions}
+    for name, account_actions in actions.items():
+        if getattr(account_actions, 'min_delay', 0) or getattr(account_actions, 'max_delay', 0):
+            raise ValueError(
+                f"Account {name}: WarmupActions delays would stack on the scheduler's; "
+                f"create it with min_delay=0, max_delay=0 (see build_accounts)"
+            )
+    account_limits = {a['name']: a.get('limits', {}) for a in config.get('accounts', [])}
+
+    scheduler = WarmupScheduler(
+        tracker, actions, comment_gen, phases, limits,
+        account_limits=account_limits, action_limit=limit
+    )
 
-    # Get in-progress prospects
-    in_progress = tracker.get_prospects_by_status('in_progress')
+    # Get in-progress prospects whose next phase is due
+    in_progress = tracker.get_due_prospects()
     pending = tracker.get_prospects_by_status('pending')
 
-    # Start some pending prospects
-    max_new = limits['max_follows_per_day'] - stats['follows']
+    # Start some pending prospects (every account has its own follow budget)
+    max_new = sum(a.limits['max_follows_per_day'] for a in scheduler.accounts.values())
     for prospect in pending[:max_new]:
-        if limit and (stats['follows'] + stats['likes'] + stats['comments']) >= limit:
-            break
-
-        # Start warm-up for this prospect
         tracker.advance_phase(prospect.instagram_handle)
         in_progress.append(tracker.prospects[prospect.instagram_handle])
 
     # Process in-progress prospects
     prospects_to_process = in_progress[:limit] if limit else in_progress
+    stats = asyncio.run(scheduler.run(prospects_to_process))
 
-    for prospect in tqdm(prospects_to_process, desc="Processing warm-up", unit="prospect"):
-        if limit and (stats['follows'] + stats['likes'] + stats['comments']) >= limit:
-            break
-
-        phase = prospect.current_phase
-        phase_config = phases.get(str(phase), {})
-        action = phase_config.get('action', 'ready')
-
-        logger.info(f"[{prospect.instagram_handle}] Phase {phase}: {phase_config.get('description', action)}")
-
-        try:
-            if action == 'follow':
-                if stats['follows'] < limits['max_follows_per_day']:
-                    if not prospect.followed_at:
-                        success, error = actions.follow(prospect.instagram_handle)
-                        if success:
-                            tracker.mark_followed(prospect.instagram_handle)
-                            stats['follows'] += 1
-                        else:
-                            tracker.set_error(prospect.instagram_handle, error)
-                            stats['errors'] += 1
-                            continue
-
-                    # Advance to next phase
-                    tracker.advance_phase(prospect.instagram_handle)
-
-            elif action == 'like':
-                count = phase_config.get('count', 1)
-                posts = actions.get_recent_posts(prospect.instagram_handle, limit=10)
-
-                liked = 0
-                for post in posts:
-                    if liked >= count:
-                        break
-                    if stats['likes'] >= limits['max_likes_per_day']:
-                        break
-                    if post['url'] in prospect.posts_liked:
-                        continue
-
-                    success, error = actions.like_post(post['url'])
-                    if success:
-                        tracker.add_liked_post(prospect.instagram_handle, post['url'])
-                        stats['likes'] += 1
-                        liked += 1
-                    else:
-                        tracker.set_error(prospect.instagram_handle, error)
-                        stats['errors'] += 1
-
-                if liked >= count:
-                    tracker.advance_phase(prospect.instagram_handle)
-
-            elif action == 'comment':
-                count = phase_config.get('count', 1)
-                posts = actions.get_recent_posts(prospect.instagram_handle, limit=10)
-
-                commented = 0
-                for post in posts:
-                    if commented >= count:
-                        break
-                    if stats['comments'] >= limits['max_comments_per_day']:
-                        break
-                    if post['url'] in prospect.posts_commented:
-                        continue
-                    if post['url'] in prospect.posts_liked:
-                        # Prefer posts we haven't interacted with
-                        continue
-
-                    # Generate comment
-                    comment = comment_gen.generate_comment(
-                        page_name=prospect.page_name,
-                        post_caption=post.get('caption', ''),
-                        post_type='image'
-                    )
-
-                    success, error = actions.comment(post['url'], comment)
-                    if success:
-                        tracker.add_comment(prospect.instagram_handle, post['url'], comment)
-                        stats['comments'] += 1
-                        commented += 1
-                    else:
-                        tracker.set_error(prospect.instagram_handle, error)
-                        stats['errors'] += 1
-
-                if commented >= count or phase_config.get('optional', False):
-                    tracker.advance_phase(prospect.instagram_handle)
-
-            elif action == 'ready':
-                tracker.update_status(prospect.instagram_handle, 'ready_for_dm')
-                stats['ready_for_dm'] += 1
-                logger.info(f"[{prospect.instagram_handle}] Ready for DM!")
-
-        except Exception as e:
-            logger.error(f"Error processing {prospect.instagram_handle}: {e}")
-            tracker.set_error(prospect.instagram_handle, str(e))
-            stats['errors'] += 1
-
-    # Save state
+    # Refresh the CSV export (each action is already committed)
     tracker.save()
 
     return stats
@@ -444,21 +405,19 @@ def mark_daily_done(tracker: WarmupTracker, config: Dict):
 
 def print_status(tracker: WarmupTracker):
     """Print warm-up status summary."""
-    pending = tracker.get_prospects_by_status('pending')
+    counts = tracker.count_by_status()
     in_progress = tracker.get_prospects_by_status('in_progress')
     ready = tracker.get_prospects_by_status('ready_for_dm')
-    dm_sent = tracker.get_prospects_by_status('dm_sent')
-    failed = tracker.get_prospects_by_status('failed')
 
     print("\n" + "=" * 60)
     print("INSTAGRAM WARM-UP STATUS")
     print("=" * 60)
-    print(f"Total prospects:    {len(tracker.prospects)}")
-    print(f"Pending:            {len(pending)}")
+    print(f"Total prospects:    {sum(counts.values())}")
+    print(f"Pending:            {counts.get('pending', 0)}")
     print(f"In Progress:        {len(in_progress)}")
     print(f"Ready for DM:       {len(ready)}")
-    print(f"DM Sent:            {len(dm_sent)}")
-    print(f"Failed:             {len(failed)}")
+    print(f"DM Sent:            {counts.get('dm_sent', 0)}")
+    print(f"Failed:             {counts.get('failed', 0)}")
     print("=" * 60)
 
     # Show phase breakdown for in-progress
@@ -548,12 +507,11 @@ Examples:
         if args.dry_run:
             print("MODE: DRY RUN (no actions will be executed)\n")
 
-        limits = config.get('limits', DEFAULT_CONFIG['limits'])
-        actions = WarmupActions(
-            dry_run=args.dry_run,
-            min_delay=limits['min_delay_seconds'],
-            max_delay=limits['max_delay_seconds']
-        )
+        try:
+            actions = build_accounts(config, dry_run=args.dry_run)
+        except ValueError as e:
+            print(f"ERROR: {e}")
+            sys.exit(1)
         comment_gen = CommentGenerator()
 
         print(f"Running daily warm-up...")
@@ -574,6 +532,12 @@ Examples:
         print(f"Comments:      {stats['comments']}")
         print(f"Ready for DM:  {stats['ready_for_dm']}")
         print(f"Errors:        {stats['errors']}")
+        print("-" * 60)
+        for name, report in stats['accounts'].items():
+            print(f"@{name}: {report['actions']} actions "
+                  f"({report['actions_per_hour']}/h), "
+                  f"queue lag avg {report['mean_lag_seconds']}s / max {report['max_lag_seconds']}s, "
+                  f"{report['deferred']} deferred, {report['errors']} errors")
         print("=" * 60)
 
     elif args.manual:
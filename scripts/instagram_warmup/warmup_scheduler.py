@@ -0,0 +1,321 @@
+"""
+WarmupScheduler - Event-driven warm-up actions across several sending accounts.
+
+Each sending account has its own priority queue of due actions (follow, like
+or comment for the prospect's current phase), its own daily budget and its
+own randomized gap between actions. Accounts are drained by independent
+coroutines and every Apify actor call (and comment generation) runs off the
+event loop, so one account waiting out its gap or on a slow actor run never
+holds up another.
+
+Recent posts for upcoming like/comment actions are fetched a few queue
+entries ahead, concurrently, so the scraper run is usually done by the time
+the account gets to the prospect.
+
+Per-account throughput and queue lag (how long a due action waited for its
+account) are reported with the run stats.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from scripts.instagram_warmup.warmup_tracker import WarmupTracker, WarmupState
+from scripts.instagram_warmup.warmup_actions import WarmupActions
+from scripts.instagram_warmup.comment_generator import CommentGenerator
+
+logger = logging.getLogger(__name__)
+
+# action -> (stats counter, daily limit key)
+BUDGETS = {
+    'follow': ('follows', 'max_follows_per_day'),
+    'like': ('likes', 'max_likes_per_day'),
+    'comment': ('comments', 'max_comments_per_day'),
+}
+
+# Queue entries per account whose posts are fetched ahead of time
+PREFETCH_AHEAD = 3
+
+# Concurrent post-scraper runs across all accounts
+MAX_POST_FETCHES = 4
+
+# Posts fetched per prospect for like/comment phases
+POSTS_PER_PROSPECT = 10
+
+
+@dataclass(order=True)
+class ScheduledAction:
+    """A prospect's phase action, ordered by due time then priority."""
+
+    due_at: float
+    priority: int
+    seq: int
+    handle: str = field(compare=False)
+    phase: int = field(compare=False)
+    action: str = field(compare=False)
+    started: bool = field(default=False, compare=False)
+
+
+class Account:
+    """One sending account: its queue, budget, pacing and counters."""
+
+    def __init__(self, name: str, actions: WarmupActions, limits: Dict):
+        self.name = name
+        self.actions = actions
+        self.limits = limits
+        self.queue: List[ScheduledAction] = []
+        self.next_free_at = 0.0
+        self.counts = {'follows': 0, 'likes': 0, 'comments': 0, 'errors': 0}
+        self.lags: List[float] = []
+        self.deferred = 0
+
+    def has_budget(self, action: str) -> bool:
+        counter, limit_key = BUDGETS[action]
+        return self.counts[counter] < self.limits[limit_key]
+
+    def gap(self) -> float:
+        """Randomized delay before this account's next action."""
+        return random.uniform(self.limits['min_delay_seconds'], self.limits['max_delay_seconds'])
+
+    def report(self, elapsed: float) -> Dict:
+        """Throughput and queue lag for this account."""
+        actions = self.counts['follows'] + self.counts['likes'] + self.counts['comments']
+        return {
+            **self.counts,
+            'actions': actions,
+            'actions_per_hour': round(actions * 3600 / elapsed, 1) if elapsed > 0 else 0.0,
+            'mean_lag_seconds': round(sum(self.lags) / len(self.lags), 1) if self.lags else 0.0,
+            'max_lag_seconds': round(max(self.lags), 1) if self.lags else 0.0,
+            'deferred': self.deferred,
+        }
+
+
+class WarmupScheduler:
+    """Runs one day of warm-up actions for a set of sending accounts."""
+
+    def __init__(
+        self,
+        tracker: WarmupTracker,
+        accounts: Dict[str, WarmupActions],
+        comment_gen: CommentGenerator,
+        phases: Dict,
+        limits: Dict,
+        account_limits: Optional[Dict[str, Dict]] = None,
+        action_limit: Optional[int] = None
+    ):
+        """
+        Args:
+            tracker: Warm-up state store
+            accounts: Account name -> WarmupActions for that account's session
+            comment_gen: Comment generator for comment phases
+            phases: Phase config (see warmup_orchestrator.DEFAULT_CONFIG)
+            limits: Daily limits and delays applied to every account
+            account_limits: Per-account overrides of `limits`
+            action_limit: Stop after this many follows/likes/comments in total
+        """
+        account_limits = account_limits or {}
+        self.tracker = tracker
+        self.comment_gen = comment_gen
+        self.phases = phases
+        self.accounts = {
+            name: Account(name, actions, {**limits, **account_limits.get(name, {})})
+            for name, actions in accounts.items()
+        }
+        self.action_limit = action_limit
+        self.actions_taken = 0
+        self.stats = {'follows': 0, 'likes': 0, 'comments': 0, 'errors': 0, 'ready_for_dm': 0}
+        self._seq = itertools.count()
+        self._prospects: Dict[str, WarmupState] = {}
+        self._posts: Dict[str, asyncio.Task] = {}
+        self._fetch_slots: Optional[asyncio.Semaphore] = None
+
+    # -------------------------------------------------------------------------
+    # Queueing
+    # -------------------------------------------------------------------------
+
+    def assign(self, prospect: WarmupState) -> Account:
+        """The prospect's pinned account, else the least loaded one (pinned from now on)."""
+        if prospect.account in self.accounts:
+            return self.accounts[prospect.account]
+        account = min(self.accounts.values(), key=lambda a: len(a.queue))
+        self.tracker.assign_account(prospect.instagram_handle, account.name)
+        prospect.account = account.name
+        return account
+
+    def enqueue(self, prospect: WarmupState, due_at: float):
+        """Queue the prospect's current phase action on its account."""
+        phase = prospect.current_phase
+        action = self.phases.get(str(phase), {}).get('action', 'ready')
+
+        if action == 'ready':
+            self.tracker.update_status(prospect.instagram_handle, 'ready_for_dm')
+            self.stats['ready_for_dm'] += 1
+            logger.info(f"[{prospect.instagram_handle}] Ready for DM!")
+            return
+
+        account = self.assign(prospect)
+        self._prospects[prospect.instagram_handle] = prospect
+        # Prospects further along the sequence go first
+        heapq.heappush(account.queue, ScheduledAction(
+            due_at, -phase, next(self._seq), prospect.instagram_handle, phase, action
+        ))
+
+    def _prefetch(self, account: Account):
+        """Start post fetches for the next few like/comment actions on this account."""
+        for job in heapq.nsmallest(PREFETCH_AHEAD, account.queue):
+            if job.action in ('like', 'comment') and account.has_budget(job.action):
+                self._fetch_posts(account, job.handle)
+
+    def _fetch_posts(self, account: Account, handle: str) -> asyncio.Task:
+        if handle not in self._posts:
+            async def fetch():
+                async with self._fetch_slots:
+                    return await asyncio.to_thread(
+                        account.actions.get_recent_posts, handle, limit=POSTS_PER_PROSPECT
+                    )
+            self._posts[handle] = asyncio.create_task(fetch())
+        return self._posts[handle]
+
+    # -------------------------------------------------------------------------
+    # Execution
+    # -------------------------------------------------------------------------
+
+    def _limit_reached(self) -> bool:
+        return self.action_limit is not None and self.actions_taken >= self.action_limit
+
+    def _can_act(self, account: Account, action: str) -> bool:
+        return account.has_budget(action) and not self._limit_reached()
+
+    async def _act(self, account: Account, job: ScheduledAction, func, *args):
+        """Run one account action once the account's gap has passed."""
+        delay = account.next_free_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        started = time.monotonic()
+        if not job.started:
+            job.started = True
+            account.lags.append(max(0.0, started - job.due_at))
+        account.next_free_at = started + account.gap()
+        self.actions_taken += 1
+        return await asyncio.to_thread(func, *args)
+
+    def _count(self, account: Account, counter: str):
+        account.counts[counter] += 1
+        self.stats[counter] += 1
+
+    def _error(self, account: Account, handle: str, error: str):
+        self.tracker.set_error(handle, error)
+        self._count(account, 'errors')
+
+    async def _execute(self, account: Account, job: ScheduledAction):
+        """Carry out one prospect's phase action (same rules as the sequential run)."""
+        handle = job.handle
+        prospect = self._prospects[handle]
+        phase_config = self.phases.get(str(job.phase), {})
+        actions = account.actions
+
+        if not self._can_act(account, job.action):
+            account.deferred += 1
+            return
+
+        logger.info(f"[{account.name}] [{handle}] Phase {job.phase}: "
+                    f"{phase_config.get('description', job.action)}")
+
+        if job.action == 'follow':
+            if not prospect.followed_at:
+                success, error = await self._act(account, job, actions.follow, handle)
+                if not success:
+                    self._error(account, handle, error)
+                    return
+                self.tracker.mark_followed(handle)
+                self._count(account, 'follows')
+            self.tracker.advance_phase(handle)
+            return
+
+        count = phase_config.get('count', 1)
+        posts = await self._fetch_posts(account, handle)
+        done = 0
+
+        for post in posts:
+            if done >= count or not self._can_act(account, job.action):
+                break
+
+            if job.action == 'like':
+                if post['url'] in prospect.posts_liked:
+                    continue
+                success, error = await self._act(account, job, actions.like_post, post['url'])
+                if success:
+                    self.tracker.add_liked_post(handle, post['url'])
+                    self._count(account, 'likes')
+                    done += 1
+                else:
+                    self._error(account, handle, error)
+
+            else:
+                if post['url'] in prospect.posts_commented:
+                    continue
+                if post['url'] in prospect.posts_liked:
+                    # Prefer posts we haven't interacted with
+                    continue
+                comment = await asyncio.to_thread(
+                    self.comment_gen.generate_comment,
+                    page_name=prospect.page_name,
+                    post_caption=post.get('caption', ''),
+                    post_type='image'
+                )
+                success, error = await self._act(account, job, actions.comment, post['url'], comment)
+                if success:
+                    self.tracker.add_comment(handle, post['url'], comment)
+                    self._count(account, 'comments')
+                    done += 1
+                else:
+                    self._error(account, handle, error)
+
+        if done >= count or (job.action == 'comment' and phase_config.get('optional', False)):
+            self.tracker.advance_phase(handle)
+
+    async def _drain(self, account: Account):
+        """Work through one account's queue in due/priority order."""
+        while account.queue:
+            if self._limit_reached():
+                account.deferred += len(account.queue)
+                account.queue.clear()
+                break
+
+            self._prefetch(account)
+            job = heapq.heappop(account.queue)
+            delay = job.due_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            try:
+                await self._execute(account, job)
+            except Exception as e:
+                logger.error(f"[{account.name}] Error processing {job.handle}: {e}")
+                self._error(account, job.handle, str(e))
+
+    async def run(self, prospects: List[WarmupState]) -> Dict:
+        """Queue the prospects' due actions and drain every account concurrently.
+
+        Returns the run stats, with a per-account report under 'accounts'.
+        """
+        self._fetch_slots = asyncio.Semaphore(MAX_POST_FETCHES)
+        started = time.monotonic()
+        for prospect in prospects:
+            self.enqueue(prospect, started)
+
+        try:
+            await asyncio.gather(*(self._drain(account) for account in self.accounts.values()))
+        finally:
+            for task in self._posts.values():
+                task.cancel()
+
+        elapsed = time.monotonic() - started
+        self.stats['elapsed_seconds'] = round(elapsed, 1)
+        self.stats['accounts'] = {name: account.report(elapsed) for name, account in self.accounts.items()}
+        return self.stats
@@ -5,19 +5,62 @@ Tracks warm-up progress per prospect:
 - Current phase (day 1-7)
 - Actions completed (follow, likes, comments)
 - Status (pending, in_progress, ready_for_dm, dm_sent, failed)
+
+State lives in SQLite next to the state CSV (warmup_state.csv ->
+warmup_state.db): one row per prospect with indexed status / phase /
+next_action_at columns, and liked/commented posts in their own table. Every
+tracker call is a single small transaction, so a crash mid-run loses at most
+the action in flight. The CSV is an export (save()) and, for an existing
+CSV without a database yet, the one-time import source.
 """
 
-import os
 import json
 import logging
+import sqlite3
+from collections.abc import Mapping
+from contextlib import contextmanager
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 from dataclasses import dataclass, field, asdict
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+# Minimum gap between phases: one phase per daily run, with slack for runs
+# that start a little earlier than the day before
+PHASE_INTERVAL = timedelta(hours=20)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS prospects (
+    instagram_handle TEXT PRIMARY KEY,
+    page_name TEXT NOT NULL DEFAULT '',
+    contact_name TEXT NOT NULL DEFAULT '',
+    current_phase INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'pending',
+    warmup_start_date TEXT,
+    followed_at TEXT,
+    likes_completed INTEGER NOT NULL DEFAULT 0,
+    comments_completed INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    retry_count INTEGER NOT NULL DEFAULT 0,
+    next_action_at TEXT,
+    account TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_prospects_status ON prospects(status, next_action_at);
+CREATE INDEX IF NOT EXISTS idx_prospects_phase ON prospects(current_phase);
+CREATE INDEX IF NOT EXISTS idx_prospects_next_action ON prospects(next_action_at);
+
+CREATE TABLE IF NOT EXISTS post_interactions (
+    instagram_handle TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    post_url TEXT NOT NULL,
+    comment_text TEXT,
+    created_at TEXT NOT NULL,
+    PRIMARY KEY (instagram_handle, kind, post_url)
+);
+"""
+
 
 @dataclass
 class WarmupState:
@@ -44,14 +87,17 @@ class WarmupState:
     last_error: Optional[str] = None
     retry_count: int = 0
 
+    # Scheduling
+    next_action_at: Optional[datetime] = None
+    account: Optional[str] = None  # Sending account that engages this prospect
+
     def to_dict(self) -> Dict:
         """Convert to dictionary for CSV storage."""
         data = asdict(self)
         # Convert datetime to ISO string
-        if self.warmup_start_date:
-            data['warmup_start_date'] = self.warmup_start_date.isoformat()
-        if self.followed_at:
-            data['followed_at'] = self.followed_at.isoformat()
+        for key in ('warmup_start_date', 'followed_at', 'next_action_at'):
+            if getattr(self, key):
+                data[key] = getattr(self, key).isoformat()
         # Convert lists to JSON strings
         data['posts_liked'] = json.dumps(self.posts_liked)
         data['posts_commented'] = json.dumps(self.posts_commented)
@@ -67,19 +113,14 @@ class WarmupState:
         retry_count = int(data.get('retry_count', 0) or 0)
 
         # Parse datetime fields
-        warmup_start_date = None
-        if data.get('warmup_start_date'):
-            try:
-                warmup_start_date = datetime.fromisoformat(str(data['warmup_start_date']))
-            except (ValueError, TypeError):
-                pass
-
-        followed_at = None
-        if data.get('followed_at'):
-            try:
-                followed_at = datetime.fromisoformat(str(data['followed_at']))
-            except (ValueError, TypeError):
-                pass
+        dates = {}
+        for key in ('warmup_start_date', 'followed_at', 'next_action_at'):
+            dates[key] = None
+            if data.get(key):
+                try:
+                    dates[key] = datetime.fromisoformat(str(data[key]))
+                except (ValueError, TypeError):
+                    pass
 
         # Parse JSON list fields
         posts_liked = []
@@ -102,17 +143,56 @@ class WarmupState:
             contact_name=str(data.get('contact_name', '')),
             current_phase=current_phase,
             status=str(data.get('status', 'pending')),
-            warmup_start_date=warmup_start_date,
-            followed_at=followed_at,
+            warmup_start_date=dates['warmup_start_date'],
+            followed_at=dates['followed_at'],
             likes_completed=likes_completed,
             posts_liked=posts_liked,
             comments_completed=comments_completed,
             posts_commented=posts_commented,
             last_error=data.get('last_error') if data.get('last_error') else None,
-            retry_count=retry_count
+            retry_count=retry_count,
+            next_action_at=dates['next_action_at'],
+            account=data.get('account') if data.get('account') else None
         )
 
 
+
+
+class ProspectView(Mapping):
+    """Read-only handle -> WarmupState mapping backed by the tracker's database.
+
+    Each lookup reads current state, so values are snapshots; change state
+    through the tracker methods.
+    """
+
+    def __init__(self, tracker: 'WarmupTracker'):
+        self._tracker = tracker
+
+    def __getitem__(self, handle: str) -> WarmupState:
+        states = self._tracker._select("instagram_handle = ?", (handle,))
+        if not states:
+            raise KeyError(handle)
+        return states[0]
+
+    def __contains__(self, handle) -> bool:
+        with self._tracker._transaction() as conn:
+            return conn.execute(
+                "SELECT 1 FROM prospects WHERE instagram_handle = ?", (handle,)
+            ).fetchone() is not None
+
+    def __iter__(self) -> Iterator[str]:
+        with self._tracker._transaction() as conn:
+            rows = conn.execute("SELECT instagram_handle FROM prospects ORDER BY rowid").fetchall()
+        return iter([r[0] for r in rows])
+
+    def __len__(self) -> int:
+        with self._tracker._transaction() as conn:
+            return conn.execute("SELECT COUNT(*) FROM prospects").fetchone()[0]
+
+    def values(self) -> List[WarmupState]:
+        return self._tracker._select()
+
+
 class WarmupTracker:
     """Manages warm-up state for all prospects."""
 
@@ -120,32 +200,128 @@ class WarmupTracker:
         'instagram_handle', 'page_name', 'contact_name',
         'current_phase', 'status', 'warmup_start_date', 'followed_at',
         'likes_completed', 'posts_liked', 'comments_completed', 'posts_commented',
-        'last_error', 'retry_count'
+        'last_error', 'retry_count', 'next_action_at', 'account'
     ]
 
-    def __init__(self, csv_path: Path):
-        """Initialize tracker with CSV file path."""
+    PROSPECT_COLUMNS = [
+        'instagram_handle', 'page_name', 'contact_name', 'current_phase', 'status',
+        'warmup_start_date', 'followed_at', 'likes_completed', 'comments_completed',
+        'last_error', 'retry_count', 'next_action_at', 'account'
+    ]
+
+    def __init__(self, csv_path: Path, db_path: Optional[Path] = None):
+        """Initialize tracker with the state CSV path (database defaults to its .db sibling)."""
         self.csv_path = Path(csv_path)
-        self.prospects: Dict[str, WarmupState] = {}
-        self._load()
+        self.db_path = Path(db_path) if db_path else self.csv_path.with_suffix('.db')
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        is_new = not self.db_path.exists()
+        self._init_db()
 
-    def _load(self):
-        """Load state from CSV file."""
         if not self.csv_path.exists():
             # Create empty CSV with headers
             self._create_empty_csv()
-            return
-
+        elif is_new:
+            self._import_state_csv()
+
+    # -------------------------------------------------------------------------
+    # Connection / schema
+    # -------------------------------------------------------------------------
+
+    @contextmanager
+    def _transaction(self):
+        """Connection that commits on success and rolls back on error."""
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
         try:
-            df = pd.read_csv(self.csv_path, encoding='utf-8')
-            for _, row in df.iterrows():
-                state = WarmupState.from_dict(row.to_dict())
-                handle = self._normalize_handle(state.instagram_handle)
-                self.prospects[handle] = state
-            logger.info(f"Loaded {len(self.prospects)} prospects from {self.csv_path}")
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def _init_db(self):
+        """Create tables and indexes if needed."""
+        with self._transaction() as conn:
+            conn.executescript(SCHEMA)
+            # Databases created before a column existed get it added in place
+            existing = {r['name'] for r in conn.execute("PRAGMA table_info(prospects)")}
+            for column in self.PROSPECT_COLUMNS:
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE prospects ADD COLUMN {column}")
+
+    def _import_state_csv(self):
+        """One-time import of a legacy state CSV into a new database."""
+        try:
+            df = pd.read_csv(self.csv_path, encoding='utf-8', dtype=str, keep_default_na=False)
         except Exception as e:
             logger.error(f"Error loading CSV: {e}")
-            self.prospects = {}
+            return
+
+        states = [WarmupState.from_dict(record) for record in df.to_dict('records')]
+        with self._transaction() as conn:
+            for state in states:
+                state.instagram_handle = self._normalize_handle(state.instagram_handle)
+                if state.instagram_handle:
+                    self._insert_state(conn, state)
+        logger.info(f"Imported {len(states)} prospects from {self.csv_path} into {self.db_path}")
+
+    def _insert_state(self, conn: sqlite3.Connection, state: WarmupState):
+        """Write a full WarmupState (prospect row plus post interactions)."""
+        data = state.to_dict()
+        conn.execute(
+            f"INSERT OR REPLACE INTO prospects ({','.join(self.PROSPECT_COLUMNS)}) "
+            f"VALUES ({','.join('?' * len(self.PROSPECT_COLUMNS))})",
+            [data[c] for c in self.PROSPECT_COLUMNS],
+        )
+        now = datetime.now().isoformat()
+        interactions = [('like', url, None) for url in state.posts_liked]
+        interactions += [('comment', url, None) for url in state.posts_commented]
+        conn.executemany(
+            "INSERT OR IGNORE INTO post_interactions "
+            "(instagram_handle, kind, post_url, comment_text, created_at) VALUES (?, ?, ?, ?, ?)",
+            [(state.instagram_handle, kind, url, text, now) for kind, url, text in interactions],
+        )
+
+    def _select(self, where: str = '', params: tuple = (), order: str = 'rowid',
+                limit: Optional[int] = None) -> List[WarmupState]:
+        """Load prospects matching a WHERE clause, with their post interactions."""
+        clause = f"WHERE {where}" if where else ''
+        query = f"SELECT * FROM prospects {clause} ORDER BY {order}"
+        if limit is not None:
+            query += f" LIMIT {int(limit)}"
+
+        with self._transaction() as conn:
+            rows = conn.execute(query, params).fetchall()
+            if not rows:
+                return []
+            posts = conn.execute(
+                "SELECT instagram_handle, kind, post_url FROM post_interactions "
+                f"WHERE instagram_handle IN (SELECT instagram_handle FROM ({query})) ORDER BY rowid",
+                params,
+            ).fetchall()
+
+        liked: Dict[str, List[str]] = {}
+        commented: Dict[str, List[str]] = {}
+        for handle, kind, url in posts:
+            (liked if kind == 'like' else commented).setdefault(handle, []).append(url)
+
+        states = []
+        for row in rows:
+            state = WarmupState.from_dict(dict(row))
+            state.posts_liked = liked.get(state.instagram_handle, [])
+            state.posts_commented = commented.get(state.instagram_handle, [])
+            states.append(state)
+        return states
+
+    def _update(self, handle: str, assignments: str, params: tuple = ()) -> bool:
+        """Single-row UPDATE for a normalized handle. Returns True if it exists."""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                f"UPDATE prospects SET {assignments} WHERE instagram_handle = ?", params + (handle,)
+            )
+            return cursor.rowcount > 0
 
     def _create_empty_csv(self):
         """Create empty CSV with headers."""
@@ -163,16 +339,26 @@ class WarmupTracker:
             handle = handle[1:]
         return handle
 
+    @property
+    def prospects(self) -> ProspectView:
+        """All prospects keyed by normalized handle."""
+        return ProspectView(self)
+
     def save(self):
-        """Save state to CSV file."""
-        if not self.prospects:
+        """Export state to the CSV file.
+
+        Every tracker call is already committed to the database; this only
+        refreshes the CSV snapshot.
+        """
+        states = self._select()
+        if not states:
             self._create_empty_csv()
             return
 
-        rows = [state.to_dict() for state in self.prospects.values()]
+        rows = [state.to_dict() for state in states]
         df = pd.DataFrame(rows, columns=self.CSV_COLUMNS)
         df.to_csv(self.csv_path, index=False, encoding='utf-8')
-        logger.info(f"Saved {len(self.prospects)} prospects to {self.csv_path}")
+        logger.info(f"Saved {len(states)} prospects to {self.csv_path}")
 
     def add_prospect(self, instagram_handle: str, page_name: str, contact_name: str) -> bool:
         """Add a new prospect. Returns False if already exists."""
@@ -180,79 +366,113 @@ class WarmupTracker:
         if not handle:
             return False
 
-        if handle in self.prospects:
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO prospects (instagram_handle, page_name, contact_name) VALUES (?, ?, ?)",
+                (handle, page_name, contact_name),
+            )
+        if cursor.rowcount == 0:
             logger.debug(f"Prospect {handle} already exists, skipping")
             return False
 
-        self.prospects[handle] = WarmupState(
-            instagram_handle=handle,
-            page_name=page_name,
-            contact_name=contact_name
-        )
         logger.debug(f"Added prospect: {handle}")
         return True
 
     def update_status(self, instagram_handle: str, status: str):
         """Update prospect status."""
         handle = self._normalize_handle(instagram_handle)
-        if handle in self.prospects:
-            self.prospects[handle].status = status
+        if self._update(handle, "status = ?", (status,)):
             logger.debug(f"Updated {handle} status to {status}")
 
     def advance_phase(self, instagram_handle: str):
-        """Advance prospect to next phase."""
+        """Advance prospect to next phase.
+
+        Starting a pending prospect makes it due immediately; later phases
+        become due PHASE_INTERVAL from now.
+        """
         handle = self._normalize_handle(instagram_handle)
-        if handle in self.prospects:
-            prospect = self.prospects[handle]
-            prospect.current_phase += 1
-            if prospect.status == 'pending':
-                prospect.status = 'in_progress'
-                prospect.warmup_start_date = datetime.now()
-            logger.debug(f"Advanced {handle} to phase {prospect.current_phase}")
+        now = datetime.now()
+        # SET expressions all see the pre-update row
+        if self._update(
+            handle,
+            "current_phase = current_phase + 1, "
+            "warmup_start_date = CASE WHEN status = 'pending' THEN ? ELSE warmup_start_date END, "
+            "next_action_at = CASE WHEN status = 'pending' THEN ? ELSE ? END, "
+            "status = CASE WHEN status = 'pending' THEN 'in_progress' ELSE status END",
+            (now.isoformat(), now.isoformat(), (now + PHASE_INTERVAL).isoformat()),
+        ):
+            logger.debug(f"Advanced {handle} to next phase")
+
+    def assign_account(self, instagram_handle: str, account: str):
+        """Pin the sending account that engages this prospect."""
+        handle = self._normalize_handle(instagram_handle)
+        if self._update(handle, "account = ?", (account,)):
+            logger.debug(f"Assigned {handle} to account {account}")
 
     def mark_followed(self, instagram_handle: str):
         """Mark prospect as followed."""
         handle = self._normalize_handle(instagram_handle)
-        if handle in self.prospects:
-            self.prospects[handle].followed_at = datetime.now()
+        if self._update(handle, "followed_at = ?", (datetime.now().isoformat(),)):
             logger.debug(f"Marked {handle} as followed")
 
+    def _add_interaction(self, handle: str, kind: str, post_url: str,
+                         comment_text: Optional[str], counter: str) -> bool:
+        """Record one post interaction and bump its counter (no-op if repeated)."""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO post_interactions "
+                "(instagram_handle, kind, post_url, comment_text, created_at) "
+                "SELECT ?, ?, ?, ?, ? WHERE EXISTS "
+                "(SELECT 1 FROM prospects WHERE instagram_handle = ?)",
+                (handle, kind, post_url, comment_text, datetime.now().isoformat(), handle),
+            )
+            if cursor.rowcount == 0:
+                return False
+            conn.execute(
+                f"UPDATE prospects SET {counter} = {counter} + 1 WHERE instagram_handle = ?", (handle,)
+            )
+        return True
+
     def add_liked_post(self, instagram_handle: str, post_url: str):
         """Record a liked post."""
         handle = self._normalize_handle(instagram_handle)
-        if handle in self.prospects:
-            prospect = self.prospects[handle]
-            if post_url not in prospect.posts_liked:
-                prospect.posts_liked.append(post_url)
-                prospect.likes_completed += 1
-                logger.debug(f"Added liked post for {handle}: {post_url}")
+        if self._add_interaction(handle, 'like', post_url, None, 'likes_completed'):
+            logger.debug(f"Added liked post for {handle}: {post_url}")
 
     def add_comment(self, instagram_handle: str, post_url: str, comment_text: str):
         """Record a comment."""
         handle = self._normalize_handle(instagram_handle)
-        if handle in self.prospects:
-            prospect = self.prospects[handle]
-            if post_url not in prospect.posts_commented:
-                prospect.posts_commented.append(post_url)
-                prospect.comments_completed += 1
-                logger.debug(f"Added comment for {handle} on {post_url}")
+        if self._add_interaction(handle, 'comment', post_url, comment_text, 'comments_completed'):
+            logger.debug(f"Added comment for {handle} on {post_url}")
 
     def set_error(self, instagram_handle: str, error: str):
         """Set error on prospect."""
         handle = self._normalize_handle(instagram_handle)
-        if handle in self.prospects:
-            prospect = self.prospects[handle]
-            prospect.last_error = error
-            prospect.retry_count += 1
+        if self._update(handle, "last_error = ?, retry_count = retry_count + 1", (error,)):
             logger.warning(f"Error for {handle}: {error}")
 
     def get_prospects_by_status(self, status: str) -> List[WarmupState]:
         """Get all prospects with given status."""
-        return [p for p in self.prospects.values() if p.status == status]
+        return self._select("status = ?", (status,))
 
     def get_prospects_by_phase(self, phase: int) -> List[WarmupState]:
         """Get all prospects at given phase."""
-        return [p for p in self.prospects.values() if p.current_phase == phase]
+        return self._select("current_phase = ?", (phase,))
+
+    def get_due_prospects(self, now: Optional[datetime] = None,
+                          limit: Optional[int] = None) -> List[WarmupState]:
+        """In-progress prospects whose next action is due, oldest first."""
+        now = now or datetime.now()
+        return self._select(
+            "status = 'in_progress' AND (next_action_at IS NULL OR next_action_at <= ?)",
+            (now.isoformat(),), order="next_action_at, rowid", limit=limit,
+        )
+
+    def count_by_status(self) -> Dict[str, int]:
+        """Number of prospects per status."""
+        with self._transaction() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) FROM prospects GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
 
     def get_ready_for_dm(self) -> List[WarmupState]:
         """Get all prospects ready for DM."""
@@ -270,17 +490,21 @@ class WarmupTracker:
             logger.error("CSV missing 'instagram_handles' column")
             return 0
 
-        count = 0
-        for _, row in df.iterrows():
-            handles_str = row.get('instagram_handles', '')
-            handles = self._parse_handles(handles_str)
-
-            page_name = str(row.get('page_name', ''))
-            contact_name = str(row.get('contact_name', ''))
-
-            for handle in handles:
-                if self.add_prospect(handle, page_name, contact_name):
-                    count += 1
+        rows = []
+        for record in df.to_dict('records'):
+            page_name = str(record.get('page_name', ''))
+            contact_name = str(record.get('contact_name', ''))
+            for handle in self._parse_handles(record.get('instagram_handles', '')):
+                if handle:
+                    rows.append((handle, page_name, contact_name))
+
+        with self._transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO prospects (instagram_handle, page_name, contact_name) VALUES (?, ?, ?)",
+                rows,
+            )
+            count = conn.total_changes - before
 
         self.save()
         logger.info(f"Imported {count} prospects from {prospects_csv}")
@@ -18,13 +18,18 @@ Tiers:
 - COOL (5-7): Nurture sequence - Weekly
 - COLD (0-4): Low priority / skip - Monthly or skip
 
+Scores are computed column-wise for the whole frame (score_frame). Large
+files can be rescored in streaming fashion with --chunksize.
+
 Usage:
     python scripts/lead_scorer.py               # Test mode (3 contacts)
     python scripts/lead_scorer.py --all         # Process all contacts
     python scripts/lead_scorer.py --csv output/prospects.csv  # Standalone mode
+    python scripts/lead_scorer.py --csv output/prospects_master.csv --all --chunksize 50000
 """
 
 import os
+import re
 import sys
 import argparse
 import logging
@@ -32,9 +37,9 @@ from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 
+import numpy as np
 import pandas as pd
 from dotenv import load_dotenv
-from tqdm import tqdm
 
 # Add scripts directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
@@ -147,6 +152,15 @@ TIER_ACTIONS = {
 }
 
 
+# Output columns written by this module
+SCORE_COLUMNS = ["lead_score", "lead_tier", "score_breakdown"]
+
+
+def _is_set(value: Any) -> bool:
+    """Truthiness that treats NaN (missing CSV cell) as not set."""
+    return bool(pd.notna(value) and value)
+
+
 def calculate_lead_score(row: pd.Series) -> Dict[str, Any]:
     """
     Calculate composite lead score based on all enrichment signals.
@@ -196,22 +210,22 @@ def calculate_lead_score(row: pd.Series) -> Dict[str, Any]:
     # === Operational Maturity Signals ===
 
     # CRM (+2)
-    if row.get("has_crm"):
+    if _is_set(row.get("has_crm")):
         score += SCORING_CONFIG["has_crm"]["points"]
         breakdown.append(f"has_crm:+{SCORING_CONFIG['has_crm']['points']}")
 
     # Marketing pixel (+1)
-    if row.get("has_marketing_pixel"):
+    if _is_set(row.get("has_marketing_pixel")):
         score += SCORING_CONFIG["has_marketing_pixel"]["points"]
         breakdown.append(f"has_pixel:+{SCORING_CONFIG['has_marketing_pixel']['points']}")
 
     # Scheduling tool (+1)
-    if row.get("has_scheduling_tool"):
+    if _is_set(row.get("has_scheduling_tool")):
         score += SCORING_CONFIG["has_scheduling_tool"]["points"]
         breakdown.append(f"has_scheduling:+{SCORING_CONFIG['has_scheduling_tool']['points']}")
 
     # Chat widget (+1)
-    if row.get("has_chat_widget"):
+    if _is_set(row.get("has_chat_widget")):
         score += SCORING_CONFIG["has_chat_widget"]["points"]
         breakdown.append(f"has_chat:+{SCORING_CONFIG['has_chat_widget']['points']}")
 
@@ -274,11 +288,176 @@ def calculate_lead_score(row: pd.Series) -> Dict[str, Any]:
     }
 
 
+def _column(df: pd.DataFrame, name: str) -> pd.Series:
+    """Column by name, or an all-missing column if absent."""
+    if name in df.columns:
+        return df[name]
+    return pd.Series(np.nan, index=df.index, dtype=object)
+
+
+def _truthy(series: pd.Series) -> np.ndarray:
+    """Vectorized Python truthiness, with NaN treated as not set."""
+    return (series.notna() & ~series.isin([False, ""])).to_numpy(dtype=bool)
+
+
+def _truncated_int(series: pd.Series) -> np.ndarray:
+    """Numeric column coerced like int(value or 0): invalid/missing -> 0."""
+    return np.trunc(pd.to_numeric(series, errors="coerce").fillna(0).to_numpy(dtype=float))
+
+
+def _has_text(series: pd.Series, empty_values: List[str]) -> np.ndarray:
+    """True where the cell is non-blank text and not one of empty_values."""
+    text = series.where(series.notna(), "").astype(str)
+    return ((text.str.strip() != "") & ~text.isin(empty_values)).to_numpy(dtype=bool)
+
+
+def score_components(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Compute every scoring signal as a whole-column boolean mask.
+
+    Mirrors calculate_lead_score; keys are the breakdown labels in the
+    order they appear in score_breakdown.
+    """
+    ad_count = _truncated_int(_column(df, "ad_count"))
+    review_count = _truncated_int(_column(df, "gmaps_review_count"))
+    rating = pd.to_numeric(_column(df, "gmaps_rating"), errors="coerce").fillna(0).to_numpy(dtype=float)
+
+    position = _column(df, "contact_position")
+    position = position.where(position.notna(), "").astype(str).str.lower()
+    title_pattern = "|".join(re.escape(t) for t in DECISION_MAKER_TITLES)
+
+    email = _column(df, "primary_email")
+    email_text = email.where(email.notna(), "").astype(str)
+    has_email = ((email_text.str.strip() != "") & (email_text.str.lower() != "nan")).to_numpy(dtype=bool)
+    has_phone = _has_text(_column(df, "phones"), ["[]", "nan"])
+
+    return {
+        "active_fb_ads": ad_count > 0,
+        "multiple_creatives": ad_count >= 3,
+        "reviews_30+": review_count >= 30,
+        "reviews_100+": review_count >= 100,
+        "has_crm": _truthy(_column(df, "has_crm")),
+        "has_pixel": _truthy(_column(df, "has_marketing_pixel")),
+        "has_scheduling": _truthy(_column(df, "has_scheduling_tool")),
+        "has_chat": _truthy(_column(df, "has_chat_widget")),
+        "decision_maker": position.str.contains(title_pattern, regex=True).to_numpy(dtype=bool),
+        "email+phone": has_email & has_phone,
+        "email_only": has_email & ~has_phone,
+        "has_instagram": _has_text(_column(df, "instagram_handles"), ["[]", "nan"]),
+        "good_rating": rating >= 4.0,
+    }
+
+
+# Breakdown label -> SCORING_CONFIG key
+COMPONENT_CONFIG_KEYS = {
+    "active_fb_ads": "active_fb_ads",
+    "multiple_creatives": "multiple_creatives",
+    "reviews_30+": "high_review_count",
+    "reviews_100+": "very_high_review_count",
+    "has_crm": "has_crm",
+    "has_pixel": "has_marketing_pixel",
+    "has_scheduling": "has_scheduling_tool",
+    "has_chat": "has_chat_widget",
+    "decision_maker": "decision_maker",
+    "email+phone": "email_and_phone",
+    "email_only": "email_only",
+    "has_instagram": "has_instagram",
+    "good_rating": "good_rating",
+}
+
+
+def score_frame(df: pd.DataFrame, include_components: bool = False) -> pd.DataFrame:
+    """
+    Score every row of a DataFrame with whole-column operations.
+
+    Produces the same lead_score / lead_tier / score_breakdown values as
+    calculate_lead_score applied row by row.
+
+    Args:
+        df: Contacts with enrichment columns
+        include_components: Also return one points column per signal
+            (score_<label>)
+
+    Returns:
+        DataFrame indexed like df with SCORE_COLUMNS (+ component columns)
+    """
+    components = score_components(df)
+
+    score = np.zeros(len(df), dtype=int)
+    breakdown = pd.Series("", index=df.index, dtype=object)
+    points_columns = {}
+    for label, mask in components.items():
+        points = SCORING_CONFIG[COMPONENT_CONFIG_KEYS[label]]["points"]
+        score += np.where(mask, points, 0)
+        breakdown += np.where(mask, f"{label}:+{points}|", "")
+        if include_components:
+            points_columns[f"score_{label}"] = np.where(mask, points, 0)
+
+    tier = np.select(
+        [score >= TIER_THRESHOLDS["HOT"], score >= TIER_THRESHOLDS["WARM"], score >= TIER_THRESHOLDS["COOL"]],
+        ["HOT", "WARM", "COOL"],
+        default="COLD",
+    )
+    breakdown = breakdown.str.rstrip("|").replace("", "no_signals")
+
+    result = pd.DataFrame({
+        "lead_score": score,
+        "lead_tier": tier,
+        "score_breakdown": breakdown.to_numpy(dtype=object),
+    }, index=df.index)
+    for name, values in points_columns.items():
+        result[name] = values
+    return result
+
+
+def _update_stats(stats: Dict, scores: pd.DataFrame):
+    """Accumulate scoring stats for a batch of scored rows."""
+    if len(scores) == 0:
+        return
+    stats['scored'] += len(scores)
+    for tier, count in scores['lead_tier'].value_counts().items():
+        stats['tiers'][tier] += int(count)
+    stats['max_score'] = max(stats['max_score'], int(scores['lead_score'].max()))
+    stats['min_score'] = min(stats['min_score'], int(scores['lead_score'].min()))
+    stats['_score_sum'] = stats.get('_score_sum', 0) + int(scores['lead_score'].sum())
+    stats['avg_score'] = round(stats['_score_sum'] / stats['scored'], 2)
+
+
+def score_csv_chunked(
+    csv_path: Path,
+    output_path: Path,
+    chunksize: int,
+    stats: Dict
+) -> Dict:
+    """
+    Stream a CSV through score_frame chunk by chunk.
+
+    Memory stays bounded by the chunk size, so multi-hundred-thousand-row
+    masters can be rescored after every enrichment pass.
+    """
+    tmp_path = output_path.with_name(f".{output_path.name}.tmp")
+    total = 0
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as out:
+        for i, chunk in enumerate(pd.read_csv(csv_path, encoding='utf-8', chunksize=chunksize)):
+            scores = score_frame(chunk)
+            chunk[SCORE_COLUMNS] = scores[SCORE_COLUMNS]
+            chunk.to_csv(out, index=False, header=(i == 0))
+            _update_stats(stats, scores)
+            total += len(chunk)
+            logger.info(f"Scored {total} contacts")
+
+    # Replace atomically (input and output may be the same file)
+    tmp_path.replace(output_path)
+    stats['total'] = total
+    return stats
+
+
 def score_leads(
     csv_path: Path,
     output_path: Optional[Path] = None,
     limit: Optional[int] = None,
-    dry_run: bool = False
+    dry_run: bool = False,
+    chunksize: Optional[int] = None
 ) -> Dict:
     """
     Score all leads in a CSV file.
@@ -288,20 +467,14 @@ def score_leads(
         output_path: Output CSV path
         limit: Max contacts to process
         dry_run: Preview without saving
+        chunksize: Stream the CSV in chunks of this many rows (ignored with limit)
 
     Returns:
         Stats dictionary
     """
-    # Load CSV
-    try:
-        df = pd.read_csv(csv_path, encoding='utf-8')
-    except Exception as e:
-        logger.error(f"Failed to read CSV: {e}")
-        return {'error': str(e)}
-
     # Stats
     stats = {
-        'total': len(df),
+        'total': 0,
         'scored': 0,
         'tiers': {'HOT': 0, 'WARM': 0, 'COOL': 0, 'COLD': 0},
         'avg_score': 0,
@@ -309,6 +482,28 @@ def score_leads(
         'min_score': 15,
     }
 
+    if output_path is None:
+        output_path = csv_path.parent / f"{csv_path.stem}_scored{csv_path.suffix}"
+
+    if chunksize and not limit and not dry_run:
+        try:
+            score_csv_chunked(csv_path, output_path, chunksize, stats)
+        except Exception as e:
+            logger.error(f"Failed to score CSV: {e}")
+            return {'error': str(e)}
+        stats.pop('_score_sum', None)
+        logger.info(f"Saved to {output_path}")
+        return stats
+
+    # Load CSV
+    try:
+        df = pd.read_csv(csv_path, encoding='utf-8')
+    except Exception as e:
+        logger.error(f"Failed to read CSV: {e}")
+        return {'error': str(e)}
+
+    stats['total'] = len(df)
+
     # Apply limit
     if limit:
         df_to_process = df.head(limit).copy()
@@ -319,53 +514,33 @@ def score_leads(
 
     if dry_run:
         logger.info("DRY RUN - No file will be saved")
-        for idx, row in df_to_process.head(10).iterrows():
-            result = calculate_lead_score(row)
-            logger.info(f"  {row.get('page_name', 'Unknown')[:40]}: "
+        preview = df_to_process.head(10)
+        for (idx, row), (_, result) in zip(preview.iterrows(), score_frame(preview).iterrows()):
+            logger.info(f"  {str(row.get('page_name', 'Unknown'))[:40]}: "
                        f"Score={result['lead_score']} Tier={result['lead_tier']}")
         return stats
 
     # Calculate scores
-    scores = []
-    for idx, row in tqdm(df_to_process.iterrows(), total=len(df_to_process), desc="Scoring leads"):
-        result = calculate_lead_score(row)
-        scores.append(result)
-
-        # Update stats
-        stats['scored'] += 1
-        stats['tiers'][result['lead_tier']] += 1
-        stats['max_score'] = max(stats['max_score'], result['lead_score'])
-        stats['min_score'] = min(stats['min_score'], result['lead_score'])
+    scores = score_frame(df_to_process)
+    _update_stats(stats, scores)
+    stats.pop('_score_sum', None)
 
     # Add scores to dataframe
-    scores_df = pd.DataFrame(scores)
-    df_to_process['lead_score'] = scores_df['lead_score'].values
-    df_to_process['lead_tier'] = scores_df['lead_tier'].values
-    df_to_process['score_breakdown'] = scores_df['score_breakdown'].values
-
-    # Calculate average
-    stats['avg_score'] = round(df_to_process['lead_score'].mean(), 2)
+    df_to_process[SCORE_COLUMNS] = scores[SCORE_COLUMNS]
 
     # If we limited, we need to merge back with original
     if limit:
         # Update the original dataframe with scores for processed rows
-        df['lead_score'] = ''
-        df['lead_tier'] = ''
-        df['score_breakdown'] = ''
-
-        for idx, row in df_to_process.iterrows():
-            df.at[idx, 'lead_score'] = row['lead_score']
-            df.at[idx, 'lead_tier'] = row['lead_tier']
-            df.at[idx, 'score_breakdown'] = row['score_breakdown']
+        for col in SCORE_COLUMNS:
+            df[col] = ''
+        df[SCORE_COLUMNS] = df[SCORE_COLUMNS].astype(object)
+        df.loc[df_to_process.index, SCORE_COLUMNS] = df_to_process[SCORE_COLUMNS]
 
         df_output = df
     else:
         df_output = df_to_process
 
     # Save output
-    if output_path is None:
-        output_path = csv_path.parent / f"{csv_path.stem}_scored{csv_path.suffix}"
-
     df_output.to_csv(output_path, index=False, encoding='utf-8')
     logger.info(f"Saved to {output_path}")
 
@@ -427,6 +602,8 @@ def main():
                        help='Limit number of contacts to process (alternative to --all)')
     parser.add_argument('--dry-run', action='store_true',
                        help='Preview without saving')
+    parser.add_argument('--chunksize', type=int,
+                       help='Stream the CSV in chunks of N rows (for very large files)')
 
     args = parser.parse_args()
 
@@ -513,7 +690,8 @@ def main():
         csv_path=csv_path,
         output_path=output_path,
         limit=limit,
-        dry_run=args.dry_run
+        dry_run=args.dry_run,
+        chunksize=args.chunksize
     )
 
     # Create latest symlink in pipeline mode
@@ -28,7 +28,6 @@ from typing import Optional, List, Dict, Tuple
 from difflib import SequenceMatcher
 
 import pandas as pd
-import requests
 from dotenv import load_dotenv
 from tqdm import tqdm
 from apify_client import ApifyClient
@@ -37,6 +36,7 @@ from apify_client import ApifyClient
 sys.path.insert(0, str(Path(__file__).parent))
 from utils.run_id import get_run_id_from_env, get_versioned_filename, create_latest_symlink
 from utils.enrichment_config import should_run_module
+from utils.exa_client import get_exa_client
 
 load_dotenv()
 
@@ -61,7 +61,6 @@ OUTPUT_BASE = "03f_linkedin.csv"
 
 # Exa API
 EXA_API_KEY = os.getenv('EXA_API_KEY')
-EXA_API_URL = "https://api.exa.ai/search"
 
 # Apify API (fallback when Exa is exhausted)
 APIFY_API_KEY = os.getenv('APIFY_API_TOKEN') or os.getenv('APIFY_API_KEY')
@@ -136,34 +135,14 @@ def search_exa_linkedin(name: str, company: str = None, num_results: int = 5) ->
         query = f'site:linkedin.com/in "{name}"'
 
     try:
-        headers = {
-            "accept": "application/json",
-            "content-type": "application/json",
-            "x-api-key": EXA_API_KEY
-        }
-
-        payload = {
-            "query": query,
-            "numResults": num_results,
-            "type": "auto",
-            "contents": {
-                "text": {"maxCharacters": 1000}
-            }
-        }
-
-        response = requests.post(EXA_API_URL, headers=headers, json=payload, timeout=15)
-
-        if response.status_code == 200:
-            data = response.json()
-            return data.get("results", [])
-        elif response.status_code == 402:
+        client = get_exa_client()
+        results = client.search(query, num_results, max_characters=1000)
+        if client.exhausted:
             # Credits exhausted - set flag and return empty
             _exa_exhausted = True
             logger.warning("Exa API credits exhausted (402). Switching to Apify fallback.")
             return []
-        else:
-            logger.error(f"Exa API error: {response.status_code} - {response.text[:200]}")
-            return []
+        return results
     except Exception as e:
         logger.error(f"Exa search error: {e}")
         return []
@@ -4,24 +4,41 @@ ManyChat Instagram Bulk Messaging Script
 Sends bulk messages to Instagram contacts via ManyChat API by reading Instagram handles
 from CSV files, finding subscribers, and sending customized messages.
 
+Subscribers are resolved up front, several contacts at a time (--workers), over
+one pooled HTTP session that is paced to ManyChat's rate limit. Each contact is
+looked up by email, then phone, then name, stopping at the first hit. Lookup
+answers and handle -> subscriber_id matches are cached on disk per ManyChat
+page (output/cache/manychat_subscribers.db), so repeat campaigns to the same
+audience make no lookup calls. A cached match whose send fails because the
+subscriber no longer exists is dropped and looked up again next time.
+
 Usage:
     python scripts/manychat_sender.py --csv output/hubspot_contacts.csv --message "Hi {contact_name}!..."
     python scripts/manychat_sender.py --csv output/hubspot_contacts.csv --dry-run
+    python scripts/manychat_sender.py --csv output/hubspot_contacts.csv --workers 8 --no-cache
 """
 
 import os
 import sys
-import time
 import re
+import hashlib
 import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 from tqdm import tqdm
 
+# Add scripts directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+from utils.rate_limiter import RateLimiter
+from utils.response_cache import ResponseCache, make_cache_key
+
 # Load environment variables
 load_dotenv()
 
@@ -29,6 +46,23 @@ BASE_DIR = Path(__file__).parent.parent
 MANYCHAT_API_KEY = os.getenv('MANYCHAT_API_KEY')
 MANYCHAT_BASE_URL = 'https://api.manychat.com/fb'
 
+# Concurrent subscriber lookups (all share the client's rate limiter)
+DEFAULT_WORKERS = 4
+
+# Pooled connections kept open to the API
+POOL_SIZE = 16
+
+# Subscriber lookup cache (output/cache/manychat_subscribers.db)
+CACHE_NAME = 'manychat_subscribers'
+CACHE_TTL_DAYS = 90
+NOT_FOUND_TTL_DAYS = 7
+
+NOT_FOUND = "Subscriber not found"
+
+# Send errors meaning the cached subscriber ID is no longer valid
+INVALID_SUBSCRIBER_ERRORS = ('subscriber does not exist', 'subscriber not found',
+                             'invalid subscriber', 'wrong subscriber')
+
 
 class ManyChatClient:
     """Client for interacting with ManyChat API."""
@@ -39,7 +73,8 @@ class ManyChatClient:
         
         Args:
             api_key: ManyChat API key
-            delay: Delay in seconds between API requests (default 0.1 = 10 req/sec)
+            delay: Minimum seconds between API requests across all threads
+                (default 0.1 = 10 req/sec)
         """
         self.api_key = api_key
         self.delay = delay
@@ -49,6 +84,12 @@ class ManyChatClient:
         }
         if not api_key:
             raise ValueError("MANYCHAT_API_KEY not found in environment variables")
+        self.limiter = RateLimiter(delay)
+        self._account_id: Optional[str] = None
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+        self.session.mount('https://', adapter)
     
     def _make_request(self, method: str, endpoint: str, params: Optional[Dict] = None, 
                      json_data: Optional[Dict] = None) -> Tuple[Optional[Dict], Optional[str]]:
@@ -61,12 +102,11 @@ class ManyChatClient:
         url = f"{MANYCHAT_BASE_URL}{endpoint}"
         
         try:
-            time.sleep(self.delay)  # Rate limiting
-            
-            response = requests.request(
+            self.limiter.wait()  # Rate limiting
+
+            response = self.session.request(
                 method=method,
                 url=url,
-                headers=self.headers,
                 params=params,
                 json=json_data,
                 timeout=30
@@ -95,6 +135,22 @@ class ManyChatClient:
         except Exception as e:
             return None, f"Unexpected error: {str(e)}"
     
+    def account_id(self) -> str:
+        """
+        ID of the ManyChat page this API key belongs to (fetched once).
+
+        Falls back to a hash of the API key if the page can't be read, so
+        cached data is always scoped to one account.
+        """
+        if self._account_id is None:
+            data, _ = self._make_request('GET', '/page/getInfo')
+            page_id = ((data or {}).get('data') or {}).get('id')
+            if page_id:
+                self._account_id = f"page:{page_id}"
+            else:
+                self._account_id = f"key:{hashlib.sha256(self.api_key.encode('utf-8')).hexdigest()[:16]}"
+        return self._account_id
+
     def find_subscriber_by_name(self, name: str) -> Tuple[Optional[int], Optional[str]]:
         """
         Find subscriber by name.
@@ -120,11 +176,11 @@ class ManyChatClient:
             return None, "Invalid API response"
         
         if data.get('status') != 'success':
-            return None, "Subscriber not found"
+            return None, NOT_FOUND
         
         subscribers = data.get('data', [])
         if not subscribers or len(subscribers) == 0:
-            return None, "Subscriber not found"
+            return None, NOT_FOUND
         
         # If multiple results, use the first one
         # In future, could add more sophisticated matching
@@ -161,11 +217,11 @@ class ManyChatClient:
             return None, "Invalid API response"
 
         if data.get('status') != 'success':
-            return None, "Subscriber not found"
+            return None, NOT_FOUND
 
         subscribers = data.get('data', [])
         if not subscribers or len(subscribers) == 0:
-            return None, "Subscriber not found"
+            return None, NOT_FOUND
 
         subscriber = subscribers[0]
         subscriber_id = subscriber.get('id')
@@ -203,11 +259,11 @@ class ManyChatClient:
             return None, "Invalid API response"
 
         if data.get('status') != 'success':
-            return None, "Subscriber not found"
+            return None, NOT_FOUND
 
         subscribers = data.get('data', [])
         if not subscribers or len(subscribers) == 0:
-            return None, "Subscriber not found"
+            return None, NOT_FOUND
 
         subscriber = subscribers[0]
         subscriber_id = subscriber.get('id')
@@ -243,11 +299,11 @@ class ManyChatClient:
             return None, "Invalid API response"
 
         if data.get('status') != 'success':
-            return None, "Subscriber not found"
+            return None, NOT_FOUND
 
         subscribers = data.get('data', [])
         if not subscribers or len(subscribers) == 0:
-            return None, "Subscriber not found"
+            return None, NOT_FOUND
 
         subscriber = subscribers[0]
         subscriber_id = subscriber.get('id')
@@ -298,6 +354,116 @@ class ManyChatClient:
             return False, "Failed to send message"
 
 
+class SubscriberResolver:
+    """Resolves contacts to ManyChat subscriber IDs, concurrently and cached.
+
+    Each contact is looked up by email, then phone, then name, stopping at the
+    first hit. Answers, including "not found" (kept for a shorter time), are
+    cached per lookup value, and every resolved ID is also cached against the
+    Instagram handle. Cache keys include the client's ManyChat page, so
+    another page's subscriber IDs are never returned. API errors (rate
+    limits, timeouts) are never cached.
+    """
+
+    def __init__(self, client: ManyChatClient, workers: int = DEFAULT_WORKERS, use_cache: bool = True):
+        """
+        Args:
+            client: ManyChat client (its rate limiter paces every worker)
+            workers: Contacts resolved concurrently
+            use_cache: Read and write the on-disk subscriber cache
+        """
+        self.client = client
+        self.workers = workers
+        self.cache = ResponseCache(CACHE_NAME, ttl_seconds=CACHE_TTL_DAYS * 24 * 60 * 60) if use_cache else None
+        self.account = client.account_id() if use_cache else ''
+        self.lookup_calls = 0
+        self.cache_hits = 0
+        self._lock = threading.Lock()
+
+    def _cached(self, key: str) -> Optional[Dict]:
+        if self.cache is None:
+            return None
+        hit = self.cache.get(key)
+        if hit is not None:
+            with self._lock:
+                self.cache_hits += 1
+        return hit
+
+    def _lookup(self, method: str, value: str) -> Tuple[Optional[int], Optional[str]]:
+        """One cached lookup. Returns (subscriber_id, error_message)."""
+        key = make_cache_key(self.account, method, value)
+        hit = self._cached(key)
+        if hit is not None:
+            return hit['id'], None if hit['id'] else NOT_FOUND
+
+        finders = {
+            'email': self.client.find_subscriber_by_email,
+            'phone': self.client.find_subscriber_by_phone,
+            'name': self.client.find_subscriber_by_name,
+        }
+        with self._lock:
+            self.lookup_calls += 1
+        subscriber_id, error = finders[method](value)
+
+        if self.cache is not None and (subscriber_id or error == NOT_FOUND):
+            ttl = None if subscriber_id else NOT_FOUND_TTL_DAYS * 24 * 60 * 60
+            self.cache.set(key, {'id': subscriber_id}, ttl_seconds=ttl)
+        return subscriber_id, error
+
+    def resolve(self, handle: str, email: str = '', phone: str = '',
+                name: str = '') -> Tuple[Optional[int], Optional[str], Optional[str]]:
+        """
+        Find the subscriber for one contact.
+
+        Returns:
+            Tuple of (subscriber_id, lookup_method, error_message)
+        """
+        handle_key = make_cache_key(self.account, 'handle', handle)
+        hit = self._cached(handle_key)
+        if hit is not None:
+            return hit['id'], hit['method'], None
+
+        lookups = [(method, value) for method, value in (('email', email), ('phone', phone), ('name', name))
+                   if value]
+        if not lookups:
+            return None, None, "No email, phone, or name available for lookup"
+
+        error = None
+        for method, value in lookups:
+            subscriber_id, error = self._lookup(method, value)
+            if subscriber_id:
+                if self.cache is not None:
+                    self.cache.set(handle_key, {'id': subscriber_id, 'method': method})
+                return subscriber_id, method, None
+
+        return None, None, error or NOT_FOUND
+
+    def forget(self, handle: str, method: Optional[str] = None, value: str = ''):
+        """Drop a cached match (and the lookup that found it) whose subscriber is gone."""
+        if self.cache is None:
+            return
+        self.cache.delete(make_cache_key(self.account, 'handle', handle))
+        if method and value:
+            self.cache.delete(make_cache_key(self.account, method, value))
+
+    def resolve_many(self, contacts: List[Dict]) -> Dict[str, Tuple[Optional[int], Optional[str], Optional[str]]]:
+        """Resolve contacts concurrently. Returns {instagram_handle: (subscriber_id, method, error)}."""
+        resolved = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {
+                executor.submit(self.resolve, c['instagram_handle'], c['email'], c['phone'], c['contact_name']):
+                    c['instagram_handle']
+                for c in contacts
+            }
+            for future in tqdm(as_completed(futures), total=len(futures), desc="Finding subscribers", unit="handle"):
+                resolved[futures[future]] = future.result()
+        return resolved
+
+    def close(self):
+        if self.cache is not None:
+            self.cache.close()
+
+
 def parse_instagram_handles(handles_str: str) -> List[str]:
     """
     Parse comma-separated Instagram handles from CSV column.
@@ -437,11 +603,18 @@ def format_message(template: str, contact_name: str, company_name: str, instagra
     return message
 
 
-def process_csv_and_send(client: ManyChatClient, csv_path: Path, message_template: str, 
-                        message_tag: str, dry_run: bool = False) -> Dict:
+def process_csv_and_send(client: ManyChatClient, csv_path: Path, message_template: str,
+                        message_tag: str, dry_run: bool = False,
+                        resolver: Optional[SubscriberResolver] = None) -> Dict:
     """
     Process CSV file and send messages via ManyChat.
-    
+
+    All subscribers are resolved first (concurrently, see SubscriberResolver),
+    then messages are sent in CSV order.
+
+    Args:
+        resolver: Subscriber resolver to use (default: a cached one for `client`)
+
     Returns:
         Dictionary with processing results
     """
@@ -469,144 +642,92 @@ def process_csv_and_send(client: ManyChatClient, csv_path: Path, message_templat
             'results': []
         }
     
-    # Track processed handles to avoid duplicates
+    # One contact per unique handle, in CSV order
     processed_handles = set()
+    contacts = []
+
+    for idx, row in df.iterrows():
+        handles = parse_instagram_handles(row.get('instagram_handles', ''))
+        if not handles:
+            continue
+
+        # Get contact info
+        contact_name = get_contact_name(row)
+        company_name = get_company_name(row)
+        email = get_email(row)
+        phone = get_phone(row)
+
+        for handle in handles:
+            # Skip if already processed
+            if handle in processed_handles:
+                continue
+            processed_handles.add(handle)
+            contacts.append({
+                'instagram_handle': handle,
+                'contact_name': contact_name,
+                'company_name': company_name,
+                'email': email,
+                'phone': phone,
+                'message': format_message(message_template, contact_name, company_name, handle),
+            })
+
     results = []
     sent_count = 0
     skipped_count = 0
     error_count = 0
-    
-    # Process each row
-    total_rows = len(df)
-    
-    with tqdm(total=total_rows, desc="Processing rows", unit="row") as pbar:
-        for idx, row in df.iterrows():
-            # Parse Instagram handles
-            handles_str = row.get('instagram_handles', '')
-            handles = parse_instagram_handles(handles_str)
-            
-            if not handles:
-                pbar.update(1)
-                continue
-            
-            # Get contact info
-            contact_name = get_contact_name(row)
-            company_name = get_company_name(row)
-            email = get_email(row)
-            phone = get_phone(row)
-
-            # Process each handle
-            for handle in handles:
-                # Skip if already processed
-                if handle in processed_handles:
+    lookup_calls = 0
+    cache_hits = 0
+
+    if dry_run:
+        # Dry run: just log what would be sent
+        for contact in contacts:
+            results.append({**contact, 'status': 'dry_run', 'subscriber_id': None,
+                            'lookup_method': None, 'error_message': None})
+            sent_count += 1
+    else:
+        own_resolver = resolver is None
+        if own_resolver:
+            resolver = SubscriberResolver(client)
+        try:
+            resolved = resolver.resolve_many(contacts)
+            lookup_calls = resolver.lookup_calls
+            cache_hits = resolver.cache_hits
+
+            for contact in tqdm(contacts, desc="Sending messages", unit="handle"):
+                subscriber_id, lookup_method, find_error = resolved[contact['instagram_handle']]
+
+                if not subscriber_id:
+                    # Subscriber not found - skip
+                    results.append({**contact, 'status': 'skipped', 'subscriber_id': None,
+                                    'lookup_method': None, 'error_message': find_error or NOT_FOUND})
+                    skipped_count += 1
                     continue
-                processed_handles.add(handle)
-
-                # Format message
-                message = format_message(message_template, contact_name, company_name, handle)
-
-                if dry_run:
-                    # Dry run: just log what would be sent
-                    results.append({
-                        'instagram_handle': handle,
-                        'contact_name': contact_name,
-                        'company_name': company_name,
-                        'email': email,
-                        'phone': phone,
-                        'message': message,
-                        'status': 'dry_run',
-                        'subscriber_id': None,
-                        'lookup_method': None,
-                        'error_message': None
-                    })
+
+                success, send_error = client.send_message(subscriber_id, contact['message'], message_tag)
+                results.append({**contact, 'status': 'sent' if success else 'error',
+                                'subscriber_id': subscriber_id, 'lookup_method': lookup_method,
+                                'error_message': send_error})
+                if success:
                     sent_count += 1
                 else:
-                    # Try to find subscriber: email > phone > name (in order of reliability)
-                    subscriber_id = None
-                    find_error = None
-                    lookup_method = None
-
-                    # 1. Try email first (most reliable)
-                    if email:
-                        subscriber_id, find_error = client.find_subscriber_by_email(email)
-                        if subscriber_id:
-                            lookup_method = 'email'
-
-                    # 2. Try phone if email didn't work
-                    if not subscriber_id and phone:
-                        subscriber_id, find_error = client.find_subscriber_by_phone(phone)
-                        if subscriber_id:
-                            lookup_method = 'phone'
-
-                    # 3. Try name as fallback
-                    if not subscriber_id and contact_name:
-                        subscriber_id, find_error = client.find_subscriber_by_name(contact_name)
-                        if subscriber_id:
-                            lookup_method = 'name'
-
-                    # Build error message if not found
-                    if not subscriber_id:
-                        if not email and not phone and not contact_name:
-                            find_error = "No email, phone, or name available for lookup"
-                        elif not find_error:
-                            find_error = "Subscriber not found"
-
-                    if find_error or not subscriber_id:
-                        # Subscriber not found - skip
-                        results.append({
-                            'instagram_handle': handle,
-                            'contact_name': contact_name,
-                            'company_name': company_name,
-                            'email': email,
-                            'phone': phone,
-                            'message': message,
-                            'status': 'skipped',
-                            'subscriber_id': None,
-                            'lookup_method': None,
-                            'error_message': find_error or "Subscriber not found"
-                        })
-                        skipped_count += 1
-                    else:
-                        # Send message
-                        success, send_error = client.send_message(subscriber_id, message, message_tag)
-
-                        if success:
-                            results.append({
-                                'instagram_handle': handle,
-                                'contact_name': contact_name,
-                                'company_name': company_name,
-                                'email': email,
-                                'phone': phone,
-                                'message': message,
-                                'status': 'sent',
-                                'subscriber_id': subscriber_id,
-                                'lookup_method': lookup_method,
-                                'error_message': None
-                            })
-                            sent_count += 1
-                        else:
-                            results.append({
-                                'instagram_handle': handle,
-                                'contact_name': contact_name,
-                                'company_name': company_name,
-                                'email': email,
-                                'phone': phone,
-                                'message': message,
-                                'status': 'error',
-                                'subscriber_id': subscriber_id,
-                                'lookup_method': lookup_method,
-                                'error_message': send_error
-                            })
-                            error_count += 1
-            
-            pbar.update(1)
-    
+                    error_count += 1
+                    if any(marker in (send_error or '').lower() for marker in INVALID_SUBSCRIBER_ERRORS):
+                        lookup_values = {'email': contact['email'], 'phone': contact['phone'],
+                                         'name': contact['contact_name']}
+                        resolver.forget(contact['instagram_handle'], lookup_method,
+                                        lookup_values.get(lookup_method, ''))
+        finally:
+            if own_resolver:
+                resolver.close()
+
     return {
         'error': None,
         'total_handles': len(processed_handles),
         'sent': sent_count,
         'skipped': skipped_count,
         'errors': error_count,
+        'lookup_calls': lookup_calls,
+        'cache_hits': cache_hits,
         'results': results
     }
 
@@ -641,6 +762,9 @@ def print_summary(results: Dict):
     print(f"Messages sent successfully:      {results['sent']}")
     print(f"Handles skipped (not found):     {results['skipped']}")
     print(f"Errors encountered:              {results['errors']}")
+    if results.get('lookup_calls') or results.get('cache_hits'):
+        print(f"Subscriber lookup API calls:     {results['lookup_calls']}")
+        print(f"Subscriber lookup cache hits:    {results['cache_hits']}")
     print("=" * 60)
     
     if results['errors'] > 0:
@@ -680,6 +804,10 @@ Examples:
   # Custom message tag and delay
   python scripts/manychat_sender.py --csv output/hubspot_contacts.csv \\
       --message "Hello {contact_name}!" --message-tag POST_PURCHASE_UPDATE --delay 0.2
+
+  # More concurrent lookups, ignoring cached subscriber IDs
+  python scripts/manychat_sender.py --csv output/hubspot_contacts.csv \\
+      --message "Hello {contact_name}!" --workers 8 --no-cache
         """
     )
     
@@ -691,6 +819,10 @@ Examples:
                        help='ManyChat message tag (default: ACCOUNT_UPDATE)')
     parser.add_argument('--delay', type=float, default=0.1,
                        help='Delay in seconds between API calls (default: 0.1)')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                       help=f'Concurrent subscriber lookups (default: {DEFAULT_WORKERS})')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Do not read or write the subscriber lookup cache')
     parser.add_argument('--dry-run', action='store_true',
                        help='Test mode - validate CSV and template without sending messages')
     
@@ -739,13 +871,18 @@ Examples:
     if args.dry_run:
         print("DRY RUN MODE - No messages will be sent\n")
     
-    results = process_csv_and_send(
-        client=client,
-        csv_path=csv_path,
-        message_template=message_template,
-        message_tag=args.message_tag,
-        dry_run=args.dry_run
-    )
+    resolver = SubscriberResolver(client, workers=args.workers, use_cache=not args.no_cache)
+    try:
+        results = process_csv_and_send(
+            client=client,
+            csv_path=csv_path,
+            message_template=message_template,
+            message_tag=args.message_tag,
+            dry_run=args.dry_run,
+            resolver=resolver
+        )
+    finally:
+        resolver.close()
     
     # Print summary
     print_summary(results)
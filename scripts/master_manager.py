@@ -22,6 +22,12 @@ Usage:
 
     # Deduplicate master only
     python scripts/master_manager.py dedupe
+
+    # Keyed SQLite store (output/prospects_master.db): merges become upserts
+    python scripts/master_manager.py --store import            # one-time: load CSV into store
+    python scripts/master_manager.py --store merge --input processed/03i_scored.csv
+    python scripts/master_manager.py --store enrich --all
+    python scripts/master_manager.py --store export            # write prospects_master.csv
 """
 
 import os
@@ -41,6 +47,7 @@ from dotenv import load_dotenv
 
 # Add scripts directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
+from master_store import MasterStore, STORE_PATH
 
 load_dotenv()
 
@@ -106,6 +113,17 @@ def normalize_url(url: str) -> str:
     return url
 
 
+def normalize_key(series: pd.Series) -> pd.Series:
+    """Normalize a key column for matching (casefold, trim, collapse whitespace)."""
+    return (
+        series.fillna('')
+        .astype(str)
+        .str.strip()
+        .str.casefold()
+        .str.replace(r'\s+', ' ', regex=True)
+    )
+
+
 def load_master() -> pd.DataFrame:
     """Load prospects_master.csv, creating empty DataFrame if doesn't exist."""
     if MASTER_PATH.exists():
@@ -296,10 +314,78 @@ def run_enricher(csv_path: Path, enrichment_type: str, limit: Optional[int] = No
         return False
 
 
+def merge_enriched(
+    master_df: pd.DataFrame,
+    enriched: pd.DataFrame,
+    key: str = 'page_name'
+) -> tuple:
+    """
+    Write enriched values back into master, matched on a normalized key.
+
+    Master is indexed once by the normalized key and the enriched frame is
+    aligned to it with a single reindex. Each column is then updated in one
+    vectorized assignment, touching only cells where the enriched value is
+    non-null and non-blank (existing master values are otherwise kept).
+    If the enriched frame repeats a key, its last row wins.
+
+    Args:
+        master_df: Master DataFrame (modified in place and returned)
+        enriched: Enricher output containing the key column
+        key: Column used to match rows
+
+    Returns:
+        Tuple of (master_df, {column: number of master cells updated})
+    """
+    if key not in enriched.columns or key not in master_df.columns or len(enriched) == 0:
+        return master_df, {}
+
+    enriched_keys = normalize_key(enriched[key])
+    has_key = (enriched_keys != '').to_numpy()
+    updates = enriched[has_key].drop(columns=[key])
+    updates.index = enriched_keys[has_key]
+    updates = updates[~updates.index.duplicated(keep='last')]
+    if len(updates) == 0:
+        return master_df, {}
+
+    # Non-null, non-blank enriched cells
+    valid = updates.notna() & ~updates.apply(lambda s: s.astype(str).str.strip() == '')
+
+    # Align enriched rows to master rows (several master rows may share a key)
+    master_keys = normalize_key(master_df[key])
+    matched = master_keys.isin(updates.index).to_numpy()
+    target_index = master_df.index[matched]
+    aligned = updates.reindex(master_keys[matched])
+    aligned_valid = valid.reindex(master_keys[matched], fill_value=False)
+    aligned.index = target_index
+    aligned_valid.index = target_index
+
+    fill_counts = {}
+    for col in updates.columns:
+        mask = aligned_valid[col].to_numpy(dtype=bool)
+        fill_counts[col] = int(mask.sum())
+        if not fill_counts[col]:
+            continue
+
+        if col not in master_df.columns:
+            master_df[col] = None
+
+        rows = target_index[mask]
+        values = aligned.loc[rows, col]
+        try:
+            master_df.loc[rows, col] = values
+        except (TypeError, ValueError):
+            # Incompatible dtypes (e.g. text into a float column read from CSV)
+            master_df[col] = master_df[col].astype(object)
+            master_df.loc[rows, col] = values
+
+    return master_df, fill_counts
+
+
 def run_incremental_enrichment(
     master_df: pd.DataFrame,
     enrichment_type: str,
-    limit: Optional[int] = None
+    limit: Optional[int] = None,
+    store: Optional[MasterStore] = None
 ) -> pd.DataFrame:
     """
     Run enricher only on rows needing it, then merge results back.
@@ -307,7 +393,8 @@ def run_incremental_enrichment(
     1. Filter to rows needing enrichment
     2. Save filtered rows to temp file
     3. Run enricher on temp file
-    4. Load results and merge back to master
+    4. Load results and merge back to master (and to the store, if given,
+       which only writes the enriched rows)
     """
     config = ENRICHMENT_CONFIG.get(enrichment_type)
     if not config:
@@ -348,24 +435,12 @@ def run_incremental_enrichment(
         return master_df
 
     # Merge enriched data back to master by page_name
-    for _, enriched_row in enriched.iterrows():
-        page_name = enriched_row.get('page_name')
-        if not page_name:
-            continue
-
-        mask = master_df['page_name'] == page_name
-        if not mask.any():
-            continue
-
-        # Update only the enriched columns (non-null values)
-        for col in enriched.columns:
-            if col == 'page_name':
-                continue
-            if pd.notna(enriched_row[col]) and str(enriched_row[col]).strip() != '':
-                # Ensure column exists in master
-                if col not in master_df.columns:
-                    master_df[col] = None
-                master_df.loc[mask, col] = enriched_row[col]
+    if store is not None:
+        store.update_by_key(enriched)
+    master_df, fill_counts = merge_enriched(master_df, enriched)
+    for col, count in fill_counts.items():
+        if count:
+            logger.info(f"  {col}: {count} cells updated")
 
     # Cleanup
     temp_path.unlink()
@@ -384,6 +459,11 @@ def save_master(df: pd.DataFrame) -> Path:
     return MASTER_PATH
 
 
+def get_store(args) -> Optional[MasterStore]:
+    """Return the keyed master store when --store is set."""
+    return MasterStore() if getattr(args, 'store', False) else None
+
+
 def cmd_merge(args):
     """Handle merge command."""
     input_path = Path(args.input)
@@ -398,6 +478,13 @@ def cmd_merge(args):
     incoming = pd.read_csv(input_path, encoding='utf-8')
     logger.info(f"Loaded incoming: {len(incoming)} rows, {len(incoming.columns)} columns")
 
+    store = get_store(args)
+    if store:
+        stats = store.upsert(incoming)
+        print(f"\nMerge complete: {stats['inserted']} inserted, {stats['updated']} updated, "
+              f"{stats['merged']} duplicates merged ({store.count()} contacts)")
+        return 0
+
     # Backup current master
     backup_master()
 
@@ -414,11 +501,17 @@ def cmd_merge(args):
 
 def cmd_enrich(args):
     """Handle enrich command."""
-    # Backup current master
-    backup_master()
+    store = get_store(args)
 
-    # Load master
-    master = load_master()
+    if store:
+        # Store writes are per-row transactions; no full-file backup needed
+        master = store.load()
+    else:
+        # Backup current master
+        backup_master()
+
+        # Load master
+        master = load_master()
     if len(master) == 0:
         logger.error("Master is empty, nothing to enrich")
         return 1
@@ -438,10 +531,11 @@ def cmd_enrich(args):
         print(f"Running {etype} enrichment...")
         print(f"{'='*60}")
 
-        master = run_incremental_enrichment(master, etype, limit=args.limit)
+        master = run_incremental_enrichment(master, etype, limit=args.limit, store=store)
 
     # Save updated master
-    save_master(master)
+    if not store:
+        save_master(master)
 
     print(f"\nEnrichment complete: {len(master)} contacts processed")
     return 0
@@ -463,6 +557,12 @@ def cmd_sync(args):
 
 def cmd_dedupe(args):
     """Handle dedupe command."""
+    store = get_store(args)
+    if store:
+        # Unique key indexes keep the store deduplicated on every upsert
+        print(f"\nStore is deduplicated on write: {store.count()} contacts")
+        return 0
+
     # Backup current master
     backup_master()
 
@@ -483,9 +583,40 @@ def cmd_dedupe(args):
     return 0
 
 
+def cmd_import(args):
+    """Handle import command - load a CSV (default: master CSV) into the store."""
+    input_path = Path(args.input) if args.input else MASTER_PATH
+    if not input_path.is_absolute():
+        input_path = BASE_DIR / input_path
+
+    if not input_path.exists():
+        logger.error(f"Input file not found: {input_path}")
+        return 1
+
+    df = pd.read_csv(input_path, encoding='utf-8')
+    store = MasterStore()
+    stats = store.upsert(df)
+    print(f"\nImported {len(df)} rows into {store.db_path}: {stats['inserted']} inserted, "
+          f"{stats['updated']} updated, {stats['merged']} duplicates merged")
+    return 0
+
+
+def cmd_export(args):
+    """Handle export command - write the store to CSV (default: master CSV)."""
+    output_path = Path(args.output) if args.output else MASTER_PATH
+    if not output_path.is_absolute():
+        output_path = BASE_DIR / output_path
+
+    store = MasterStore()
+    store.export_csv(output_path)
+    print(f"\nExported {store.count()} contacts to {output_path}")
+    return 0
+
+
 def cmd_status(args):
     """Handle status command - show enrichment status."""
-    master = load_master()
+    store = get_store(args)
+    master = store.load() if store else load_master()
     if len(master) == 0:
         print("Master is empty")
         return 0
@@ -524,6 +655,8 @@ Commands:
   sync    Merge + enrich in one step
   dedupe  Deduplicate master
   status  Show enrichment status
+  import  Load a CSV into the keyed store (output/prospects_master.db)
+  export  Write the keyed store to CSV
 
 Examples:
   python scripts/master_manager.py merge --input processed/03i_scored.csv
@@ -531,8 +664,11 @@ Examples:
   python scripts/master_manager.py enrich --type google_maps --limit 10
   python scripts/master_manager.py sync --input processed/03i_scored.csv
   python scripts/master_manager.py status
+  python scripts/master_manager.py --store merge --input processed/03i_scored.csv
         """
     )
+    parser.add_argument('--store', action='store_true',
+                        help=f'Use the keyed SQLite store ({STORE_PATH.name}) instead of the CSV')
 
     subparsers = parser.add_subparsers(dest='command', help='Command to run')
 
@@ -557,6 +693,12 @@ Examples:
     # Status command
     subparsers.add_parser('status', help='Show enrichment status')
 
+    # Store import/export
+    import_parser = subparsers.add_parser('import', help='Load a CSV into the keyed store')
+    import_parser.add_argument('--input', '-i', help='CSV to import (default: master CSV)')
+    export_parser = subparsers.add_parser('export', help='Export the keyed store to CSV')
+    export_parser.add_argument('--output', '-o', help='CSV path (default: master CSV)')
+
     args = parser.parse_args()
 
     if not args.command:
@@ -566,7 +708,7 @@ Examples:
     print(f"\n{'='*60}")
     print("MASTER MANAGER")
     print(f"{'='*60}")
-    print(f"Master file: {MASTER_PATH}")
+    print(f"Master file: {STORE_PATH if args.store or args.command in ('import', 'export') else MASTER_PATH}")
 
     if args.command == 'merge':
         return cmd_merge(args)
@@ -578,6 +720,10 @@ Examples:
         return cmd_dedupe(args)
     elif args.command == 'status':
         return cmd_status(args)
+    elif args.command == 'import':
+        return cmd_import(args)
+    elif args.command == 'export':
+        return cmd_export(args)
     else:
         parser.print_help()
         return 1
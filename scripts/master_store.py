@@ -0,0 +1,389 @@
+"""
+Master Store - Keyed SQLite storage for prospects master
+
+Holds the master contact list in a SQLite table with unique indexes on the
+three dedupe keys used by master_manager (normalized page_name, primary_email
+and website_url). Merges become upserts that only touch incoming rows, so
+master maintenance scales with the size of each delta instead of the full
+history. The CSV (output/prospects_master.csv) remains an export format.
+
+Data columns are added on demand (ALTER TABLE) as enrichers introduce them,
+and values are stored with SQLite's dynamic typing.
+
+Usage:
+    from master_store import MasterStore
+
+    store = MasterStore()                 # output/prospects_master.db
+    stats = store.upsert(incoming_df)     # {'inserted': .., 'updated': .., 'merged': ..}
+    counts = store.update_by_key(enriched_df)
+    df = store.load()
+    store.export_csv(Path("output/prospects_master.csv"))
+"""
+
+import logging
+import math
+import re
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).parent.parent
+STORE_PATH = BASE_DIR / "output" / "prospects_master.db"
+
+TABLE = "prospects"
+
+# Internal columns (not exported)
+KEY_COLUMNS = ["page_key", "email_key", "url_key"]
+INTERNAL_COLUMNS = ["id"] + KEY_COLUMNS
+
+# Dedupe priority: page_name > primary_email > website_url
+KEY_SOURCES = {
+    "page_key": "page_name",
+    "email_key": "primary_email",
+    "url_key": "website_url",
+}
+
+
+def is_missing(value: Any) -> bool:
+    """True for None/NaN/blank-string cells."""
+    if value is None:
+        return True
+    if isinstance(value, float) and math.isnan(value):
+        return True
+    return isinstance(value, str) and value.strip() == ""
+
+
+def normalize_name(value: Any) -> str:
+    """Normalize page_name for matching (same rules as master_manager.normalize_key)."""
+    if is_missing(value):
+        return ""
+    return re.sub(r"\s+", " ", str(value).strip().casefold())
+
+
+def normalize_email(value: Any) -> str:
+    """Normalize email for matching."""
+    if is_missing(value):
+        return ""
+    return str(value).strip().lower()
+
+
+def normalize_url(value: Any) -> str:
+    """Normalize URL for matching (remove protocol, www, trailing slash)."""
+    if is_missing(value):
+        return ""
+    url = str(value).lower().strip()
+    url = url.replace("https://", "").replace("http://", "")
+    url = url.replace("www.", "")
+    return url.rstrip("/")
+
+
+KEY_NORMALIZERS = {
+    "page_key": normalize_name,
+    "email_key": normalize_email,
+    "url_key": normalize_url,
+}
+
+
+def record_keys(record: Dict[str, Any]) -> Dict[str, str]:
+    """Compute normalized dedupe keys for a row."""
+    return {
+        key: KEY_NORMALIZERS[key](record.get(source))
+        for key, source in KEY_SOURCES.items()
+    }
+
+
+def richness(record: Dict[str, Any]) -> int:
+    """Number of populated cells in a row."""
+    return sum(1 for value in record.values() if not is_missing(value))
+
+
+def to_sql_value(value: Any) -> Any:
+    """Convert a pandas/numpy cell into a value SQLite can store."""
+    if is_missing(value):
+        return None
+    if hasattr(value, "item"):  # numpy scalar
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, bool):
+        return str(value)  # Round-trips through CSV as True/False
+    if isinstance(value, (int, float, str)):
+        return value
+    return str(value)
+
+
+def quote(column: str) -> str:
+    """Quote a column name for SQL."""
+    return '"' + column.replace('"', '""') + '"'
+
+
+def dataframe_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Convert a DataFrame into SQLite-ready row dicts."""
+    columns = [str(c) for c in df.columns]
+    return [
+        {col: to_sql_value(value) for col, value in zip(columns, row)}
+        for row in df.itertuples(index=False, name=None)
+    ]
+
+
+class MasterStore:
+    """SQLite-backed master contact store with unique dedupe keys."""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = Path(db_path) if db_path else STORE_PATH
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_db()
+
+    # -------------------------------------------------------------------------
+    # Connection / schema
+    # -------------------------------------------------------------------------
+
+    @contextmanager
+    def _transaction(self):
+        """Connection that commits on success and rolls back on error."""
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def _init_db(self):
+        """Create table and unique key indexes if needed."""
+        with self._transaction() as conn:
+            conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {TABLE} (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    page_key TEXT NOT NULL DEFAULT '',
+                    email_key TEXT NOT NULL DEFAULT '',
+                    url_key TEXT NOT NULL DEFAULT ''
+                )
+            """)
+            for key in KEY_COLUMNS:
+                conn.execute(
+                    f"CREATE UNIQUE INDEX IF NOT EXISTS idx_{TABLE}_{key} "
+                    f"ON {TABLE}({key}) WHERE {key} != ''"
+                )
+
+    def _columns(self, conn: sqlite3.Connection) -> List[str]:
+        """Data columns in insertion order."""
+        rows = conn.execute(f"PRAGMA table_info({TABLE})").fetchall()
+        return [r["name"] for r in rows if r["name"] not in INTERNAL_COLUMNS]
+
+    def _ensure_columns(self, conn: sqlite3.Connection, columns: Iterable[str]) -> List[str]:
+        """Add any missing data columns. Returns the full data column list."""
+        existing = self._columns(conn)
+        known = set(existing) | set(INTERNAL_COLUMNS)
+        for col in columns:
+            if col not in known:
+                conn.execute(f"ALTER TABLE {TABLE} ADD COLUMN {quote(col)}")
+                existing.append(col)
+                known.add(col)
+        return existing
+
+    # -------------------------------------------------------------------------
+    # Row helpers
+    # -------------------------------------------------------------------------
+
+    def _find_matches(self, conn: sqlite3.Connection, keys: Dict[str, str]) -> Set[int]:
+        """Ids of rows sharing any non-empty key."""
+        ids = set()
+        for key, value in keys.items():
+            if value:
+                # The redundant "!= ''" lets SQLite use the partial unique index
+                row = conn.execute(
+                    f"SELECT id FROM {TABLE} WHERE {key} = ? AND {key} != ''", (value,)
+                ).fetchone()
+                if row:
+                    ids.add(row["id"])
+        return ids
+
+    def _get_rows(self, conn: sqlite3.Connection, ids: Iterable[int]) -> List[Dict[str, Any]]:
+        """Fetch rows by id as dicts (including id)."""
+        ids = list(ids)
+        placeholders = ",".join("?" * len(ids))
+        rows = conn.execute(f"SELECT * FROM {TABLE} WHERE id IN ({placeholders})", ids).fetchall()
+        return [{k: r[k] for k in r.keys() if k not in KEY_COLUMNS} for r in rows]
+
+    def _write_row(self, conn: sqlite3.Connection, record: Dict[str, Any], row_id: Optional[int] = None) -> int:
+        """Insert (row_id=None) or overwrite a row, recomputing its keys."""
+        values = {k: v for k, v in record.items() if k != "id"}
+        values.update(record_keys(values))
+        columns = list(values)
+        if row_id is None:
+            cursor = conn.execute(
+                f"INSERT INTO {TABLE} ({','.join(quote(c) for c in columns)}) "
+                f"VALUES ({','.join('?' * len(columns))})",
+                [values[c] for c in columns],
+            )
+            return cursor.lastrowid
+        conn.execute(
+            f"UPDATE {TABLE} SET {','.join(quote(c) + ' = ?' for c in columns)} WHERE id = ?",
+            [values[c] for c in columns] + [row_id],
+        )
+        return row_id
+
+    def _merge_into(
+        self,
+        conn: sqlite3.Connection,
+        record: Dict[str, Any],
+        ids: Set[int],
+        target: Optional[int] = None
+    ) -> int:
+        """
+        Consolidate a record with the matching stored rows.
+
+        The richest row becomes the base and the others fill its gaps (same
+        "keep the richest row" rule as master_manager.deduplicate). Rows that
+        only match once gaps are filled are absorbed too, so the result never
+        violates a unique key. The merged row is written to `target` (default:
+        lowest matching id) and the other rows are deleted.
+
+        Returns:
+            Number of stored rows deleted
+        """
+        ids = set(ids)
+        while True:
+            candidates = self._get_rows(conn, ids) + [record]
+            candidates.sort(key=richness, reverse=True)
+            merged: Dict[str, Any] = {}
+            for candidate in candidates:
+                for col, value in candidate.items():
+                    if col != "id" and is_missing(merged.get(col)) and not is_missing(value):
+                        merged[col] = value
+            extra = self._find_matches(conn, record_keys(merged)) - ids
+            if not extra:
+                break
+            ids |= extra
+
+        if target is None:
+            target = min(ids)
+        deleted = 0
+        for row_id in ids:
+            if row_id != target:
+                conn.execute(f"DELETE FROM {TABLE} WHERE id = ?", (row_id,))
+                deleted += 1
+        self._write_row(conn, merged, target)
+        return deleted
+
+    # -------------------------------------------------------------------------
+    # Public API
+    # -------------------------------------------------------------------------
+
+    def upsert(self, df: pd.DataFrame) -> Dict[str, int]:
+        """
+        Upsert incoming rows, deduplicating against stored rows by key.
+
+        Only rows matching an incoming row's page_name, primary_email or
+        website_url are read or written.
+
+        Returns:
+            Stats dict: inserted, updated, merged (stored duplicates absorbed)
+        """
+        stats = {"inserted": 0, "updated": 0, "merged": 0}
+        if len(df) == 0:
+            return stats
+
+        with self._transaction() as conn:
+            self._ensure_columns(conn, [str(c) for c in df.columns])
+            for record in dataframe_records(df):
+                ids = self._find_matches(conn, record_keys(record))
+                if not ids:
+                    self._write_row(conn, record)
+                    stats["inserted"] += 1
+                    continue
+                stats["merged"] += self._merge_into(conn, record, ids)
+                stats["updated"] += 1
+
+        logger.info(
+            f"Upserted {len(df)} rows: {stats['inserted']} inserted, "
+            f"{stats['updated']} updated, {stats['merged']} duplicates merged"
+        )
+        return stats
+
+    def update_by_key(self, enriched: pd.DataFrame, key: str = "page_name") -> Dict[str, int]:
+        """
+        Write enricher output into matching rows (non-null, non-blank cells only).
+
+        Mirrors master_manager.merge_enriched for the store: rows are matched
+        on the normalized page_name and enriched values overwrite stored ones.
+
+        Returns:
+            {column: number of rows updated}
+        """
+        fill_counts: Dict[str, int] = {}
+        if key not in enriched.columns or len(enriched) == 0:
+            return fill_counts
+
+        with self._transaction() as conn:
+            self._ensure_columns(conn, [str(c) for c in enriched.columns])
+            for record in dataframe_records(enriched):
+                page_key = normalize_name(record.get(key))
+                if not page_key:
+                    continue
+                row = conn.execute(
+                    f"SELECT id FROM {TABLE} WHERE page_key = ? AND page_key != ''", (page_key,)
+                ).fetchone()
+                if not row:
+                    continue
+
+                stored = self._get_rows(conn, [row["id"]])[0]
+                changes = {
+                    col: value for col, value in record.items()
+                    if col != key and not is_missing(value)
+                }
+                if not changes:
+                    continue
+                for col in changes:
+                    fill_counts[col] = fill_counts.get(col, 0) + 1
+                stored.update(changes)
+
+                # A new email/website may now collide with another stored row
+                conflicts = self._find_matches(conn, record_keys(stored)) - {row["id"]}
+                if conflicts:
+                    self._merge_into(conn, stored, conflicts | {row["id"]}, target=row["id"])
+                else:
+                    self._write_row(conn, stored, row["id"])
+
+        return fill_counts
+
+    def load(self) -> pd.DataFrame:
+        """Load the full master as a DataFrame (data columns only, insertion order)."""
+        with self._transaction() as conn:
+            columns = self._columns(conn)
+            if not columns:
+                return pd.DataFrame()
+            df = pd.read_sql_query(
+                f"SELECT {','.join(quote(c) for c in columns)} FROM {TABLE} ORDER BY id",
+                conn,
+            )
+
+        # Restore boolean columns stored as 'True'/'False'
+        for col in df.columns:
+            if df[col].dtype == object or pd.api.types.is_string_dtype(df[col]):
+                values = set(df[col].dropna().unique())
+                if values and values <= {"True", "False"}:
+                    df[col] = df[col].map({"True": True, "False": False})
+        return df
+
+    def count(self) -> int:
+        """Number of stored contacts."""
+        with self._transaction() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM {TABLE}").fetchone()[0]
+
+    def export_csv(self, path: Path) -> Path:
+        """Export the store to CSV."""
+        df = self.load()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_csv(path, index=False, encoding="utf-8")
+        logger.info(f"Exported {len(df)} rows to {path}")
+        return path
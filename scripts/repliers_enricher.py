@@ -38,6 +38,10 @@ from urllib.parse import urljoin
 from dotenv import load_dotenv
 from tqdm import tqdm
 
+# Add scripts directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+from utils.instagram_apis import get_instagram_search
+
 load_dotenv()
 
 # Try to import Groq client for LLM-based Instagram discovery
@@ -72,7 +76,7 @@ APIFY_API_TOKEN = os.getenv('APIFY_API_TOKEN') or os.getenv('APIFY_API_KEY')
 # Apify actors
 BUILTWITH_ACTOR = "datavoyantlab/builtwith-bulk-scraper"  # Tech stack detection
 FB_ADS_ACTOR = "curious_coder/facebook-ads-library-scraper"  # Meta ads
-INSTAGRAM_ACTOR = "apify/instagram-search-scraper"  # Instagram search
+# Instagram search (apify/instagram-search-scraper) goes through utils.instagram_apis
 
 # Try to import Apify client
 try:
@@ -1157,6 +1161,10 @@ def search_instagram_apify(client: Any, agent_name: str, city: str = "") -> Dict
     Search for agent's Instagram handle via Apify Instagram Search.
     NOTE: This actor has low accuracy - prefer search_instagram_combined instead.
 
+    Results come from the shared utils.instagram_apis search, so repeat
+    queries are answered from its cache; `client` is used only if the
+    shared search has no client of its own yet.
+
     Returns dict with:
         - instagram_handle: str
         - instagram_followers: int
@@ -1177,82 +1185,72 @@ def search_instagram_apify(client: Any, agent_name: str, city: str = "") -> Dict
             first_city = city.split(',')[0].strip()
             search_query = f"{agent_name} {first_city} real estate"
 
-        run_input = {
-            "search": search_query,
-            "resultsLimit": 10,
-            "searchType": "user",
-        }
-
-        run = client.actor(INSTAGRAM_ACTOR).call(run_input=run_input, timeout_secs=60)
-
-        status = run.get('status')
-        if status in ['SUCCEEDED', 'TIMED-OUT']:
-            dataset_id = run.get('defaultDatasetId')
-            if dataset_id:
-                items = list(client.dataset(dataset_id).iterate_items())
-
-                # Parse agent name for matching
-                name_parts = [p.lower() for p in agent_name.split() if len(p) > 2]
-                real_estate_keywords = ['realtor', 'agent', 'broker', 'real estate', 'properties', 'realty', 'homes', 'luxury']
-
-                best_match = None
-                best_score = 0
-
-                for item in items:
-                    username = item.get('username', '')
-                    full_name = item.get('fullName', '') or item.get('full_name', '')
-                    bio = item.get('biography', '') or item.get('bio', '')
-                    followers = item.get('followersCount', 0) or item.get('followers', 0)
-                    verified = item.get('verified', False)
-
-                    # Calculate match score
-                    score = 0
-
-                    # Check name match
-                    full_name_lower = full_name.lower()
-                    name_matches = sum(1 for part in name_parts if part in full_name_lower)
-                    score += name_matches * 30
-
-                    # Check username for name parts
-                    username_lower = username.lower().replace('_', ' ').replace('.', ' ')
-                    username_matches = sum(1 for part in name_parts if part in username_lower)
-                    score += username_matches * 20
-
-                    # Check bio for real estate keywords
-                    bio_lower = (bio or '').lower()
-                    if any(kw in bio_lower for kw in real_estate_keywords):
-                        score += 25
-
-                    # Bonus for verified or high followers
-                    if verified:
-                        score += 20
-                    if followers > 10000:
-                        score += 10
-                    elif followers > 1000:
-                        score += 5
-
-                    if score > best_score:
-                        best_score = score
-                        best_match = {
-                            "username": username,
-                            "full_name": full_name,
-                            "bio": bio,
-                            "followers": followers,
-                            "score": score,
-                        }
-
-                if best_match:
-                    result["instagram_handle"] = f"@{best_match['username']}"
-                    result["instagram_followers"] = best_match['followers']
-                    result["instagram_bio"] = (best_match['bio'] or '')[:200]
-
-                    # Determine confidence
-                    if best_match['score'] >= 70:
-                        result["instagram_confidence"] = 'high'
-                    elif best_match['score'] >= 40:
-                        result["instagram_confidence"] = 'medium'
-                    else:
-                        result["instagram_confidence"] = 'low'
+        # Shared, cached and batched with instagram_enricher's searches
+        search = get_instagram_search(client)
+        items = search.search(search_query) if search else []
+
+        # Parse agent name for matching
+        name_parts = [p.lower() for p in agent_name.split() if len(p) > 2]
+        real_estate_keywords = ['realtor', 'agent', 'broker', 'real estate', 'properties', 'realty', 'homes', 'luxury']
+
+        best_match = None
+        best_score = 0
+
+        for item in items:
+            username = item.get('username', '')
+            full_name = item.get('fullName', '') or item.get('full_name', '')
+            bio = item.get('biography', '') or item.get('bio', '')
+            followers = item.get('followersCount', 0) or item.get('followers', 0)
+            verified = item.get('verified', False)
+
+            # Calculate match score
+            score = 0
+
+            # Check name match
+            full_name_lower = full_name.lower()
+            name_matches = sum(1 for part in name_parts if part in full_name_lower)
+            score += name_matches * 30
+
+            # Check username for name parts
+            username_lower = username.lower().replace('_', ' ').replace('.', ' ')
+            username_matches = sum(1 for part in name_parts if part in username_lower)
+            score += username_matches * 20
+
+            # Check bio for real estate keywords
+            bio_lower = (bio or '').lower()
+            if any(kw in bio_lower for kw in real_estate_keywords):
+                score += 25
+
+            # Bonus for verified or high followers
+            if verified:
+                score += 20
+            if followers > 10000:
+                score += 10
+            elif followers > 1000:
+                score += 5
+
+            if score > best_score:
+                best_score = score
+                best_match = {
+                    "username": username,
+                    "full_name": full_name,
+                    "bio": bio,
+                    "followers": followers,
+                    "score": score,
+                }
+
+        if best_match:
+            result["instagram_handle"] = f"@{best_match['username']}"
+            result["instagram_followers"] = best_match['followers']
+            result["instagram_bio"] = (best_match['bio'] or '')[:200]
+
+            # Determine confidence
+            if best_match['score'] >= 70:
+                result["instagram_confidence"] = 'high'
+            elif best_match['score'] >= 40:
+                result["instagram_confidence"] = 'medium'
+            else:
+                result["instagram_confidence"] = 'low'
 
     except Exception as e:
         logger.debug(f"Instagram search error for {agent_name}: {e}")
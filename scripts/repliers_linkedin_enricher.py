@@ -25,10 +25,13 @@ from typing import Optional, Dict, List
 from difflib import SequenceMatcher
 
 import pandas as pd
-import requests
 from dotenv import load_dotenv
 from tqdm import tqdm
 
+# Add scripts directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+from utils.exa_client import get_exa_client
+
 load_dotenv()
 
 # Setup logging
@@ -49,7 +52,6 @@ DEFAULT_INPUT = "output/repliers/top_agents_2025_enriched.csv"
 
 # Exa API
 EXA_API_KEY = os.getenv('EXA_API_KEY')
-EXA_API_URL = "https://api.exa.ai/search"
 
 # Apify API (fallback)
 APIFY_API_KEY = os.getenv('APIFY_API_TOKEN') or os.getenv('APIFY_API_KEY')
@@ -121,34 +123,14 @@ def search_linkedin_exa(name: str, company: str = "") -> Optional[str]:
         query = f'site:linkedin.com/in "{name}" real estate'
 
     try:
-        headers = {
-            "x-api-key": EXA_API_KEY,
-            "Content-Type": "application/json"
-        }
-
-        payload = {
-            "query": query,
-            "numResults": 5,
-            "type": "keyword",
-            "contents": {
-                "text": {"maxCharacters": 500}
-            }
-        }
+        client = get_exa_client()
+        results = client.search(query, num_results=5, max_characters=500, search_type="keyword")
 
-        response = requests.post(EXA_API_URL, headers=headers, json=payload, timeout=30)
-
-        if response.status_code == 402:
+        if client.exhausted:
             logger.warning("Exa API credits exhausted, switching to Apify fallback")
             _exa_exhausted = True
             return None
 
-        if response.status_code != 200:
-            logger.debug(f"Exa API error: {response.status_code}")
-            return None
-
-        data = response.json()
-        results = data.get('results', [])
-
         if not results:
             return None
 
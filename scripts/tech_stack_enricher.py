@@ -24,6 +24,10 @@ Usage:
     python scripts/tech_stack_enricher.py           # Test mode (3 contacts)
     python scripts/tech_stack_enricher.py --all     # Process all contacts
     python scripts/tech_stack_enricher.py --csv output/prospects.csv  # Standalone
+
+    # Nightly audit of the master list: concurrent fetch + process-pool detection
+    python scripts/tech_stack_enricher.py --csv output/prospects_master.csv \
+        --output output/prospects_master.csv --all --parallel --workers 32
 """
 
 import os
@@ -33,6 +37,7 @@ import argparse
 import logging
 import time
 import json
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from pathlib import Path
 from typing import Optional, Dict, List, Any
 from urllib.parse import urlparse
@@ -75,6 +80,18 @@ REQUEST_HEADERS = {
     "Accept-Language": "en-US,en;q=0.5",
 }
 
+# Parallel mode settings
+FETCH_WORKERS = 16       # Concurrent HTML downloads (I/O bound, threads)
+DETECT_WORKERS = None    # Detection processes (CPU bound); None = os.cpu_count()
+
+# Output columns written by this module
+TECH_COLUMNS = [
+    "has_crm", "crm_name", "has_marketing_pixel", "pixel_types",
+    "has_scheduling_tool", "scheduling_tool", "has_chat_widget",
+    "chat_widget", "has_lead_form", "has_idx", "idx_provider",
+    "tech_stack_raw", "tech_count"
+]
+
 # =============================================================================
 # TECHNOLOGY DETECTION SIGNATURES
 # =============================================================================
@@ -443,13 +460,46 @@ TECH_SIGNATURES = {
 }
 
 
-def fetch_website_html(url: str, timeout: int = REQUEST_TIMEOUT) -> Optional[str]:
+# Generic lead/contact form patterns (not tied to a known provider)
+LEAD_FORM_INDICATORS = [
+    r'<form[^>]*(?:contact|lead|inquiry|schedule|get-started|request)',
+    r'<form[^>]*id\s*=\s*["\'][^"\']*(?:contact|lead|inquiry)[^"\']*["\']',
+    r'<form[^>]*class\s*=\s*["\'][^"\']*(?:contact|lead|inquiry)[^"\']*["\']',
+    r'type\s*=\s*["\']email["\'][^>]*placeholder\s*=\s*["\'][^"\']*email',
+    r'<input[^>]*name\s*=\s*["\'](?:email|phone|name)["\']',
+]
+
+
+def _compile_signatures() -> List[tuple]:
+    """Compile TECH_SIGNATURES once at import time: [(tech_id, config, [patterns])]."""
+    compiled = []
+    for tech_id, config in TECH_SIGNATURES.items():
+        patterns = []
+        for pattern in config["patterns"]:
+            try:
+                patterns.append(re.compile(pattern, re.IGNORECASE))
+            except re.error as e:
+                logger.warning(f"Invalid regex pattern for {tech_id}: {e}")
+        compiled.append((tech_id, config, patterns))
+    return compiled
+
+
+COMPILED_SIGNATURES = _compile_signatures()
+COMPILED_LEAD_FORM_INDICATORS = [re.compile(p, re.IGNORECASE) for p in LEAD_FORM_INDICATORS]
+
+
+def fetch_website_html(
+    url: str,
+    timeout: int = REQUEST_TIMEOUT,
+    session: Optional[requests.Session] = None
+) -> Optional[str]:
     """
     Fetch HTML content from a website.
 
     Args:
         url: Website URL
         timeout: Request timeout in seconds
+        session: Optional shared session (connection pooling in parallel mode)
 
     Returns:
         HTML content or None if failed
@@ -457,12 +507,14 @@ def fetch_website_html(url: str, timeout: int = REQUEST_TIMEOUT) -> Optional[str
     if not url:
         return None
 
+    http = session or requests
+
     # Ensure URL has scheme
     if not url.startswith(('http://', 'https://')):
         url = f'https://{url}'
 
     try:
-        response = requests.get(
+        response = http.get(
             url,
             headers=REQUEST_HEADERS,
             timeout=timeout,
@@ -474,7 +526,7 @@ def fetch_website_html(url: str, timeout: int = REQUEST_TIMEOUT) -> Optional[str
     except requests.exceptions.SSLError:
         # Try without SSL verification as fallback
         try:
-            response = requests.get(
+            response = http.get(
                 url,
                 headers=REQUEST_HEADERS,
                 timeout=timeout,
@@ -508,18 +560,15 @@ def detect_technologies(html: str) -> List[Dict]:
     detected = []
     html_lower = html.lower()
 
-    for tech_id, config in TECH_SIGNATURES.items():
-        for pattern in config["patterns"]:
-            try:
-                if re.search(pattern, html_lower, re.IGNORECASE):
-                    detected.append({
-                        "id": tech_id,
-                        "name": config["display_name"],
-                        "category": config["category"],
-                    })
-                    break  # Found this tech, move to next
-            except re.error as e:
-                logger.warning(f"Invalid regex pattern for {tech_id}: {e}")
+    for tech_id, config, patterns in COMPILED_SIGNATURES:
+        for pattern in patterns:
+            if pattern.search(html_lower):
+                detected.append({
+                    "id": tech_id,
+                    "name": config["display_name"],
+                    "category": config["category"],
+                })
+                break  # Found this tech, move to next
 
     return detected
 
@@ -540,16 +589,8 @@ def detect_generic_lead_form(html: str) -> bool:
     html_lower = html.lower()
 
     # Look for form elements with contact/lead-related attributes
-    form_indicators = [
-        r'<form[^>]*(?:contact|lead|inquiry|schedule|get-started|request)',
-        r'<form[^>]*id\s*=\s*["\'][^"\']*(?:contact|lead|inquiry)[^"\']*["\']',
-        r'<form[^>]*class\s*=\s*["\'][^"\']*(?:contact|lead|inquiry)[^"\']*["\']',
-        r'type\s*=\s*["\']email["\'][^>]*placeholder\s*=\s*["\'][^"\']*email',
-        r'<input[^>]*name\s*=\s*["\'](?:email|phone|name)["\']',
-    ]
-
-    for pattern in form_indicators:
-        if re.search(pattern, html_lower, re.IGNORECASE):
+    for pattern in COMPILED_LEAD_FORM_INDICATORS:
+        if pattern.search(html_lower):
             return True
 
     return False
@@ -594,21 +635,9 @@ def aggregate_tech_stack(detected: List[Dict], has_generic_form: bool) -> Dict[s
     }
 
 
-def enrich_with_tech_stack(row: Dict, delay: float = 0.5) -> Dict[str, Any]:
-    """
-    Enrich a single contact with tech stack data.
-
-    Args:
-        row: Contact row as dict
-        delay: Delay before request
-
-    Returns:
-        Dict with tech stack fields
-    """
-    website_url = str(row.get("website_url", "")).strip()
-
-    # Default empty result
-    empty_result = {
+def empty_tech_result() -> Dict[str, Any]:
+    """Default tech stack fields for contacts with no website or no HTML."""
+    return {
         "has_crm": False,
         "crm_name": "",
         "has_marketing_pixel": False,
@@ -624,8 +653,42 @@ def enrich_with_tech_stack(row: Dict, delay: float = 0.5) -> Dict[str, Any]:
         "tech_count": 0,
     }
 
+
+def analyze_html(html: Optional[str]) -> Dict[str, Any]:
+    """
+    Run detection and aggregation on fetched HTML.
+
+    Pure CPU work with no I/O, so it can be shipped to a process pool.
+
+    Args:
+        html: HTML content (None if fetch failed)
+
+    Returns:
+        Dict with tech stack fields
+    """
+    if not html:
+        return empty_tech_result()
+
+    detected = detect_technologies(html)
+    has_generic_form = detect_generic_lead_form(html)
+    return aggregate_tech_stack(detected, has_generic_form)
+
+
+def enrich_with_tech_stack(row: Dict, delay: float = 0.5) -> Dict[str, Any]:
+    """
+    Enrich a single contact with tech stack data.
+
+    Args:
+        row: Contact row as dict
+        delay: Delay before request
+
+    Returns:
+        Dict with tech stack fields
+    """
+    website_url = str(row.get("website_url", "")).strip()
+
     if not website_url or website_url.lower() in ["nan", "none", ""]:
-        return empty_result
+        return empty_tech_result()
 
     # Rate limiting
     time.sleep(delay)
@@ -635,27 +698,108 @@ def enrich_with_tech_stack(row: Dict, delay: float = 0.5) -> Dict[str, Any]:
 
     if not html:
         logger.debug(f"Could not fetch HTML for: {website_url}")
-        return empty_result
-
-    # Detect technologies
-    detected = detect_technologies(html)
-    has_generic_form = detect_generic_lead_form(html)
+        return empty_tech_result()
 
-    # Aggregate results
-    result = aggregate_tech_stack(detected, has_generic_form)
+    result = analyze_html(html)
 
-    if detected:
-        logger.debug(f"Found {len(detected)} technologies on {website_url}: {[t['name'] for t in detected]}")
+    if result["tech_count"]:
+        logger.debug(f"Found {result['tech_count']} technologies on {website_url}: {result['tech_stack_raw']}")
 
     return result
 
 
+def build_session(pool_size: int = FETCH_WORKERS) -> requests.Session:
+    """Create a keep-alive session whose connection pool matches the fetcher width."""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def enrich_tech_stack_parallel(
+    rows: List[tuple],
+    fetch_workers: int = FETCH_WORKERS,
+    detect_workers: Optional[int] = DETECT_WORKERS,
+    detect_executor=None
+) -> pd.DataFrame:
+    """
+    Fetch HTML concurrently and run detection in a process pool.
+
+    Downloads run on a bounded thread pool sharing one pooled session. As each
+    page arrives it is handed to the detection pool, so regex scanning never
+    competes with the fetch threads for the GIL and fetching never waits on
+    detection.
+
+    Args:
+        rows: List of (index, row_dict) tuples with website_url
+        fetch_workers: Max concurrent HTTP fetches
+        detect_workers: Detection processes (None = cpu count)
+        detect_executor: Optional executor to use for detection (tests/reuse)
+
+    Returns:
+        DataFrame of TECH_COLUMNS indexed like the input rows. Rows whose
+        fetch or detection raised are left out (as in serial mode) and
+        counted in the frame's attrs["errors"].
+    """
+    results: Dict[Any, Dict[str, Any]] = {}
+    errors = 0
+    if not rows:
+        frame = pd.DataFrame(columns=TECH_COLUMNS)
+        frame.attrs["errors"] = 0
+        return frame
+
+    session = build_session(fetch_workers)
+    own_executor = detect_executor is None
+    detector = detect_executor or ProcessPoolExecutor(max_workers=detect_workers)
+
+    try:
+        with ThreadPoolExecutor(max_workers=fetch_workers) as fetcher:
+            fetch_futures = {
+                fetcher.submit(fetch_website_html, str(row.get("website_url", "")).strip(), REQUEST_TIMEOUT, session): idx
+                for idx, row in rows
+            }
+
+            detect_futures = {}
+            for future in tqdm(as_completed(fetch_futures), total=len(fetch_futures), desc="Fetching websites"):
+                idx = fetch_futures[future]
+                try:
+                    html = future.result()
+                except Exception as e:
+                    logger.error(f"Fetch failed for row {idx}: {e}")
+                    errors += 1
+                    continue
+                if html:
+                    detect_futures[detector.submit(analyze_html, html)] = idx
+                else:
+                    results[idx] = empty_tech_result()
+
+        for future in tqdm(as_completed(detect_futures), total=len(detect_futures), desc="Detecting tech stacks"):
+            idx = detect_futures[future]
+            try:
+                results[idx] = future.result()
+            except Exception as e:
+                logger.error(f"Detection failed for row {idx}: {e}")
+                errors += 1
+    finally:
+        session.close()
+        if own_executor:
+            detector.shutdown()
+
+    frame = pd.DataFrame.from_dict(results, orient="index", columns=TECH_COLUMNS)
+    frame.attrs["errors"] = errors
+    return frame
+
+
 def enrich_tech_stack(
     csv_path: Path,
     output_path: Optional[Path] = None,
     limit: Optional[int] = None,
     dry_run: bool = False,
-    delay: float = 0.5
+    delay: float = 0.5,
+    parallel: bool = False,
+    fetch_workers: int = FETCH_WORKERS,
+    detect_workers: Optional[int] = DETECT_WORKERS
 ) -> Dict:
     """
     Enrich CSV with tech stack detection data.
@@ -665,7 +809,10 @@ def enrich_tech_stack(
         output_path: Output CSV path
         limit: Max contacts to process
         dry_run: Preview without making requests
-        delay: Delay between requests
+        delay: Delay between requests (serial mode only)
+        parallel: Use concurrent fetcher + detection process pool
+        fetch_workers: Max concurrent fetches in parallel mode
+        detect_workers: Detection processes in parallel mode (None = cpu count)
 
     Returns:
         Stats dictionary
@@ -682,13 +829,7 @@ def enrich_tech_stack(
         return {"error": "Missing required column: website_url"}
 
     # Initialize tech stack columns if not exist
-    tech_columns = [
-        "has_crm", "crm_name", "has_marketing_pixel", "pixel_types",
-        "has_scheduling_tool", "scheduling_tool", "has_chat_widget",
-        "chat_widget", "has_lead_form", "has_idx", "idx_provider",
-        "tech_stack_raw", "tech_count"
-    ]
-    for col in tech_columns:
+    for col in TECH_COLUMNS:
         if col not in df.columns:
             if col.startswith("has_"):
                 df[col] = False
@@ -740,33 +881,52 @@ def enrich_tech_stack(
             logger.info(f"  Would analyze: {row.get('website_url')}")
         return stats
 
-    # Process each contact
-    for idx, row in tqdm(rows_to_process, desc="Detecting tech stacks"):
-        try:
-            tech_data = enrich_with_tech_stack(row, delay=delay)
+    if parallel:
+        results = enrich_tech_stack_parallel(
+            rows_to_process,
+            fetch_workers=fetch_workers,
+            detect_workers=detect_workers
+        )
+
+        # Single vectorized write-back of all tech columns
+        df[TECH_COLUMNS] = df[TECH_COLUMNS].astype(object)
+        df.loc[results.index, TECH_COLUMNS] = results
+
+        stats["processed"] = len(results)
+        stats["errors"] = results.attrs.get("errors", 0)
+        stats["found_tech"] = int((results["tech_count"] > 0).sum())
+        stats["with_crm"] = int(results["has_crm"].sum())
+        stats["with_pixel"] = int(results["has_marketing_pixel"].sum())
+        stats["with_scheduling"] = int(results["has_scheduling_tool"].sum())
+        stats["with_chat"] = int(results["has_chat_widget"].sum())
+    else:
+        # Process each contact
+        for idx, row in tqdm(rows_to_process, desc="Detecting tech stacks"):
+            try:
+                tech_data = enrich_with_tech_stack(row, delay=delay)
 
-            # Update dataframe
-            for key, value in tech_data.items():
-                df.at[idx, key] = value
+                # Update dataframe
+                for key, value in tech_data.items():
+                    df.at[idx, key] = value
 
-            if tech_data.get("tech_count", 0) > 0:
-                stats["found_tech"] += 1
+                if tech_data.get("tech_count", 0) > 0:
+                    stats["found_tech"] += 1
 
-            # Track specific tech categories
-            if tech_data.get("has_crm"):
-                stats["with_crm"] += 1
-            if tech_data.get("has_marketing_pixel"):
-                stats["with_pixel"] += 1
-            if tech_data.get("has_scheduling_tool"):
-                stats["with_scheduling"] += 1
-            if tech_data.get("has_chat_widget"):
-                stats["with_chat"] += 1
+                # Track specific tech categories
+                if tech_data.get("has_crm"):
+                    stats["with_crm"] += 1
+                if tech_data.get("has_marketing_pixel"):
+                    stats["with_pixel"] += 1
+                if tech_data.get("has_scheduling_tool"):
+                    stats["with_scheduling"] += 1
+                if tech_data.get("has_chat_widget"):
+                    stats["with_chat"] += 1
 
-            stats["processed"] += 1
+                stats["processed"] += 1
 
-        except Exception as e:
-            logger.error(f"Error processing {row.get('website_url')}: {e}")
-            stats["errors"] += 1
+            except Exception as e:
+                logger.error(f"Error processing {row.get('website_url')}: {e}")
+                stats["errors"] += 1
 
     # Save output
     if output_path is None:
@@ -822,6 +982,12 @@ def main():
                        help='Preview without making requests')
     parser.add_argument('--delay', type=float, default=0.5,
                        help='Delay between requests in seconds (default: 0.5)')
+    parser.add_argument('--parallel', action='store_true',
+                       help='Concurrent HTML fetch with process-pool detection')
+    parser.add_argument('--workers', type=int, default=FETCH_WORKERS,
+                       help=f'Concurrent fetches in parallel mode (default: {FETCH_WORKERS})')
+    parser.add_argument('--detect-workers', type=int, default=DETECT_WORKERS,
+                       help='Detection processes in parallel mode (default: CPU count)')
 
     args = parser.parse_args()
 
@@ -893,6 +1059,8 @@ def main():
     print(f"Output: {output_path}")
     if args.dry_run:
         print("Mode: DRY RUN")
+    elif args.parallel:
+        print(f"Mode: PARALLEL ({args.workers} fetchers)")
 
     # Run enrichment
     stats = enrich_tech_stack(
@@ -900,7 +1068,10 @@ def main():
         output_path=output_path,
         limit=limit,
         dry_run=args.dry_run,
-        delay=args.delay
+        delay=args.delay,
+        parallel=args.parallel,
+        fetch_workers=args.workers,
+        detect_workers=args.detect_workers
     )
 
     # Create latest symlink in pipeline mode
@@ -0,0 +1,250 @@
+"""Shared Exa search client.
+
+One pooled HTTP session, an on-disk response cache and retry/backoff for
+every module that searches Exa (email drafter researcher, exa_enricher,
+linkedin_enricher, contact_name_resolver). Responses are cached by
+(query, num_results, max_characters) so re-runs only pay for new queries.
+
+Sync callers use search(); async callers use search_async() or
+search_many_async(), which run requests on the client's own worker pool so
+the event loop is never blocked.
+
+Usage:
+    from utils.exa_client import get_exa_client
+
+    exa = get_exa_client()
+    results = exa.search('"Acme Realty" owner', num_results=3)
+    batches = await exa.search_many_async(["query one", "query two"], num_results=2)
+
+Environment:
+    EXA_API_KEY            API key (required for live calls)
+    EXA_CACHE_TTL_DAYS     Response cache lifetime, 0 disables (default: 7)
+    EXA_CONCURRENCY        Max parallel requests per client (default: 8)
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.response_cache import ResponseCache, make_cache_key
+
+logger = logging.getLogger(__name__)
+
+EXA_API_URL = "https://api.exa.ai/search"
+
+DEFAULT_TIMEOUT = 15
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF = 1.0  # seconds, doubled per attempt
+DEFAULT_CACHE_TTL_DAYS = 7
+DEFAULT_CONCURRENCY = 8
+
+# Statuses worth retrying (rate limit / transient server errors)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class ExaClient:
+    """Pooled, cached, retrying Exa search client (thread-safe)."""
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        cache: Optional[ResponseCache] = None,
+        max_concurrency: int = DEFAULT_CONCURRENCY,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        timeout: float = DEFAULT_TIMEOUT
+    ):
+        self.api_key = api_key if api_key is not None else os.getenv('EXA_API_KEY')
+        self.cache = cache
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        # Set when Exa answers 402 (credits exhausted); callers can switch to fallbacks
+        self.exhausted = False
+        self.stats = {'requests': 0, 'cache_hits': 0, 'retries': 0, 'errors': 0}
+        self._stats_lock = threading.Lock()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, max_concurrency))
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            "accept": "application/json",
+            "content-type": "application/json",
+            "x-api-key": self.api_key or "",
+        })
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_concurrency), thread_name_prefix='exa'
+        )
+
+    def _count(self, stat: str, n: int = 1):
+        with self._stats_lock:
+            self.stats[stat] += n
+
+    @staticmethod
+    def cache_key(query: str, num_results: int, max_characters: int, search_type: str = 'auto') -> str:
+        """Cache key for one search."""
+        if search_type == 'auto':
+            return make_cache_key('exa', query, num_results, max_characters)
+        return make_cache_key('exa', query, num_results, max_characters, search_type)
+
+    def _post(self, payload: Dict[str, Any]) -> Optional[List[Dict]]:
+        """POST one search with retry/backoff. Returns None on failure."""
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            delay = self.backoff * (2 ** attempt)
+            self._count('requests')
+
+            try:
+                response = self.session.post(EXA_API_URL, json=payload, timeout=self.timeout)
+            except (requests.Timeout, requests.ConnectionError) as e:
+                if last_attempt:
+                    logger.error(f"Exa request failed after {attempt + 1} attempts: {e}")
+                    return None
+                self._count('retries')
+                time.sleep(delay)
+                continue
+
+            if response.status_code == 200:
+                return response.json().get('results', [])
+
+            if response.status_code == 402:
+                self.exhausted = True
+                logger.warning("Exa API credits exhausted (402)")
+                return None
+
+            if response.status_code in RETRY_STATUSES and not last_attempt:
+                retry_after = response.headers.get('Retry-After', '') if response.headers else ''
+                if str(retry_after).isdigit():
+                    delay = max(delay, float(retry_after))
+                self._count('retries')
+                time.sleep(delay)
+                continue
+
+            logger.error(f"Exa API error: {response.status_code}")
+            return None
+
+        return None
+
+    def search(
+        self,
+        query: str,
+        num_results: int = 3,
+        max_characters: int = 3000,
+        use_cache: bool = True,
+        search_type: str = 'auto'
+    ) -> List[Dict]:
+        """
+        Search Exa (blocking).
+
+        Args:
+            query: Search query string
+            num_results: Number of results to return
+            max_characters: Page text characters to include per result
+            use_cache: Read/write the response cache
+            search_type: Exa search type ('auto', 'keyword', 'neural')
+
+        Returns:
+            List of result dicts (url, title, text, ...); [] on failure
+        """
+        if not self.api_key or self.exhausted:
+            return []
+
+        key = self.cache_key(query, num_results, max_characters, search_type)
+        if use_cache and self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self._count('cache_hits')
+                return cached
+
+        payload = {
+            "query": query,
+            "numResults": num_results,
+            "type": search_type,
+            "contents": {
+                "text": {"maxCharacters": max_characters}
+            }
+        }
+
+        try:
+            results = self._post(payload)
+        except Exception as e:
+            logger.error(f"Exa search error: {e}")
+            results = None
+
+        if results is None:
+            self._count('errors')
+            return []
+
+        # Empty answers are cached too; failures are not
+        if use_cache and self.cache is not None:
+            self.cache.set(key, results)
+        return results
+
+    async def search_async(
+        self,
+        query: str,
+        num_results: int = 3,
+        max_characters: int = 3000,
+        use_cache: bool = True
+    ) -> List[Dict]:
+        """Search Exa without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            functools.partial(self.search, query, num_results, max_characters, use_cache)
+        )
+
+    async def search_many_async(
+        self,
+        queries: Sequence[str],
+        num_results: int = 3,
+        max_characters: int = 3000,
+        use_cache: bool = True
+    ) -> List[List[Dict]]:
+        """
+        Run several searches concurrently (e.g. all queries for one prospect).
+
+        Duplicate queries are only sent once.
+
+        Returns:
+            One result list per query, in input order
+        """
+        unique = list(dict.fromkeys(queries))
+        batches = await asyncio.gather(*(
+            self.search_async(q, num_results, max_characters, use_cache) for q in unique
+        ))
+        by_query = dict(zip(unique, batches))
+        return [by_query[q] for q in queries]
+
+    def close(self):
+        """Release the session, worker pool and cache."""
+        self._executor.shutdown(wait=False)
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+
+
+_client: Optional[ExaClient] = None
+_client_lock = threading.Lock()
+
+
+def get_exa_client() -> ExaClient:
+    """Return the process-wide Exa client (created on first use)."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            ttl_days = float(os.getenv('EXA_CACHE_TTL_DAYS', DEFAULT_CACHE_TTL_DAYS))
+            cache = ResponseCache('exa', ttl_seconds=ttl_days * 86400) if ttl_days > 0 else None
+            _client = ExaClient(
+                cache=cache,
+                max_concurrency=int(os.getenv('EXA_CONCURRENCY', DEFAULT_CONCURRENCY))
+            )
+        return _client
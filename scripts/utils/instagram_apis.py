@@ -1,7 +1,46 @@
-"""Paid Instagram API integrations for fast handle lookup."""
+"""Paid Instagram API integrations for fast handle lookup.
 
+Instagram user searches go through the Apify Instagram Search Scraper via one
+process-wide ApifySearch (see get_instagram_search()):
+
+- one shared ApifyClient, created on first use;
+- an on-disk result cache keyed by normalized query, so instagram_enricher
+  and repliers_enricher never re-run the actor for a query they have seen;
+- batching: concurrent async searches arriving within a short window are
+  sent as one actor run (several comma-separated search terms), and
+  search_many() packs its misses the same way;
+- a record of every actor run (queries, latency, cost in USD) so paid-API
+  usage can be budgeted (report()).
+
+Actor runs are blocking calls, so async callers run them on worker threads
+and the event loop is never blocked.
+
+Usage:
+    from utils.instagram_apis import get_instagram_search
+
+    search = get_instagram_search()
+    profiles = await search.search_async("acme realty")
+    by_query = search.search_many(["jane doe miami real estate", "acme realty"])
+    print(search.report())
+
+Environment:
+    APIFY_API_TOKEN                  Apify token (or APIFY_API_KEY; required for live calls)
+    USE_PAID_INSTAGRAM_API           Enable search_apify_instagram() (default: false)
+    APIFY_INSTAGRAM_CACHE_TTL_DAYS   Result cache lifetime, 0 disables (default: 30)
+    APIFY_INSTAGRAM_BATCH_SIZE       Search terms per actor run (default: 10)
+    APIFY_CONCURRENCY                Max actor runs in flight (default: 5)
+"""
+
+import asyncio
+import logging
 import os
-from typing import List, Optional
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+from utils.response_cache import ResponseCache, make_cache_key, normalize_cache_part
 
 # Try to import Apify client, but make it optional
 try:
@@ -11,56 +50,347 @@ except ImportError:
     APIFY_AVAILABLE = False
     ApifyClient = None
 
+logger = logging.getLogger(__name__)
+
+INSTAGRAM_SEARCH_ACTOR = os.getenv('APIFY_INSTAGRAM_SEARCH_ACTOR', 'apify/instagram-search-scraper')
+
+DEFAULT_CACHE_TTL_DAYS = 30
+DEFAULT_BATCH_SIZE = 10
+DEFAULT_MAX_RUNS = 5
+DEFAULT_RESULTS_PER_QUERY = 10
+DEFAULT_RUN_TIMEOUT = 120  # seconds
+
+# How long an async search waits for others to share its actor run
+BATCH_WINDOW = 0.25  # seconds
+
+# Profile fields kept in the cache (what the matchers use)
+PROFILE_FIELDS = ('username', 'fullName', 'biography', 'followersCount', 'verified')
+
+# Run statuses whose dataset is usable; only complete runs are cached
+USABLE_STATUSES = ('SUCCEEDED', 'TIMED-OUT')
+
+
+@dataclass
+class ApifyCall:
+    """One actor run: what it searched, how long it took and what it cost."""
+
+    actor: str
+    queries: int
+    items: int
+    status: str
+    latency_seconds: float
+    cost_usd: float
+
+
+def normalize_query(query: str) -> str:
+    """Casefolded, single-spaced query. Commas are dropped (they separate batched terms)."""
+    return normalize_cache_part(re.sub(r',', ' ', query or ''))
+
 
 def get_apify_client():
     """Get Apify client if available, otherwise return None."""
     if not APIFY_AVAILABLE:
         return None
-    
-    api_token = os.getenv('APIFY_API_TOKEN')
+
+    api_token = os.getenv('APIFY_API_TOKEN') or os.getenv('APIFY_API_KEY')
     if not api_token:
         return None
-    
+
     try:
         return ApifyClient(api_token)
     except Exception:
         return None
 
 
+class ApifySearch:
+    """Cached, batching Apify Instagram user search (thread-safe; async-safe per event loop)."""
+
+    def __init__(
+        self,
+        client=None,
+        cache: Optional[ResponseCache] = None,
+        actor_id: str = INSTAGRAM_SEARCH_ACTOR,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_runs: int = DEFAULT_MAX_RUNS,
+        results_per_query: int = DEFAULT_RESULTS_PER_QUERY,
+        batch_window: float = BATCH_WINDOW
+    ):
+        self.client = client
+        self.cache = cache
+        self.actor_id = actor_id
+        self.batch_size = max(1, batch_size)
+        self.results_per_query = results_per_query
+        self.batch_window = batch_window
+        self.calls: List[ApifyCall] = []
+        self.stats = {'queries': 0, 'cache_hits': 0, 'runs': 0, 'errors': 0}
+        self._stats_lock = threading.Lock()
+        self._run_slots = threading.BoundedSemaphore(max(1, max_runs))
+        # Async batching state (used from one event loop at a time)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._queued: List[str] = []
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+
+    def _count(self, stat: str, n: int = 1):
+        with self._stats_lock:
+            self.stats[stat] += n
+
+    def cache_key(self, query: str) -> str:
+        """Cache key for one normalized query."""
+        return make_cache_key('apify_instagram', self.actor_id, query, self.results_per_query)
+
+    def _cached(self, query: str) -> Optional[List[Dict]]:
+        if self.cache is None:
+            return None
+        hit = self.cache.get(self.cache_key(query))
+        if hit is not None:
+            self._count('cache_hits')
+        return hit
+
+    @staticmethod
+    def _item_query(item: Dict) -> str:
+        return normalize_query(item.get('searchTerm') or item.get('query') or item.get('search') or '')
+
+    def _run(self, queries: List[str]) -> Dict[str, List[Dict]]:
+        """One actor run for up to batch_size normalized queries (blocking).
+
+        Returns {query: profiles}. Raises on actor/API failure, so nothing is cached.
+        """
+        if self.client is None:
+            raise RuntimeError("Apify client not available")
+
+        run_input = {
+            "search": ", ".join(queries),
+            "searchType": "user",
+            "searchLimit": self.results_per_query,
+            "resultsLimit": self.results_per_query,
+        }
+
+        with self._run_slots:
+            started = time.perf_counter()
+            run = self.client.actor(self.actor_id).call(run_input=run_input, timeout_secs=DEFAULT_RUN_TIMEOUT)
+            status = (run or {}).get('status', 'UNKNOWN')
+            items = []
+            if status in USABLE_STATUSES and run.get('defaultDatasetId'):
+                items = list(self.client.dataset(run['defaultDatasetId']).iterate_items())
+            latency = time.perf_counter() - started
+
+        call = ApifyCall(self.actor_id, len(queries), len(items), status,
+                         round(latency, 2), float((run or {}).get('usageTotalUsd') or 0.0))
+        with self._stats_lock:
+            self.calls.append(call)
+            self.stats['runs'] += 1
+        logger.info(f"Apify {self.actor_id}: {call.queries} queries, {call.items} items, "
+                    f"{call.status} in {call.latency_seconds:.1f}s, ${call.cost_usd:.4f}")
+
+        if status not in USABLE_STATUSES:
+            raise RuntimeError(f"Actor run {status}")
+
+        # Map items back to their search term; a lone query owns every item
+        results = {query: [] for query in queries}
+        unattributed = 0
+        for item in items:
+            query = queries[0] if len(queries) == 1 else self._item_query(item)
+            if query not in results:
+                unattributed += 1
+            elif item.get('username'):
+                results[query].append({field: item.get(field) for field in PROFILE_FIELDS})
+
+        if len(queries) > 1 and items and unattributed == len(items):
+            # The actor does not tag items with their search term, so batched
+            # runs cannot be split back per query; search one query per run
+            logger.warning(f"Apify {self.actor_id}: no item names its search term; "
+                           f"falling back to one query per run")
+            self.batch_size = 1
+            results = {}
+            for query in queries:
+                results.update(self._run([query]))
+            return results
+
+        if status == 'SUCCEEDED' and self.cache is not None:
+            # An empty answer is only trusted when every item could be placed
+            self.cache.set_many({self.cache_key(q): profiles for q, profiles in results.items()
+                                 if profiles or not unattributed})
+        return results
+
+    def search_many(self, queries: Sequence[str]) -> Dict[str, List[Dict]]:
+        """
+        Search several queries (blocking), cache first, misses packed batch_size per run.
+
+        Returns:
+            {query: [profile dicts]} keyed by the queries as given; [] on failure
+        """
+        normalized = {q: normalize_query(q) for q in queries}
+        self._count('queries', len(normalized))
+        found: Dict[str, List[Dict]] = {}
+        misses = []
+        for query in dict.fromkeys(normalized.values()):
+            hit = self._cached(query)
+            if hit is not None:
+                found[query] = hit
+            elif query:
+                misses.append(query)
+
+        for offset in range(0, len(misses), self.batch_size):
+            batch = misses[offset:offset + self.batch_size]
+            try:
+                found.update(self._run(batch))
+            except Exception as e:
+                self._count('errors')
+                logger.error(f"Apify Instagram search error: {e}")
+
+        return {q: found.get(n, []) for q, n in normalized.items()}
+
+    def search(self, query: str) -> List[Dict]:
+        """Search one query (blocking)."""
+        return self.search_many([query])[query]
+
+    async def search_async(self, query: str) -> List[Dict]:
+        """
+        Search one query without blocking the event loop.
+
+        Searches arriving within batch_window of each other share one actor
+        run (up to batch_size terms); identical in-flight queries share a result.
+        """
+        query = normalize_query(query)
+        self._count('queries')
+        if not query:
+            return []
+        hit = self._cached(query)
+        if hit is not None:
+            return hit
+
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Batches left over from an earlier event loop can never complete
+            self._loop, self._pending, self._queued, self._flush_timer = loop, {}, [], None
+
+        if query not in self._pending:
+            self._pending[query] = loop.create_future()
+            self._queued.append(query)
+            if len(self._queued) >= self.batch_size:
+                self._flush()
+            elif self._flush_timer is None:
+                self._flush_timer = loop.call_later(self.batch_window, self._flush)
+        return await asyncio.shield(self._pending[query])
+
+    def _flush(self):
+        """Send the queued async searches as one actor run."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        batch, self._queued = self._queued, []
+        if batch:
+            asyncio.get_running_loop().create_task(self._run_async(batch))
+
+    async def _run_async(self, batch: List[str]):
+        try:
+            results = await asyncio.to_thread(self._run, batch)
+        except Exception as e:
+            self._count('errors')
+            logger.error(f"Apify Instagram search error: {e}")
+            results = {}
+        for query in batch:
+            future = self._pending.pop(query, None)
+            if future is not None and not future.done():
+                future.set_result(results.get(query, []))
+
+    def report(self) -> Dict:
+        """Totals for budgeting: runs, cost, latency and cache savings."""
+        with self._stats_lock:
+            calls = list(self.calls)
+            stats = dict(self.stats)
+        cost = sum(c.cost_usd for c in calls)
+        searched = sum(c.queries for c in calls)
+        latencies = [c.latency_seconds for c in calls]
+        return {
+            **stats,
+            'cost_usd': round(cost, 4),
+            'cost_per_query_usd': round(cost / searched, 4) if searched else 0.0,
+            'mean_latency_seconds': round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+            'max_latency_seconds': round(max(latencies), 2) if latencies else 0.0,
+        }
+
+    def close(self):
+        """Release the cache."""
+        if self.cache is not None:
+            self.cache.close()
+
+
+_search: Optional[ApifySearch] = None
+_search_lock = threading.Lock()
+
+
+def get_instagram_search(client=None) -> Optional[ApifySearch]:
+    """Return the process-wide Apify Instagram search, or None without a client.
+
+    `client` is only used when the search is first created and no
+    APIFY_API_TOKEN client can be built.
+    """
+    global _search
+    with _search_lock:
+        if _search is None:
+            client = get_apify_client() or client
+            if client is None:
+                return None
+            ttl_days = float(os.getenv('APIFY_INSTAGRAM_CACHE_TTL_DAYS', DEFAULT_CACHE_TTL_DAYS))
+            cache = ResponseCache('apify_instagram', ttl_seconds=ttl_days * 86400) if ttl_days > 0 else None
+            _search = ApifySearch(
+                client=client,
+                cache=cache,
+                batch_size=int(os.getenv('APIFY_INSTAGRAM_BATCH_SIZE', DEFAULT_BATCH_SIZE)),
+                max_runs=int(os.getenv('APIFY_CONCURRENCY', DEFAULT_MAX_RUNS))
+            )
+        return _search
+
+
+def company_handles(profiles: List[Dict], company_name: str, limit: int = 3) -> List[str]:
+    """Handles of profiles whose name or username mentions most of the company name's words."""
+    words = [w for w in re.findall(r'[a-z0-9]+', company_name.lower()) if len(w) > 2]
+    if not words:
+        return []
+    handles = []
+    for profile in profiles:
+        username = (profile.get('username') or '').lower()
+        text = f"{(profile.get('fullName') or '').lower()} {username.replace('_', ' ').replace('.', ' ')}"
+        compact = re.sub(r'[^a-z0-9]', '', text)
+        if sum(1 for w in words if w in compact) * 2 >= len(words):
+            handles.append(username)
+    return handles[:limit]
+
+
 async def search_apify_instagram(company_name: str, website_url: str = "") -> List[str]:
     """
-    Search for Instagram handles using Apify Instagram Scraper.
-    
+    Search for Instagram handles using Apify Instagram Search Scraper.
+
     Args:
         company_name: Company name to search for
-        website_url: Company website URL (optional)
-        
+        website_url: Company website URL (optional; its domain is searched
+            when there is no company name)
+
     Returns:
         List of Instagram handles found
     """
     if not os.getenv('USE_PAID_INSTAGRAM_API', 'false').lower() == 'true':
         return []
-    
-    client = get_apify_client()
-    if not client:
+
+    search = get_instagram_search()
+    if not search:
         return []
-    
-    try:
-        # Use Apify's Instagram Profile Scraper
-        # Note: This is a placeholder - actual implementation depends on Apify actor
-        # You would need to configure the specific actor ID and input format
-        
-        # Example actor: apify/instagram-scraper
-        # Input format: {"usernames": ["username1", "username2"]}
-        
-        # For now, return empty list - user needs to configure their Apify actor
-        # This is a template for future integration
+
+    name = company_name or ''
+    if not name.strip() and website_url:
+        name = re.sub(r'^(https?://)?(www\.)?', '', website_url).split('/')[0].split('.')[0]
+    if not name.strip():
         return []
+
+    try:
+        profiles = await search.search_async(name)
     except Exception:
         return []
+    return company_handles(profiles, name)
 
 
 def is_paid_api_enabled() -> bool:
     """Check if paid Instagram API is enabled."""
-    return os.getenv('USE_PAID_INSTAGRAM_API', 'false').lower() == 'true' and get_apify_client() is not None
-
+    return os.getenv('USE_PAID_INSTAGRAM_API', 'false').lower() == 'true' and get_instagram_search() is not None
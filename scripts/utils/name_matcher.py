@@ -0,0 +1,298 @@
+"""Fuzzy person-name linkage between two contact tables.
+
+Matches people across sources (HubSpot contacts, Repliers/MLS agents, ...)
+without comparing every row against every other row. Names are normalized
+(accents, punctuation, "Jr."/"III" suffixes, middle names, common nicknames)
+and indexed under two blocking keys:
+
+- first initial + last name  ("j|smith")
+- Soundex of first + last name  ("J500|S530"), which catches spelling variants
+
+Only pairs that share a block are scored. Scores are computed on unique name
+pairs with numpy (bigram Dice similarity of first, last and full name), so a
+100k x 500k join costs seconds rather than hours. A shared surname is not
+enough: the first names must agree (same canonical name, an initial, or a
+near-identical spelling), so "Joan Smith" never matches "John Smith".
+
+Usage:
+    from utils.name_matcher import NameIndex
+
+    index = NameIndex(agents['agent_name'])
+    matches = index.match(hubspot['First Name'] + ' ' + hubspot['Last Name'])
+    # matches: left, right (index labels), confidence, candidates, ambiguous
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+MIN_CONFIDENCE = 0.8
+
+# A runner-up this close to the best candidate (and pointing at a different
+# name) makes the match ambiguous
+AMBIGUITY_MARGIN = 0.05
+
+# Similarity weights: first name, last name, full normalized name
+WEIGHTS = (0.35, 0.45, 0.2)
+
+# First name given as an initial ("J. Smith") that agrees with the other side
+INITIAL_SIMILARITY = 0.75
+
+# Different first names below this bigram similarity are different people
+# (John/Joan, Maria/Mario, Daniel/Danielle) and score 0
+FIRST_NAME_FLOOR = 0.8
+
+# Bigrams compared per name; longer names are truncated
+MAX_BIGRAMS = 24
+
+# Candidate pairs scored per numpy batch (bounds memory)
+CHUNK_SIZE = 50_000
+
+SUFFIXES = {
+    'jr', 'sr', 'ii', 'iii', 'iv', 'v', 'esq', 'md', 'phd', 'pa', 'cpa',
+    'mr', 'mrs', 'ms', 'dr',
+}
+
+# Nickname -> canonical first name
+NICKNAMES = {
+    'abby': 'abigail', 'al': 'albert', 'alex': 'alexander', 'andy': 'andrew',
+    'barb': 'barbara', 'ben': 'benjamin', 'beth': 'elizabeth', 'bill': 'william',
+    'billy': 'william', 'bob': 'robert', 'bobby': 'robert', 'brad': 'bradley',
+    'cathy': 'catherine', 'charlie': 'charles', 'chris': 'christopher', 'chuck': 'charles',
+    'cindy': 'cynthia', 'dan': 'daniel', 'danny': 'daniel', 'dave': 'david',
+    'deb': 'deborah', 'debbie': 'deborah', 'don': 'donald', 'doug': 'douglas',
+    'ed': 'edward', 'eddie': 'edward', 'fred': 'frederick', 'greg': 'gregory',
+    'jack': 'john', 'jake': 'jacob', 'jim': 'james', 'jimmy': 'james',
+    'joe': 'joseph', 'joey': 'joseph', 'jon': 'john', 'johnny': 'john',
+    'josh': 'joshua', 'kathy': 'katherine', 'kate': 'katherine', 'katie': 'katherine',
+    'ken': 'kenneth', 'kenny': 'kenneth', 'larry': 'lawrence', 'liz': 'elizabeth',
+    'matt': 'matthew', 'mike': 'michael', 'mikey': 'michael', 'nate': 'nathan',
+    'nick': 'nicholas', 'pat': 'patricia', 'patty': 'patricia', 'peggy': 'margaret',
+    'pete': 'peter', 'phil': 'philip', 'rich': 'richard', 'rick': 'richard',
+    'ricky': 'richard', 'rob': 'robert', 'ron': 'ronald', 'sam': 'samuel',
+    'steve': 'steven', 'stephen': 'steven', 'sue': 'susan', 'susie': 'susan',
+    'ted': 'edward', 'tim': 'timothy', 'tom': 'thomas', 'tommy': 'thomas',
+    'tony': 'anthony', 'vicky': 'victoria', 'will': 'william', 'zach': 'zachary',
+    'pepe': 'jose', 'paco': 'francisco', 'pancho': 'francisco', 'lupe': 'guadalupe',
+    'nacho': 'ignacio', 'chema': 'jose', 'memo': 'guillermo', 'beto': 'alberto',
+}
+
+DROPPED_CHARS = re.compile(r"[.'`]")
+SEPARATORS = re.compile(r'[^a-z]+')
+
+SOUNDEX_CODES = str.maketrans(
+    'bfpvcgjkqsxzdtlmnr',
+    '111122222222334556',
+)
+
+
+@lru_cache(maxsize=None)
+def soundex(word: str) -> str:
+    """American Soundex code ('' for empty input)."""
+    word = ''.join(c for c in word.lower() if 'a' <= c <= 'z')
+    if not word:
+        return ''
+    digits = word.translate(SOUNDEX_CODES)
+    code = []
+    previous = digits[0]
+    for char, digit in zip(word[1:], digits[1:]):
+        if digit.isdigit() and digit != previous:
+            code.append(digit)
+        # h/w do not separate equal codes; vowels do
+        if char not in 'hw':
+            previous = digit
+    return (word[0].upper() + ''.join(code) + '000')[:4]
+
+
+def split_name(value: str) -> Tuple[str, str]:
+    """Normalized (first, last) for one raw name; ('', '') if unusable.
+
+    Strips accents and punctuation, drops suffixes/titles and middle names,
+    and maps nicknames to their canonical first name.
+    """
+    if not value.isascii():
+        value = unicodedata.normalize('NFKD', value).encode('ascii', 'ignore').decode('ascii')
+    value = DROPPED_CHARS.sub('', value.lower())
+    tokens = [t for t in SEPARATORS.split(value) if t and t not in SUFFIXES]
+    if len(tokens) < 2:
+        return '', ''
+    return NICKNAMES.get(tokens[0], tokens[0]), tokens[-1]
+
+
+def name_parts(names: pd.Series) -> pd.DataFrame:
+    """Normalize full names into first/last/full plus blocking keys.
+
+    Work happens once per distinct raw value, so repeated names are free.
+    Returns a frame aligned with `names` (same index) with columns first,
+    last, full, block_initial and block_phonetic. Unusable names get ''.
+    """
+    codes, uniques = pd.factorize(names.fillna('').astype(str))
+    split = [split_name(value) for value in uniques.tolist()]
+    first = [f for f, _ in split]
+    last = [l for _, l in split]
+    parts = pd.DataFrame({
+        'first': first,
+        'last': last,
+        'full': [f'{f} {l}' if f else '' for f, l in split],
+        'block_initial': [f'{f[0]}|{l}' if f else '' for f, l in split],
+        'block_phonetic': [f'{soundex(f)}|{soundex(l)}' if f else '' for f, l in split],
+    })
+    parts = parts.iloc[codes].reset_index(drop=True)
+    parts.index = names.index
+    return parts
+
+
+def bigram_matrix(values: Iterable[str]) -> np.ndarray:
+    """Encode each string as a row of bigram ids (space-bounded, -1 padded)."""
+    width = MAX_BIGRAMS + 1
+    padded = [f' {value} '[:width].ljust(width, '~') for value in values]
+    if not padded:
+        return np.empty((0, MAX_BIGRAMS), dtype=np.int32)
+    chars = np.frombuffer(''.join(padded).encode('ascii'), dtype=np.uint8)
+    chars = chars.reshape(len(padded), width).astype(np.int32)
+    grams = chars[:, :-1] * 256 + chars[:, 1:]
+    return np.where(chars[:, 1:] == ord('~'), -1, grams)
+
+
+def dice(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Row-wise bigram Dice similarity of two aligned bigram matrices."""
+    left_len = (left >= 0).sum(axis=1)
+    right_len = (right >= 0).sum(axis=1)
+    # Padding is masked on the left, so it can only match real bigrams
+    found = ((left[:, :, None] == right[:, None, :]).any(axis=2) & (left >= 0)).sum(axis=1)
+    total = left_len + right_len
+    score = np.divide(2 * found, total, out=np.zeros(len(total)), where=total > 0)
+    return np.minimum(score, 1.0)
+
+
+class EncodedNames:
+    """Bigram matrices for a table of distinct normalized names."""
+
+    def __init__(self, names: pd.DataFrame):
+        first = names['first'].tolist()
+        self.first = np.array(first, dtype=object)
+        self.first_len = np.array([len(f) for f in first], dtype=np.int32)
+        self.first_grams = bigram_matrix(first)
+        self.last_grams = bigram_matrix(names['last'].tolist())
+        self.full_grams = bigram_matrix(names['full'].tolist())
+
+
+def score_pairs(left: EncodedNames, right: EncodedNames,
+                left_ids: np.ndarray, right_ids: np.ndarray) -> np.ndarray:
+    """Weighted name similarity for pairs of rows in two encoded tables.
+
+    Pairs whose first names disagree (not equal after nickname mapping, not
+    an initial, and below FIRST_NAME_FLOOR) score 0 whatever their surnames.
+    """
+    w_first, w_last, w_full = WEIGHTS
+    scores = np.zeros(len(left_ids))
+    for start in range(0, len(left_ids), CHUNK_SIZE):
+        li = left_ids[start:start + CHUNK_SIZE]
+        ri = right_ids[start:start + CHUNK_SIZE]
+
+        first = dice(left.first_grams[li], right.first_grams[ri])
+        initial_only = (left.first_len[li] == 1) | (right.first_len[ri] == 1)
+        same_first = left.first[li] == right.first[ri]
+        agrees = same_first | initial_only | (first >= FIRST_NAME_FLOOR)
+        first = np.where(initial_only, INITIAL_SIMILARITY, first)
+        first = np.where(same_first, 1.0, first)
+
+        last = dice(left.last_grams[li], right.last_grams[ri])
+        full = dice(left.full_grams[li], right.full_grams[ri])
+        score = w_first * first + w_last * last + w_full * full
+        scores[start:start + CHUNK_SIZE] = np.where(agrees, score, 0.0)
+    return scores
+
+
+class NameIndex:
+    """Blocking index over one side of a name join (typically the larger one).
+
+    Build once, then call match() for as many left-hand tables as needed.
+    """
+
+    BLOCKS = ('block_initial', 'block_phonetic')
+
+    def __init__(self, names: pd.Series):
+        self.parts = name_parts(names)
+        usable = self.parts[self.parts['full'] != '']
+        # Distinct normalized names are scored once and mapped back to rows
+        self.names = usable.drop_duplicates('full').reset_index(drop=True)
+        self.ids = pd.Series(np.arange(len(self.names)), index=self.names['full'])
+        self.encoded = EncodedNames(self.names)
+        self.rows = pd.DataFrame({'right_id': self.ids.loc[usable['full']].to_numpy(),
+                                  'right': usable.index})
+        self.blocks = {
+            block: self.names[[block]].assign(right_id=np.arange(len(self.names)))
+            for block in self.BLOCKS
+        }
+
+    def __len__(self) -> int:
+        return len(self.parts)
+
+    def candidates(self, names: pd.DataFrame) -> pd.DataFrame:
+        """Distinct (left_id, right_id) pairs sharing at least one block."""
+        pairs = []
+        for block in self.BLOCKS:
+            left = names[[block]].assign(left_id=np.arange(len(names)))
+            pairs.append(left.merge(self.blocks[block], on=block)[['left_id', 'right_id']])
+        return pd.concat(pairs, ignore_index=True).drop_duplicates(ignore_index=True)
+
+    def match(self, names: pd.Series, min_confidence: float = MIN_CONFIDENCE) -> pd.DataFrame:
+        """Best match per left row at or above min_confidence.
+
+        Returns one row per matched left row: left / right index labels,
+        confidence (0-1), candidates (distinct names scored) and ambiguous
+        (another name scored within AMBIGUITY_MARGIN, or several right rows
+        share the best name; the first of those is returned).
+        """
+        columns = ['left', 'right', 'confidence', 'candidates', 'ambiguous']
+        parts = name_parts(names)
+        usable = parts[parts['full'] != '']
+        left_names = usable.drop_duplicates('full').reset_index(drop=True)
+        pairs = self.candidates(left_names)
+        if pairs.empty:
+            return pd.DataFrame(columns=columns)
+
+        pairs['confidence'] = score_pairs(EncodedNames(left_names), self.encoded,
+                                          pairs['left_id'].to_numpy(), pairs['right_id'].to_numpy())
+        pairs = pairs.sort_values(['left_id', 'confidence'], ascending=[True, False], kind='stable')
+        rank = pairs.groupby('left_id', sort=False).cumcount()
+        runner_up = pairs.loc[rank == 1].set_index('left_id')['confidence']
+
+        best = pairs.loc[rank == 0].set_index('left_id')
+        best['candidates'] = pairs.groupby('left_id', sort=False).size()
+        best['ambiguous'] = (best['confidence'] - runner_up.reindex(best.index, fill_value=-1.0)
+                             < AMBIGUITY_MARGIN)
+        best = best[best['confidence'] >= min_confidence]
+
+        # Expand distinct names back to rows on both sides
+        shared = self.rows.groupby('right_id', sort=False)['right'].agg(['first', 'size'])
+        best = best.join(shared, on='right_id')
+        best['ambiguous'] |= best['size'] > 1
+        best = best.rename(columns={'first': 'right'})
+
+        left_rows = pd.DataFrame({
+            'left_id': pd.Series(np.arange(len(left_names)), index=left_names['full']).loc[usable['full']].to_numpy(),
+            'left': usable.index,
+        })
+        matched = left_rows.merge(best, left_on='left_id', right_index=True)
+        return matched[columns].reset_index(drop=True)
+
+
+def link(left_names: pd.Series, right_names: pd.Series,
+         min_confidence: float = MIN_CONFIDENCE) -> pd.DataFrame:
+    """One-off join: build a NameIndex on right_names and match left_names."""
+    return NameIndex(right_names).match(left_names, min_confidence=min_confidence)
+
+
+def full_names(first: pd.Series, last: Optional[pd.Series] = None) -> pd.Series:
+    """Combine separate first/last name columns into one name Series."""
+    first = first.astype('string').fillna('')
+    if last is None:
+        return first
+    return (first + ' ' + last.astype('string').fillna('')).str.strip()
+
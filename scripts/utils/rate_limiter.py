@@ -0,0 +1,33 @@
+"""Thread-safe rate limiter for paid APIs (Hunter, MillionVerifier, ...).
+
+Spaces calls at least `min_interval` seconds apart across all threads that
+share the limiter, so worker pools can fan out without tripping 429s.
+
+Usage:
+    from utils.rate_limiter import RateLimiter
+
+    hunter_limiter = RateLimiter(0.15)
+    hunter_limiter.wait()
+    resp = requests.get(...)
+"""
+
+import threading
+import time
+
+
+class RateLimiter:
+    """Thread-safe minimum spacing between calls."""
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._next_at = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until the next call is allowed."""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_at - now
+            self._next_at = max(now, self._next_at) + self.min_interval
+        if wait > 0:
+            time.sleep(wait)
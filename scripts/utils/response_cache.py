@@ -0,0 +1,125 @@
+"""On-disk TTL cache for paid/slow API responses.
+
+A small SQLite key/value store (one file per cache name under output/cache/)
+so enrichers can skip API calls for inputs they have already looked up.
+Values are JSON-encoded. Negative results (e.g. "no places found") can be
+cached too, so re-runs only pay for genuinely new inputs.
+
+Usage:
+    from utils.response_cache import ResponseCache, make_cache_key
+
+    cache = ResponseCache("google_maps", ttl_seconds=30 * 86400)
+    key = make_cache_key("Acme Realty", "miami")
+    hit = cache.get(key)
+    if hit is None:
+        hit = call_api(...)
+        cache.set(key, hit)
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+BASE_DIR = Path(__file__).parent.parent.parent
+CACHE_DIR = BASE_DIR / "output" / "cache"
+
+DEFAULT_TTL_SECONDS = 30 * 24 * 60 * 60  # 30 days
+
+
+def normalize_cache_part(value: Any) -> str:
+    """Normalize one key component (casefold, trim, collapse whitespace)."""
+    if value is None:
+        return ""
+    return re.sub(r"\s+", " ", str(value).strip().casefold())
+
+
+def make_cache_key(*parts: Any) -> str:
+    """Build a stable cache key from normalized parts."""
+    raw = "\x1f".join(normalize_cache_part(p) for p in parts)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Thread-safe SQLite-backed key/value cache with per-entry expiry."""
+
+    def __init__(
+        self,
+        name: str,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        path: Optional[Path] = None
+    ):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.path = Path(path) if path else CACHE_DIR / f"{name}.db"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if missing/expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] < time.time():
+                self.misses += 1
+                return None
+            self.hits += 1
+            return json.loads(row[0])
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Return {key: value} for all unexpired keys found."""
+        found = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                found[key] = value
+        return found
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None):
+        """Store a JSON-serializable value."""
+        self.set_many({key: value}, ttl_seconds)
+
+    def set_many(self, items: Dict[str, Any], ttl_seconds: Optional[float] = None):
+        """Store several values in one transaction."""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        expires_at = time.time() + ttl
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                [(k, json.dumps(v), expires_at) for k, v in items.items()],
+            )
+            self._conn.commit()
+
+    def delete(self, key: str):
+        """Remove a key."""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        """Delete expired entries. Returns number removed."""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM cache WHERE expires_at < ?", (time.time(),))
+            self._conn.commit()
+            return cursor.rowcount
+
+    def close(self):
+        """Close the underlying connection."""
+        with self._lock:
+            self._conn.close()
@@ -6,9 +6,12 @@ import sys
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
+import pandas as pd
+
 from scripts.email_verifier.scorer import (
     calculate_send_score,
     score_for_sending,
+    score_frame,
     EmailScore,
     SendRecommendation
 )
@@ -302,3 +305,43 @@ class TestScoreBreakdown:
         assert 'hunter' in score.breakdown
         assert 'domain' in score.breakdown
         assert 'pattern' in score.breakdown
+
+
+class TestScoreFrame:
+    """score_frame should agree with calculate_send_score row by row."""
+
+    def test_matches_calculate_send_score(self):
+        emails = ['john@company.com', 'info@company.com']
+        statuses = [None] + list(VerificationStatus)
+        hunters = [None, 0, 45, 100]
+        catch_alls = [None, False, True]
+        rows = [
+            {'email': e, 'verification_status': st, 'hunter_confidence': h, 'is_catch_all': c}
+            for e in emails for st in statuses for h in hunters for c in catch_alls
+        ]
+
+        scored = score_frame(pd.DataFrame(rows))
+
+        for row, (_, frame_score) in zip(rows, scored.iterrows()):
+            verification = None
+            if row['verification_status'] is not None:
+                verification = VerificationResult(email=row['email'], status=row['verification_status'])
+            expected = calculate_send_score(
+                email=row['email'],
+                verification_result=verification,
+                hunter_confidence=row['hunter_confidence'],
+                is_catch_all_domain=row['is_catch_all']
+            )
+            assert frame_score['api_score'] == expected.api_score, row
+            assert frame_score['hunter_score'] == expected.hunter_score, row
+            assert frame_score['domain_score'] == expected.domain_score, row
+            assert frame_score['pattern_score'] == expected.pattern_score, row
+            assert frame_score['total_score'] == expected.total_score, row
+            assert frame_score['recommendation'] == expected.recommendation.value, row
+
+    def test_catch_all_text_flags_are_parsed(self):
+        df = pd.DataFrame({
+            'email': ['john@company.com'] * 6,
+            'is_catch_all': ['False', 'True', 'false', '1', '0', ''],
+        })
+        assert list(score_frame(df)['domain_score']) == [15, 0, 15, 0, 15, 15]
@@ -0,0 +1,241 @@
+"""Tests for batched Apify DM dispatch and the resumable send ledger."""
+import os
+import sys
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+import apify_dm_sender
+from apify_dm_sender import (SendLedger, campaign_id, dispatch_dms, item_outcome, plan_batches,
+                             process_csv_and_send, run_dm_batch)
+
+
+class FakeApify:
+    """Minimal ApifyClient: records actor inputs and returns canned per-item results."""
+
+    def __init__(self, latency=0.0, status='SUCCEEDED', item_for=None, fail_wait=False):
+        self.latency = latency
+        self.status = status
+        self.item_for = item_for or (lambda username: {'username': username, 'status': 'sent'})
+        self.fail_wait = fail_wait
+        self.inputs = []
+        self.runs = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def actor(self, actor_id):
+        return self
+
+    def start(self, run_input):
+        with self.lock:
+            run_id = f'run{len(self.inputs)}'
+            self.inputs.append(run_input)
+            self.runs[run_id] = run_input
+        return {'id': run_id, 'status': 'RUNNING', 'defaultDatasetId': run_id}
+
+    def run(self, run_id):
+        return _Run(self, run_id)
+
+    def dataset(self, dataset_id):
+        return _Dataset(self, dataset_id)
+
+
+class _Run:
+    def __init__(self, api, run_id):
+        self.api, self.run_id = api, run_id
+
+    def wait_for_finish(self):
+        api = self.api
+        with api.lock:
+            api.in_flight += 1
+            api.max_in_flight = max(api.max_in_flight, api.in_flight)
+        time.sleep(api.latency)
+        with api.lock:
+            api.in_flight -= 1
+        if api.fail_wait:
+            raise ConnectionError('connection reset')
+        return {'id': self.run_id, 'status': api.status, 'defaultDatasetId': self.run_id}
+
+
+class _Dataset:
+    def __init__(self, api, dataset_id):
+        self.api, self.dataset_id = api, dataset_id
+
+    def iterate_items(self):
+        items = (self.api.item_for(u) for u in self.api.runs[self.dataset_id]['influencers'])
+        return [item for item in items if item]
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / 'prospects.csv'
+    pd.DataFrame({
+        'instagram_handles': [f'@agent{i}' for i in range(7)] + ['@agent0'],
+        'contact_name': ['Jane Doe'] * 8,
+    }).to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture
+def ledger(tmp_path, csv_path):
+    return SendLedger(tmp_path / 'ledger.db', campaign_id(csv_path, 'Hi {contact_name}'))
+
+
+def jobs(n):
+    return [(f'user{i}', f'Hi user{i}') for i in range(n)]
+
+
+class TestRunDmBatch:
+    """Tests for packing DMs into one run and mapping results back."""
+
+    def test_pairs_and_per_item_results(self):
+        api = FakeApify(item_for=lambda u: {'username': f'@{u.upper()}', 'error': 'Blocked'} if u == 'user1' else None)
+        run_id, outcomes = run_dm_batch(api, 'cookie', jobs(3))
+
+        assert api.inputs[0]['influencers'] == ['user0', 'user1', 'user2']
+        assert api.inputs[0]['messages'] == ['Hi user0', 'Hi user1', 'Hi user2']
+        assert api.inputs[0]['INSTAGRAM_COOKIES'][0]['value'] == 'cookie'
+        assert outcomes == {'user0': ('sent', None), 'user1': ('error', 'Blocked'), 'user2': ('sent', None)}
+        assert 'delaySeconds' not in api.inputs[0]
+
+        run_dm_batch(api, 'cookie', jobs(2), delay=3.0, delay_input='delaySeconds')
+        assert api.inputs[1]['delaySeconds'] == 3.0
+
+    def test_failed_run_without_item_is_unconfirmed(self):
+        api = FakeApify(status='FAILED', item_for=lambda u: {'username': u, 'success': True} if u == 'user0' else None)
+        _, outcomes = run_dm_batch(api, 'cookie', jobs(2))
+        assert outcomes['user0'] == ('sent', None)
+        assert outcomes['user1'][0] == 'unconfirmed'
+
+    def test_item_outcome(self):
+        assert item_outcome({'influencer': 'Bob', 'status': 'FAILED'}) == ('bob', 'error', 'FAILED')
+        assert item_outcome({'message': 'no recipient'}) is None
+
+
+class TestDispatch:
+    """Tests for batching, bounded runs and pacing."""
+
+    def test_batches_per_session_with_bounded_runs(self, ledger):
+        api = FakeApify(latency=0.1)
+        sessions = {'A': 'a', 'B': 'b', 'C': 'c'}
+        results = dispatch_dms(api, jobs(12), sessions, ledger, batch_size=2, max_runs=2, delay=0,
+                               pairs_messages=True)
+
+        assert len(api.inputs) == 6
+        assert api.max_in_flight == 2
+        assert all(r['status'] == 'sent' for r in results.values())
+        assert {results['user0']['session'], results['user1']['session']} == {'A', 'B'}
+        cookies = {i['INSTAGRAM_COOKIES'][0]['value'] for i in api.inputs if 'user0' in i['influencers']}
+        assert cookies == {'a'}
+
+    def test_session_is_paced_to_send_rate(self, ledger):
+        api = FakeApify()
+        started = time.monotonic()
+        dispatch_dms(api, jobs(6), {'A': 'a'}, ledger, batch_size=3, delay=0.05, delay_input='delaySeconds',
+                     pairs_messages=True)
+        # Second batch waits for the first batch's 3 x 0.05s; the actor spaces DMs inside each run
+        assert time.monotonic() - started >= 0.14
+        assert len(api.inputs) == 2
+        assert [i['delaySeconds'] for i in api.inputs] == [0.05, 0.05]
+
+    def test_one_dm_per_run_without_actor_delay(self, ledger):
+        api = FakeApify()
+        started = time.monotonic()
+        dispatch_dms(api, jobs(3), {'A': 'a'}, ledger, batch_size=3, delay=0.05, delay_input=None,
+                     pairs_messages=True)
+        assert [i['influencers'] for i in api.inputs] == [['user0'], ['user1'], ['user2']]
+        assert time.monotonic() - started >= 0.09
+
+    def test_personalized_messages_are_not_batched_unless_paired(self, ledger):
+        api = FakeApify()
+        same = [(f'user{i}', 'Hi there') for i in range(3)]
+        dispatch_dms(api, jobs(2) + same, {'A': 'a'}, ledger, batch_size=5, delay=0)
+        assert [i['influencers'] for i in api.inputs] == [['user0'], ['user1'], ['user0', 'user1', 'user2']]
+        assert api.inputs[2]['messages'] == ['Hi there'] * 3
+
+    def test_plan_batches(self):
+        same = [(f'same{i}', 'Hi') for i in range(3)]
+        assert plan_batches(jobs(2) + same, 2) == [[('user0', 'Hi user0')], [('user1', 'Hi user1')],
+                                                   same[:2], same[2:]]
+        assert plan_batches(jobs(3), 2, pairs_messages=True) == [jobs(3)[:2], jobs(3)[2:]]
+
+    def test_lost_runs_are_recorded_unconfirmed(self, ledger):
+        api = FakeApify(fail_wait=True)
+        results = dispatch_dms(api, jobs(2), {'A': 'a'}, ledger, batch_size=5, delay=0)
+        assert {r['status'] for r in results.values()} == {'unconfirmed'}
+        assert ledger.statuses() == {'user0': 'unconfirmed', 'user1': 'unconfirmed'}
+        assert results['user0']['run_id'] == 'run0'
+
+
+class TestProcessCsvAndSend:
+    """Tests for the resumable campaign."""
+
+    @pytest.fixture(autouse=True)
+    def env(self, monkeypatch):
+        monkeypatch.setenv('INSTAGRAM_SESSION_ID', 'cookie')
+
+    def test_resume_never_resends(self, csv_path, ledger, monkeypatch):
+        api = FakeApify(item_for=lambda u: {'username': u, 'error': 'Rate limited'} if u == 'agent3' else
+                        {'username': u, 'status': 'sent'})
+        monkeypatch.setattr(apify_dm_sender, 'get_apify_client', lambda: api)
+        # A previous run died after handing agent1 and agent2 to the actor
+        ledger.record({'agent1': ('pending', None), 'agent2': ('sent', None)})
+
+        first = process_csv_and_send(csv_path, 'Hi {contact_name}', delay=0, batch_size=2,
+                                     ledger_path=ledger.db_path)
+        assert first['total_handles'] == 7 and first['already_sent'] == 2
+        assert (first['sent'], first['errors'], first['runs']) == (4, 1, 3)
+        assert [r['instagram_handle'] for r in first['results']] == ['agent0', 'agent3', 'agent4', 'agent5', 'agent6']
+        assert first['results'][1]['error'] == 'Rate limited'
+        assert first['results'][0]['message'] == 'Hi Jane'
+
+        # Only the failed DM is retried
+        api.item_for = lambda u: {'username': u, 'status': 'sent'}
+        second = process_csv_and_send(csv_path, 'Hi {contact_name}', delay=0, ledger_path=ledger.db_path)
+        assert [r['instagram_handle'] for r in second['results']] == ['agent3']
+        assert second['sent'] == 1 and second['already_sent'] == 6
+        assert api.inputs[-1]['influencers'] == ['agent3']
+
+    def test_other_campaigns_are_not_skipped(self, csv_path, ledger, tmp_path, monkeypatch):
+        api = FakeApify()
+        monkeypatch.setattr(apify_dm_sender, 'get_apify_client', lambda: api)
+        ledger.record({f'agent{i}': ('sent', None) for i in range(7)})
+
+        # A new message to the same list is a new campaign
+        results = process_csv_and_send(csv_path, 'New listing, {contact_name}!', delay=0,
+                                       ledger_path=ledger.db_path)
+        assert results['sent'] == 7 and results['already_sent'] == 0
+
+        # ...unless it resumes the old campaign explicitly
+        resumed = process_csv_and_send(csv_path, 'Hi again', delay=0, ledger_path=ledger.db_path,
+                                       campaign=ledger.campaign)
+        assert resumed['already_sent'] == 7 and resumed['results'] == []
+
+        # The same list saved elsewhere is a different campaign too
+        copy = tmp_path / 'copy.csv'
+        copy.write_text(csv_path.read_text())
+        assert campaign_id(copy, 'Hi {contact_name}') != ledger.campaign
+
+    def test_dry_run_sends_nothing(self, csv_path, tmp_path, monkeypatch):
+        monkeypatch.setattr(apify_dm_sender, 'get_apify_client', lambda: pytest.fail('client used'))
+        ledger_path = tmp_path / 'ledger.db'
+        results = process_csv_and_send(csv_path, 'Hi', dry_run=True, ledger_path=ledger_path)
+        assert results['sent'] == 7
+        assert not ledger_path.exists()
+
+    def test_dry_run_reads_existing_ledger(self, csv_path, ledger, monkeypatch):
+        monkeypatch.setattr(apify_dm_sender, 'get_apify_client', lambda: pytest.fail('client used'))
+        ledger.record({'agent1': ('sent', None)})
+        results = process_csv_and_send(csv_path, 'Hi {contact_name}', dry_run=True, ledger_path=ledger.db_path)
+        assert results['sent'] == 6 and results['already_sent'] == 1
+        assert ledger.statuses() == {'agent1': 'sent'}
+
+    def test_missing_session(self, csv_path, ledger, monkeypatch):
+        monkeypatch.setattr(apify_dm_sender, 'get_apify_client', lambda: FakeApify())
+        results = process_csv_and_send(csv_path, 'Hi', session_envs=['NO_SUCH_SESSION'], ledger_path=ledger.db_path)
+        assert 'NO_SUCH_SESSION' in results['error']
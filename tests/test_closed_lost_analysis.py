@@ -0,0 +1,137 @@
+"""Tests for the closed lost analyses computed over the deals frame."""
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "hubspot_funnel"))
+
+import closed_lost_analysis as cla
+
+OWNERS = {"1": "Ana", "2": "Beto", "3": "Carla"}
+NOW = datetime.now(timezone.utc)
+
+NOSHOW = "no_asistio_al_demo_y_no_se_pudo_reagendar"
+PRICE = "precio_alto_vs_expectativa"
+HIGIENE = "higiene_de_lead_duplicadospamcontacto_invalido"
+TIMING = "mal_timing__budget_freeze"
+
+
+def parsed(name, amount, owner="Ana", reason="", details="", profile="", source="", days_ago=1):
+    return {
+        "id": name, "name": name, "amount": amount, "closedate": NOW - timedelta(days=days_ago),
+        "owner_id": "", "owner_name": owner, "loss_reason": reason, "loss_details": details,
+        "customer_profile": profile, "lead_source": source, "lead_source_detail": "", "origen_importacion": "",
+    }
+
+
+@pytest.fixture
+def deals():
+    return [
+        parsed("A", 500, reason=PRICE, profile="Realtor", source="PAID_SEARCH"),
+        parsed("B", 500.5, reason=NOSHOW, source="PAID_SEARCH"),
+        parsed("C", 7000, owner="Beto", reason=PRICE, details="Se fue con Zoho", profile="inmobiliaria"),
+        parsed("D", 0, owner="Beto", reason=HIGIENE, details="Duplicado, ya tiene cuenta", profile="realtor"),
+        parsed("E", 1200, reason=TIMING, details="Retomar en enero", source="ORGANIC_SEARCH"),
+        parsed("F", 0, reason=TIMING, details="Sin presupuesto", source="ORGANIC_SEARCH"),
+        parsed("G", 3000, owner="Beto", reason=NOSHOW, details="tipo de cambio en Bolivia", source="PAID_SEARCH"),
+        parsed("H", 0, reason=None, details=None, profile=None, source=None),
+    ]
+
+
+class TestDealsFrame:
+    """Tests for deals_frame."""
+
+    def test_typed_columns(self, deals):
+        df = cla.deals_frame(deals)
+        for col in ("owner_name", "loss_reason", "reason_label", "source_label"):
+            assert isinstance(df[col].dtype, pd.CategoricalDtype)
+        assert df["amount"].dtype == float
+        assert str(df["closedate"].dt.tz) == "UTC"
+        assert df.loc[7, "loss_reason"] == "" and df.loc[7, "source_label"] == "Unknown"
+        assert df.loc[0, "reason_label"] == "Precio alto"
+
+    def test_split_by_period(self, deals):
+        deals += [parsed("Old", 10, days_ago=45), parsed("Older", 10, days_ago=90)]
+        recent, previous = cla.split_by_period(cla.deals_frame(deals))
+        assert len(recent) == 8
+        assert list(previous["name"]) == ["Old"]
+
+
+class TestAnalyses:
+    """Grouped aggregations keep the shapes and ordering the report relies on."""
+
+    def test_loss_reasons_most_common_order(self, deals):
+        reasons = cla.analyze_loss_reasons(deals)
+        # Ties keep first-appearance order, like Counter.most_common()
+        assert list(reasons) == ["Precio alto", "No asistió al demo", "Mal timing/Budget", "Higiene de lead"]
+        assert reasons["Precio alto"] == {"count": 2, "pct": pytest.approx(200 / 7)}
+
+    def test_customer_profiles(self, deals):
+        profiles = cla.analyze_customer_profiles(deals)
+        assert profiles["Realtor/Agente"] == {"count": 2, "pct": 25.0, "avg_amount": 250.0}
+        assert list(profiles) == ["Realtor/Agente", "Inmobiliaria"]
+
+    def test_by_owner_includes_owners_without_losses(self, deals):
+        by_owner = cla.analyze_by_owner(deals, OWNERS)
+        assert by_owner["Carla"]["count"] == 0 and by_owner["Carla"]["reasons"] == {}
+        assert by_owner["Beto"]["total_amount"] == 10000
+        assert list(by_owner["Beto"]["reasons"]) == ["Precio alto", "Higiene de lead", "No asistió al demo"]
+        assert list(by_owner["Beto"]["deals"]["name"]) == ["C", "D", "G"]
+
+    def test_revenue_by_reason(self, deals):
+        revenue = cla.analyze_revenue_by_reason(deals)
+        assert list(revenue) == ["Precio alto", "No asistió al demo", "Mal timing/Budget", "Higiene de lead", "unknown"]
+        assert revenue["Precio alto"]["avg_deal"] == 3750
+
+    def test_segments_keep_gap_between_bins(self, deals):
+        segments = cla.segment_by_deal_size(deals)
+        # 500.5 falls between Small and Medium, as before
+        assert [s["count"] for s in segments.values()] == [4, 1, 2]
+
+    def test_keyword_analyses(self, deals):
+        assert cla.categorize_higiene_verbatims(deals) == {"Duplicado": {"count": 1, "pct": 100.0, "revenue": 0.0}}
+        assert cla.extract_enhanced_competitors(deals) == {
+            "Zoho": {"mentions": 1, "deals_lost": 1, "revenue_lost": 7000.0}
+        }
+        assert cla.analyze_geographic_friction(deals) == [
+            {"deal": "G", "amount": 3000.0, "details": "tipo de cambio en Bolivia", "keyword": "bolivia"}
+        ]
+        seasonality = cla.analyze_seasonality(deals)
+        assert list(seasonality["delayed_interest"]["deals"]["name"]) == ["E"]
+        assert seasonality["true_budget_loss"]["count"] == 1
+
+    def test_owner_rankings(self, deals):
+        quality = cla.analyze_owner_lead_quality(deals, OWNERS)
+        assert list(quality) == ["Beto", "Ana"]
+        assert cla.analyze_noshow_rate(deals, OWNERS)["Carla"] == {"noshow_count": 0, "total_deals": 0, "noshow_rate": 0}
+        assert [r["owner"] for r in cla.owner_efficiency_matrix(deals, OWNERS)] == ["Beto", "Ana", "Carla"]
+
+    def test_lead_sources(self, deals):
+        sources = cla.analyze_by_lead_source(deals)
+        assert list(sources) == ["Paid Search", "Unknown", "Organic Search"]
+        assert sources["Paid Search"]["top_reasons"] == [("No asistió al demo", 2), ("Precio alto", 1)]
+        assert sources["Unknown"]["top_reasons"] == [("Precio alto", 1), ("Higiene de lead", 1), ("N/A", 1)]
+        by_owner = cla.analyze_lead_source_by_owner(deals, OWNERS)
+        assert by_owner["Ana"]["total"] == 5
+        assert list(by_owner["Ana"]["sources"]) == ["Paid Search", "Organic Search", "Unknown"]
+
+
+class TestReport:
+    """Tests for generate_report."""
+
+    def test_frame_and_list_inputs_match(self, deals):
+        frame = cla.deals_frame(deals)
+        recent, previous = cla.split_by_period(frame)
+        from_frame = cla.generate_report(recent, previous, OWNERS)
+        from_list = cla.generate_report(deals, [], OWNERS)
+        strip = lambda r: [line for line in r.split("\n") if not line.startswith("Generated")]
+        assert strip(from_frame) == strip(from_list)
+        assert "| C | Beto | $7,000 | Precio alto | Se fue con Zoho |" in from_frame
+        assert "| H | Ana | $0 | - | - |" in from_frame
+
+    def test_empty_period(self):
+        report = cla.generate_report([], [], OWNERS)
+        assert "| Deals Lost | 0 | 0 | +0% |" in report
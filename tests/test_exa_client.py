@@ -0,0 +1,115 @@
+"""Tests for the shared Exa client."""
+import asyncio
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from utils.exa_client import ExaClient
+from utils.response_cache import ResponseCache
+
+
+def response(status, results=None, headers=None):
+    resp = MagicMock()
+    resp.status_code = status
+    resp.headers = headers or {}
+    resp.json.return_value = {'results': results or []}
+    return resp
+
+
+@pytest.fixture
+def client(tmp_path):
+    cache = ResponseCache('exa', path=tmp_path / 'exa.db')
+    c = ExaClient(api_key='test-key', cache=cache, max_retries=2, backoff=0)
+    yield c
+    c.close()
+
+
+class TestSearch:
+    """Tests for ExaClient.search."""
+
+    def test_returns_results_and_sends_payload(self, client):
+        with patch.object(client.session, 'post', return_value=response(200, [{'url': 'a'}])) as post:
+            results = client.search('acme realty', num_results=2, max_characters=500)
+
+        assert results == [{'url': 'a'}]
+        payload = post.call_args.kwargs['json']
+        assert payload['numResults'] == 2
+        assert payload['contents']['text']['maxCharacters'] == 500
+
+    def test_caches_by_query_and_num_results(self, client):
+        with patch.object(client.session, 'post', return_value=response(200, [{'url': 'a'}])) as post:
+            client.search('acme realty', num_results=2)
+            client.search('  Acme Realty ', num_results=2)
+            client.search('acme realty', num_results=3)
+
+        assert post.call_count == 2
+        assert client.stats['cache_hits'] == 1
+
+    def test_search_type_is_sent_and_keyed(self, client):
+        with patch.object(client.session, 'post', return_value=response(200, [{'url': 'a'}])) as post:
+            client.search('acme realty', num_results=2, search_type='keyword')
+            assert post.call_args.kwargs['json']['type'] == 'keyword'
+            client.search('acme realty', num_results=2)
+            assert post.call_args.kwargs['json']['type'] == 'auto'
+
+        assert post.call_count == 2
+
+    def test_retries_transient_errors(self, client):
+        responses = [response(429), response(503), response(200, [{'url': 'a'}])]
+        with patch.object(client.session, 'post', side_effect=responses), \
+             patch('utils.exa_client.time.sleep'):
+            results = client.search('acme')
+
+        assert results == [{'url': 'a'}]
+        assert client.stats['retries'] == 2
+
+    def test_honours_retry_after(self, client):
+        responses = [response(429, headers={'Retry-After': '7'}), response(200, [])]
+        with patch.object(client.session, 'post', side_effect=responses), \
+             patch('utils.exa_client.time.sleep') as sleep:
+            client.search('acme')
+
+        sleep.assert_called_once_with(7.0)
+
+    def test_failures_are_not_cached(self, client):
+        timeouts = [requests.Timeout()] * 3
+        with patch.object(client.session, 'post', side_effect=timeouts), \
+             patch('utils.exa_client.time.sleep'):
+            assert client.search('acme') == []
+
+        with patch.object(client.session, 'post', return_value=response(200, [{'url': 'a'}])):
+            assert client.search('acme') == [{'url': 'a'}]
+
+    def test_402_marks_exhausted(self, client):
+        with patch.object(client.session, 'post', return_value=response(402)) as post:
+            assert client.search('acme') == []
+            assert client.search('other') == []
+
+        assert client.exhausted is True
+        assert post.call_count == 1
+
+    def test_no_api_key_skips_request(self, tmp_path):
+        c = ExaClient(api_key='', cache=None)
+        with patch.object(c.session, 'post') as post:
+            assert c.search('acme') == []
+        post.assert_not_called()
+        c.close()
+
+
+class TestSearchManyAsync:
+    """Tests for concurrent per-prospect batches."""
+
+    def test_preserves_order_and_dedupes(self, client):
+        def fake_post(url, json, timeout):
+            return response(200, [{'url': json['query']}])
+
+        with patch.object(client.session, 'post', side_effect=fake_post) as post:
+            batches = asyncio.run(client.search_many_async(['a', 'b', 'a'], num_results=1))
+
+        assert [b[0]['url'] for b in batches] == ['a', 'b', 'a']
+        assert post.call_count == 2
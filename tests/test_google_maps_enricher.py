@@ -0,0 +1,109 @@
+"""Tests for batched, cached Google Maps enrichment."""
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+import google_maps_enricher as gme
+from utils.response_cache import ResponseCache
+
+
+def place(name, place_id, website="", reviews=10):
+    return {
+        "name": name, "rating": 4.8, "review_count": reviews, "place_id": place_id,
+        "website": website, "phone": "", "address": "", "business_status": "OPERATIONAL",
+        "categories": [], "url": f"https://maps.google.com/?cid={place_id}",
+    }
+
+
+def fake_batch(queries, limit=5):
+    catalog = {
+        "Acme": [place("Acme Realty", "p1", "acme.com")],
+        "Beta Homes": [place("Beta Homes", "p2")],
+    }
+    return {q: catalog.get(q, []) for q in queries}
+
+
+class TestSearchBatch:
+    """Tests for search_google_maps_batch."""
+
+    def test_maps_items_back_to_queries(self):
+        client = MagicMock()
+        client.actor.return_value.call.return_value = {"defaultDatasetId": "ds"}
+        client.dataset.return_value.iterate_items.return_value = [
+            {"searchString": "Beta Homes", "title": "Beta Homes", "placeId": "p2"},
+            {"searchString": "Acme", "title": "Acme Realty", "placeId": "p1"},
+        ]
+
+        with patch.object(gme, 'get_apify_client', return_value=client):
+            results = gme.search_google_maps_batch(["Acme", "Beta Homes", "Gamma"])
+
+        run_input = client.actor.return_value.call.call_args.kwargs["run_input"]
+        assert run_input["searchStringsArray"] == ["Acme", "Beta Homes", "Gamma"]
+        assert [p["place_id"] for p in results["Acme"]] == ["p1"]
+        assert [p["place_id"] for p in results["Beta Homes"]] == ["p2"]
+        assert results["Gamma"] == []
+
+    def test_failed_run_returns_none(self):
+        client = MagicMock()
+        client.actor.return_value.call.side_effect = RuntimeError("boom")
+
+        with patch.object(gme, 'get_apify_client', return_value=client):
+            assert gme.search_google_maps_batch(["Acme"]) is None
+
+
+class TestFetchPlaces:
+    """Tests for fetch_places batching and caching."""
+
+    def test_batches_and_caches(self, tmp_path):
+        cache = ResponseCache("gmaps_test", path=tmp_path / "c.db")
+        searches = {
+            gme.place_cache_key("Acme LLC"): ("Acme LLC", None),
+            gme.place_cache_key("Beta Homes"): ("Beta Homes", None),
+            gme.place_cache_key("Gamma"): ("Gamma", None),
+        }
+
+        with patch.object(gme, 'search_google_maps_batch', side_effect=fake_batch) as mock_batch:
+            first = gme.fetch_places(searches, cache=cache, batch_size=2)
+            second = gme.fetch_places(searches, cache=cache, batch_size=2)
+
+        assert mock_batch.call_count == 2  # 3 searches in batches of 2, second run fully cached
+        assert first == second
+        assert first[gme.place_cache_key("Acme")][0]["place_id"] == "p1"
+
+    def test_failed_batches_not_cached(self, tmp_path):
+        cache = ResponseCache("gmaps_test", path=tmp_path / "c.db")
+        searches = {gme.place_cache_key("Acme"): ("Acme", None)}
+
+        with patch.object(gme, 'search_google_maps_batch', return_value=None):
+            results = gme.fetch_places(searches, cache=cache)
+
+        assert results == {gme.place_cache_key("Acme"): []}
+        assert cache.get(gme.place_cache_key("Acme")) is None
+
+
+class TestEnrichGoogleMaps:
+    """Tests for the CSV enrichment flow."""
+
+    def test_duplicate_companies_searched_once(self, tmp_path):
+        csv_path = tmp_path / "in.csv"
+        out_path = tmp_path / "out.csv"
+        pd.DataFrame({
+            "page_name": ["Acme", "Acme", "Beta Homes", "Nobody"],
+            "website_url": ["acme.com", "https://www.acme.com", "", ""],
+        }).to_csv(csv_path, index=False)
+
+        with patch.object(gme, 'search_google_maps_batch', side_effect=fake_batch) as mock_batch, \
+                patch.object(gme, 'get_place_cache', return_value=ResponseCache("t", path=tmp_path / "c.db")):
+            stats = gme.enrich_google_maps(csv_path, out_path, delay=0)
+
+        queries = [q for call in mock_batch.call_args_list for q in call.args[0]]
+        out = pd.read_csv(out_path, keep_default_na=False)
+        assert sorted(queries) == ["Acme", "Beta Homes", "Nobody"]
+        assert stats["processed"] == 4
+        assert stats["found"] == 3
+        assert stats["searches"] == 3
+        assert list(out["gmaps_place_id"]) == ["p1", "p1", "p2", ""]
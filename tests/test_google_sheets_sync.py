@@ -0,0 +1,223 @@
+"""Tests for the differential Google Sheets sync."""
+import os
+import re
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from google_sheets_sync import column_letter, plan_sync, row_keys, sync_to_sheet, update_ranges
+
+
+class MemoryWorksheet:
+    """In-memory worksheet exposing the gspread calls sync_to_sheet makes."""
+
+    def __init__(self, values=None, rows=1000, cols=26):
+        self.values = [list(r) for r in (values or [])]
+        self.row_count = rows
+        self.col_count = cols
+        self.calls = []
+
+    def get_all_values(self):
+        self.calls.append('get_all_values')
+        width = max((len(r) for r in self.values), default=0)
+        rows = [r + [''] * (width - len(r)) for r in self.values]
+        while rows and not any(rows[-1]):
+            rows.pop()
+        return rows
+
+    def batch_update(self, data, value_input_option=None):
+        self.calls.append('batch_update')
+        for item in data:
+            start, end = re.match(r'A(\d+):[A-Z]+(\d+)$', item['range']).groups()
+            assert int(end) - int(start) + 1 == len(item['values'])
+            assert int(end) <= self.row_count
+            for offset, row in enumerate(item['values']):
+                index = int(start) - 1 + offset
+                while len(self.values) <= index:
+                    self.values.append([])
+                self.values[index] = list(row)
+
+    def clear(self):
+        self.calls.append('clear')
+        self.values = []
+
+    def resize(self, rows=None, cols=None):
+        self.calls.append('resize')
+        if rows is not None:
+            self.row_count = rows
+            self.values = self.values[:rows]
+        if cols is not None:
+            self.col_count = cols
+
+    def format(self, *args):
+        self.calls.append('format')
+
+    def freeze(self, rows=None):
+        self.calls.append('freeze')
+
+
+class MemoryClient:
+    def __init__(self, worksheet=None):
+        self.worksheet = worksheet
+        test = self
+
+        class Sheet:
+            def worksheet(self, name):
+                if test.worksheet is None:
+                    raise LookupError(name)
+                return test.worksheet
+
+            def add_worksheet(self, title, rows, cols):
+                test.worksheet = MemoryWorksheet(rows=rows, cols=cols)
+                return test.worksheet
+
+        self.sheet = Sheet()
+
+    def open_by_key(self, sheet_id):
+        return self.sheet
+
+
+def contacts(n=5):
+    return pd.DataFrame({
+        'contact_name': [f'Agent {i}' for i in range(n)],
+        'primary_email': [f'agent{i}@example.com' for i in range(n)],
+        'page_name': [f'Page {i}' for i in range(n)],
+        'lead_score': [float(i) for i in range(n)],
+    })
+
+
+def sheet_frame(worksheet):
+    header, *rows = worksheet.get_all_values()
+    return pd.DataFrame(rows, columns=header)
+
+
+def expected_frame(df):
+    return df[['contact_name', 'primary_email', 'page_name', 'lead_score']].fillna('').astype(str)
+
+
+def same_contacts(worksheet, df):
+    actual = sheet_frame(worksheet).sort_values('primary_email').reset_index(drop=True)
+    expected = expected_frame(df).sort_values('primary_email').reset_index(drop=True)
+    return actual.equals(expected)
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    return tmp_path / 'manifest.json'
+
+
+class TestPlan:
+    """Tests for the diff itself."""
+
+    def test_helpers(self):
+        assert [column_letter(i) for i in (1, 26, 27, 52)] == ['A', 'Z', 'AA', 'AZ']
+        keys = row_keys([['a@x.com', 'P'], ['', 'Page'], ['', ''], ['A@X.com ', 'Q']], ['primary_email', 'page_name'])
+        assert keys[:2] == ['email:a@x.com', 'page:page']
+        assert keys[2].startswith('row:')
+        assert keys[3] == 'email:a@x.com#2'
+        assert update_ranges({2: ['a'], 3: ['b'], 7: ['c']}, 2) == [
+            {'range': 'A2:B3', 'values': [['a'], ['b']]},
+            {'range': 'A7:B7', 'values': [['c']]},
+        ]
+
+    def test_header_change_is_full_rewrite(self):
+        plan = plan_sync([['old', 'cols'], ['1', '2']], ['primary_email'], [['a@x.com']], ['email:a@x.com'])
+        assert plan.full
+        assert plan.updates == {1: ['primary_email'], 2: ['a@x.com']}
+
+    def test_only_changed_rows_are_written(self):
+        columns = ['primary_email', 'lead_score']
+        current = [columns, ['a@x.com', '1'], ['b@x.com', '2'], ['c@x.com', '3']]
+        rows = [['a@x.com', '1'], ['b@x.com', '9'], ['c@x.com', '3'], ['d@x.com', '4']]
+        plan = plan_sync(current, columns, rows, row_keys(rows, columns))
+        assert (plan.inserted, plan.updated, plan.deleted) == (1, 1, 0)
+        assert plan.updates == {3: ['b@x.com', '9'], 5: ['d@x.com', '4']}
+
+    def test_deletions_are_filled(self):
+        columns = ['primary_email']
+        current = [columns] + [[f'{c}@x.com'] for c in 'abcde']
+
+        # b's slot takes the insert; trailing deleted rows are dropped by the resize
+        rows = [['a@x.com'], ['c@x.com'], ['z@x.com']]
+        plan = plan_sync(current, columns, rows, row_keys(rows, columns))
+        assert plan.updates == {3: ['z@x.com']}
+        assert (plan.inserted, plan.deleted, plan.moved) == (1, 3, 0)
+
+        # No insert for b's slot: the bottom row moves up into it
+        rows = [['a@x.com'], ['c@x.com'], ['e@x.com']]
+        plan = plan_sync(current, columns, rows, row_keys(rows, columns))
+        assert plan.updates == {3: ['e@x.com']}
+        assert (plan.deleted, plan.moved) == (2, 1)
+
+
+class TestSyncToSheet:
+    """End-to-end syncs against an in-memory worksheet."""
+
+    def test_first_sync_creates_worksheet(self, manifest):
+        client = MemoryClient()
+        df = contacts()
+        stats = sync_to_sheet(df, 'sheet', client=client, manifest_path=manifest)
+        assert stats['full'] and stats['inserted'] == 5
+        assert same_contacts(client.worksheet, df)
+        assert client.worksheet.calls.count('batch_update') == 1
+
+    def test_unchanged_sync_makes_no_calls(self, manifest):
+        client = MemoryClient()
+        df = contacts()
+        sync_to_sheet(df, 'sheet', client=client, manifest_path=manifest)
+        client.worksheet.calls.clear()
+
+        stats = sync_to_sheet(df.copy(), 'sheet', client=client, manifest_path=manifest)
+        assert stats['write_calls'] == 0
+        assert client.worksheet.calls == []
+
+    def test_changes_go_out_in_one_batch_update(self, manifest):
+        worksheet = MemoryWorksheet(rows=6)
+        client = MemoryClient(worksheet)
+        df = contacts()
+        sync_to_sheet(df, 'sheet', client=client, manifest_path=manifest)
+        worksheet.calls.clear()
+
+        df.loc[1, 'lead_score'] = 99.0
+        df = pd.concat([df.drop(index=3), contacts(8).iloc[5:]], ignore_index=True)
+        stats = sync_to_sheet(df, 'sheet', client=client, manifest_path=manifest)
+
+        assert (stats['inserted'], stats['updated'], stats['deleted']) == (3, 1, 1)
+        assert worksheet.calls == ['get_all_values', 'resize', 'batch_update']
+        assert same_contacts(worksheet, df)
+
+    def test_shrinking_keeps_rows_contiguous(self, manifest):
+        worksheet = MemoryWorksheet()
+        client = MemoryClient(worksheet)
+        df = contacts(6)
+        sync_to_sheet(df, 'sheet', client=client, manifest_path=manifest)
+
+        df = df.iloc[[0, 2, 5]].reset_index(drop=True)
+        stats = sync_to_sheet(df, 'sheet', client=client, manifest_path=manifest)
+        assert stats['deleted'] == 3
+        assert worksheet.row_count == 4
+        assert same_contacts(worksheet, df)
+
+    def test_manual_edits_are_detected_when_data_changes(self, manifest):
+        worksheet = MemoryWorksheet()
+        client = MemoryClient(worksheet)
+        df = contacts()
+        sync_to_sheet(df, 'sheet', client=client, manifest_path=manifest)
+
+        worksheet.values[2][0] = 'edited by hand'
+        df.loc[4, 'contact_name'] = 'Renamed'
+        sync_to_sheet(df, 'sheet', client=client, manifest_path=manifest)
+        assert same_contacts(worksheet, df)
+
+    def test_full_rewrites_everything(self, manifest):
+        worksheet = MemoryWorksheet([['stale'], ['junk']])
+        client = MemoryClient(worksheet)
+        df = contacts()
+        sync_to_sheet(df, 'sheet', client=client, manifest_path=manifest)
+        stats = sync_to_sheet(df, 'sheet', full=True, client=client, manifest_path=manifest)
+        assert stats['full']
+        assert 'clear' in worksheet.calls
+        assert same_contacts(worksheet, df)
@@ -0,0 +1,166 @@
+"""Tests for the HubSpot enricher's concurrent, cached email waterfall."""
+import os
+import sys
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+import hubspot_enricher
+from hubspot_enricher import PROVIDERS, enrich_contact
+from utils import response_cache
+
+
+@pytest.fixture(autouse=True)
+def providers(monkeypatch, tmp_path):
+    """Fresh caches under tmp_path, no pacing, and no real lookups."""
+    monkeypatch.setattr(response_cache, 'CACHE_DIR', tmp_path)
+    for key in ('HUNTER_API_KEY', 'APOLLO_API_KEY', 'EXA_API_KEY'):
+        monkeypatch.setattr(hubspot_enricher, key, 'test-key')
+    for provider in PROVIDERS.values():
+        monkeypatch.setattr(provider, 'func', lambda *args: None)
+        monkeypatch.setattr(provider, '_cache', None)
+        monkeypatch.setattr(provider, 'calls', 0)
+        monkeypatch.setattr(provider, 'errors', 0)
+        monkeypatch.setattr(provider.limiter, 'min_interval', 0)
+    yield PROVIDERS
+    for provider in PROVIDERS.values():
+        if provider._cache is not None:
+            provider._cache.close()
+
+
+def fake(result=None, delay=0.0, calls=None):
+    def lookup(*args):
+        if calls is not None:
+            calls.append(args)
+        time.sleep(delay)
+        return result
+    return lookup
+
+
+def contact(**overrides):
+    row = {'First Name': 'Jane', 'Last Name': 'Doe', 'Company Name': 'Doe Realty',
+           'Email': None, 'Phone Number': None, 'Website URL': 'https://www.doerealty.com'}
+    row.update(overrides)
+    return pd.Series(row)
+
+
+def email(address, source, verified):
+    return {'email': address, 'source': source, 'verified': verified}
+
+
+class TestRace:
+    """Tests for the per-contact lookup race."""
+
+    def test_first_verified_email_wins(self, providers, monkeypatch):
+        monkeypatch.setattr(providers['hunter'], 'func', fake(email('slow@doe.com', 'hunter', True), delay=1.0))
+        monkeypatch.setattr(providers['apollo'], 'func', fake(email('jane@doe.com', 'apollo', True), delay=0.05))
+        monkeypatch.setattr(providers['exa'], 'func', fake(email('exa@doe.com', 'exa', False), delay=1.0))
+
+        started = time.perf_counter()
+        result = enrich_contact(contact())
+        assert time.perf_counter() - started < 0.5
+        assert (result['email'], result['email_source'], result['enriched']) == ('jane@doe.com', 'apollo', True)
+
+    def test_unverified_results_keep_waterfall_order(self, providers, monkeypatch):
+        monkeypatch.setattr(providers['hunter'], 'func', fake(email('h@doe.com', 'hunter', False), delay=0.2))
+        monkeypatch.setattr(providers['apollo'], 'func', fake(email('a@doe.com', 'apollo', False)))
+        monkeypatch.setattr(providers['exa'], 'func', fake(email('e@doe.com', 'exa', False)))
+
+        result = enrich_contact(contact())
+        assert result['email_source'] == 'hunter'
+
+    def test_hunter_starts_once_website_is_found(self, providers, monkeypatch):
+        hunter_calls = []
+        monkeypatch.setattr(providers['duckduckgo'], 'func', fake('https://janedoe.com/about', delay=0.05))
+        monkeypatch.setattr(providers['hunter'], 'func', fake(email('jane@janedoe.com', 'hunter', True),
+                                                              calls=hunter_calls))
+
+        result = enrich_contact(contact(**{'Website URL': None}))
+        assert hunter_calls == [('janedoe.com', 'Jane', 'Doe')]
+        assert result['website'] == 'https://janedoe.com/about'
+        assert result['email'] == 'jane@janedoe.com'
+
+    def test_phone_scraped_only_without_email(self, providers, monkeypatch):
+        scraped = []
+        monkeypatch.setattr(providers['website'], 'func', fake('(305) 555-0100', calls=scraped))
+
+        result = enrich_contact(contact())
+        assert result['phone'] == '(305) 555-0100' and result['email'] == ''
+
+        monkeypatch.setattr(providers['exa'], 'func', fake(email('e@doe.com', 'exa', False)))
+        enrich_contact(contact(**{'Company Name': 'Other Co'}))
+        assert len(scraped) == 1
+
+    def test_providers_without_keys_are_skipped(self, providers, monkeypatch):
+        monkeypatch.setattr(hubspot_enricher, 'APOLLO_API_KEY', None)
+        called = []
+        monkeypatch.setattr(providers['apollo'], 'func', fake(email('a@doe.com', 'apollo', True), calls=called))
+        result = enrich_contact(contact())
+        assert called == [] and result['email'] == ''
+        assert providers['apollo']._cache is None
+
+    def test_contacts_with_email_are_skipped(self, providers):
+        result = enrich_contact(contact(Email='known@doe.com'))
+        assert result['email'] == 'known@doe.com'
+        assert all(p.calls == 0 for p in providers.values())
+
+
+class TestCachedLookup:
+    """Tests for per-provider caching and rate limiting."""
+
+    def test_answers_are_cached_errors_are_not(self, providers, monkeypatch):
+        calls = []
+        monkeypatch.setattr(providers['apollo'], 'func', fake(None, calls=calls))
+        assert providers['apollo']('Jane', 'Doe', 'Doe Realty') is None
+        assert providers['apollo']('jane', 'doe', 'doe realty') is None
+        assert len(calls) == 1
+
+        def failing(*args):
+            calls.append(args)
+            raise RuntimeError('429')
+
+        monkeypatch.setattr(providers['exa'], 'func', failing)
+        providers['exa']('Jane Doe', 'Doe Realty')
+        providers['exa']('Jane Doe', 'Doe Realty')
+        assert len(calls) == 3
+        assert providers['exa'].errors == 2
+
+    def test_provider_calls_are_spaced(self, providers, monkeypatch):
+        monkeypatch.setattr(providers['hunter'].limiter, 'min_interval', 0.05)
+        monkeypatch.setattr(providers['hunter'], 'use_cache', False)
+        stamps = []
+        lock = threading.Lock()
+
+        def record(*args):
+            with lock:
+                stamps.append(time.monotonic())
+
+        monkeypatch.setattr(providers['hunter'], 'func', record)
+        threads = [threading.Thread(target=providers['hunter'], args=('doe.com', 'J', str(i))) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        stamps.sort()
+        assert all(b - a >= 0.04 for a, b in zip(stamps, stamps[1:]))
+
+
+class TestLookupErrors:
+    """Provider functions raise on HTTP errors so failures are not cached."""
+
+    def test_hunter_raises_on_rate_limit(self, monkeypatch):
+        class Response:
+            status_code = 429
+
+            def raise_for_status(self):
+                raise hubspot_enricher.requests.HTTPError('429 Too Many Requests')
+
+        monkeypatch.setattr(hubspot_enricher, 'HUNTER_API_KEY', 'key')
+        monkeypatch.setattr(hubspot_enricher.requests, 'get', lambda *a, **k: Response())
+        with pytest.raises(hubspot_enricher.requests.HTTPError):
+            hubspot_enricher.find_email_hunter('doe.com', 'Jane', 'Doe')
@@ -0,0 +1,265 @@
+"""Tests for the hubspot_funnel extraction layer (search client + snapshot).
+
+Runs against a local mock of HubSpot's CRM search endpoint.
+"""
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "hubspot_funnel"))
+
+import hubspot_extract
+from hubspot_extract import FunnelExtractor, HubSpotSearchClient, SearchSpec, to_ms
+
+DAY_MS = 86400 * 1000
+NOW_MS = int(time.time() * 1000)
+FUTURE_MS = NOW_MS + 365 * DAY_MS
+
+
+def deal(deal_id, owner, created_days_ago, modified_ms=NOW_MS - DAY_MS, stage="open"):
+    return {"id": str(deal_id), "properties": {
+        "hubspot_owner_id": owner,
+        "dealname": f"Deal {deal_id}",
+        "dealstage": stage,
+        "createdate": str(NOW_MS - created_days_ago * DAY_MS),
+        "hs_lastmodifieddate": str(modified_ms),
+    }}
+
+
+def matches(record, filters):
+    for f in filters:
+        value = record["properties"].get(f["propertyName"])
+        if f["operator"] == "EQ" and value != f["value"]:
+            return False
+        if f["operator"] == "GTE" and (to_ms(value) is None or to_ms(value) < int(f["value"])):
+            return False
+    return True
+
+
+class MockSearch:
+    """POST /crm/v3/objects/{type}/search with filters and cursor paging."""
+
+    def __init__(self, records, fail_first=0):
+        self.records = records
+        self.payloads = []
+        self.fail_first = fail_first
+        self.lock = threading.Lock()
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def reply(self, status, payload=None, headers=None):
+                body = json.dumps(payload or {}).encode()
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with mock.lock:
+                    mock.payloads.append((self.path, payload))
+                    if mock.fail_first:
+                        mock.fail_first -= 1
+                        return self.reply(429, headers={"Retry-After": "0"})
+                object_type = self.path.split("/")[4]
+                found = [r for r in mock.records.get(object_type, [])
+                         if matches(r, payload["filterGroups"][0]["filters"])]
+                start = int(payload.get("after", 0))
+                page = found[start:start + payload["limit"]]
+                body = {"results": page}
+                if start + payload["limit"] < len(found):
+                    body["paging"] = {"next": {"after": str(start + payload["limit"])}}
+                self.reply(200, body)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def records():
+    return {"deals": [
+        deal(1, "A", 10), deal(2, "A", 20), deal(3, "A", 400),
+        deal(4, "B", 5), deal(5, "B", 30), deal(6, "C", 1),
+    ]}
+
+
+@pytest.fixture
+def server(records):
+    mock = MockSearch(records)
+    yield mock
+    mock.close()
+
+
+def make_extractor(server, tmp_path, **kwargs):
+    client = HubSpotSearchClient("key", base_url=server.url, requests_per_second=0)
+    return FunnelExtractor("key", client=client, snapshot_path=tmp_path / "snap.db", **kwargs)
+
+
+def spec(owners=("A", "B")):
+    return SearchSpec("deals", list(owners), ["dealname", "dealstage"], "createdate", NOW_MS - 180 * DAY_MS)
+
+
+class TestSearchClient:
+    """Tests for HubSpotSearchClient."""
+
+    def test_follows_paging_cursor(self, server, monkeypatch):
+        monkeypatch.setattr(hubspot_extract, "SEARCH_LIMIT", 1)
+        client = HubSpotSearchClient("key", base_url=server.url, requests_per_second=0)
+        results = client.search("deals", [{"propertyName": "hubspot_owner_id", "operator": "EQ", "value": "A"}],
+                                ["dealname"])
+        assert [r["id"] for r in results] == ["1", "2", "3"]
+        assert client.stats["requests"] == 3
+
+    def test_retries_after_429(self, records):
+        mock = MockSearch(records, fail_first=2)
+        try:
+            client = HubSpotSearchClient("key", base_url=mock.url, requests_per_second=0)
+            results = client.search("deals", [], ["dealname"])
+        finally:
+            mock.close()
+        assert len(results) == 6
+        assert client.stats["retries"] == 2
+
+    def test_search_many_runs_every_job(self, server):
+        client = HubSpotSearchClient("key", base_url=server.url, requests_per_second=0)
+        jobs = {owner: ("deals", [{"propertyName": "hubspot_owner_id", "operator": "EQ", "value": owner}], [])
+                for owner in ("A", "B", "C")}
+        found = client.search_many(jobs)
+        assert {k: len(v) for k, v in found.items()} == {"A": 3, "B": 2, "C": 1}
+
+
+class TestSnapshot:
+    """Tests for incremental syncs through FunnelExtractor."""
+
+    def test_first_run_downloads_window(self, server, tmp_path):
+        extractor = make_extractor(server, tmp_path)
+        deals = extractor.fetch(spec())
+        extractor.close()
+
+        assert sorted(d["id"] for d in deals) == ["1", "2", "4", "5"]
+        filters = [p["filterGroups"][0]["filters"] for _, p in server.payloads]
+        assert not any(f["propertyName"] == "hs_lastmodifieddate" for fs in filters for f in fs)
+
+    def test_second_run_only_fetches_changes(self, server, records, tmp_path, monkeypatch):
+        extractor = make_extractor(server, tmp_path)
+        extractor.fetch(spec())
+        extractor.close()
+
+        # Deal 2 moves to closed lost after the first sync
+        records["deals"][1] = deal(2, "A", 20, modified_ms=FUTURE_MS, stage="lost")
+        server.payloads.clear()
+        monkeypatch.setattr(hubspot_extract, "SYNC_OVERLAP_MS", 0)
+
+        extractor = make_extractor(server, tmp_path)
+        deals = extractor.fetch(spec())
+        extractor.close()
+
+        by_id = {d["id"]: d["properties"] for d in deals}
+        assert sorted(by_id) == ["1", "2", "4", "5"]
+        assert by_id["2"]["dealstage"] == "lost"
+        # Both owners asked only for modified records
+        assert len(server.payloads) == 2
+        for _, payload in server.payloads:
+            assert any(f["propertyName"] == "hs_lastmodifieddate" for f in payload["filterGroups"][0]["filters"])
+
+    def test_refresh_and_new_owners_download_in_full(self, server, tmp_path):
+        extractor = make_extractor(server, tmp_path)
+        extractor.fetch(spec(owners=("A",)))
+        extractor.close()
+        server.payloads.clear()
+
+        extractor = make_extractor(server, tmp_path)
+        deals = extractor.fetch(spec(owners=("A", "C")))
+        extractor.close()
+
+        incremental = {p["filterGroups"][0]["filters"][0]["value"]:
+                       any(f["propertyName"] == "hs_lastmodifieddate" for f in p["filterGroups"][0]["filters"])
+                       for _, p in server.payloads}
+        assert incremental == {"A": True, "C": False}
+        assert sorted(d["id"] for d in deals) == ["1", "2", "6"]
+
+        server.payloads.clear()
+        extractor = make_extractor(server, tmp_path, refresh=True)
+        extractor.fetch(spec(owners=("A",)))
+        extractor.close()
+        assert len(server.payloads[0][1]["filterGroups"][0]["filters"]) == 2
+
+    def test_full_sync_drops_deleted_and_reassigned_deals(self, server, records, tmp_path):
+        extractor = make_extractor(server, tmp_path)
+        extractor.fetch(spec())
+        extractor.close()
+
+        # Deal 1 is deleted and deal 5 moves to an owner outside the report
+        records["deals"] = [d for d in records["deals"] if d["id"] != "1"]
+        records["deals"][3] = deal(5, "C", 30, modified_ms=FUTURE_MS)
+
+        extractor = make_extractor(server, tmp_path)
+        assert sorted(d["id"] for d in extractor.fetch(spec())) == ["1", "2", "4", "5"]
+        extractor.close()
+
+        extractor = make_extractor(server, tmp_path, refresh=True)
+        assert sorted(d["id"] for d in extractor.fetch(spec())) == ["2", "4"]
+        extractor.close()
+
+    def test_stale_snapshot_is_reconciled_in_full(self, server, records, tmp_path, monkeypatch):
+        extractor = make_extractor(server, tmp_path)
+        extractor.fetch(spec())
+        extractor.close()
+
+        records["deals"] = [d for d in records["deals"] if d["id"] != "4"]
+        server.payloads.clear()
+        # Past the reconcile age the next sync re-downloads each owner's window
+        monkeypatch.setattr(hubspot_extract.time, "time",
+                            lambda: (NOW_MS + (hubspot_extract.RECONCILE_AFTER_DAYS + 1) * DAY_MS) / 1000)
+
+        extractor = make_extractor(server, tmp_path)
+        deals = extractor.fetch(spec())
+        extractor.close()
+
+        assert sorted(d["id"] for d in deals) == ["1", "2", "5"]
+        for _, payload in server.payloads:
+            assert len(payload["filterGroups"][0]["filters"]) == 2
+
+    def test_without_snapshot_returns_raw_results(self, server):
+        client = HubSpotSearchClient("key", base_url=server.url, requests_per_second=0)
+        extractor = FunnelExtractor("key", client=client, snapshot_path=None)
+        deals = extractor.fetch(spec())
+        assert sorted(d["id"] for d in deals) == ["1", "2", "4", "5"]
+
+
+class TestClosedLostFetch:
+    """closed_lost_analysis filters the stage locally."""
+
+    def test_only_closed_lost_deals(self, records, tmp_path):
+        import closed_lost_analysis
+
+        records["deals"] = [
+            {"id": "1", "properties": {"hubspot_owner_id": "A", "dealstage": closed_lost_analysis.CLOSED_LOST_STAGE,
+                                       "closedate": str(NOW_MS - DAY_MS)}},
+            {"id": "2", "properties": {"hubspot_owner_id": "A", "dealstage": "other",
+                                       "closedate": str(NOW_MS - DAY_MS)}},
+        ]
+        mock = MockSearch(records)
+        try:
+            extractor = make_extractor(mock, tmp_path)
+            deals = closed_lost_analysis.fetch_deals(["A"], extractor=extractor)
+            extractor.close()
+        finally:
+            mock.close()
+        assert [d["id"] for d in deals] == ["1"]
@@ -0,0 +1,191 @@
+"""Tests for the shared, cached and batching Apify Instagram search."""
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from utils import instagram_apis
+from utils.instagram_apis import ApifySearch, company_handles, search_apify_instagram
+from utils.response_cache import ResponseCache
+
+
+class FakeApify:
+    """ApifyClient stand-in: one profile per search term, tagged with its searchTerm."""
+
+    def __init__(self, status='SUCCEEDED', latency=0.0, tag_terms=True, fail=False):
+        self.status = status
+        self.latency = latency
+        self.tag_terms = tag_terms
+        self.fail = fail
+        self.inputs = []
+        self.lock = threading.Lock()
+
+    def actor(self, actor_id):
+        return self
+
+    def call(self, run_input, timeout_secs=None):
+        if self.fail:
+            raise ConnectionError('apify down')
+        time.sleep(self.latency)
+        with self.lock:
+            self.inputs.append(run_input)
+            run_id = str(len(self.inputs) - 1)
+        return {'status': self.status, 'defaultDatasetId': run_id, 'usageTotalUsd': 0.02}
+
+    def dataset(self, dataset_id):
+        terms = [t.strip() for t in self.inputs[int(dataset_id)]['search'].split(',')]
+        items = [{'username': t.replace(' ', '_'), 'fullName': t.title(), 'followersCount': 5}
+                 for t in terms]
+        if self.tag_terms:
+            for item, term in zip(items, terms):
+                item['searchTerm'] = term
+        return _Items(items)
+
+
+class _Items:
+    def __init__(self, items):
+        self.items = items
+
+    def iterate_items(self):
+        return iter(self.items)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    c = ResponseCache('apify_instagram', path=tmp_path / 'apify_instagram.db')
+    yield c
+    c.close()
+
+
+def searcher(api, cache, **kwargs):
+    return ApifySearch(client=api, cache=cache, **{'batch_window': 0.05, **kwargs})
+
+
+class TestSearchMany:
+    """Tests for blocking batched searches."""
+
+    def test_misses_are_batched_and_cached(self, cache):
+        api = FakeApify()
+        search = searcher(api, cache, batch_size=2)
+        results = search.search_many(['Acme Realty', 'Jane Doe', 'acme  realty', 'Bob, Co'])
+
+        assert [run['search'] for run in api.inputs] == ['acme realty, jane doe', 'bob co']
+        assert results['Acme Realty'][0]['username'] == 'acme_realty'
+        assert results['acme  realty'] == results['Acme Realty']
+        assert results['Bob, Co'][0]['fullName'] == 'Bob Co'
+
+        again = searcher(api, cache).search_many(['ACME REALTY', 'bob co'])
+        assert len(api.inputs) == 2
+        assert again['bob co'][0]['username'] == 'bob_co'
+
+    def test_failures_are_not_cached(self, cache):
+        api = FakeApify(status='FAILED')
+        search = searcher(api, cache)
+        assert search.search('acme realty') == []
+        api.status = 'SUCCEEDED'
+        assert search.search('acme realty')[0]['username'] == 'acme_realty'
+        assert len(api.inputs) == 2
+        assert search.stats['errors'] == 1
+
+    def test_unattributed_batches_fall_back_to_single_runs(self, cache, caplog):
+        api = FakeApify(tag_terms=False)
+        search = searcher(api, cache, batch_size=2)
+        with caplog.at_level('WARNING', logger=instagram_apis.__name__):
+            results = search.search_many(['one', 'two', 'three'])
+
+        assert [run['search'] for run in api.inputs] == ['one, two', 'one', 'two', 'three']
+        assert {q: [p['username'] for p in r] for q, r in results.items()} == \
+            {'one': ['one'], 'two': ['two'], 'three': ['three']}
+        assert 'search term' in caplog.text
+        assert search.batch_size == 1
+
+        # Each single-query answer was cached
+        assert searcher(api, cache).search('two')[0]['username'] == 'two'
+        assert len(api.inputs) == 4
+
+    def test_partly_unattributed_empty_answers_are_not_cached(self, cache):
+        api = FakeApify()
+        api.dataset = lambda dataset_id: _Items([{'username': 'one', 'searchTerm': 'one'},
+                                                 {'username': 'stray'}])
+        search = searcher(api, cache)
+        assert [p['username'] for p in search.search_many(['one', 'two'])['one']] == ['one']
+        assert cache.get(search.cache_key('one')) is not None
+        assert cache.get(search.cache_key('two')) is None
+
+    def test_report(self, cache):
+        search = searcher(FakeApify(latency=0.02), cache, batch_size=2)
+        search.search_many(['a1', 'b2', 'c3'])
+        search.search('a1')
+        report = search.report()
+        assert (report['runs'], report['queries'], report['cache_hits']) == (2, 4, 1)
+        assert report['cost_usd'] == 0.04 and report['cost_per_query_usd'] == round(0.04 / 3, 4)
+        assert report['max_latency_seconds'] >= 0.02
+        assert [c.queries for c in search.calls] == [2, 1]
+
+
+class TestSearchAsync:
+    """Tests for async searches sharing actor runs."""
+
+    def test_concurrent_searches_share_a_run(self, cache):
+        api = FakeApify(latency=0.05)
+        search = searcher(api, cache, batch_size=3)
+
+        async def run():
+            return await asyncio.gather(*(search.search_async(q) for q in
+                                          ['a1', 'b2', 'A1', 'c3', 'd4']))
+
+        results = asyncio.run(run())
+        assert sorted(run['search'] for run in api.inputs) == ['a1, b2, c3', 'd4']
+        assert [r[0]['username'] for r in results] == ['a1', 'b2', 'a1', 'c3', 'd4']
+
+        # Cached for the next event loop too
+        asyncio.run(search.search_async('d4'))
+        assert len(api.inputs) == 2
+
+    def test_errors_resolve_to_empty(self, cache):
+        search = searcher(FakeApify(fail=True), cache)
+        assert asyncio.run(search.search_async('acme')) == []
+        assert search.stats['errors'] == 1 and search._pending == {}
+
+    def test_runs_off_the_event_loop(self, cache):
+        search = searcher(FakeApify(latency=0.2), cache)
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.02)
+
+        async def run():
+            await asyncio.gather(search.search_async('acme'), ticker())
+
+        asyncio.run(run())
+        assert max(b - a for a, b in zip(ticks, ticks[1:])) < 0.1
+
+
+class TestSearchApifyInstagram:
+    """Tests for the instagram_enricher entry point."""
+
+    def test_company_handles(self):
+        profiles = [{'username': 'acmerealtymiami', 'fullName': ''},
+                    {'username': 'someone_else', 'fullName': 'Jane Doe'},
+                    {'username': 'acme.homes', 'fullName': 'Acme Realty Group'}]
+        assert company_handles(profiles, 'Acme Realty') == ['acmerealtymiami', 'acme.homes']
+        assert company_handles(profiles, 'A B') == []
+
+    def test_gated_and_shared(self, cache, monkeypatch):
+        api = FakeApify()
+        monkeypatch.setattr(instagram_apis, '_search', searcher(api, cache))
+        monkeypatch.delenv('USE_PAID_INSTAGRAM_API', raising=False)
+        assert asyncio.run(search_apify_instagram('Acme Realty')) == []
+
+        monkeypatch.setenv('USE_PAID_INSTAGRAM_API', 'true')
+        assert asyncio.run(search_apify_instagram('Acme Realty')) == ['acme_realty']
+        assert asyncio.run(search_apify_instagram('', 'https://www.acmerealty.com/about')) == ['acmerealty']
+        assert instagram_apis.is_paid_api_enabled()
+        assert len(api.inputs) == 2
@@ -0,0 +1,166 @@
+"""Tests for the Instagram enricher's concurrent scheduler and async scraping."""
+
+import asyncio
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import instagram_enricher
+from instagram_enricher import (
+    deep_scrape_website_async,
+    enrich_instagram_handles,
+    first_strategy_with_handles,
+    run_blocking,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_state(monkeypatch, tmp_path):
+    monkeypatch.setattr(instagram_enricher, 'INPUT_FILE', str(tmp_path / 'missing.csv'))
+    instagram_enricher._website_cache.clear()
+    yield
+    instagram_enricher._website_cache.clear()
+
+
+def make_df(n):
+    return pd.DataFrame({'page_name': [f'Agent {i}' for i in range(n)], 'instagram_handles': ['[]'] * n})
+
+
+class TestScheduler:
+    """Tests for the worker-pool scheduler in enrich_instagram_handles."""
+
+    @pytest.mark.asyncio
+    async def test_slow_contact_does_not_stall_others(self):
+        durations = {'Agent 0': 0.4}
+
+        async def fake_enrich(row, skip_enhanced=False, verify_handles=False):
+            await asyncio.sleep(durations.get(row['page_name'], 0.05))
+            return [f"@{row['page_name'].replace(' ', '_').lower()}"]
+
+        with patch.object(instagram_enricher, 'enrich_contact_instagram', fake_enrich):
+            started = time.perf_counter()
+            df, found = await enrich_instagram_handles(make_df(13), run_all=True, concurrency=4)
+            elapsed = time.perf_counter() - started
+
+        # Fixed batches of 4 would take 0.4 + 3 * 0.05; the pool overlaps the slow contact
+        assert elapsed < 0.5
+        assert found == 13
+        assert json.loads(df.loc[12, 'instagram_handles']) == ['@agent_12']
+
+    @pytest.mark.asyncio
+    async def test_errors_are_isolated(self):
+        async def fake_enrich(row, skip_enhanced=False, verify_handles=False):
+            if row['page_name'] == 'Agent 1':
+                raise RuntimeError('boom')
+            return ['@found_it']
+
+        with patch.object(instagram_enricher, 'enrich_contact_instagram', fake_enrich):
+            df, found = await enrich_instagram_handles(make_df(3), run_all=True, concurrency=2)
+
+        assert found == 2
+        assert df.loc[1, 'instagram_handles'] == '[]'
+
+    @pytest.mark.asyncio
+    async def test_checkpoints_while_running(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(instagram_enricher, 'CHECKPOINT_EVERY', 2)
+        checkpoint = tmp_path / 'out.csv'
+
+        async def fake_enrich(row, skip_enhanced=False, verify_handles=False):
+            return ['@found_it']
+
+        with patch.object(instagram_enricher, 'enrich_contact_instagram', fake_enrich):
+            await enrich_instagram_handles(make_df(3), run_all=True, concurrency=1, checkpoint_path=checkpoint)
+
+        saved = pd.read_csv(checkpoint)
+        assert list(saved['instagram_handles'][:2]) == ['["@found_it"]'] * 2
+
+
+class TestProviderLimits:
+    """Tests for run_blocking."""
+
+    @pytest.mark.asyncio
+    async def test_provider_concurrency_is_bounded(self, monkeypatch):
+        monkeypatch.setitem(instagram_enricher.PROVIDER_LIMITS, 'web', 2)
+        active, peak = [0], [0]
+        lock = threading.Lock()
+
+        def blocking_call():
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+
+        await asyncio.gather(*(run_blocking('web', blocking_call) for _ in range(6)))
+        assert peak[0] == 2
+
+
+class TestAsyncScraping:
+    """Tests for the non-blocking website scrape."""
+
+    @pytest.mark.asyncio
+    async def test_homepage_with_instagram_skips_other_pages(self):
+        fetched = []
+
+        def fake_scrape(url, timeout=10):
+            fetched.append(url)
+            return '<a href="https://instagram.com/best_agent">IG</a>'
+
+        with patch.object(instagram_enricher, 'scrape_website', fake_scrape):
+            html = await deep_scrape_website_async('example.com')
+
+        assert fetched == ['https://example.com/']
+        assert 'best_agent' in html
+
+    @pytest.mark.asyncio
+    async def test_pages_are_cached_per_run(self):
+        fetched = []
+
+        def fake_scrape(url, timeout=10):
+            fetched.append(url)
+            return '<p>no links</p>'
+
+        with patch.object(instagram_enricher, 'scrape_website', fake_scrape):
+            await deep_scrape_website_async('https://example.com')
+            await deep_scrape_website_async('https://example.com')
+
+        assert sorted(fetched) == ['https://example.com/', 'https://example.com/about']
+
+
+class TestStrategyRace:
+    """Tests for first_strategy_with_handles."""
+
+    @pytest.mark.asyncio
+    async def test_first_new_handles_win_and_rest_are_cancelled(self):
+        cancelled = []
+
+        async def slow():
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+            return ['@too_late']
+
+        async def known():
+            return ['@already_have']
+
+        async def fast():
+            await asyncio.sleep(0.01)
+            return ['@new_handle', '@x']
+
+        result = await first_strategy_with_handles([slow, known, fast], {'@already_have'})
+        await asyncio.sleep(0)
+
+        assert result == ['@new_handle']
+        assert cancelled == [True]
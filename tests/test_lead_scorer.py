@@ -0,0 +1,94 @@
+"""Tests for vectorized lead scoring."""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from lead_scorer import SCORE_COLUMNS, calculate_lead_score, score_frame, score_leads
+
+
+@pytest.fixture
+def contacts():
+    return pd.DataFrame({
+        'page_name': ['Hot Co', 'Warm Co', 'Cold Co', 'Empty Co'],
+        'ad_count': [5, 1, 0, np.nan],
+        'gmaps_review_count': [150, 40, 0, np.nan],
+        'gmaps_rating': [4.8, 4.0, 3.5, np.nan],
+        'has_crm': [True, False, False, np.nan],
+        'has_marketing_pixel': [True, True, False, np.nan],
+        'has_scheduling_tool': [True, False, False, np.nan],
+        'has_chat_widget': [False, False, False, np.nan],
+        'contact_position': ['Owner', 'Agent', np.nan, ''],
+        'primary_email': ['a@hot.com', 'b@warm.com', '', np.nan],
+        'phones': ['["+1 305"]', '[]', '[]', np.nan],
+        'instagram_handles': ['["hotco"]', '[]', np.nan, np.nan],
+    })
+
+
+class TestScoreFrame:
+    """Tests for score_frame."""
+
+    def test_matches_row_scoring(self, contacts):
+        expected = pd.DataFrame(
+            [calculate_lead_score(row) for _, row in contacts.iterrows()],
+            index=contacts.index,
+        )
+
+        result = score_frame(contacts)
+
+        pd.testing.assert_frame_equal(
+            result[SCORE_COLUMNS].astype(object), expected[SCORE_COLUMNS].astype(object)
+        )
+
+    def test_scores_and_tiers(self, contacts):
+        result = score_frame(contacts)
+
+        assert list(result['lead_score']) == [18, 8, 0, 0]
+        assert list(result['lead_tier']) == ['HOT', 'WARM', 'COLD', 'COLD']
+        assert result.loc[2, 'score_breakdown'] == 'no_signals'
+        assert result.loc[1, 'score_breakdown'] == (
+            'active_fb_ads:+3|reviews_30+:+2|has_pixel:+1|email_only:+1|good_rating:+1'
+        )
+
+    def test_missing_flags_not_counted(self, contacts):
+        result = score_frame(contacts)
+
+        assert 'has_crm' not in result.loc[3, 'score_breakdown']
+
+    def test_component_columns(self, contacts):
+        result = score_frame(contacts, include_components=True)
+
+        assert list(result['score_has_crm']) == [2, 0, 0, 0]
+        component_sum = result.filter(like='score_').drop(columns='score_breakdown').sum(axis=1)
+        assert list(component_sum) == list(result['lead_score'])
+
+
+class TestScoreLeads:
+    """Tests for score_leads file handling."""
+
+    def test_chunked_matches_in_memory(self, contacts, tmp_path):
+        csv_path = tmp_path / 'in.csv'
+        contacts.to_csv(csv_path, index=False)
+
+        full_stats = score_leads(csv_path, tmp_path / 'full.csv')
+        chunk_stats = score_leads(csv_path, tmp_path / 'chunked.csv', chunksize=3)
+
+        full = pd.read_csv(tmp_path / 'full.csv')
+        chunked = pd.read_csv(tmp_path / 'chunked.csv')
+        pd.testing.assert_frame_equal(full[SCORE_COLUMNS], chunked[SCORE_COLUMNS])
+        assert full_stats == chunk_stats
+        assert chunk_stats['tiers'] == {'HOT': 1, 'WARM': 1, 'COOL': 0, 'COLD': 2}
+
+    def test_limit_leaves_other_rows_blank(self, contacts, tmp_path):
+        csv_path = tmp_path / 'in.csv'
+        contacts.to_csv(csv_path, index=False)
+
+        stats = score_leads(csv_path, tmp_path / 'out.csv', limit=2)
+
+        out = pd.read_csv(tmp_path / 'out.csv', keep_default_na=False)
+        assert stats['scored'] == 2
+        assert list(out['lead_tier']) == ['HOT', 'WARM', '', '']
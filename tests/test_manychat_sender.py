@@ -0,0 +1,190 @@
+"""Tests for ManyChat subscriber resolution and the bulk sender."""
+import os
+import sys
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from manychat_sender import ManyChatClient, SubscriberResolver, process_csv_and_send
+from utils import response_cache
+
+
+class Response:
+    def __init__(self, status_code, data=None):
+        self.status_code = status_code
+        self.data = data or {}
+        self.text = ''
+
+    def json(self):
+        return self.data
+
+
+class FakeAPI:
+    """Stands in for the client's session: subscribers keyed by (field, value)."""
+
+    def __init__(self, subscribers=None, status_code=200, delay=0.0, page_id=1):
+        self.subscribers = subscribers or {}
+        self.status_code = status_code
+        self.delay = delay
+        self.page_id = page_id
+        self.send_error = None
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def request(self, method, url, params=None, json=None, timeout=None):
+        time.sleep(self.delay)
+        with self.lock:
+            self.calls.append((url.rsplit('/fb', 1)[1], params, json))
+        if self.status_code != 200:
+            return Response(self.status_code)
+        if url.endswith('/page/getInfo'):
+            return Response(200, {'status': 'success', 'data': {'id': self.page_id}})
+        if json is not None:
+            if self.send_error:
+                return Response(400, {'message': self.send_error})
+            return Response(200, {'status': 'success'})
+        field, value = next(iter(params.items()))
+        subscriber_id = self.subscribers.get((field, value))
+        return Response(200, {'status': 'success', 'data': [{'id': subscriber_id}] if subscriber_id else []})
+
+    def lookups(self):
+        return [c for c in self.calls if c[0].startswith('/subscriber/')]
+
+    def sends(self):
+        return [c for c in self.calls if c[0] == '/sending/sendContent']
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(response_cache, 'CACHE_DIR', tmp_path)
+
+
+def client_with(api, delay=0.0):
+    client = ManyChatClient('test-key', delay=delay)
+    client.session = api
+    return client
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / 'contacts.csv'
+    pd.DataFrame({
+        'instagram_handles': ['@jane_doe, @doe_realty', '@bob', '@carl', '@jane_doe', None],
+        'firstname': ['Jane', 'Bob', 'Carl', 'Jane', 'Dan'],
+        'email': ['Jane@Doe.com', 'bob@x.com', None, None, 'dan@x.com'],
+        'phone': [None, '(305) 555-0100', None, None, None],
+    }).to_csv(path, index=False)
+    return path
+
+
+API_SUBSCRIBERS = {('email', 'jane@doe.com'): 11, ('phone', '3055550100'): 22}
+
+
+class TestSubscriberResolver:
+    """Tests for short-circuiting, caching and concurrency."""
+
+    def test_stops_at_first_hit(self):
+        api = FakeAPI({('email', 'jane@doe.com'): 11, ('phone', '3055550100'): 22})
+        resolver = SubscriberResolver(client_with(api))
+        assert resolver.resolve('jane', 'jane@doe.com', '3055550100', 'Jane') == (11, 'email', None)
+        assert resolver.resolve('bob', 'bob@x.com', '3055550100', 'Bob') == (22, 'phone', None)
+        assert [c[1] for c in api.lookups()] == [{'email': 'jane@doe.com'}, {'email': 'bob@x.com'},
+                                                 {'phone': '3055550100'}]
+
+    def test_repeat_resolution_makes_no_calls(self):
+        api = FakeAPI(API_SUBSCRIBERS)
+        resolver = SubscriberResolver(client_with(api))
+        assert resolver.resolve('nobody', 'no@x.com', '', 'Nobody') == (None, None, 'Subscriber not found')
+        resolver.resolve('jane', 'jane@doe.com')
+        resolver.close()
+        assert len(api.lookups()) == 3
+
+        # A new run (and a new handle sharing a cached email) hits only the cache
+        resolver = SubscriberResolver(client_with(api))
+        assert resolver.resolve('nobody', 'no@x.com', '', 'Nobody') == (None, None, 'Subscriber not found')
+        assert resolver.resolve('jane', '') == (11, 'email', None)
+        assert resolver.resolve('jane_alt', 'JANE@doe.com') == (11, 'email', None)
+        assert len(api.lookups()) == 3
+        assert resolver.lookup_calls == 0 and resolver.cache_hits == 4
+
+    def test_cache_is_scoped_to_the_manychat_page(self):
+        resolver = SubscriberResolver(client_with(FakeAPI(API_SUBSCRIBERS, page_id=1)))
+        assert resolver.resolve('jane', 'jane@doe.com') == (11, 'email', None)
+        resolver.close()
+
+        # Another page's API key never sees page 1's subscriber IDs
+        other = FakeAPI({('email', 'jane@doe.com'): 99}, page_id=2)
+        resolver = SubscriberResolver(client_with(other))
+        assert resolver.resolve('jane', 'jane@doe.com') == (99, 'email', None)
+        assert len(other.lookups()) == 1 and resolver.cache_hits == 0
+
+    def test_api_errors_are_not_cached(self):
+        api = FakeAPI(status_code=429)
+        resolver = SubscriberResolver(client_with(api))
+        subscriber_id, method, error = resolver.resolve('jane', 'jane@doe.com')
+        assert subscriber_id is None and 'Rate limit' in error
+
+        api.status_code = 200
+        api.subscribers = API_SUBSCRIBERS
+        assert resolver.resolve('jane', 'jane@doe.com') == (11, 'email', None)
+        assert len(api.lookups()) == 2
+
+    def test_contacts_resolve_concurrently_under_rate_limit(self):
+        api = FakeAPI(delay=0.1)
+        resolver = SubscriberResolver(client_with(api, delay=0.02), workers=4, use_cache=False)
+        contacts = [{'instagram_handle': f'h{i}', 'email': f'{i}@x.com', 'phone': '', 'contact_name': ''}
+                    for i in range(8)]
+
+        started = time.perf_counter()
+        resolved = resolver.resolve_many(contacts)
+        assert time.perf_counter() - started < 0.5
+        assert set(resolved) == {f'h{i}' for i in range(8)}
+        assert resolver.cache is None and resolver.lookup_calls == 8
+
+
+class TestProcessCsvAndSend:
+    """Tests for the bulk resolve-then-send flow."""
+
+    def test_second_campaign_needs_no_lookups(self, csv_path):
+        api = FakeAPI(API_SUBSCRIBERS)
+        client = client_with(api)
+
+        first = process_csv_and_send(client, csv_path, 'Hi {contact_name} @{instagram_handle}', 'ACCOUNT_UPDATE')
+        assert (first['total_handles'], first['sent'], first['skipped'], first['errors']) == (4, 3, 1, 0)
+        sent = {r['instagram_handle']: r['subscriber_id'] for r in first['results'] if r['status'] == 'sent'}
+        assert sent == {'jane_doe': 11, 'doe_realty': 11, 'bob': 22}
+        assert [r['instagram_handle'] for r in first['results']] == ['jane_doe', 'doe_realty', 'bob', 'carl']
+        assert first['results'][0]['message'] == 'Hi Jane @jane_doe'
+        assert first['lookup_calls'] > 0
+
+        lookups = len(api.lookups())
+        second = process_csv_and_send(client, csv_path, 'Hi again {contact_name}', 'ACCOUNT_UPDATE')
+        assert second['sent'] == 3 and second['lookup_calls'] == 0
+        assert len(api.lookups()) == lookups
+
+    def test_invalid_subscriber_is_evicted(self, csv_path):
+        api = FakeAPI(API_SUBSCRIBERS)
+        client = client_with(api)
+        process_csv_and_send(client, csv_path, 'Hi', 'ACCOUNT_UPDATE')
+        lookups = len(api.lookups())
+
+        # Bob's subscriber was deleted on ManyChat's side
+        api.subscribers = {('email', 'jane@doe.com'): 11, ('phone', '3055550100'): 33}
+        api.send_error = 'Subscriber does not exist'
+        failed = process_csv_and_send(client, csv_path, 'Hi', 'ACCOUNT_UPDATE')
+        assert failed['errors'] == 3 and len(api.lookups()) == lookups
+
+        api.send_error = None
+        again = process_csv_and_send(client, csv_path, 'Hi', 'ACCOUNT_UPDATE')
+        sent = {r['instagram_handle']: r['subscriber_id'] for r in again['results'] if r['status'] == 'sent'}
+        assert sent == {'jane_doe': 11, 'doe_realty': 11, 'bob': 33}
+        assert again['lookup_calls'] > 0
+
+    def test_dry_run_makes_no_calls(self, csv_path):
+        api = FakeAPI(API_SUBSCRIBERS)
+        results = process_csv_and_send(client_with(api), csv_path, 'Hi', 'ACCOUNT_UPDATE', dry_run=True)
+        assert results['sent'] == 4 and api.calls == []
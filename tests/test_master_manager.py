@@ -0,0 +1,74 @@
+"""Tests for master_manager merge-back."""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from master_manager import merge_enriched, normalize_key
+
+
+class TestNormalizeKey:
+    """Tests for normalize_key."""
+
+    def test_casefold_and_whitespace(self):
+        keys = normalize_key(pd.Series(['  Acme  Realty ', 'ACME REALTY', None]))
+        assert list(keys) == ['acme realty', 'acme realty', '']
+
+
+class TestMergeEnriched:
+    """Tests for vectorized merge of enricher output into master."""
+
+    def _master(self):
+        return pd.DataFrame({
+            'page_name': ['Acme Realty', 'Beta Homes', 'Gamma Group'],
+            'gmaps_place_id': [np.nan, np.nan, 'existing'],
+            'primary_email': ['a@acme.com', '', 'g@gamma.com'],
+        })
+
+    def test_updates_only_non_null_cells(self):
+        enriched = pd.DataFrame({
+            'page_name': ['acme realty', 'Gamma Group'],
+            'gmaps_place_id': ['place_1', np.nan],
+            'primary_email': ['', 'new@gamma.com'],
+        })
+
+        master, counts = merge_enriched(self._master(), enriched)
+
+        assert master.loc[0, 'gmaps_place_id'] == 'place_1'
+        assert master.loc[0, 'primary_email'] == 'a@acme.com'
+        assert master.loc[2, 'gmaps_place_id'] == 'existing'
+        assert master.loc[2, 'primary_email'] == 'new@gamma.com'
+        assert pd.isna(master.loc[1, 'gmaps_place_id'])
+        assert counts == {'gmaps_place_id': 1, 'primary_email': 1}
+
+    def test_adds_new_columns(self):
+        enriched = pd.DataFrame({'page_name': ['Beta Homes'], 'tech_count': [3]})
+
+        master, counts = merge_enriched(self._master(), enriched)
+
+        assert 'tech_count' in master.columns
+        assert master.loc[1, 'tech_count'] == 3
+        assert pd.isna(master.loc[0, 'tech_count'])
+        assert counts == {'tech_count': 1}
+
+    def test_unmatched_and_blank_keys_ignored(self):
+        enriched = pd.DataFrame({
+            'page_name': ['Unknown Co', None, ''],
+            'gmaps_place_id': ['x', 'y', 'z'],
+        })
+
+        master, counts = merge_enriched(self._master(), enriched)
+
+        assert master['gmaps_place_id'].notna().sum() == 1
+        assert counts == {'gmaps_place_id': 0}
+
+    def test_text_into_float_column(self):
+        master = pd.DataFrame({'page_name': ['Acme Realty'], 'crm_name': [np.nan]})
+        enriched = pd.DataFrame({'page_name': ['Acme Realty'], 'crm_name': ['HubSpot']})
+
+        master, _ = merge_enriched(master, enriched)
+
+        assert master.loc[0, 'crm_name'] == 'HubSpot'
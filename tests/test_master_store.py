@@ -0,0 +1,123 @@
+"""Tests for the keyed SQLite master store."""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from master_store import MasterStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return MasterStore(tmp_path / "master.db")
+
+
+def _master():
+    return pd.DataFrame({
+        'page_name': ['Acme Realty', 'Beta Homes'],
+        'primary_email': ['a@acme.com', np.nan],
+        'website_url': ['https://www.acme.com/', 'beta.com'],
+        'has_crm': [True, False],
+        'tech_count': [2, 0],
+    })
+
+
+class TestUpsert:
+    """Tests for MasterStore.upsert."""
+
+    def test_insert_and_load_roundtrip(self, store):
+        stats = store.upsert(_master())
+
+        df = store.load()
+        assert stats == {'inserted': 2, 'updated': 0, 'merged': 0}
+        assert list(df.columns) == ['page_name', 'primary_email', 'website_url', 'has_crm', 'tech_count']
+        assert list(df['page_name']) == ['Acme Realty', 'Beta Homes']
+        assert list(df['has_crm']) == [True, False]
+        assert pd.isna(df.loc[1, 'primary_email'])
+
+    def test_fill_gaps_on_page_name_match(self, store):
+        store.upsert(_master())
+        incoming = pd.DataFrame({
+            'page_name': ['beta homes'],
+            'primary_email': ['info@beta.com'],
+            'lead_score': [7],
+        })
+
+        stats = store.upsert(incoming)
+
+        df = store.load()
+        assert stats == {'inserted': 0, 'updated': 1, 'merged': 0}
+        assert len(df) == 2
+        beta = df[df['page_name'] == 'Beta Homes'].iloc[0]
+        assert beta['primary_email'] == 'info@beta.com'
+        assert beta['lead_score'] == 7
+        assert beta['website_url'] == 'beta.com'
+
+    def test_dedupes_by_email_and_url(self, store):
+        store.upsert(_master())
+        incoming = pd.DataFrame({
+            'page_name': ['Acme Realty Group', 'Beta Homes LLC'],
+            'primary_email': ['A@ACME.COM', np.nan],
+            'website_url': [np.nan, 'http://beta.com'],
+        })
+
+        stats = store.upsert(incoming)
+
+        assert stats['inserted'] == 0
+        assert store.count() == 2
+
+    def test_row_matching_two_stored_rows_merges_them(self, store):
+        store.upsert(_master())
+        incoming = pd.DataFrame({
+            'page_name': ['Acme Realty'],
+            'primary_email': ['a@acme.com'],
+            'website_url': ['beta.com'],
+        })
+
+        stats = store.upsert(incoming)
+
+        assert stats['merged'] == 1
+        assert store.count() == 1
+
+    def test_duplicates_within_batch(self, store):
+        incoming = pd.DataFrame({
+            'page_name': ['Acme Realty', 'ACME  realty'],
+            'city': [np.nan, 'Miami'],
+        })
+
+        store.upsert(incoming)
+
+        df = store.load()
+        assert len(df) == 1
+        assert df.loc[0, 'city'] == 'Miami'
+
+
+class TestUpdateByKey:
+    """Tests for MasterStore.update_by_key."""
+
+    def test_updates_non_null_cells(self, store):
+        store.upsert(_master())
+        enriched = pd.DataFrame({
+            'page_name': ['Acme Realty', 'Beta Homes', 'Unknown'],
+            'gmaps_place_id': ['p1', np.nan, 'p3'],
+            'tech_count': [np.nan, 4, 1],
+        })
+
+        counts = store.update_by_key(enriched)
+
+        df = store.load()
+        assert counts == {'gmaps_place_id': 1, 'tech_count': 1}
+        assert list(df['gmaps_place_id'].fillna('')) == ['p1', '']
+        assert list(df['tech_count']) == [2, 4]
+
+    def test_export_csv(self, store, tmp_path):
+        store.upsert(_master())
+        path = store.export_csv(tmp_path / "out" / "master.csv")
+
+        df = pd.read_csv(path)
+        assert len(df) == 2
+        assert list(df['has_crm']) == [True, False]
@@ -0,0 +1,115 @@
+"""Tests for blocked fuzzy name linkage and the HubSpot local enricher."""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from hubspot_local_enricher import fill_from_agents
+from utils.name_matcher import NameIndex, link, name_parts, soundex
+
+
+@pytest.fixture
+def agents():
+    return pd.DataFrame({
+        'agent_name': ['John A. Smith', 'Robert Jones Jr.', 'José García', 'Jane Smith',
+                       'María Lopez', 'Michael Brown', 'Michael Brown', 'Pat Kelly'],
+        'agent_email': ['john@smith.com', 'bob@jones.com', None, 'jane@smith.com',
+                        'maria@lopez.com', 'mb1@brown.com', 'mb2@brown.com', 'pat@kelly.com'],
+        'agent_phone': ['111', '222', '333', None, '555', '666', '777', '888'],
+    }, index=range(10, 18))
+
+
+class TestNormalization:
+    """Tests for name_parts and soundex."""
+
+    def test_soundex(self):
+        assert [soundex(w) for w in ('Robert', 'Rupert', 'Ashcraft', 'Tymczak', 'Pfister', '')] == [
+            'R163', 'R163', 'A261', 'T522', 'P236', '']
+
+    def test_name_parts(self):
+        parts = name_parts(pd.Series(['  José  M. García-Pérez Jr.', 'Bob Smith', 'Cher', None]))
+        assert parts.loc[0, ['first', 'last', 'block_initial']].tolist() == ['jose', 'perez', 'j|perez']
+        assert parts.loc[1, 'full'] == 'robert smith'
+        assert parts.loc[1, 'block_phonetic'] == 'R163|S530'
+        assert (parts.loc[2:, 'full'] == '').all()
+
+
+class TestNameIndex:
+    """Tests for blocked matching and confidence scores."""
+
+    def test_near_misses_match(self, agents):
+        left = pd.Series(['John Smith', 'Bob Jones', 'Jose Garcia', 'Maria Lópes'], index=list('abcd'))
+        matches = NameIndex(agents['agent_name']).match(left).set_index('left')
+        assert matches['right'].to_dict() == {'a': 10, 'b': 11, 'c': 12, 'd': 14}
+        assert matches.loc['a', 'confidence'] == 1.0
+        assert 0.8 <= matches.loc['d', 'confidence'] < 1.0
+
+    def test_different_people_do_not_match(self, agents):
+        matches = link(pd.Series(['Janet Smithers', 'Xavier Quinn', 'Pat']), agents['agent_name'])
+        assert matches.empty
+
+    def test_similar_first_names_on_a_shared_surname_do_not_match(self):
+        left = pd.Series(['John Smith', 'Maria Garcia', 'Carlos Diaz', 'Juan Perez', 'Danielle Lee', 'Ivana Petrov'])
+        right = pd.Series(['Joan Smith', 'Mario Garcia', 'Carla Diaz', 'Juana Perez', 'Daniel Lee', 'Ivan Petrov'])
+        assert link(left, right).empty
+        assert link(right, left).empty
+        assert (link(left, right, min_confidence=0)['confidence'] == 0).all()
+
+    def test_first_name_variants_still_match(self):
+        left = pd.Series(['Jon Smith', 'J. Smith', 'Phillip Diaz'])
+        right = pd.Series(['John Smith', 'Philip Diaz'])
+        matches = link(left, right)
+        assert matches['left'].tolist() == [0, 1, 2]
+        assert matches['right'].tolist() == [0, 0, 1]
+
+    def test_ambiguous_matches_are_flagged(self, agents):
+        matches = link(pd.Series(['J. Smith', 'Mike Brown']), agents['agent_name'], min_confidence=0)
+        assert matches['ambiguous'].all()
+        assert matches.loc[matches['left'] == 1, 'right'].item() == 15
+
+    def test_scales_with_blocks_not_rows(self):
+        rng = np.random.default_rng(0)
+        letters = list('abcdefghijklmnoprstuvw')
+        lasts = np.array([''.join(rng.choice(letters, size=6)) for _ in range(5000)])
+        right = pd.Series(np.char.add('maria ', rng.choice(lasts, 20_000)))
+        left = pd.Series(np.char.add('mary ', lasts[:2000]))
+        matches = NameIndex(right).match(left, min_confidence=0)
+        # Only names sharing a block are scored, never the whole right side
+        assert matches['candidates'].max() < 50
+        assert (matches['left'] < 2000).all() and len(matches) > 0
+
+
+class TestFillFromAgents:
+    """Tests for hubspot_local_enricher.fill_from_agents."""
+
+    def test_fills_email_and_phone_separately(self, agents):
+        hubspot = pd.DataFrame({
+            'First Name': ['John', 'Jose', 'Jane', 'Mike', 'Known'],
+            'Last Name': ['Smith', 'Garcia', 'Smith', 'Brown', 'Person'],
+            'Email': [None, None, '', None, 'k@p.com'],
+            'Phone Number': [None, None, None, None, '999'],
+        })
+        stats = fill_from_agents(hubspot, agents)
+
+        assert hubspot.loc[[0, 2], 'Email'].tolist() == ['john@smith.com', 'jane@smith.com']
+        assert pd.isna(hubspot.loc[1, 'Email'])
+        assert hubspot.loc[[0, 1], 'Phone Number'].tolist() == ['111', '333']
+        assert pd.isna(hubspot.loc[2, 'Phone Number'])
+        assert hubspot.loc[0, 'Email Source'] == 'repliers_db'
+        assert pd.isna(hubspot.loc[1, 'Email Source'])
+        # Two Michael Browns with different emails/phones: left alone
+        assert pd.isna(hubspot.loc[3, 'Email']) and pd.isna(hubspot.loc[3, 'Phone Number'])
+        assert stats == {'already_complete': 1, 'ambiguous': 2, 'fuzzy': 0,
+                         'enriched_email': 2, 'enriched_phone': 2}
+
+    def test_duplicate_agent_rows_are_not_ambiguous(self, agents):
+        agents.loc[16, 'agent_email'] = 'mb1@brown.com'
+        hubspot = pd.DataFrame({'First Name': ['Michael'], 'Last Name': ['Brown'],
+                                'Email': [np.nan], 'Phone Number': ['1']})
+        stats = fill_from_agents(hubspot, agents)
+        assert hubspot.loc[0, 'Email'] == 'mb1@brown.com'
+        assert stats['enriched_email'] == 1 and stats['ambiguous'] == 0
@@ -0,0 +1,119 @@
+"""Tests for tech stack enricher parallel mode."""
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+import tech_stack_enricher as tse
+
+
+HUBSPOT_HTML = '<script src="//js.hs-scripts.com/123.js"></script><script>fbq("init")</script>'
+CALENDLY_HTML = '<a href="https://calendly.com/agent">Book</a><form id="contact-form"></form>'
+
+
+def fake_fetch(url, timeout=None, session=None):
+    return {
+        "https://a.com": HUBSPOT_HTML,
+        "https://b.com": CALENDLY_HTML,
+    }.get(url)
+
+
+class TestAnalyzeHtml:
+    """Tests for the pure detection step."""
+
+    def test_detects_crm_and_pixel(self):
+        result = tse.analyze_html(HUBSPOT_HTML)
+        assert result["has_crm"] is True
+        assert result["crm_name"] == "HubSpot"
+        assert result["has_marketing_pixel"] is True
+        assert result["tech_count"] == 2
+
+    def test_empty_html_returns_defaults(self):
+        assert tse.analyze_html(None) == tse.empty_tech_result()
+
+    def test_matches_serial_enrichment(self):
+        with patch.object(tse, 'fetch_website_html', side_effect=fake_fetch):
+            serial = tse.enrich_with_tech_stack({"website_url": "https://b.com"}, delay=0)
+        assert serial == tse.analyze_html(CALENDLY_HTML)
+        assert serial["has_lead_form"] is True
+
+
+class TestParallelEnrichment:
+    """Tests for concurrent fetch + pooled detection."""
+
+    def test_results_indexed_by_row(self):
+        rows = [
+            (10, {"website_url": "https://a.com"}),
+            (11, {"website_url": "https://b.com"}),
+            (12, {"website_url": "https://down.com"}),
+        ]
+        with patch.object(tse, 'fetch_website_html', side_effect=fake_fetch), \
+                ThreadPoolExecutor(max_workers=2) as detector:
+            results = tse.enrich_tech_stack_parallel(rows, fetch_workers=3, detect_executor=detector)
+
+        assert list(results.columns) == tse.TECH_COLUMNS
+        assert sorted(results.index) == [10, 11, 12]
+        assert results.loc[10, "crm_name"] == "HubSpot"
+        assert results.loc[11, "scheduling_tool"] == "Calendly"
+        assert results.loc[12, "tech_count"] == 0
+
+    def test_enrich_tech_stack_parallel_writes_back(self, tmp_path):
+        csv_path = tmp_path / "in.csv"
+        out_path = tmp_path / "out.csv"
+        pd.DataFrame({
+            "page_name": ["A", "B", "C"],
+            "website_url": ["https://a.com", "", "https://b.com"],
+        }).to_csv(csv_path, index=False)
+
+        original = tse.enrich_tech_stack_parallel
+
+        def run_inline(rows, fetch_workers, detect_workers):
+            with ThreadPoolExecutor(max_workers=2) as detector:
+                return original(rows, fetch_workers, detect_executor=detector)
+
+        with patch.object(tse, 'fetch_website_html', side_effect=fake_fetch), \
+                patch.object(tse, 'enrich_tech_stack_parallel', side_effect=run_inline):
+            stats = tse.enrich_tech_stack(csv_path, out_path, parallel=True)
+
+        out = pd.read_csv(out_path, keep_default_na=False)
+        assert stats["processed"] == 2
+        assert stats["skipped"] == 1
+        assert stats["with_crm"] == 1
+        assert stats["with_scheduling"] == 1
+        assert list(out["crm_name"]) == ["HubSpot", "", ""]
+        assert list(out["scheduling_tool"]) == ["", "", "Calendly"]
+
+    def test_worker_exceptions_are_counted_as_errors(self, tmp_path):
+        csv_path = tmp_path / "in.csv"
+        pd.DataFrame({"website_url": ["https://a.com", "https://boom.com", "https://b.com"]}).to_csv(
+            csv_path, index=False)
+
+        def flaky_fetch(url, timeout=None, session=None):
+            if url == "https://boom.com":
+                raise RuntimeError("connection pool is full")
+            return fake_fetch(url)
+
+        analyze = tse.analyze_html
+
+        def flaky_analyze(html):
+            if html == CALENDLY_HTML:
+                raise ValueError("bad markup")
+            return analyze(html)
+
+        original = tse.enrich_tech_stack_parallel
+
+        def run_inline(rows, fetch_workers, detect_workers):
+            with ThreadPoolExecutor(max_workers=2) as detector, \
+                    patch.object(tse, 'analyze_html', side_effect=flaky_analyze):
+                return original(rows, fetch_workers, detect_executor=detector)
+
+        with patch.object(tse, 'fetch_website_html', side_effect=flaky_fetch), \
+                patch.object(tse, 'enrich_tech_stack_parallel', side_effect=run_inline):
+            stats = tse.enrich_tech_stack(csv_path, tmp_path / "out.csv", parallel=True)
+
+        assert stats["errors"] == 2
+        assert stats["processed"] == 1
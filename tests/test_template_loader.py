@@ -0,0 +1,163 @@
+"""Tests for template loading, render plans and bulk rendering."""
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from scripts.email_templates import template_loader
+from scripts.email_templates.template_loader import (
+    Slot, Template, clear_template_cache, compile_text, load_template,
+    render_many, render_template
+)
+
+
+def make_template(subject, body):
+    return Template(
+        id='t', name='T', description='', path='', trigger={}, variables=[],
+        hubspot_template_id=None, subject=subject, body=body
+    )
+
+
+@pytest.fixture
+def config_dir(tmp_path, monkeypatch):
+    """A temporary templates directory with one template."""
+    (tmp_path / 'followup').mkdir()
+    (tmp_path / 'followup' / 'hello.md').write_text(
+        '---\nid: hello\n---\nSubject: Hola {{ first_name }}\n\nBody v1 {{ company_name }}\n'
+    )
+    (tmp_path / 'templates.json').write_text(json.dumps({'templates': [{
+        'id': 'hello', 'name': 'Hello', 'description': '', 'path': 'followup/hello.md',
+        'trigger': {}, 'variables': ['first_name', 'company_name']
+    }]}))
+    monkeypatch.setattr(template_loader, 'CONFIG_DIR', tmp_path)
+    monkeypatch.setattr(template_loader, 'TEMPLATES_JSON', tmp_path / 'templates.json')
+    clear_template_cache()
+    yield tmp_path
+    clear_template_cache()
+
+
+class TestCompileText:
+    """Tests for render plan compilation."""
+
+    def test_splits_literals_and_slots(self):
+        plan = compile_text('Hola {{ first_name }}, de {{company_name}}.')
+        assert plan.segments == (
+            'Hola ', Slot(('first_name',), None, '{{ first_name }}'),
+            ', de ', Slot(('company_name',), None, '{{company_name}}'), '.'
+        )
+
+    def test_parses_fallbacks_and_default(self):
+        plan = compile_text('{{ first_name | contact_name | default("equipo") }}')
+        assert plan.slots == [Slot(('first_name', 'contact_name'), 'equipo', plan.slots[0].placeholder)]
+
+    def test_plans_are_cached(self):
+        assert compile_text('Hi {{ x }}') is compile_text('Hi {{ x }}')
+
+    def test_dotted_names_are_left_alone(self):
+        assert compile_text('{{ deal.demo_date }}').segments == ('{{ deal.demo_date }}',)
+
+
+class TestRenderTemplate:
+    """Tests for single renders."""
+
+    def test_substitutes_and_keeps_missing_placeholders(self):
+        template = make_template('Hi {{ first_name }}', 'From {{ owner_name }} at {{ company_name }}')
+        subject, body = render_template(template, {'first_name': 'Ana', 'owner_name': None})
+        assert subject == 'Hi Ana'
+        assert body == 'From  at {{ company_name }}'
+
+    def test_strict_raises_on_missing(self):
+        template = make_template('Hi {{ first_name }}', '')
+        with pytest.raises(ValueError, match='first_name'):
+            render_template(template, {}, strict=True)
+
+    def test_fallback_chain_and_default(self):
+        template = make_template('Hola {{ first_name | contact_name | default("equipo") }}', '')
+        assert render_template(template, {'first_name': '', 'contact_name': 'Ana'})[0] == 'Hola Ana'
+        assert render_template(template, {})[0] == 'Hola equipo'
+
+
+class TestLoadTemplateCache:
+    """Tests for mtime-based template caching."""
+
+    def test_reuses_parsed_file_until_mtime_changes(self, config_dir, monkeypatch):
+        assert load_template('hello').body == 'Body v1 {{ company_name }}'
+
+        parses = []
+        original = template_loader.parse_frontmatter
+        monkeypatch.setattr(template_loader, 'parse_frontmatter', lambda c: parses.append(1) or original(c))
+        load_template('hello')
+        assert parses == []
+
+        path = config_dir / 'followup' / 'hello.md'
+        path.write_text('Subject: Hola\n\nBody v2\n')
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert load_template('hello').body == 'Body v2'
+        assert parses == [1]
+
+    def test_returned_templates_are_independent(self, config_dir):
+        first = load_template('hello')
+        first.frontmatter['id'] = 'changed'
+        assert load_template('hello').frontmatter['id'] == 'hello'
+
+
+class TestRenderMany:
+    """Tests for column-wise bulk rendering."""
+
+    def test_matches_render_template(self):
+        template = make_template(
+            'Hola {{ first_name | default("equipo") }}',
+            '{{ company_name }} / {{ owner_name }} / {{ amount }}'
+        )
+        rows = [
+            {'first_name': 'Ana', 'company_name': 'Acme', 'owner_name': 'Tomas', 'amount': 1500},
+            {'first_name': None, 'company_name': 'Beta', 'owner_name': None, 'amount': 20},
+        ]
+
+        rendered = render_many(template, pd.DataFrame(rows, dtype=object))
+
+        assert list(rendered['subject']) == ['Hola Ana', 'Hola equipo']
+        assert rendered['body'].iloc[0] == render_template(template, rows[0])[1]
+        assert rendered['body'].iloc[1] == 'Beta /  / 20'
+
+    def test_missing_values_and_floats_match_render_template(self):
+        template = make_template('{{ first_name | default("team") }}', '{{ owner_name }} {{ amount }}')
+        rows = [{'first_name': 'Ana', 'owner_name': 'Tomas', 'amount': 100},
+                {'amount': 2.5},
+                {'first_name': 'Bo', 'owner_name': None}]
+
+        rendered = render_many(template, rows)
+
+        expected = [render_template(template, row) for row in rows]
+        assert list(rendered['subject']) == [subject for subject, _ in expected]
+        assert list(rendered['body']) == [body for _, body in expected]
+        assert list(rendered['body']) == ['Tomas 100', '{{ owner_name }} 2.5', ' {{ amount }}']
+
+    def test_float_columns_render_whole_numbers_as_ints(self):
+        template = make_template('', '{{ amount }}')
+        # A missing amount upcasts the column to float
+        frame = pd.DataFrame({'amount': [1500, None, 20]})
+        assert list(render_many(template, frame)['body']) == ['1500', '{{ amount }}', '20']
+
+    def test_strict_raises_on_missing_value(self):
+        template = make_template('Hi {{ first_name }}', '')
+        with pytest.raises(ValueError, match='first_name'):
+            render_many(template, [{'first_name': 'Ana'}, {'other': 'x'}], strict=True)
+
+    def test_missing_column_keeps_placeholder(self):
+        template = make_template('Hi {{ first_name }}', '{{ unknown }}')
+        rendered = render_many(template, [{'first_name': 'Ana'}])
+        assert rendered['body'].iloc[0] == '{{ unknown }}'
+
+    def test_strict_raises_on_missing_column(self):
+        template = make_template('Hi {{ first_name }}', '')
+        with pytest.raises(ValueError, match='first_name'):
+            render_many(template, pd.DataFrame({'other': ['x']}), strict=True)
+
+    def test_preserves_index(self):
+        template = make_template('{{ a }}', '')
+        rendered = render_many(template, pd.DataFrame({'a': ['x', 'y']}, index=[10, 20]))
+        assert list(rendered.index) == [10, 20]
@@ -0,0 +1,234 @@
+"""Tests for batched HubSpot reads and bulk template sends.
+
+Runs the HubSpot client against a local mock HubSpot server.
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from scripts.email_templates.hubspot_data import HubSpotDealClient, TTLCache
+from scripts.email_templates.template_loader import Template
+
+
+def make_db(n_deals):
+    """Deals 1..n, each with contact c{i} and company co{i}; deal 2 has no company."""
+    db = {'deals': {}, 'contacts': {}, 'companies': {}, 'assoc': {'contacts': {}, 'companies': {}}}
+    for i in range(1, n_deals + 1):
+        db['deals'][str(i)] = {'dealname': f'Deal {i}', 'amount': str(100 * i), 'hubspot_owner_id': '777'}
+        db['contacts'][f'c{i}'] = {'firstname': f'Ana{i}', 'email': f'ana{i}@example.com', 'company': f'Contact Co {i}'}
+        db['assoc']['contacts'][str(i)] = f'c{i}'
+        if i != 2:
+            db['companies'][f'co{i}'] = {'name': f'Company {i}'}
+            db['assoc']['companies'][str(i)] = f'co{i}'
+    return db
+
+
+class MockHubSpot:
+    """Minimal HubSpot API: batch read, associations batch read, owners."""
+
+    def __init__(self, db, fail_first=None):
+        self.db = db
+        self.calls = []
+        self.fail_first = dict(fail_first or {})
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def reply(self, status, payload=None, headers=None):
+                body = json.dumps(payload or {}).encode()
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                mock.calls.append(('GET', self.path))
+                owner_id = self.path.rsplit('/', 1)[-1]
+                self.reply(200, {'id': owner_id, 'firstName': 'Marta'})
+
+            def do_POST(self):
+                mock.calls.append(('POST', self.path))
+                length = int(self.headers.get('Content-Length', 0))
+                payload = json.loads(self.rfile.read(length))
+                ids = [i['id'] for i in payload['inputs']]
+
+                if mock.fail_first.get(self.path):
+                    mock.fail_first[self.path] -= 1
+                    return self.reply(429, headers={'Retry-After': '0'})
+
+                parts = self.path.strip('/').split('/')
+                if parts[1] == 'v4':  # /crm/v4/associations/deals/{to}/batch/read
+                    links = mock.db['assoc'][parts[4]]
+                    results = [{'from': {'id': i}, 'to': [{'toObjectId': links[i]}]} for i in ids if i in links]
+                else:  # /crm/v3/objects/{type}/batch/read
+                    records = mock.db[parts[3]]
+                    results = [{'id': i, 'properties': records[i]} for i in ids if i in records]
+                self.reply(200, {'results': results})
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def hubspot():
+    with MockHubSpot(make_db(250)) as server:
+        yield server
+
+
+@pytest.fixture
+def client(hubspot):
+    c = HubSpotDealClient(api_key='test-key', base_url=hubspot.url)
+    yield c
+    c.close()
+
+
+class TestHubSpotDealClient:
+    """Tests for the batch HubSpot client."""
+
+    def test_fetch_deal_records_batches_calls(self, hubspot, client):
+        deal_ids = [str(i) for i in range(1, 251)]
+        records = client.fetch_deal_records(deal_ids)
+
+        assert len(records) == 250
+        assert records['1']['contact']['email'] == 'ana1@example.com'
+        assert records['1']['company']['name'] == 'Company 1'
+        assert records['2']['company'] is None
+        # 5 batch endpoints x 3 chunks of <=100
+        assert len(hubspot.calls) == 15
+        assert all(method == 'POST' for method, _ in hubspot.calls)
+
+    def test_missing_deals_are_omitted(self, client):
+        records = client.fetch_deal_records(['1', '9999'])
+        assert list(records) == ['1']
+
+    def test_retries_rate_limited_batch(self):
+        path = '/crm/v3/objects/deals/batch/read'
+        with MockHubSpot(make_db(3), fail_first={path: 1}) as server:
+            c = HubSpotDealClient(api_key='test-key', base_url=server.url)
+            records = c.fetch_deal_records(['1', '3'])
+            c.close()
+
+        assert set(records) == {'1', '3'}
+        assert c.stats['retries'] == 1
+
+    def test_owner_names_are_cached(self, hubspot, client):
+        assert client.get_owner_name('777') == 'Marta'
+        assert client.get_owner_name('777') == 'Marta'
+        assert hubspot.calls == [('GET', '/crm/v3/owners/777')]
+
+    def test_local_owner_names_skip_api(self, hubspot, client):
+        assert client.get_owner_name('1918855052') == 'Tomas'
+        assert hubspot.calls == []
+
+    def test_no_api_key_makes_no_calls(self, hubspot):
+        c = HubSpotDealClient(api_key='', base_url=hubspot.url)
+        assert c.fetch_deal_records(['1']) == {}
+        assert hubspot.calls == []
+
+
+class TestTTLCache:
+    """Tests for the in-process owner cache."""
+
+    def test_entries_expire(self):
+        now = [0.0]
+        cache = TTLCache(ttl_seconds=10, clock=lambda: now[0])
+        cache.set('a', 'Marta')
+        assert cache.get('a') == 'Marta'
+        now[0] = 10.0
+        assert cache.get('a') is None
+
+
+class TestBulkSend:
+    """Tests for send_template_bulk."""
+
+    @pytest.fixture
+    def template(self):
+        return Template(
+            id='followup', name='Follow-up', description='', path='', trigger={},
+            variables=[], hubspot_template_id=None,
+            subject='Hola {{ first_name }}', body='{{ company_name }} / {{ owner_name }}'
+        )
+
+    def test_bulk_send_uses_one_smtp_session(self, hubspot, client, template, tmp_path):
+        from scripts.email_templates import template_sender
+
+        deal_ids = [str(i) for i in range(1, 6)] + ['9999']
+        with patch.object(template_sender, 'load_template', return_value=template), \
+             patch.object(template_sender, 'GMAIL_ADDRESS', 'me@example.com'), \
+             patch.object(template_sender, 'GMAIL_APP_PASSWORD', 'pw'), \
+             patch.object(template_sender, 'LOGS_DIR', tmp_path), \
+             patch.object(template_sender, 'SMTPSession') as mock_session:
+            stats = template_sender.send_template_bulk('followup', deal_ids, client=client)
+
+        session = mock_session.return_value
+        assert mock_session.call_count == 1
+        assert session.send_message.call_count == 5
+        session.close.assert_called_once()
+        assert stats['sent'] == 5
+        assert stats['errors'] == {'9999': 'Deal not found'}
+        # 5 batch calls + one owner lookup (cached for the other deals)
+        assert stats['hubspot_requests'] == 6
+        assert len(hubspot.calls) == 6
+
+        msg = session.send_message.call_args_list[1].args[0]
+        assert msg['To'] == 'ana2@example.com'
+        assert msg['Subject'] == 'Hola Ana2'
+
+    def test_bulk_dry_run_does_not_connect(self, client, template, tmp_path, capsys):
+        from scripts.email_templates import template_sender
+
+        with patch.object(template_sender, 'load_template', return_value=template), \
+             patch.object(template_sender, 'LOGS_DIR', tmp_path), \
+             patch.object(template_sender, 'SMTPSession') as mock_session:
+            stats = template_sender.send_template_bulk('followup', ['1', '2'], dry_run=True, client=client)
+
+        mock_session.assert_not_called()
+        assert stats['sent'] == 2
+        assert 'Company 1 / Marta' in capsys.readouterr().out
+
+
+class TestLoadDealIds:
+    """Tests for collecting bulk deal IDs."""
+
+    def test_reads_csv_and_dedupes(self, tmp_path):
+        from scripts.email_templates.template_sender import load_deal_ids
+
+        deals_file = tmp_path / 'deals.csv'
+        deals_file.write_text('dealname,deal_id\nA,10\nB,11\n')
+
+        assert load_deal_ids('9, 10', str(deals_file)) == ['9', '10', '11']
+
+    def test_reads_plain_list(self, tmp_path):
+        from scripts.email_templates.template_sender import load_deal_ids
+
+        deals_file = tmp_path / 'deals.txt'
+        deals_file.write_text('1\n2\n\n3\n')
+
+        assert load_deal_ids(deals_file=str(deals_file)) == ['1', '2', '3']
+
+    def test_deal_id_is_merged_without_duplicates(self):
+        from scripts.email_templates import template_sender
+
+        with patch.object(template_sender, 'send_template_bulk',
+                          return_value={'sent': 3, 'failed': 0, 'hubspot_requests': 1}) as bulk, \
+                patch('sys.argv', ['template_sender.py', '--template', 't', '--deal-id', '2', '--deal-ids', '1,2,3']):
+            assert template_sender.main() == 0
+
+        assert bulk.call_args.kwargs['deal_ids'] == ['2', '1', '3']